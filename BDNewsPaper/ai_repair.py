@@ -37,6 +37,8 @@ except ImportError:
 from itemadapter import ItemAdapter
 from scrapy.exceptions import NotConfigured
 
+from BDNewsPaper.html_store import get_item_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -260,7 +262,7 @@ class AIRepairPipeline:
             return item
         
         # Get raw HTML
-        raw_html = adapter.get('_raw_html', '') or adapter.get('response_body', '')
+        raw_html = get_item_html(adapter)
         if not raw_html:
             return item
         
@@ -15,7 +15,6 @@ Run with: uvicorn BDNewsPaper.api:app --reload
 import os
 import sqlite3
 import time
-from datetime import datetime, date
 from typing import List, Optional, Dict
 from contextlib import contextmanager
 from collections import defaultdict
@@ -25,6 +24,8 @@ from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response, H
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+from BDNewsPaper.stats_rollup import StatsRollup
+
 # Admin API key for protected endpoints
 ADMIN_API_KEY = os.getenv('ADMIN_API_KEY', '')
 
@@ -217,6 +218,24 @@ def get_db():
         conn.close()
 
 
+@contextmanager
+def get_rollup():
+    """
+    Get the stats rollup as context manager, read as it is.
+
+    The pipeline and ``python -m BDNewsPaper.stats_rollup`` build and
+    update it; a request never backfills it under a write lock.
+    """
+    with get_db() as conn:
+        rollup = StatsRollup(conn)
+        if not rollup.exists():
+            raise HTTPException(
+                status_code=503,
+                detail="Stats rollup not built yet: run python -m BDNewsPaper.stats_rollup --rebuild",
+            )
+        yield rollup
+
+
 def row_to_dict(row) -> dict:
     """Convert sqlite row to dictionary."""
     return dict(row) if row else {}
@@ -241,9 +260,8 @@ async def health_check():
     """Detailed health check."""
     try:
         with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM articles")
-            count = cursor.fetchone()[0]
+            rollup = StatsRollup(conn)
+            count = rollup.totals()["articles"] if rollup.exists() else None
         return {
             "status": "healthy",
             "database": "connected",
@@ -256,58 +274,18 @@ async def health_check():
 @app.get("/stats", response_model=StatsResponse, tags=["Statistics"])
 async def get_stats():
     """Get database statistics."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Total articles
-        cursor.execute("SELECT COUNT(*) FROM articles")
-        total = cursor.fetchone()[0]
-        
-        # Articles by paper
-        cursor.execute("""
-            SELECT paper_name, COUNT(*) as count 
-            FROM articles 
-            GROUP BY paper_name 
-            ORDER BY count DESC
-        """)
-        papers = {row['paper_name']: row['count'] for row in cursor.fetchall()}
-        
-        # Articles by category
-        cursor.execute("""
-            SELECT category, COUNT(*) as count 
-            FROM articles 
-            WHERE category IS NOT NULL 
-            GROUP BY category 
-            ORDER BY count DESC 
-            LIMIT 20
-        """)
-        categories = {row['category']: row['count'] for row in cursor.fetchall()}
-        
-        # Date range
-        cursor.execute("""
-            SELECT MIN(publication_date) as earliest, 
-                   MAX(publication_date) as latest 
-            FROM articles 
-            WHERE publication_date IS NOT NULL
-        """)
-        date_row = cursor.fetchone()
-        
-        # Recent articles (last 24 hours)
-        cursor.execute("""
-            SELECT COUNT(*) FROM articles 
-            WHERE scraped_at >= datetime('now', '-1 day')
-        """)
-        recent = cursor.fetchone()[0]
+    with get_rollup() as rollup:
+        totals = rollup.totals()
         
         return {
-            "total_articles": total,
-            "papers": papers,
-            "categories": categories,
+            "total_articles": totals["articles"],
+            "papers": rollup.counts_by("paper_name"),
+            "categories": rollup.counts_by("category", limit=20),
             "date_range": {
-                "earliest": date_row['earliest'],
-                "latest": date_row['latest'],
+                "earliest": totals["earliest_published"],
+                "latest": totals["latest_published"],
             },
-            "recent_articles": recent,
+            "recent_articles": rollup.totals(hours=24)["articles"],
         }
 
 
@@ -414,31 +392,25 @@ async def get_article_by_url(url: str = Query(..., description="Article URL")):
 @app.get("/papers", tags=["Papers"])
 async def list_papers():
     """List all newspapers with article counts."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT paper_name, COUNT(*) as count,
-                   MAX(publication_date) as latest_article
-            FROM articles 
-            GROUP BY paper_name 
-            ORDER BY count DESC
-        """)
-        return [row_to_dict(row) for row in cursor.fetchall()]
+    with get_rollup() as rollup:
+        return [
+            {
+                "paper_name": paper["paper_name"],
+                "count": paper["count"],
+                "latest_article": paper["latest_article"],
+            }
+            for paper in rollup.papers()
+        ]
 
 
 @app.get("/categories", tags=["Categories"])
 async def list_categories():
     """List all categories with article counts."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT category, COUNT(*) as count 
-            FROM articles 
-            WHERE category IS NOT NULL 
-            GROUP BY category 
-            ORDER BY count DESC
-        """)
-        return [row_to_dict(row) for row in cursor.fetchall()]
+    with get_rollup() as rollup:
+        return [
+            {"category": category, "count": count}
+            for category, count in rollup.counts_by("category").items()
+        ]
 
 
 @app.get("/search", tags=["Search"])
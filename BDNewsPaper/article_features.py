@@ -0,0 +1,419 @@
+"""
+Article Feature Store
+=====================
+Per-article NLP features, computed once and queried by the analysis scripts.
+
+The bias, geo-mapping, analytics and dashboard scripts used to re-read raw
+article bodies and recompute the same text features on every run, so they
+were capped at a few hundred recent rows. The feature worker instead runs
+each article through ``FeatureExtractor`` once and stores the results in
+two tables next to ``articles``:
+
+    article_features        one row per article: word count, TextBlob
+                            polarity, lexicon sentiment and political lean
+    article_feature_terms   (article, kind, term, count) for the kinds
+                            token     - headline keywords
+                            location  - places mentioned in the headline
+                            person    - name-like phrases
+                            organization
+                            lexicon   - bias/sentiment lexicon category hits
+
+The worker is incremental: it only processes article ids past the last one
+stored, in batches spread over a process pool. The scripts then run
+aggregate queries (``FeatureStore``) that cover the whole archive.
+
+Usage:
+    python -m BDNewsPaper.article_features            # process new articles
+    python -m BDNewsPaper.article_features --rebuild  # recompute everything
+
+    from BDNewsPaper.article_features import FeatureStore, update_features
+
+    update_features(db_path)
+    store = FeatureStore(sqlite3.connect(db_path))
+    store.term_counts('location', days=30)
+"""
+
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from BDNewsPaper.lexicon_matcher import load_matcher
+from BDNewsPaper.lexicons import BIAS_LEXICON, LOCATION_ALIASES, SENTIMENT_LEXICON, STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes; --rebuild recomputes older rows
+FEATURES_VERSION = 2
+
+TERM_KINDS = ('token', 'location', 'person', 'organization', 'lexicon')
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS article_features (
+        article_id INTEGER PRIMARY KEY,
+        paper_name TEXT,
+        category TEXT,
+        scraped_at TEXT,
+        word_count INTEGER NOT NULL,
+        polarity REAL,
+        sentiment TEXT NOT NULL,
+        political_lean TEXT NOT NULL,
+        version INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_article_features_scraped_at ON article_features(scraped_at);
+    CREATE INDEX IF NOT EXISTS idx_article_features_paper ON article_features(paper_name, scraped_at);
+
+    CREATE TABLE IF NOT EXISTS article_feature_terms (
+        article_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        term TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (article_id, kind, term)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_article_feature_terms_term ON article_feature_terms(kind, term);
+"""
+
+# Entity heuristics (capitalized multi-word phrases)
+_NAME_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b')
+_PERSON_TITLES = ('Mr', 'Mrs', 'Dr', 'PM', 'President', 'Minister')
+_ORGANIZATION_SUFFIXES = frozenset(['University', 'College', 'Bank', 'Corporation', 'Ltd', 'Inc', 'Company'])
+_TOKEN_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+
+try:
+    from textblob import TextBlob
+    TEXTBLOB_AVAILABLE = True
+except ImportError:
+    TEXTBLOB_AVAILABLE = False
+
+
+def lean_label(left: int, right: int) -> str:
+    """Political lean from left/right lexicon hits."""
+    if left > right * 1.5:
+        return "left"
+    if right > left * 1.5:
+        return "right"
+    return "center"
+
+
+def sentiment_label(positive: int, negative: int) -> str:
+    """Sentiment from positive/negative lexicon hits."""
+    if positive > negative * 1.5:
+        return "positive"
+    if negative > positive * 1.5:
+        return "negative"
+    return "neutral"
+
+
+class FeatureExtractor:
+    """Compute the stored features for one article."""
+
+    def __init__(self):
+        # Built once per lexicon and cached on disk (see lexicon_matcher)
+        self.lexicon_matcher = load_matcher({**BIAS_LEXICON, **SENTIMENT_LEXICON})
+        self.location_matcher = load_matcher(LOCATION_ALIASES)
+
+    def lexicon_counts(self, text: str) -> Dict[str, int]:
+        """Hits per bias and sentiment lexicon category, in one pass."""
+        counts = self.lexicon_matcher.counts(text)
+        return {category: counts[category] for category in self.lexicon_matcher.ids}
+
+    def locations(self, text: str) -> List[str]:
+        """Distinct locations mentioned in text, by canonical name."""
+        return self.location_matcher.distinct(text)
+
+    @staticmethod
+    def entities(text: str) -> Tuple[Counter, Counter]:
+        """People and organizations among capitalized multi-word phrases."""
+        people, organizations = Counter(), Counter()
+        for match in _NAME_PATTERN.findall(text):
+            words = match.split()
+            if any(title in words[0] for title in _PERSON_TITLES):
+                people[match] += 1
+            elif words[-1] in _ORGANIZATION_SUFFIXES:
+                organizations[match] += 1
+            else:
+                # Could be person or place - counted as a name
+                people[match] += 1
+        return people, organizations
+
+    @staticmethod
+    def tokens(headline: str) -> Counter:
+        """Headline keywords: lowercase words of 3+ letters minus stop words."""
+        return Counter(w for w in _TOKEN_PATTERN.findall(headline.lower()) if w not in STOP_WORDS)
+
+    def extract(self, headline: str, body: str) -> Dict:
+        """Features of one article, as stored by the worker."""
+        headline = headline or ""
+        body = body or ""
+        text = f"{headline} {body}"
+
+        lexicon = self.lexicon_counts(text)
+        people, organizations = self.entities(f"{headline} {body[:1000]}")
+
+        polarity = None
+        if TEXTBLOB_AVAILABLE:
+            polarity = TextBlob(f"{headline}. {body[:500]}").sentiment.polarity
+
+        terms = [('lexicon', category, count) for category, count in lexicon.items() if count]
+        terms += [('token', word, count) for word, count in self.tokens(headline).items()]
+        terms += [('location', loc, 1) for loc in self.locations(headline)]
+        terms += [('person', name, count) for name, count in people.items()]
+        terms += [('organization', name, count) for name, count in organizations.items()]
+
+        return {
+            "word_count": len(text.split()),
+            "polarity": polarity,
+            "sentiment": sentiment_label(lexicon["positive"], lexicon["negative"]),
+            "political_lean": lean_label(lexicon["left_leaning"], lexicon["right_leaning"]),
+            "terms": terms,
+        }
+
+
+# Per-process extractor for pool workers
+_extractor: Optional[FeatureExtractor] = None
+
+
+def _extract_batch(rows: List[tuple]) -> List[tuple]:
+    """Extract features for (id, paper, category, scraped_at, headline, body) rows."""
+    global _extractor
+    if _extractor is None:
+        _extractor = FeatureExtractor()
+    return [(row[:4], _extractor.extract(row[4], row[5])) for row in rows]
+
+
+class FeatureWorker:
+    """
+    Fill article_features for articles not processed yet.
+
+    Batches are extracted in a process pool (``workers`` > 1) or inline,
+    and written in id order from this process, so the highest stored id
+    always marks where the next run resumes.
+    """
+
+    def __init__(self, db_path: str, workers: Optional[int] = None, batch_size: int = 200):
+        self.db_path = db_path
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+
+        self.stats = {
+            'articles': 0,
+            'batches': 0,
+            'terms': 0,
+        }
+
+    def run(self, limit: Optional[int] = None) -> int:
+        """Process articles past the last stored id. Returns articles processed."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            store = FeatureStore(conn)
+            if not store.create_schema():
+                return 0
+            after_id = store.last_article_id()
+            pending = conn.execute("SELECT COUNT(*) FROM articles WHERE id > ?", (after_id,)).fetchone()[0]
+            if limit is not None:
+                pending = min(pending, limit)
+            batches = self._batches(conn, after_id, limit)
+            # A pool only pays off with more than one batch to spread
+            if self.workers > 1 and pending > self.batch_size:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    self._write_all(conn, self._parallel(pool, batches))
+            else:
+                self._write_all(conn, (_extract_batch(rows) for rows in batches))
+        finally:
+            conn.close()
+        return self.stats['articles']
+
+    def rebuild(self) -> int:
+        """Drop stored features and process the whole archive."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            conn.execute("DROP TABLE IF EXISTS article_feature_terms")
+            conn.execute("DROP TABLE IF EXISTS article_features")
+            conn.commit()
+        finally:
+            conn.close()
+        return self.run()
+
+    def _batches(self, conn: sqlite3.Connection, after_id: int, limit: Optional[int]) -> Iterable[List[tuple]]:
+        """Read unprocessed articles in id order, batch_size at a time."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.batch_size if remaining is None else min(self.batch_size, remaining)
+            rows = conn.execute("""
+                SELECT id, paper_name, category, scraped_at, headline, article
+                FROM articles WHERE id > ? ORDER BY id LIMIT ?
+            """, (after_id, size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def _parallel(self, pool: ProcessPoolExecutor, batches: Iterable[List[tuple]]):
+        """Keep a bounded number of batches in flight; yield results in order."""
+        in_flight = deque()
+        for rows in batches:
+            in_flight.append(pool.submit(_extract_batch, rows))
+            if len(in_flight) >= self.workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def _write_all(self, conn: sqlite3.Connection, results: Iterable[List[tuple]]) -> None:
+        for batch in results:
+            feature_rows, term_rows = [], []
+            for (article_id, paper, category, scraped_at), features in batch:
+                feature_rows.append((
+                    article_id, paper, category, scraped_at, features["word_count"],
+                    features["polarity"], features["sentiment"], features["political_lean"],
+                    FEATURES_VERSION,
+                ))
+                term_rows.extend((article_id, kind, term, count) for kind, term, count in features["terms"])
+            conn.executemany(
+                "INSERT OR REPLACE INTO article_features VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                feature_rows
+            )
+            conn.executemany("INSERT OR REPLACE INTO article_feature_terms VALUES (?, ?, ?, ?)", term_rows)
+            conn.commit()
+            self.stats['articles'] += len(feature_rows)
+            self.stats['terms'] += len(term_rows)
+            self.stats['batches'] += 1
+
+
+class FeatureStore:
+    """Aggregate queries over stored article features."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def create_schema(self) -> bool:
+        """Create the feature tables. Returns False if there is no articles table."""
+        has_articles = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name='articles'"
+        ).fetchone()
+        if not has_articles:
+            return False
+        self.conn.executescript(_SCHEMA)
+        return True
+
+    def last_article_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(article_id), 0) FROM article_features").fetchone()[0]
+
+    @staticmethod
+    def _filters(days: Optional[float], paper: Optional[str]) -> Tuple[str, tuple]:
+        clauses, params = [], []
+        if days is not None:
+            clauses.append("f.scraped_at >= datetime('now', ?)")
+            params.append(f"-{float(days)} days")
+        if paper is not None:
+            clauses.append("f.paper_name = ?")
+            params.append(paper)
+        return (" AND ".join(clauses) or "1"), tuple(params)
+
+    def article_count(self, days: Optional[float] = None, paper: Optional[str] = None) -> int:
+        """Articles with stored features."""
+        where, params = self._filters(days, paper)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM article_features f WHERE {where}", params
+        ).fetchone()[0]
+
+    @staticmethod
+    def _term_filters(kind: str, min_length: int, exclude: Iterable[str]) -> Tuple[str, tuple]:
+        if kind not in TERM_KINDS:
+            raise ValueError(f"Unknown feature kind: {kind}")
+        exclude = tuple(exclude)
+        clauses = ""
+        if min_length:
+            clauses += f" AND length(t.term) >= {int(min_length)}"
+        if exclude:
+            clauses += f" AND t.term NOT IN ({', '.join('?' * len(exclude))})"
+        return clauses, exclude
+
+    def term_counts(self, kind: str, days: Optional[float] = None, paper: Optional[str] = None,
+                    limit: Optional[int] = None, articles: bool = False,
+                    min_length: int = 0, exclude: Iterable[str] = ()) -> List[Tuple[str, int]]:
+        """
+        Most frequent terms of a kind, as (term, count) pairs.
+
+        ``articles=True`` counts articles mentioning the term instead of
+        mentions. ``min_length`` and ``exclude`` drop short or unwanted terms.
+        """
+        term_where, term_params = self._term_filters(kind, min_length, exclude)
+        where, params = self._filters(days, paper)
+        total = "COUNT(*)" if articles else "SUM(t.count)"
+        query = f"""
+            SELECT t.term, {total} AS n
+            FROM article_features f
+            JOIN article_feature_terms t ON t.article_id = f.article_id AND t.kind = ?{term_where}
+            WHERE {where}
+            GROUP BY t.term
+            ORDER BY n DESC, t.term
+        """
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self.conn.execute(query, (kind,) + term_params + params).fetchall()
+
+    def term_counts_by(self, group: str, kind: str, days: Optional[float] = None,
+                       min_length: int = 0, exclude: Iterable[str] = ()) -> Dict[str, Dict[str, int]]:
+        """Term counts of a kind per 'paper' or per 'day': {group: {term: count}}."""
+        column = {'paper': "f.paper_name", 'day': "date(f.scraped_at)"}[group]
+        term_where, term_params = self._term_filters(kind, min_length, exclude)
+        where, params = self._filters(days, None)
+        result: Dict[str, Dict[str, int]] = {}
+        for key, term, count in self.conn.execute(f"""
+            SELECT {column}, t.term, SUM(t.count)
+            FROM article_features f
+            JOIN article_feature_terms t ON t.article_id = f.article_id AND t.kind = ?{term_where}
+            WHERE {where}
+            GROUP BY 1, 2
+        """, (kind,) + term_params + params):
+            result.setdefault(key, {})[term] = count
+        return result
+
+    def article_counts_by_paper(self, days: Optional[float] = None) -> Dict[str, int]:
+        """Articles with stored features per paper."""
+        where, params = self._filters(days, None)
+        return dict(self.conn.execute(
+            f"SELECT f.paper_name, COUNT(*) FROM article_features f WHERE {where} GROUP BY f.paper_name",
+            params
+        ).fetchall())
+
+
+def update_features(db_path: str, workers: Optional[int] = None) -> int:
+    """Bring the feature store up to date. Returns articles processed."""
+    if not os.path.exists(db_path):
+        return 0
+    worker = FeatureWorker(str(db_path), workers=workers)
+    processed = worker.run()
+    if processed:
+        logger.info(f"Extracted features for {processed} articles")
+    return processed
+
+
+def main():
+    """Command line interface for the feature worker."""
+    parser = argparse.ArgumentParser(description="Article feature worker")
+    parser.add_argument("--db", default="news_articles.db", help="SQLite database path")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Articles per batch")
+    parser.add_argument("--limit", type=int, default=None, help="Process at most this many articles")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute features for every article")
+    args = parser.parse_args()
+
+    worker = FeatureWorker(args.db, workers=args.workers, batch_size=args.batch_size)
+    start = time.perf_counter()
+    processed = worker.rebuild() if args.rebuild else worker.run(limit=args.limit)
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed else 0
+    print(f"Processed {processed:,} articles in {elapsed:.1f}s ({rate:,.0f}/s, "
+          f"{worker.stats['batches']} batches, {worker.stats['terms']:,} terms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Partitioned Article Storage
+===========================
+Optional month-partitioned layout for the SQLite ``articles`` table.
+
+Almost every reader asks for a recent window (``scraped_at >= ?``), while
+the archive keeps growing. In partitioned mode articles live in one table
+per scrape month, ``articles_YYYY_MM``, and ``articles`` becomes a
+``UNION ALL`` view over them. Readers keep querying ``articles``
+unchanged: SQLite pushes ``WHERE scraped_at >= ?`` and ``WHERE id > ?``
+into every partition, where each one answers from its own index. A
+partition outside the window costs one index probe, and only the recent
+partitions return rows.
+
+Old months can then be handled one at a time: ``archive()`` copies a
+partition into its own database file (optionally gzipped), drops it from
+the live database and the view, and ``vacuum()`` gives the space back.
+
+Two bookkeeping tables keep ids and URLs global across partitions:
+
+    article_partition_ids   id (AUTOINCREMENT), url (UNIQUE), partition_name
+    article_partitions      name, month, archived_to, archived_at
+
+Ids therefore keep increasing across months, which the stats rollup,
+feature worker and search sync rely on for their high-water marks.
+
+Enable with ``SQLITE_PARTITIONED = True`` (SharedSQLitePipeline migrates an
+existing table on the next crawl), or by hand:
+
+    python -m BDNewsPaper.article_partitions --migrate
+    python -m BDNewsPaper.article_partitions --list
+    python -m BDNewsPaper.article_partitions --archive 2023-01 --dest archive/ --vacuum
+"""
+
+import argparse
+import gzip
+import logging
+import os
+import re
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the pipeline, in insert order (id is allocated separately)
+ARTICLE_COLUMNS = (
+    'url', 'paper_name', 'headline', 'article', 'sub_title', 'category',
+    'author', 'publication_date', 'modification_date', 'image_url',
+    'keywords', 'source_language', 'word_count', 'content_hash',
+)
+
+# Same columns (and column order) as the unpartitioned articles table
+_PARTITION_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL,
+        paper_name TEXT NOT NULL,
+        headline TEXT NOT NULL,
+        article TEXT NOT NULL,
+        sub_title TEXT,
+        category TEXT,
+        author TEXT,
+        publication_date TEXT,
+        modification_date TEXT,
+        image_url TEXT,
+        keywords TEXT,
+        source_language TEXT,
+        word_count INTEGER,
+        content_hash TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_PARTITION_INDEXES = ('url', 'paper_name', 'publication_date', 'category', 'content_hash', 'scraped_at')
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS article_partition_ids (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        partition_name TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS article_partitions (
+        name TEXT PRIMARY KEY,
+        month TEXT NOT NULL,
+        archived_to TEXT,
+        archived_at TEXT
+    );
+"""
+
+_MONTH = re.compile(r'^(\d{4})-(\d{2})$')
+
+
+def partition_name(month: str) -> str:
+    """Table name for a 'YYYY-MM' month."""
+    match = _MONTH.match(month)
+    if not match:
+        raise ValueError(f"Month must be YYYY-MM, got {month!r}")
+    return f"articles_{match.group(1)}_{match.group(2)}"
+
+
+def current_month() -> str:
+    """The month scraped_at (UTC CURRENT_TIMESTAMP) falls in right now."""
+    return datetime.now(timezone.utc).strftime('%Y-%m')
+
+
+def articles_kind(conn: sqlite3.Connection) -> Optional[str]:
+    """'table', 'view' (partitioned) or None if there is no articles relation."""
+    row = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'articles' AND type IN ('table', 'view')"
+    ).fetchone()
+    return row[0] if row else None
+
+
+def url_table(conn: sqlite3.Connection) -> Optional[str]:
+    """
+    Relation holding every stored URL: ``article_partition_ids`` when
+    partitioned (archived URLs stay there), else ``articles``. None if
+    there is no articles relation yet.
+    """
+    kind = articles_kind(conn)
+    if kind is None:
+        return None
+    return 'article_partition_ids' if kind == 'view' else 'articles'
+
+
+class ArticlePartitions:
+    """Create, route to, and archive monthly article partitions."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def is_partitioned(self) -> bool:
+        return articles_kind(self.conn) == 'view'
+
+    def ensure(self) -> None:
+        """Switch to the partitioned layout if needed, migrating an existing table."""
+        kind = articles_kind(self.conn)
+        if kind == 'view':
+            return
+        if kind == 'table':
+            self.migrate()
+            return
+        self.conn.executescript(_SCHEMA)
+        self._create_partition(current_month())
+        self._rebuild_view()
+        self.conn.commit()
+
+    def migrate(self) -> int:
+        """
+        Move an unpartitioned articles table into monthly partitions.
+
+        Runs in one transaction; ids and URLs are preserved. Returns the
+        number of articles moved.
+        """
+        if articles_kind(self.conn) != 'table':
+            return 0
+        self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        if articles_kind(self.conn) != 'table':
+            # Another process migrated first
+            self.conn.rollback()
+            return 0
+        try:
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    self.conn.execute(statement)
+            self.conn.execute("ALTER TABLE articles RENAME TO articles_unpartitioned")
+            month_of = "COALESCE(strftime('%Y-%m', scraped_at), ?)"
+            months = [row[0] for row in self.conn.execute(
+                f"SELECT DISTINCT {month_of} FROM articles_unpartitioned", (current_month(),)
+            )]
+            columns = ', '.join(('id',) + ARTICLE_COLUMNS + ('scraped_at',))
+            moved = 0
+            for month in sorted(set(months) | {current_month()}):
+                # Indexes are built after the copy; far cheaper than per row
+                name = self._create_partition(month, indexes=False)
+                moved += self.conn.execute(
+                    f"INSERT INTO {name} ({columns}) SELECT {columns} FROM articles_unpartitioned"
+                    f" WHERE {month_of} = ?",
+                    (current_month(), month)
+                ).rowcount
+                self._create_indexes(name)
+            self.conn.execute(
+                f"""INSERT INTO article_partition_ids (id, url, partition_name)
+                    SELECT id, url, 'articles_' || replace({month_of}, '-', '_') FROM articles_unpartitioned""",
+                (current_month(),)
+            )
+            # Keep AUTOINCREMENT from reusing ids of articles deleted before the move
+            sequence = self.conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'articles_unpartitioned'"
+            ).fetchone()
+            if sequence and not self.conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'article_partition_ids'", sequence
+            ).rowcount:
+                self.conn.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('article_partition_ids', ?)", sequence
+                )
+            self.conn.execute("DROP TABLE articles_unpartitioned")
+            self._rebuild_view()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        logger.info(f"Partitioned {moved} articles by month")
+        return moved
+
+    def insert(self, values: Dict) -> int:
+        """
+        Insert one article into the current month's partition, inside the
+        caller's transaction. Returns its id; a duplicate URL raises
+        sqlite3.IntegrityError as the unpartitioned table did.
+        """
+        name = self._create_partition(current_month(), rebuild_view=True)
+        article_id = self.conn.execute(
+            "INSERT INTO article_partition_ids (url, partition_name) VALUES (?, ?)",
+            (values['url'], name)
+        ).lastrowid
+        columns = ('id',) + ARTICLE_COLUMNS
+        self.conn.execute(
+            f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            (article_id,) + tuple(values.get(column) for column in ARTICLE_COLUMNS)
+        )
+        return article_id
+
+    def url_exists(self, url: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM article_partition_ids WHERE url = ?", (url,)
+        ).fetchone() is not None
+
+    def partitions(self, include_archived: bool = False) -> List[Dict]:
+        """Partitions by month, with article counts and scrape range for live ones."""
+        result = []
+        for name, month, archived_to, archived_at in self.conn.execute(
+            "SELECT name, month, archived_to, archived_at FROM article_partitions ORDER BY month"
+        ):
+            if archived_to and not include_archived:
+                continue
+            info = {'name': name, 'month': month, 'archived_to': archived_to, 'archived_at': archived_at}
+            if not archived_to:
+                info['articles'], info['first_scraped'], info['last_scraped'] = self.conn.execute(
+                    f"SELECT COUNT(*), MIN(scraped_at), MAX(scraped_at) FROM {name}"
+                ).fetchone()
+            result.append(info)
+        return result
+
+    def archive(self, month: str, dest_dir: str, compress: bool = True) -> str:
+        """
+        Move a past month out of the live database.
+
+        The partition is copied to ``<dest_dir>/articles_YYYY_MM.db`` (then
+        gzipped if ``compress``), dropped, and removed from the view. Its
+        URLs stay registered, so archived articles are not scraped again,
+        and the stats rollup (if any) is rebuilt from the live articles.
+        Returns the archive path.
+        """
+        name = partition_name(month)
+        if month >= current_month():
+            raise ValueError(f"Cannot archive the current month ({month})")
+        if not self.conn.execute(
+            "SELECT 1 FROM article_partitions WHERE name = ? AND archived_to IS NULL", (name,)
+        ).fetchone():
+            raise ValueError(f"No live partition for {month}")
+
+        dest = Path(dest_dir)
+        dest.mkdir(parents=True, exist_ok=True)
+        path = dest / f"{name}.db"
+        if path.exists():
+            path.unlink()
+
+        self.conn.commit()
+        self.conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+        try:
+            self.conn.execute(_PARTITION_TABLE.format(name=f"archive.{name}"))
+            self.conn.execute(f"INSERT INTO archive.{name} SELECT * FROM main.{name}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute("DETACH DATABASE archive")
+
+        if compress:
+            with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.remove(path)
+            path = Path(f"{path}.gz")
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE article_partitions SET archived_to = ?, archived_at = CURRENT_TIMESTAMP WHERE name = ?",
+                (str(path), name)
+            )
+            self._rebuild_view()
+            self.conn.execute(f"DROP TABLE {name}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        from BDNewsPaper.stats_rollup import StatsRollup
+        rollup = StatsRollup(self.conn)
+        if rollup.exists():
+            rollup.rebuild()
+        logger.info(f"Archived {name} to {path}")
+        return str(path)
+
+    def vacuum(self) -> None:
+        """Return space freed by archived partitions to the filesystem."""
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def _create_partition(self, month: str, rebuild_view: bool = False, indexes: bool = True) -> str:
+        """Create a month's table (and indexes) if missing. Returns its name."""
+        name = partition_name(month)
+        if self.conn.execute("SELECT 1 FROM article_partitions WHERE name = ?", (name,)).fetchone():
+            return name
+        self.conn.execute(_PARTITION_TABLE.format(name=name))
+        if indexes:
+            self._create_indexes(name)
+        self.conn.execute("INSERT OR IGNORE INTO article_partitions (name, month) VALUES (?, ?)", (name, month))
+        if rebuild_view:
+            self._rebuild_view()
+        return name
+
+    def _create_indexes(self, name: str) -> None:
+        for column in _PARTITION_INDEXES:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{column} ON {name}({column})")
+
+    def _rebuild_view(self) -> None:
+        names = [row[0] for row in self.conn.execute(
+            "SELECT name FROM article_partitions WHERE archived_to IS NULL ORDER BY month"
+        )]
+        self.conn.execute("DROP VIEW IF EXISTS articles")
+        # IF NOT EXISTS: a concurrent writer may have just built the same view
+        self.conn.execute(
+            "CREATE VIEW IF NOT EXISTS articles AS " + " UNION ALL ".join(f"SELECT * FROM {name}" for name in names)
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command line interface for partition maintenance."""
+    parser = argparse.ArgumentParser(description="Partitioned article storage")
+    parser.add_argument("--db", default="news_articles.db", help="SQLite database path")
+    parser.add_argument("--migrate", action="store_true", help="Partition an existing articles table")
+    parser.add_argument("--list", action="store_true", help="List partitions")
+    parser.add_argument("--archive", metavar="YYYY-MM", help="Archive a past month")
+    parser.add_argument("--dest", default="archive", help="Directory for archived partitions")
+    parser.add_argument("--no-compress", action="store_true", help="Keep archives as plain .db files")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM after archiving")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30.0)
+    partitions = ArticlePartitions(conn)
+    try:
+        if args.migrate:
+            print(f"Moved {partitions.migrate():,} articles into monthly partitions")
+        if args.archive:
+            print(f"Archived {args.archive} to {partitions.archive(args.archive, args.dest, not args.no_compress)}")
+        if args.vacuum:
+            partitions.vacuum()
+        if args.list or not (args.migrate or args.archive or args.vacuum):
+            if not partitions.is_partitioned():
+                print("articles is not partitioned (use --migrate)")
+            for p in partitions.partitions(include_archived=True):
+                status = f"archived to {p['archived_to']}" if p['archived_to'] else \
+                    f"{p['articles']:>9,} articles  {p['first_scraped'] or '-'} .. {p['last_scraped'] or '-'}"
+                print(f"{p['month']}  {status}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
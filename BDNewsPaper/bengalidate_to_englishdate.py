@@ -28,7 +28,8 @@ Usage:
 import logging
 import re
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 import pytz
 
@@ -150,6 +151,198 @@ BANGLA_CALENDAR_MONTHS: Dict[str, int] = {
 }
 
 
+# Month name -> month number
+MONTH_NUMBERS: Dict[str, int] = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'May': 5, 'June': 6, 'July': 7, 'August': 8,
+    'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
+_MONTH_NAMES: Dict[int, str] = {v: k for k, v in MONTH_NUMBERS.items()}
+
+# Distinct date strings whose parse results are memoized
+DATE_CACHE_SIZE = 4096
+
+
+# =============================================================================
+# Compiled Tables
+# =============================================================================
+
+# str.translate tables for numeral conversion
+_TO_ENGLISH_NUMS = str.maketrans(BENGALI_TO_ENGLISH_NUMS)
+_TO_BENGALI_NUMS = str.maketrans(ENGLISH_TO_BENGALI_NUMS)
+
+
+def _build_lexicon() -> Dict[str, Tuple[str, int, object]]:
+    """Map every known word to (kind, priority, value); priority is table order."""
+    lexicon: Dict[str, Tuple[str, int, object]] = {}
+    tables = (
+        ('day', BENGALI_DAYS),
+        ('relative', BENGALI_RELATIVE_DATES),
+        ('period', {k: v[0] for k, v in BENGALI_TIME_PERIODS.items()}),
+        ('month', {k: MONTH_NUMBERS[v] for k, v in BENGALI_MONTHS.items()}),
+    )
+    for kind, table in tables:
+        for priority, (word, value) in enumerate(table.items()):
+            lexicon.setdefault(word, (kind, priority, value))
+    return lexicon
+
+
+_LEXICON = _build_lexicon()
+
+# Single tokenizer over numeral-converted text. Alternatives are tried in
+# order at each position: clock time, "X টা [Y মিনিট]", number, known word
+# (longest first, matched anywhere like the previous substring checks).
+_TOKEN_RE = re.compile(
+    r'(?P<hm_h>\d{1,2})[:.](?P<hm_m>\d{2})'
+    r'|(?P<ta_h>\d{1,2})\s*টা(?:\s*(?P<ta_m>\d{1,2})\s*মিনিট)?'
+    r'|(?P<num>\d+)'
+    r'|(?P<word>' + '|'.join(
+        re.escape(word) for word in sorted(_LEXICON, key=len, reverse=True)
+    ) + ')'
+)
+_MONTH_RE = re.compile('|'.join(
+    re.escape(word) for word in sorted(BENGALI_MONTHS, key=len, reverse=True)
+))
+_RELATIVE_RE = re.compile('|'.join(
+    re.escape(word) for word in sorted(BENGALI_RELATIVE_DATES, key=len, reverse=True)
+))
+_DIGIT_RE = re.compile(r'[০-৯0-9]')
+
+
+class _DateTokens(NamedTuple):
+    """Everything the tokenizer found in one date string."""
+    month: Optional[int]
+    numbers: List[str]
+    relative_days: Optional[int]
+    time: Optional[Tuple[int, int]]
+
+
+class _RelativeDate(NamedTuple):
+    """Memoized parse of a relative date; resolved against 'now' per call."""
+    days: int
+    time: Optional[Tuple[int, int]]
+
+
+@lru_cache(maxsize=None)
+def _get_timezone(name: str):
+    """Cached pytz timezone lookup (falls back to Asia/Dhaka)."""
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        logger.error(f"Unknown timezone: {name}")
+        return pytz.timezone('Asia/Dhaka')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _day_tzinfo(tz, year: int, month: int, day: int):
+    """
+    The pytz offset in effect for a whole calendar day, or None if it changes.
+
+    pytz.localize tries every offset the zone ever used; doing it once per
+    day lets every time on that day reuse the result.
+    """
+    start = tz.localize(datetime(year, month, day)).tzinfo
+    end = tz.localize(datetime(year, month, day, 23, 59)).tzinfo
+    return start if start is end else None
+
+
+def _localize(tz, year: int, month: int, day: int, hour: int, minute: int) -> datetime:
+    tzinfo = _day_tzinfo(tz, year, month, day)
+    if tzinfo is None:
+        return tz.localize(datetime(year, month, day, hour, minute))
+    return datetime(year, month, day, hour, minute, tzinfo=tzinfo)
+
+
+def _tokenize(text: str) -> _DateTokens:
+    """Scan a date string once and collect month, numbers, relative term and time."""
+    month = relative_days = None
+    month_priority = relative_priority = period_priority = len(_LEXICON)
+    base_hour = 0
+    numbers: List[str] = []
+    clock = hours_minutes = hours = None
+
+    for match in _TOKEN_RE.finditer(text.translate(_TO_ENGLISH_NUMS)):
+        kind = match.lastgroup
+        if kind == 'word':
+            word_kind, priority, value = _LEXICON[match.group('word')]
+            # Earlier table entries win, as with the previous dict-order scans
+            if word_kind == 'month' and priority < month_priority:
+                month, month_priority = value, priority
+            elif word_kind == 'relative' and priority < relative_priority:
+                relative_days, relative_priority = value, priority
+            elif word_kind == 'period' and priority < period_priority:
+                base_hour, period_priority = value, priority
+        elif kind == 'num':
+            numbers.append(match.group('num'))
+        elif kind == 'hm_m' and clock is None:
+            clock = (int(match.group('hm_h')), int(match.group('hm_m')))
+        elif kind in ('ta_h', 'ta_m'):
+            if match.group('ta_m') is not None and hours_minutes is None:
+                hours_minutes = (int(match.group('ta_h')), int(match.group('ta_m')))
+            elif hours is None:
+                hours = (int(match.group('ta_h')), 0)
+
+    time = clock or hours_minutes or hours
+    if time is not None:
+        hour, minute = time
+        # Adjust for time period if hour is less than 12
+        if hour < 12 and base_hour >= 12:
+            hour += 12
+        elif hour == 12 and base_hour < 12:
+            hour = 0
+        time = (hour % 24, min(minute, 59))
+
+    return _DateTokens(month, numbers, relative_days, time)
+
+
+def _split_day_year(numbers: List[str]) -> Tuple[str, str]:
+    """Pick day and year from the numbers of a date string (year should be >31)."""
+    if len(numbers) == 2:
+        if int(numbers[0]) > 31:
+            year, day = numbers[0], numbers[1]
+        else:
+            # Day Year, or the small number first when both look like days
+            day, year = numbers[0], numbers[1]
+    else:
+        # Three or more numbers - take first as day, last as year
+        day, year = numbers[0], numbers[-1]
+
+    if not 1900 <= int(year) <= 2100 and 1900 <= int(day) <= 2100:
+        # Try swapping if year looks like a day
+        day, year = year, day
+    return day, year
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_cached(text: str, tz, include_time: bool) -> Union[datetime, _RelativeDate, None]:
+    """Parse a stripped date string; absolute results are final, relative ones are not."""
+    tokens = _tokenize(text)
+
+    if tokens.relative_days is not None:
+        return _RelativeDate(tokens.relative_days, tokens.time)
+
+    if tokens.month is None or len(tokens.numbers) < 2:
+        logger.debug(f"Failed to parse Bengali date components from: {text}")
+        return None
+
+    day_str, year_str = _split_day_year(tokens.numbers)
+    year, month, day = int(year_str), tokens.month, int(day_str)
+    if not is_valid_date(year, month, day):
+        logger.error(f"Invalid date values: {year}-{month}-{day}")
+        return None
+
+    hour, minute = tokens.time if include_time and tokens.time else (0, 0)
+    return _localize(tz, year, month, day, hour, minute)
+
+
+def _resolve_relative(parsed: _RelativeDate, reference_date: datetime) -> datetime:
+    target_date = reference_date + timedelta(days=parsed.days)
+    if parsed.time:
+        target_date = target_date.replace(hour=parsed.time[0], minute=parsed.time[1])
+    return target_date
+
+
 # =============================================================================
 # Number Conversion Functions
 # =============================================================================
@@ -173,7 +366,7 @@ def bengali_to_english_number(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
-    return ''.join(BENGALI_TO_ENGLISH_NUMS.get(char, char) for char in text)
+    return text.translate(_TO_ENGLISH_NUMS)
 
 
 def english_to_bengali_number(text: str) -> str:
@@ -193,7 +386,7 @@ def english_to_bengali_number(text: str) -> str:
     if not isinstance(text, str):
         text = str(text)
     
-    return ''.join(ENGLISH_TO_BENGALI_NUMS.get(char, char) for char in text)
+    return text.translate(_TO_BENGALI_NUMS)
 
 
 def bengali_to_english_numbers(text_list: List[str]) -> List[str]:
@@ -262,14 +455,9 @@ def validate_bengali_date_format(bengali_date: str) -> bool:
     if not isinstance(bengali_date, str) or not bengali_date.strip():
         return False
     
-    # Check for presence of Bengali month
-    has_month = any(month in bengali_date for month in BENGALI_MONTHS.keys())
-    
-    # Check for presence of Bengali or English numbers
-    has_numbers = bool(re.search(r'[০-৯0-9]', bengali_date))
-    
-    # Check for relative date terms
-    is_relative = any(term in bengali_date for term in BENGALI_RELATIVE_DATES.keys())
+    has_month = _MONTH_RE.search(bengali_date) is not None
+    has_numbers = _DIGIT_RE.search(bengali_date) is not None
+    is_relative = _RELATIVE_RE.search(bengali_date) is not None
     
     return (has_month and has_numbers) or is_relative
 
@@ -307,18 +495,8 @@ def parse_bengali_month(text: str) -> Optional[str]:
     Returns:
         English month name or None if not found
     """
-    text = text.strip()
-    
-    # Try exact match first
-    if text in BENGALI_MONTHS:
-        return BENGALI_MONTHS[text]
-    
-    # Try finding month in text
-    for bengali, english in BENGALI_MONTHS.items():
-        if bengali in text:
-            return english
-    
-    return None
+    match = _MONTH_RE.search(text)
+    return BENGALI_MONTHS[match.group()] if match else None
 
 
 def parse_bengali_day(text: str) -> Optional[str]:
@@ -347,43 +525,7 @@ def parse_bengali_time(text: str) -> Optional[Tuple[int, int]]:
     Returns:
         Tuple of (hour, minute) or None if not found
     """
-    # Convert Bengali numbers first
-    converted = bengali_to_english_number(text)
-    
-    # Try to find time period
-    base_hour = 0
-    for period, (hour_offset, _) in BENGALI_TIME_PERIODS.items():
-        if period in text:
-            base_hour = hour_offset
-            break
-    
-    # Find time pattern (HH:MM or HH.MM or just HH টা)
-    time_patterns = [
-        r'(\d{1,2})[:\.](\d{2})',           # HH:MM or HH.MM
-        r'(\d{1,2})\s*টা\s*(\d{1,2})\s*মিনিট',  # X টা Y মিনিট
-        r'(\d{1,2})\s*টা',                   # X টা (just hours)
-    ]
-    
-    for pattern in time_patterns:
-        match = re.search(pattern, converted)
-        if match:
-            groups = match.groups()
-            hour = int(groups[0])
-            minute = int(groups[1]) if len(groups) > 1 and groups[1] else 0
-            
-            # Adjust for time period if hour is less than 12
-            if hour < 12 and base_hour >= 12:
-                hour += 12
-            elif hour == 12 and base_hour < 12:
-                hour = 0
-            
-            # Clamp values
-            hour = hour % 24
-            minute = min(minute, 59)
-            
-            return (hour, minute)
-    
-    return None
+    return _tokenize(text).time
 
 
 def parse_relative_date(text: str, reference_date: Optional[datetime] = None) -> Optional[datetime]:
@@ -397,21 +539,14 @@ def parse_relative_date(text: str, reference_date: Optional[datetime] = None) ->
     Returns:
         Datetime object or None if not a relative date
     """
-    if reference_date is None:
-        reference_date = datetime.now(pytz.timezone('Asia/Dhaka'))
+    tokens = _tokenize(text)
+    if tokens.relative_days is None:
+        return None
     
-    for term, days_offset in BENGALI_RELATIVE_DATES.items():
-        if term in text:
-            target_date = reference_date + timedelta(days=days_offset)
-            
-            # Try to parse time if present
-            time_tuple = parse_bengali_time(text)
-            if time_tuple:
-                target_date = target_date.replace(hour=time_tuple[0], minute=time_tuple[1])
-            
-            return target_date
+    if reference_date is None:
+        reference_date = datetime.now(_get_timezone('Asia/Dhaka'))
     
-    return None
+    return _resolve_relative(_RelativeDate(tokens.relative_days, tokens.time), reference_date)
 
 
 def parse_bengali_date_components(bengali_date: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
@@ -430,75 +565,45 @@ def parse_bengali_date_components(bengali_date: str) -> Tuple[Optional[str], Opt
         - "দিন মাস, বছর" (Day Month, Year)
         - "মাস দিন বছর" (Month Day Year)
     """
-    try:
-        cleaned = bengali_date.strip()
-        
-        # Remove day names if present
-        for day_bn in BENGALI_DAYS.keys():
-            cleaned = cleaned.replace(day_bn, '').strip()
-        
-        # Remove time components for date parsing
-        for period in BENGALI_TIME_PERIODS.keys():
-            if period in cleaned:
-                # Find and remove time portion
-                cleaned = re.sub(rf'{period}\s*[\d০-৯:\.]+\s*(টা|মিনিট)?', '', cleaned).strip()
-        
-        # Remove common separators and extra spaces
-        cleaned = re.sub(r'[,،|/\-]+', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # Convert Bengali numbers to English for easier parsing
-        converted = bengali_to_english_number(cleaned)
-        
-        # Find month
-        month_english = None
-        month_bengali = None
-        for bn_month, en_month in BENGALI_MONTHS.items():
-            if bn_month in cleaned:
-                month_english = en_month
-                month_bengali = bn_month
-                break
-        
-        if not month_english:
-            return None, None, None
-        
-        # Extract numbers
-        numbers = re.findall(r'\d+', converted)
-        
-        if len(numbers) < 2:
-            return None, None, None
-        
-        # Determine day and year based on value (year should be >31)
-        if len(numbers) == 2:
-            if int(numbers[0]) > 31:
-                year, day = numbers[0], numbers[1]
-            elif int(numbers[1]) > 31:
-                day, year = numbers[0], numbers[1]
-            else:
-                # Assume format: Day Year (small number first)
-                day, year = numbers[0], numbers[1]
-        else:
-            # Three or more numbers - take first as day, last as year
-            day = numbers[0]
-            year = numbers[-1]
-        
-        # Validate
-        if int(year) < 1900 or int(year) > 2100:
-            # Try swapping if year looks like a day
-            if int(day) >= 1900 and int(day) <= 2100:
-                day, year = year, day
-        
-        return month_english, day, year
-        
-    except Exception as e:
-        logger.debug(f"Error parsing Bengali date components: {e}")
+    tokens = _tokenize(bengali_date.strip())
+    if tokens.month is None or len(tokens.numbers) < 2:
         return None, None, None
+    
+    day, year = _split_day_year(tokens.numbers)
+    return _MONTH_NAMES[tokens.month], day, year
 
 
 # =============================================================================
 # Main Conversion Functions
 # =============================================================================
 
+def _convert(
+    bengali_date: str,
+    tz,
+    include_time: bool,
+    now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Convert one date string with a resolved timezone; shared by all entry points."""
+    if not bengali_date or not isinstance(bengali_date, str):
+        logger.debug("Invalid input: Bengali date must be a non-empty string")
+        return None
+    
+    bengali_date = bengali_date.strip()
+    
+    if not bengali_date:
+        return None
+    
+    try:
+        parsed = _parse_cached(bengali_date, tz, include_time)
+    except Exception as e:
+        logger.error(f"Unexpected error converting Bengali date '{bengali_date}': {e}")
+        return None
+    
+    if isinstance(parsed, _RelativeDate):
+        return _resolve_relative(parsed, now or datetime.now(tz))
+    return parsed
+
+
 def convert_bengali_date_to_english(
     bengali_date: str, 
     timezone: str = 'Asia/Dhaka',
@@ -508,7 +613,9 @@ def convert_bengali_date_to_english(
     Convert Bengali date string to timezone-aware English datetime object.
     
     This is the main function for date conversion. It handles various formats
-    including dates with times, relative dates, and different ordering.
+    including dates with times, relative dates, and different ordering. The
+    string is tokenized in a single pass, and results for absolute dates are
+    memoized (listing pages repeat the same few date strings).
     
     Args:
         bengali_date: Bengali date string (e.g., "জুলাই ১০, ২০২৪", "১৫ ডিসেম্বর ২০২৪")
@@ -528,78 +635,7 @@ def convert_bengali_date_to_english(
         >>> convert_bengali_date_to_english("গতকাল")  # Yesterday
         # Returns yesterday's date
     """
-    if not bengali_date or not isinstance(bengali_date, str):
-        logger.debug("Invalid input: Bengali date must be a non-empty string")
-        return None
-    
-    bengali_date = bengali_date.strip()
-    
-    if not bengali_date:
-        return None
-    
-    try:
-        tz = pytz.timezone(timezone)
-    except pytz.UnknownTimeZoneError:
-        logger.error(f"Unknown timezone: {timezone}")
-        tz = pytz.timezone('Asia/Dhaka')
-    
-    # Try relative date first
-    relative_result = parse_relative_date(bengali_date)
-    if relative_result:
-        if relative_result.tzinfo is None:
-            return tz.localize(relative_result)
-        return relative_result
-    
-    # Parse date components
-    month_english, day_str, year_str = parse_bengali_date_components(bengali_date)
-    
-    if not all([month_english, day_str, year_str]):
-        logger.debug(f"Failed to parse Bengali date components from: {bengali_date}")
-        return None
-    
-    try:
-        day = int(day_str)
-        year = int(year_str)
-        
-        # Convert month name to number
-        month_to_num = {
-            'January': 1, 'February': 2, 'March': 3, 'April': 4,
-            'May': 5, 'June': 6, 'July': 7, 'August': 8,
-            'September': 9, 'October': 10, 'November': 11, 'December': 12
-        }
-        month = month_to_num.get(month_english)
-        
-        if not month:
-            logger.error(f"Invalid month: {month_english}")
-            return None
-        
-        # Validate date
-        if not is_valid_date(year, month, day):
-            logger.error(f"Invalid date values: {year}-{month}-{day}")
-            return None
-        
-        # Create base datetime
-        hour, minute = 0, 0
-        
-        # Try to parse time if requested
-        if include_time:
-            time_tuple = parse_bengali_time(bengali_date)
-            if time_tuple:
-                hour, minute = time_tuple
-        
-        article_date = datetime(year, month, day, hour, minute)
-        
-        # Localize to timezone
-        localized_date = tz.localize(article_date)
-        
-        return localized_date
-        
-    except ValueError as e:
-        logger.error(f"Invalid date values in '{bengali_date}': {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error converting Bengali date '{bengali_date}': {e}")
-        return None
+    return _convert(bengali_date, _get_timezone(timezone), include_time)
 
 
 def convert_bengali_date_to_english_date_only(bengali_date: str) -> Optional[date]:
@@ -710,12 +746,7 @@ class BengaliDateParser:
         self.timezone = timezone
         self.include_time = include_time
         self.strict = strict
-        
-        try:
-            self.tz = pytz.timezone(timezone)
-        except pytz.UnknownTimeZoneError:
-            logger.warning(f"Unknown timezone {timezone}, using Asia/Dhaka")
-            self.tz = pytz.timezone('Asia/Dhaka')
+        self.tz = _get_timezone(timezone)
     
     def parse(self, date_string: str) -> Optional[datetime]:
         """
@@ -730,17 +761,43 @@ class BengaliDateParser:
         Raises:
             ValueError: If strict mode and parsing fails
         """
-        result = convert_bengali_date_to_english(
-            date_string,
-            timezone=self.timezone,
-            include_time=self.include_time
-        )
+        result = _convert(date_string, self.tz, self.include_time)
         
         if result is None and self.strict:
             raise ValueError(f"Failed to parse Bengali date: {date_string}")
         
         return result
     
+    def parse_many(self, date_strings: Iterable[str]) -> List[Optional[datetime]]:
+        """
+        Parse a batch of Bengali date strings, e.g. every entry of a listing page.
+        
+        Repeated strings are parsed once, and relative dates in the batch
+        share one reference time.
+        
+        Args:
+            date_strings: Bengali date strings to parse
+            
+        Returns:
+            List of timezone-aware datetimes (or None), in input order
+            
+        Raises:
+            ValueError: If strict mode and any string fails to parse
+        """
+        now = datetime.now(self.tz)
+        seen: Dict[str, Optional[datetime]] = {}
+        results = []
+        
+        for date_string in date_strings:
+            if date_string not in seen:
+                result = _convert(date_string, self.tz, self.include_time, now)
+                if result is None and self.strict:
+                    raise ValueError(f"Failed to parse Bengali date: {date_string}")
+                seen[date_string] = result
+            results.append(seen[date_string])
+        
+        return results
+    
     def parse_date(self, date_string: str) -> Optional[date]:
         """Parse and return date only (no time)."""
         result = self.parse(date_string)
@@ -800,4 +857,4 @@ if __name__ == "__main__":
     print("\nFormat Test")
     print("-" * 30)
     now = datetime.now()
-    print(f"Now formatted: {format_bengali_date(now, include_day=True, include_time=True)}")
\ No newline at end of file
+    print(f"Now formatted: {format_bengali_date(now, include_day=True, include_time=True)}")
@@ -44,6 +44,7 @@ from scrapy.http import HtmlResponse, Request, Response
 from scrapy.exceptions import NotConfigured
 
 from BDNewsPaper.enums import ProtectionType
+from BDNewsPaper.response_classifier import classify
 
 logger = logging.getLogger(__name__)
 
@@ -630,12 +631,6 @@ class AkamaiBypass:
         'akamai-grn',
     ]
 
-    AKAMAI_SCRIPT_PATTERNS = [
-        re.compile(r'/akam/[\d]+/[\w]+', re.I),
-        re.compile(r'_abck', re.I),
-        re.compile(r'bmak\.js', re.I),
-    ]
-
     def __init__(self, browser_timeout: int = 30):
         self.browser_timeout = browser_timeout
 
@@ -655,15 +650,9 @@ class AkamaiBypass:
                 return True
 
         # Check response body for Akamai script includes
-        try:
-            text = response.text[:10000]
-        except Exception:
-            return False
-
-        for pattern in self.AKAMAI_SCRIPT_PATTERNS:
-            if pattern.search(text):
-                logger.debug("Akamai detected via script pattern")
-                return True
+        if classify(response).has('akamai', within=10000):
+            logger.debug("Akamai detected via script pattern")
+            return True
 
         return False
 
@@ -818,12 +807,6 @@ class DataDomeBypass:
         'x-dd-type',
     ]
 
-    DATADOME_SCRIPT_PATTERNS = [
-        re.compile(r'js\.datadome\.co', re.I),
-        re.compile(r'datadome\.co/captcha', re.I),
-        re.compile(r'dd\.[\w]+\.js', re.I),
-    ]
-
     def __init__(self, browser_timeout: int = 30):
         self.browser_timeout = browser_timeout
 
@@ -844,21 +827,15 @@ class DataDomeBypass:
                 return True
 
         # Check response body for DataDome script
-        try:
-            text = response.text[:10000]
-        except Exception:
-            return False
-
-        for pattern in self.DATADOME_SCRIPT_PATTERNS:
-            if pattern.search(text):
-                logger.debug("DataDome detected via script pattern")
-                return True
+        verdict = classify(response)
+        if verdict.has('datadome', within=10000):
+            logger.debug("DataDome detected via script pattern")
+            return True
 
         # Check for DataDome captcha redirect (403 with geo.captcha-delivery.com)
-        if response.status == 403:
-            if 'captcha-delivery.com' in response.text[:5000]:
-                logger.debug("DataDome detected via captcha redirect")
-                return True
+        if response.status == 403 and verdict.has('datadome_redirect', within=5000):
+            logger.debug("DataDome detected via captcha redirect")
+            return True
 
         return False
 
@@ -965,12 +942,6 @@ class PerimeterXBypass:
         'x-px-captcha',
     ]
 
-    PX_SCRIPT_PATTERNS = [
-        re.compile(r'client\.perimeterx\.net', re.I),
-        re.compile(r'captcha\.px-cdn\.net', re.I),
-        re.compile(r'\/api\/v\d+\/collector', re.I),
-    ]
-
     PX_BLOCK_PATTERNS = [
         re.compile(r'block\.perimeterx\.net', re.I),
         re.compile(r'Access to this page has been denied', re.I),
@@ -997,21 +968,10 @@ class PerimeterXBypass:
                 logger.debug("PerimeterX detected via header: %s", header_name)
                 return True
 
-        # Check body
-        try:
-            text = response.text[:10000]
-        except Exception:
-            return False
-
-        for pattern in self.PX_SCRIPT_PATTERNS:
-            if pattern.search(text):
-                logger.debug("PerimeterX detected via script pattern")
-                return True
-
-        for pattern in self.PX_BLOCK_PATTERNS:
-            if pattern.search(text):
-                logger.debug("PerimeterX detected via block pattern")
-                return True
+        # Check body for PerimeterX scripts and block pages
+        if classify(response).has('perimeterx', within=10000):
+            logger.debug("PerimeterX detected via body pattern")
+            return True
 
         return False
 
@@ -1126,14 +1086,6 @@ class IncapsulaBypass:
         'x-cdn',
     ]
 
-    INCAPSULA_PATTERNS = [
-        r'/_Incapsula_Resource',
-        r'incapsula\.com',
-        r'Request unsuccessful.*Incapsula',
-        r'robots\.txt.*Incapsula',
-        r'reese84',
-    ]
-
     def detect(self, response) -> bool:
         """Detect Incapsula from cookies, headers, and content."""
         # Check cookies
@@ -1148,14 +1100,7 @@ class IncapsulaBypass:
                 if 'incapsula' in val.lower() or 'imperva' in val.lower():
                     return True
         # Check content
-        try:
-            text = response.text[:5000]
-            for pattern in self.INCAPSULA_PATTERNS:
-                if re.search(pattern, text, re.I):
-                    return True
-        except Exception:
-            pass
-        return False
+        return classify(response).has('incapsula', within=5000)
 
     def bypass(self, url: str) -> Optional[Dict[str, str]]:
         """Bypass Incapsula using browser automation + realistic behavior."""
@@ -1384,8 +1329,8 @@ class CaptchaBypassMiddleware:
                 if new_request:
                     return new_request
 
-        # 5. CAPTCHA detection
-        if self.captcha_enabled and self.solver:
+        # 5. CAPTCHA detection (decode only when the classifier saw a widget)
+        if self.captcha_enabled and self.solver and classify(response).has('captcha', within=10000):
             try:
                 text = response.text
             except Exception:
@@ -18,6 +18,7 @@ from BDNewsPaper.config import (
     get_default_end_date,
     list_available_spiders,
 )
+from BDNewsPaper.shared_network import network_report, prefetch
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -199,9 +200,32 @@ def run_scrapers(
         except Exception as e:
             print(f"  Error adding spider {spider_name}: {e}")
     
+    # Resolve every paper's domains while the crawlers start up
+    from twisted.internet import reactor
+    domains = set()
+    for crawler in process.crawlers:
+        domains.update(getattr(crawler.spidercls, 'allowed_domains', None) or ())
+    reactor.callWhenRunning(prefetch, domains)
+    
     print("\nStarting scrape...\n")
     process.start()
     print("\nScraping complete!")
+    print_network_report()
+
+
+def print_network_report() -> None:
+    """Print the DNS lookups and connections the spiders shared."""
+    report = network_report()
+    if not report:
+        return
+    print(f"  DNS: {report.get('dns_lookups', 0)} lookups, "
+          f"{report.get('dns_hits', 0) + report.get('dns_joined', 0)} served from cache "
+          f"(~{report.get('dns_saved_s', 0.0):.2f}s saved)")
+    if 'connections_opened' in report:
+        print(f"  Connections: {report['connections_opened']} opened, "
+              f"{report['connections_reused']} reused "
+              f"(~{report['connect_saved_s']:.2f}s of setup saved, "
+              f"median connect {report['connect_p50_ms']:.0f} ms)")
 
 
 def main() -> int:
@@ -36,7 +36,6 @@ Settings:
 import json
 import logging
 import random
-import re
 import time
 import hashlib
 from pathlib import Path
@@ -50,6 +49,7 @@ from scrapy.http import Request, Response, HtmlResponse
 from scrapy.exceptions import NotConfigured, IgnoreRequest
 
 from BDNewsPaper.enums import ProtectionType
+from BDNewsPaper.response_classifier import classify
 
 logger = logging.getLogger(__name__)
 
@@ -549,41 +549,15 @@ def make_tls_impersonated_request(
 # =============================================================================
 
 class CloudflareDetector:
-    """Detect Cloudflare protection types."""
-    
-    # Challenge page patterns
-    CHALLENGE_PATTERNS = [
-        r'<title>Just a moment\.\.\.</title>',
-        r'_cf_chl_opt',
-        r'challenge-platform',
-        r'cf-browser-verification',
-        r'cf-turnstile',
-        r'Checking your browser',
-        r'Please Wait\.\.\. \| Cloudflare',
-        r'Attention Required! \| Cloudflare',
-        r'ray ID:',
-        r'cf-ray',
-    ]
-    
-    # Block page patterns
-    BLOCK_PATTERNS = [
-        r'Access denied',
-        r'Error 1020',
-        r'Sorry, you have been blocked',
-        r'This website is using a security service',
-    ]
-    
-    # Rate limit patterns
-    RATELIMIT_PATTERNS = [
-        r'Error 1015',
-        r'rate limit',
-        r'too many requests',
-    ]
-    
-    def __init__(self):
-        self.challenge_re = [re.compile(p, re.I) for p in self.CHALLENGE_PATTERNS]
-        self.block_re = [re.compile(p, re.I) for p in self.BLOCK_PATTERNS]
-        self.ratelimit_re = [re.compile(p, re.I) for p in self.RATELIMIT_PATTERNS]
+    """
+    Detect Cloudflare protection types.
+
+    Body signatures (challenge, block and rate-limit pages) are the
+    ``cf_*`` flags of the shared response classifier.
+    """
+    
+    # Signatures are checked in the first 5KB of the body
+    WINDOW = 5000
     
     def detect(self, response: Response) -> ProtectionType:
         """
@@ -600,24 +574,14 @@ class CloudflareDetector:
         if response.status == 503:
             return ProtectionType.CHALLENGE
 
-        # Check content - safely access response.text
-        try:
-            text = response.text[:5000]  # Only check first 5KB
-        except Exception:
-            # Response is not text (e.g., binary, or encoding issue)
-            return ProtectionType.NONE
-
-        for pattern in self.challenge_re:
-            if pattern.search(text):
-                return ProtectionType.CHALLENGE
-
-        for pattern in self.block_re:
-            if pattern.search(text):
-                return ProtectionType.BLOCKED
-
-        for pattern in self.ratelimit_re:
-            if pattern.search(text):
-                return ProtectionType.RATELIMITED
+        # Check content (non-text responses classify as clean)
+        verdict = classify(response)
+        if verdict.has('cf_challenge', self.WINDOW):
+            return ProtectionType.CHALLENGE
+        if verdict.has('cf_block', self.WINDOW):
+            return ProtectionType.BLOCKED
+        if verdict.has('cf_ratelimit', self.WINDOW):
+            return ProtectionType.RATELIMITED
 
         return ProtectionType.NONE
     
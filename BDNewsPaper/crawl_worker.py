@@ -0,0 +1,339 @@
+"""
+Crawl Worker
+============
+Long-lived crawl processes that run (spider, date range) jobs back to back.
+
+run_spiders_optimized.py launched a fresh ``scrapy crawl`` process for
+every 30-day chunk of every spider, and each launch paid for Python
+startup, loading the project settings, importing every spider module and
+the Playwright/Scrapling integrations, and setting up the reactor before
+its first request. A worker pays that once. It keeps its reactor running
+and takes jobs from a queue, running each with CrawlerRunner. The shared
+DNS cache and connection pool (shared_network.py) and the per-domain
+rate controller stay warm from one job to the next.
+
+    CrawlJob          one spider over one date range
+    JobResult         how the job ended: finish reason, items, wall time,
+                      crawl time (spider open to close) and the overhead
+                      in between
+    CrawlWorkerPool   N worker processes, each handed one job at a time
+
+The pool hands out jobs round-robin across spiders and runs at most
+`max_per_spider` jobs of a spider at once (default 1), so a backfill of
+many chunks of one site does not put N processes on that site, each with
+its own rate controller. With `max_jobs`, a worker is replaced by a fresh
+one after that many jobs, which caps whatever a long run leaks. If a
+worker dies, its current job is reported as failed and the other workers
+carry on.
+
+Usage:
+    with CrawlWorkerPool(workers=4) as pool:
+        for start, end in chunks:
+            pool.submit(CrawlJob('prothomalo', start, end))
+        for result in pool.results():
+            print(result.job.spider, result.finish_reason, result.items)
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds results() waits on the queue before checking that workers are alive
+_POLL_SECONDS = 1.0
+
+
+@dataclass
+class CrawlJob:
+    """One spider over one date range; `kwargs` are extra spider arguments."""
+    spider: str
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    job: CrawlJob
+    worker: int
+    finish_reason: Optional[str]
+    items: int = 0
+    wall_s: float = 0.0          # Job taken from the queue -> crawler closed
+    crawl_s: float = 0.0         # Spider opened -> spider closed
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Finished, or closed by a CLOSESPIDER_* limit (the job ran; it was just capped)."""
+        reason = self.finish_reason or ''
+        return self.error is None and (reason == 'finished' or reason.startswith('closespider_'))
+
+    @property
+    def overhead_s(self) -> float:
+        """Per-job time outside the crawl itself: crawler setup and shutdown."""
+        return max(0.0, self.wall_s - self.crawl_s)
+
+
+def _install_resolver(runner, reactor) -> None:
+    # CrawlerProcess installs TWISTED_DNS_RESOLVER when it starts the
+    # reactor; CrawlerRunner leaves that to the caller
+    from scrapy.utils.misc import build_from_crawler, load_object
+
+    resolver = build_from_crawler(load_object(runner.settings['TWISTED_DNS_RESOLVER']), runner, reactor=reactor)
+    resolver.install_on_reactor()
+    reactor.getThreadPool().adjustPoolsize(maxthreads=runner.settings.getint('REACTOR_THREADPOOL_MAXSIZE'))
+
+
+class _Worker:
+    """Job loop inside one worker process."""
+
+    def __init__(self, worker_id: int, runner, jobs, results):
+        self.worker_id = worker_id
+        self.runner = runner
+        self.jobs = jobs
+        self.results = results
+
+    def run(self):
+        from twisted.internet import defer, reactor, threads
+
+        @defer.inlineCallbacks
+        def loop():
+            while True:
+                # Blocking get in a pool thread; the reactor keeps running
+                job = yield threads.deferToThread(self.jobs.get)
+                if job is None:
+                    break
+                result = yield self.crawl(job)
+                self.results.put(('done', self.worker_id, result))
+            reactor.stop()
+
+        reactor.callWhenRunning(loop)
+        self.results.put(('ready', self.worker_id, os.getpid()))
+        reactor.run(installSignalHandlers=False)
+
+    def crawl(self, job: CrawlJob):
+        from scrapy import signals
+        from twisted.internet import defer
+
+        @defer.inlineCallbacks
+        def run():
+            received = time.monotonic()
+            times = {}
+
+            def opened(spider):
+                times['opened'] = time.monotonic()
+
+            def closed(spider, reason):
+                times['closed'] = time.monotonic()
+
+            error = None
+            crawler = None
+            try:
+                crawler = self.runner.create_crawler(job.spider)
+                crawler.signals.connect(opened, signal=signals.spider_opened)
+                crawler.signals.connect(closed, signal=signals.spider_closed)
+                kwargs = dict(job.kwargs)
+                if job.start_date:
+                    kwargs['start_date'] = job.start_date
+                if job.end_date:
+                    kwargs['end_date'] = job.end_date
+                yield self.runner.crawl(crawler, **kwargs)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.exception(f"Job failed: {job}")
+
+            stats = crawler.stats.get_stats() if crawler is not None and crawler.stats else {}
+            finished = time.monotonic()
+            crawl_s = times.get('closed', finished) - times['opened'] if 'opened' in times else 0.0
+            return JobResult(
+                job=job,
+                worker=self.worker_id,
+                finish_reason=stats.get('finish_reason'),
+                items=stats.get('item_scraped_count', 0),
+                wall_s=round(finished - received, 3),
+                crawl_s=round(crawl_s, 3),
+                error=error,
+            )
+
+        return run()
+
+
+def _worker_main(worker_id: int, jobs, results, overrides: Dict[str, Any], log_dir: Optional[str]) -> None:
+    """Entry point of a worker process."""
+    from scrapy.utils.project import get_project_settings
+    from scrapy.utils.reactor import install_reactor
+
+    settings = get_project_settings()
+    settings.setdict(overrides, priority='cmdline')
+    if log_dir:
+        settings.set('LOG_FILE', str(Path(log_dir) / f'crawl_worker_{worker_id}.log'), priority='cmdline')
+    install_reactor(settings['TWISTED_REACTOR'])
+
+    from scrapy.crawler import CrawlerRunner
+    from scrapy.utils.log import configure_logging
+    from twisted.internet import reactor
+
+    configure_logging(settings)
+    runner = CrawlerRunner(settings)
+    _install_resolver(runner, reactor)
+    _Worker(worker_id, runner, jobs, results).run()
+
+
+class CrawlWorkerPool:
+    """
+    `workers` long-lived crawl processes (default: one per CPU). `settings`
+    override the project settings in every worker; with `log_dir`, each
+    worker logs to ``<log_dir>/crawl_worker_<n>.log``. `max_per_spider`
+    caps the workers on one spider at a time; `max_jobs` recycles a worker
+    after that many jobs (0: never).
+    """
+
+    def __init__(self, workers: Optional[int] = None, settings: Optional[Dict[str, Any]] = None,
+                 log_dir: Optional[str] = None, start_method: str = 'spawn',
+                 max_per_spider: int = 1, max_jobs: int = 0):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.settings = dict(settings or {})
+        self.log_dir = log_dir
+        self.max_per_spider = max(1, max_per_spider)
+        self.max_jobs = max_jobs
+        self.context = multiprocessing.get_context(start_method)
+        self.messages = self.context.Queue()
+        self.processes: Dict[int, Any] = {}
+        self.inboxes: Dict[int, Any] = {}
+        self.retired: List = []
+        self.idle: Deque[int] = deque()
+        self.queued: Dict[str, Deque[CrawlJob]] = {}
+        self.running: Dict[int, CrawlJob] = {}
+        self.jobs_run: Dict[int, int] = {}
+        self.next_id = 0
+        self.pending = 0
+        self.startup_s = 0.0
+
+    def _spawn(self) -> int:
+        worker_id, self.next_id = self.next_id, self.next_id + 1
+        inbox = self.inboxes[worker_id] = self.context.Queue()
+        process = self.processes[worker_id] = self.context.Process(
+            target=_worker_main, name=f'crawl-worker-{worker_id}', daemon=True,
+            args=(worker_id, inbox, self.messages, self.settings, self.log_dir),
+        )
+        process.start()
+        self.jobs_run[worker_id] = 0
+        return worker_id
+
+    def start(self) -> 'CrawlWorkerPool':
+        """Start the workers and wait until every one is ready for jobs."""
+        started = time.monotonic()
+        for _ in range(self.workers):
+            self._spawn()
+        while len(self.idle) < self.workers:
+            kind, worker_id, _ = self._next_message()
+            if kind == 'ready':
+                self.idle.append(worker_id)
+        self.startup_s = time.monotonic() - started
+        logger.info(f"{self.workers} crawl workers ready in {self.startup_s:.1f}s")
+        return self
+
+    def submit(self, job: CrawlJob) -> None:
+        self.queued.setdefault(job.spider, deque()).append(job)
+        self.pending += 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand queued jobs to idle workers, round-robin across spiders."""
+        while self.idle:
+            busy = [job.spider for job in self.running.values()]
+            spider = next((spider for spider in self.queued if busy.count(spider) < self.max_per_spider), None)
+            if spider is None:
+                return
+            jobs = self.queued.pop(spider)
+            job = jobs.popleft()
+            if jobs:
+                self.queued[spider] = jobs  # Back of the rotation
+            worker_id = self.idle.popleft()
+            self.running[worker_id] = job
+            self.inboxes[worker_id].put(job)
+
+    def _finished(self, worker_id: int) -> None:
+        """Return a worker to the idle list, or replace it once it has run max_jobs."""
+        self.jobs_run[worker_id] += 1
+        if self.max_jobs and self.jobs_run[worker_id] >= self.max_jobs:
+            logger.info(f"Recycling crawl worker {worker_id} after {self.jobs_run[worker_id]} jobs")
+            self.inboxes.pop(worker_id).put(None)
+            self.retired.append(self.processes.pop(worker_id))
+            self._spawn()
+        else:
+            self.idle.append(worker_id)
+
+    def results(self) -> Iterator[JobResult]:
+        """Yield a JobResult per submitted job, in completion order."""
+        while self.pending:
+            message = self._next_message()
+            if message is None:
+                continue
+            kind, worker_id, payload = message
+            if kind == 'ready':
+                self.idle.append(worker_id)
+                self._dispatch()
+            elif kind == 'done':
+                self.running.pop(worker_id, None)
+                self._finished(worker_id)
+                self._dispatch()
+                self.pending -= 1
+                yield payload
+            elif kind == 'lost':
+                self._dispatch()
+                self.pending -= 1
+                yield payload
+
+    def _next_message(self):
+        while True:
+            try:
+                return self.messages.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                lost = self._reap()
+                if lost is not None:
+                    return lost
+                if not any(process.is_alive() for process in self.processes.values()):
+                    raise RuntimeError("All crawl workers exited")
+
+    def _reap(self):
+        """A failed JobResult for the job of a worker that died, if any."""
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            # Dead workers get no more jobs
+            if worker_id in self.idle:
+                self.idle.remove(worker_id)
+            if worker_id not in self.running:
+                continue
+            job = self.running.pop(worker_id)
+            logger.error(f"Crawl worker {worker_id} exited with code {process.exitcode} during {job}")
+            return ('lost', worker_id, JobResult(
+                job=job, worker=worker_id, finish_reason=None,
+                error=f"worker exited with code {process.exitcode}"))
+        return None
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Stop the workers once they finish their current jobs."""
+        for worker_id, process in self.processes.items():
+            if process.is_alive():
+                self.inboxes[worker_id].put(None)
+        for process in list(self.processes.values()) + self.retired:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes, self.inboxes, self.retired = {}, {}, []
+        self.idle.clear()
+
+    def __enter__(self) -> 'CrawlWorkerPool':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,345 @@
+"""
+Dataset Export
+==============
+Streaming, sharded export of the article archive for dataset publishers
+(Hugging Face, Kaggle).
+
+Rows are read by id range (``WHERE id > ? ORDER BY id LIMIT ?``), a
+batch at a time. Each batch is written straight into the current shard,
+so memory stays constant however large the archive is. A shard is closed
+once its file reaches ``shard_bytes``. Formats:
+
+    parquet     - needs pyarrow; zstd-compressed row groups, one per batch
+    jsonl.zst   - needs zstandard
+    jsonl.gz    - standard library only
+
+An export directory holds ``data/`` and ``manifest.json``. The manifest
+lists every shard with its kind (``full`` or ``delta``), row count, id
+range, byte size and sha256, plus the last exported article id:
+
+    export()            - write a delta of the articles past the last
+                          export (a full export the first time)
+    export(full=True)   - rewrite the whole archive as fresh full shards
+                          and drop the old ones
+
+Shards are written under temporary names and renamed when complete. The
+manifest is replaced atomically after the last shard, so an interrupted
+export leaves the previous manifest intact. Stray shards are removed on
+the next run.
+
+Usage:
+    from BDNewsPaper.dataset_export import DatasetExporter
+
+    exporter = DatasetExporter("news_articles.db", "dataset_export", fmt="parquet")
+    exporter.export()             # hourly: seconds, only new articles
+
+    python -m BDNewsPaper.dataset_export --out dataset_export --format jsonl.zst
+    python -m BDNewsPaper.dataset_export --out dataset_export --verify
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+FORMATS = ("parquet", "jsonl.zst", "jsonl.gz")
+
+# Published record: field name -> (articles column, parquet type name)
+DATASET_FIELDS = {
+    "id": ("id", "int64"),
+    "url": ("url", "string"),
+    "newspaper": ("paper_name", "string"),
+    "headline": ("headline", "string"),
+    "content": ("article", "string"),
+    "category": ("category", "string"),
+    "author": ("author", "string"),
+    "date": ("publication_date", "string"),
+    "language": ("source_language", "string"),
+    "word_count": ("word_count", "int64"),
+    "scraped_at": ("scraped_at", "string"),
+}
+
+_SELECT = ", ".join(column for column, _ in DATASET_FIELDS.values())
+
+
+def default_format() -> str:
+    """Best available format: parquet, then jsonl.zst, then jsonl.gz."""
+    if PARQUET_AVAILABLE:
+        return "parquet"
+    return "jsonl.zst" if ZSTD_AVAILABLE else "jsonl.gz"
+
+
+def dataset_record(row: Sequence) -> Dict:
+    """Map a row selected in DATASET_FIELDS order to a published record."""
+    record = dict(zip(DATASET_FIELDS, row))
+    for field in ("category", "author", "date"):
+        record[field] = record[field] or ""
+    record["language"] = record["language"] or "en"
+    record["word_count"] = record["word_count"] or 0
+    return record
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Shard writers
+# ---------------------------------------------------------------------------
+
+class _JsonlShard:
+    """Compressed JSON Lines shard."""
+
+    def __init__(self, path: str, fmt: str):
+        self._raw = open(path, "wb")
+        if fmt == "jsonl.zst":
+            if not ZSTD_AVAILABLE:
+                raise ImportError("jsonl.zst needs zstandard: pip install zstandard")
+            self._out = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._out = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+
+    def write(self, records: List[Dict]) -> None:
+        self._out.write("".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        ).encode("utf-8"))
+
+    def size(self) -> int:
+        return self._raw.tell()
+
+    def close(self) -> None:
+        self._out.close()
+        self._raw.close()
+
+
+class _ParquetShard:
+    """Parquet shard, one row group per batch."""
+
+    def __init__(self, path: str, fmt: str):
+        if not PARQUET_AVAILABLE:
+            raise ImportError("parquet needs pyarrow: pip install pyarrow")
+        self.path = path
+        self.schema = pa.schema([(field, getattr(pa, kind)()) for field, (_, kind) in DATASET_FIELDS.items()])
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, records: List[Dict]) -> None:
+        self._writer.write_table(pa.Table.from_pylist(records, schema=self.schema))
+
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Exporter
+# ---------------------------------------------------------------------------
+
+class DatasetExporter:
+    """Writes the articles table as size-bounded shards plus a manifest."""
+
+    def __init__(self, db_path: str, out_dir: str, fmt: Optional[str] = None,
+                 shard_bytes: int = 128 * 1024 * 1024, batch_rows: int = 2000):
+        self.db_path = str(db_path)
+        self.out_dir = str(out_dir)
+        # Without an explicit format, keep extending the existing export
+        self.fmt = fmt or self.manifest().get("format") or default_format()
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown format {self.fmt!r}, expected one of {FORMATS}")
+        self.shard_bytes = shard_bytes
+        self.batch_rows = batch_rows
+        self.data_dir = os.path.join(self.out_dir, "data")
+        self.stats = {'rows': 0, 'shards': 0, 'bytes': 0, 'elapsed': 0.0}
+
+    # ---- manifest ----
+
+    def manifest(self) -> Dict:
+        """The current manifest (an empty one before the first export)."""
+        path = os.path.join(self.out_dir, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {"version": MANIFEST_VERSION, "format": None, "last_id": 0, "rows": 0, "shards": []}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        path = os.path.join(self.out_dir, MANIFEST_NAME)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    # ---- export ----
+
+    def export(self, full: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Export articles past the last export (everything if full or first).
+
+        limit caps the rows written this run; the next run continues from
+        there. Returns the manifest entries of the shards written.
+        """
+        started = datetime.now(timezone.utc)
+        os.makedirs(self.data_dir, exist_ok=True)
+        manifest = self.manifest()
+        if manifest["shards"] and manifest["format"] != self.fmt and not full:
+            raise ValueError(f"Export is {manifest['format']}; use full=True to switch to {self.fmt}")
+        self._remove_strays(manifest)
+
+        full = full or not manifest["shards"]
+        kind = "full" if full else "delta"
+        after_id = 0 if full else manifest["last_id"]
+        stamp = started.strftime("%Y%m%dT%H%M%S%fZ")
+
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            shards = self._write_shards(conn, after_id, limit, kind, f"{kind}-{stamp}")
+        finally:
+            conn.close()
+
+        if not shards and not full:
+            return []
+        previous = manifest["shards"]
+        manifest.update({
+            "version": MANIFEST_VERSION,
+            "format": self.fmt,
+            "updated_at": started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "shards": (shards if full else previous + shards),
+        })
+        manifest["last_id"] = max([s["max_id"] for s in manifest["shards"]] + [after_id])
+        manifest["rows"] = sum(s["rows"] for s in manifest["shards"])
+        self._write_manifest(manifest)
+        if full:
+            for shard in previous:
+                self._remove(shard["path"])
+
+        self.stats['elapsed'] = (datetime.now(timezone.utc) - started).total_seconds()
+        logger.info(f"Exported {self.stats['rows']:,} articles into {len(shards)} {kind} shards "
+                    f"({self.stats['bytes'] / 1e6:.1f} MB) in {self.stats['elapsed']:.1f}s")
+        return shards
+
+    def _rows(self, conn: sqlite3.Connection, after_id: int, limit: Optional[int]) -> Iterator[List]:
+        """Batches of rows past after_id, in id order, by keyset pagination."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.batch_rows if remaining is None else min(self.batch_rows, remaining)
+            rows = conn.execute(
+                f"SELECT {_SELECT} FROM articles WHERE id > ? ORDER BY id LIMIT ?", (after_id, size)
+            ).fetchall()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def _write_shards(self, conn: sqlite3.Connection, after_id: int, limit: Optional[int],
+                      kind: str, prefix: str) -> List[Dict]:
+        self.stats.update(dict.fromkeys(self.stats, 0))
+        writer_class = _ParquetShard if self.fmt == "parquet" else _JsonlShard
+        shards = []
+        writer = None
+        entry = None
+        for rows in self._rows(conn, after_id, limit):
+            if writer is None:
+                name = f"data/{prefix}-{len(shards):05d}.{self.fmt}"
+                writer = writer_class(os.path.join(self.out_dir, name + ".tmp"), self.fmt)
+                entry = {"path": name, "kind": kind, "rows": 0,
+                         "min_id": rows[0][0], "max_id": rows[0][0]}
+            writer.write([dataset_record(row) for row in rows])
+            entry["rows"] += len(rows)
+            entry["max_id"] = rows[-1][0]
+            if writer.size() >= self.shard_bytes:
+                shards.append(self._finish(writer, entry))
+                writer = None
+        if writer is not None:
+            shards.append(self._finish(writer, entry))
+        return shards
+
+    def _finish(self, writer, entry: Dict) -> Dict:
+        writer.close()
+        path = os.path.join(self.out_dir, entry["path"])
+        os.replace(path + ".tmp", path)
+        entry["bytes"] = os.path.getsize(path)
+        entry["sha256"] = file_sha256(path)
+        self.stats['rows'] += entry["rows"]
+        self.stats['shards'] += 1
+        self.stats['bytes'] += entry["bytes"]
+        return entry
+
+    # ---- housekeeping ----
+
+    def _remove(self, relative: str) -> None:
+        try:
+            os.remove(os.path.join(self.out_dir, relative))
+        except FileNotFoundError:
+            pass
+
+    def _remove_strays(self, manifest: Dict) -> None:
+        """Delete shards left behind by an interrupted export."""
+        listed = {shard["path"] for shard in manifest["shards"]}
+        for filename in os.listdir(self.data_dir):
+            if f"data/{filename}" not in listed:
+                self._remove(f"data/{filename}")
+
+    def verify(self) -> List[str]:
+        """Check every shard's size and sha256. Returns the paths that fail."""
+        bad = []
+        for shard in self.manifest()["shards"]:
+            path = os.path.join(self.out_dir, shard["path"])
+            if (not os.path.exists(path) or os.path.getsize(path) != shard["bytes"]
+                    or file_sha256(path) != shard["sha256"]):
+                bad.append(shard["path"])
+        return bad
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command line interface for dataset exports."""
+    parser = argparse.ArgumentParser(description="Streaming sharded dataset export")
+    parser.add_argument("--db", default="news_articles.db", help="SQLite database path")
+    parser.add_argument("--out", default="dataset_export", help="Export directory")
+    parser.add_argument("--format", choices=FORMATS, help="Shard format (default: best available)")
+    parser.add_argument("--shard-mb", type=int, default=128, help="Shard size in MB")
+    parser.add_argument("--full", action="store_true", help="Rewrite everything instead of a delta")
+    parser.add_argument("--limit", type=int, help="Export at most this many articles")
+    parser.add_argument("--verify", action="store_true", help="Check shard checksums")
+    args = parser.parse_args(argv)
+
+    exporter = DatasetExporter(args.db, args.out, args.format, shard_bytes=args.shard_mb * 1024 * 1024)
+    if args.verify:
+        bad = exporter.verify()
+        print("All shards OK" if not bad else "Bad shards:\n  " + "\n  ".join(bad))
+        return
+    shards = exporter.export(full=args.full, limit=args.limit)
+    manifest = exporter.manifest()
+    print(f"Wrote {sum(s['rows'] for s in shards):,} articles in {len(shards)} shards; "
+          f"{manifest['rows']:,} articles in {len(manifest['shards'])} shards total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Date Normalization Engine
+=========================
+One date parser shared by spiders, item processors and pipelines.
+
+Instead of trying a long list of ``strptime`` formats in order (each miss
+raising and catching ``ValueError``), the engine fingerprints the input's
+shape - digits, letter runs and separators, e.g. ``"26 Dec 2024, 12:28 AM"``
+becomes ``"00 a 0000, 00:00 a"`` - and dispatches to the format that last
+parsed that shape most often. ISO 8601 strings go straight to
+``fromisoformat`` and "X hours ago" strings to the relative-time parser.
+
+Each spider gets its own normalizer (``get_normalizer(spider.name)``), so the
+learned shapes reflect that site's conventions - notably whether
+``12/06/2024`` is day-first or month-first - and the format that most
+recently won is tried first for a shape not seen yet. A learned format is
+only replaced once another one has parsed that shape more often, so a
+stray ``13/06/2024`` on a month-first site does not flip how later
+ambiguous dates are read.
+
+Usage:
+    from BDNewsPaper.date_normalizer import get_normalizer
+
+    dt = get_normalizer('prothomalo').parse("26 December 2025, 12:28 AM")
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from BDNewsPaper.config import DHAKA_TZ
+
+# Known formats, most specific first (the order decides ambiguous input
+# for a shape seen for the first time)
+DATE_FORMATS: List[str] = [
+    # ISO-like with microseconds
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S',
+    # Standard datetime
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    # RFC 822 (RSS pubDate)
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%d %b %Y %H:%M:%S %z',
+    # Day-first with time and AM/PM
+    '%d %B, %Y %I:%M:%S %p',   # 30 January, 2022 11:12:21 AM
+    '%d %B, %Y %H:%M:%S',       # 30 January, 2022 14:30:00
+    # Day-of-week with time
+    '%A, %d %B, %Y at %I:%M %p',  # Thursday, 25 December, 2025 at 10:12 PM
+    '%A, %d %B, %Y',              # Thursday, 26 December, 2024
+    '%A, %d %B %Y',               # Thursday, 26 December 2024
+    # Full/abbreviated month name
+    '%d %B, %Y',                   # 26 December, 2024
+    '%B %d, %Y',                   # December 26, 2024
+    '%d %b %Y, %I:%M %p',         # 26 Dec 2025, 12:28 AM
+    '%d %B %Y, %I:%M %p',         # 26 December 2025, 12:28 AM
+    '%d %b %Y',                    # 26 Dec 2024
+    '%b %d, %Y',                   # Dec 26, 2024
+    # Slash-separated
+    '%d/%m/%Y',                    # 26/12/2024
+    '%m/%d/%Y',                    # 12/26/2024
+    # Dash-separated day-first
+    '%d-%m-%Y',                    # 26-12-2024
+]
+
+# Retried after dropping a trailing timezone suffix
+_SUFFIXLESS_FORMATS = ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']
+
+_RELATIVE_RE = re.compile(r'(\d+)\s+(hour|minute|day|week|month|second)s?\s+ago', re.I)
+_RELATIVE_UNITS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+}
+
+_SHAPE_TABLE = str.maketrans(
+    '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    '0' * 10 + 'a' * 52,
+)
+_LETTER_RUN = re.compile(r'a{2,}')
+
+# Per-shape win counts are halved past this, so a site that changes its
+# date format is relearned in bounded time
+_VOTE_CAP = 64
+
+
+def date_shape(value: str) -> str:
+    """Fingerprint a date string: digits -> '0', letter runs -> 'a', separators kept."""
+    return _LETTER_RUN.sub('a', value.translate(_SHAPE_TABLE))
+
+
+_MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+           'august', 'september', 'october', 'november', 'december']
+_DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+_MONTH_NUMBERS = {name: i for i, name in enumerate(_MONTHS, 1)}
+_MONTH_NUMBERS.update({name[:3]: i for i, name in enumerate(_MONTHS, 1)})
+
+# strptime directive -> regex (named group carries the field)
+_DIRECTIVES = {
+    'Y': r'(?P<Y>\d{4})',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'd': r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'H': r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'I': r'(?P<I>1[0-2]|0[1-9]|[1-9])',
+    'M': r'(?P<M>[0-5]\d|\d)',
+    'S': r'(?P<S>6[0-1]|[0-5]\d|\d)',
+    'f': r'(?P<f>\d{1,6})',
+    'p': r'(?P<p>am|pm)',
+    'B': '(?P<B>' + '|'.join(_MONTHS) + ')',
+    'b': '(?P<b>' + '|'.join(name[:3] for name in _MONTHS) + ')',
+    'A': '(?:' + '|'.join(_DAYS) + ')',
+    'a': '(?:' + '|'.join(name[:3] for name in _DAYS) + ')',
+    'z': r'(?P<z>[+-]\d\d:?[0-5]\d|(?-i:Z))',
+    'Z': r'(?:utc|gmt)',
+}
+
+
+class _CompiledFormat:
+    """
+    A strptime format compiled to one regex plus int() conversions.
+
+    Covers the directives in DATE_FORMATS with strptime's semantics
+    (case-insensitive names, whitespace runs, 1-2 digit fields) but skips
+    its per-call locale and cache bookkeeping.
+    """
+
+    def __init__(self, fmt: str):
+        pattern = []
+        literal = iter(re.split(r'(%.)', fmt))
+        for i, part in enumerate(literal):
+            if i % 2:
+                pattern.append(_DIRECTIVES[part[1]])
+            else:
+                pattern.append(r'\s+'.join(re.escape(chunk) for chunk in part.split(' ')))
+        self._regex = re.compile(''.join(pattern) + r'\Z', re.I)
+
+    def parse(self, value: str) -> Optional[datetime]:
+        match = self._regex.match(value)
+        if match is None:
+            return None
+        fields = match.groupdict()
+
+        month = fields.get('m')
+        if month is not None:
+            month = int(month)
+        else:
+            name = fields.get('B') or fields.get('b')
+            month = _MONTH_NUMBERS[name.lower()] if name else 1
+
+        hour = fields.get('H')
+        if hour is not None:
+            hour = int(hour)
+        elif fields.get('I') is not None:
+            hour = int(fields['I']) % 12
+            if (fields.get('p') or 'am').lower() == 'pm':
+                hour += 12
+        else:
+            hour = 0
+
+        micro = fields.get('f')
+        tzinfo = None
+        offset = fields.get('z')
+        if offset is not None:
+            if offset == 'Z':
+                tzinfo = timezone.utc
+            else:
+                digits = offset[1:].replace(':', '')
+                delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+                tzinfo = timezone(-delta if offset[0] == '-' else delta)
+
+        try:
+            return datetime(
+                int(fields.get('Y') or 1900), month, int(fields.get('d') or 1),
+                hour, int(fields.get('M') or 0), int(fields.get('S') or 0),
+                int(micro.ljust(6, '0')) if micro else 0, tzinfo,
+            )
+        except ValueError:
+            return None
+
+
+_compiled: Dict[str, Optional[_CompiledFormat]] = {}
+
+
+def _strptime(value: str, fmt: str) -> Optional[datetime]:
+    """Parse with a compiled format, falling back to datetime.strptime."""
+    compiled = _compiled.get(fmt, False)
+    if compiled is False:
+        try:
+            compiled = _CompiledFormat(fmt)
+        except KeyError:
+            compiled = None  # Directive not covered; use strptime
+        _compiled[fmt] = compiled
+    if compiled is not None:
+        return compiled.parse(value)
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _day_tzinfo(tz, day: date):
+    """The pytz offset in effect for a whole calendar day, or None if it changes."""
+    start = tz.localize(datetime.combine(day, time.min)).tzinfo
+    end = tz.localize(datetime.combine(day, time(23, 59))).tzinfo
+    return start if start is end else None
+
+
+class DateNormalizer:
+    """
+    Shape-dispatching date parser.
+
+    ``parse`` returns the datetime as written: aware if the string carries an
+    offset, naive otherwise. Callers decide how to localize.
+    """
+
+    def __init__(self, formats: Optional[List[str]] = None, tz=DHAKA_TZ):
+        self.formats = list(formats or DATE_FORMATS)
+        self.tz = tz
+
+        # shape -> format that parsed it most often, and each format's wins
+        self._by_shape: Dict[str, str] = {}
+        self._votes: Dict[str, Dict[str, int]] = {}
+        # Most recent winning format (tried first for unseen shapes)
+        self.last_format: Optional[str] = None
+
+        self.stats = {
+            'iso': 0,
+            'relative': 0,
+            'shape_hits': 0,
+            'learned': 0,
+            'relearned': 0,
+            'failed': 0,
+        }
+
+    def parse(self, value: str) -> Optional[datetime]:
+        """Parse a date string, or return None if no known format matches."""
+        if not value:
+            return None
+        value = value.strip()
+        if not value:
+            return None
+
+        # ISO 8601 (handles +06:00, Z, fractions, space or T separator)
+        if len(value) >= 10 and value[4] == '-' and value[:4].isdigit():
+            try:
+                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                self.stats['iso'] += 1
+                return dt
+            except ValueError:
+                pass
+
+        # Relative times: "X hours/minutes/days/weeks ago"
+        if value[0].isdigit():
+            match = _RELATIVE_RE.match(value)
+            if match:
+                self.stats['relative'] += 1
+                unit = _RELATIVE_UNITS[match.group(2).lower()]
+                return datetime.now(self.tz) - int(match.group(1)) * unit
+
+        shape = date_shape(value)
+        known = self._by_shape.get(shape)
+        if known is not None:
+            dt = _strptime(value, known)
+            if dt is not None:
+                self.stats['shape_hits'] += 1
+                self._vote(shape, known)
+                return dt
+
+        for fmt in self._candidates(known):
+            dt = _strptime(value, fmt)
+            if dt is not None:
+                self._vote(shape, fmt)
+                self.last_format = fmt
+                self.stats['learned'] += 1
+                return dt
+
+        # Strip a timezone suffix the formats above could not take
+        cleaned = value.split('+')[0].split('Z')[0]
+        if cleaned != value:
+            for fmt in _SUFFIXLESS_FORMATS:
+                dt = _strptime(cleaned, fmt)
+                if dt is not None:
+                    return dt
+
+        self.stats['failed'] += 1
+        return None
+
+    def parse_localized(self, value: str) -> Optional[datetime]:
+        """Parse and make the result timezone-aware (naive results use ``tz``)."""
+        dt = self.parse(value)
+        if dt is None or dt.tzinfo is not None:
+            return dt
+        # pytz.localize tries every offset the zone ever used; do it once per day
+        tzinfo = _day_tzinfo(self.tz, dt.date())
+        return dt.replace(tzinfo=tzinfo) if tzinfo is not None else self.tz.localize(dt)
+
+    def _vote(self, shape: str, fmt: str) -> None:
+        """Count a win; the format with the most wins parses the shape."""
+        votes = self._votes.setdefault(shape, {})
+        votes[fmt] = votes.get(fmt, 0) + 1
+        if votes[fmt] > _VOTE_CAP:
+            for key in votes:
+                votes[key] //= 2
+
+        known = self._by_shape.get(shape)
+        if known is None:
+            self._by_shape[shape] = fmt
+        elif fmt != known and votes[fmt] > votes.get(known, 0):
+            self._by_shape[shape] = fmt
+            self.stats['relearned'] += 1
+
+    def _candidates(self, skip: Optional[str]):
+        """Formats to try for an unknown shape: last winner first, then the list."""
+        last = self.last_format
+        if last is not None and last != skip:
+            yield last
+        for fmt in self.formats:
+            if fmt != skip and fmt != last:
+                yield fmt
+
+
+# Normalizers by owner (spider name); 'default' serves callers without a spider
+_normalizers: Dict[str, DateNormalizer] = {}
+
+
+def get_normalizer(name: Optional[str] = None) -> DateNormalizer:
+    """Get the date normalizer for a spider (or the shared default one)."""
+    key = name or 'default'
+    normalizer = _normalizers.get(key)
+    if normalizer is None:
+        normalizer = _normalizers.setdefault(key, DateNormalizer())
+    return normalizer
@@ -0,0 +1,450 @@
+"""
+Database Backups
+================
+Online, incremental backups of the SQLite article database.
+
+A backup runs in three stages:
+
+    snapshot   - copy the live database, including anything still in the
+                 WAL, to a scratch file through SQLite's online backup API,
+                 a batch of pages per step. In WAL mode the copy reads
+                 from one held read transaction, so it is consistent and
+                 never restarts, while the crawler keeps committing
+    chunk      - split the snapshot into content-defined chunks. A chunk
+                 ends after any page whose CRC matches a mask (within min
+                 and max sizes), so boundaries follow SQLite pages and a
+                 change only alters the chunks around the pages it touched
+    upload     - on a thread pool, compress and upload only the chunks the
+                 previous backup does not already reference, then write a
+                 manifest listing the snapshot's chunks in order
+
+Layout under a target:
+
+    chunks/<sha256[:2]>/<sha256>.z   zlib-compressed chunk
+    manifests/<name>.json            source database, creation time, page
+                                     size, size and ordered chunk list
+
+Backups are ordered by their manifest's creation time, not their name, and
+"latest" and pruning are per source database, so custom names and several
+databases sharing one target keep their history straight.
+
+Restore streams chunks back in manifest order, fetching a few ahead and
+verifying each digest, into a temporary file next to the destination. It
+replaces the destination (and drops any stale -wal/-shm) only after the
+full size has been written.
+
+A target is any object with ``put``, ``get``, ``exists``, ``list`` and
+``delete`` over '/'-separated keys. This module provides ``LocalTarget``
+(a directory) and ``S3Target`` (a boto3 client and bucket).
+
+Usage:
+    from BDNewsPaper.db_backup import BackupEngine, LocalTarget
+
+    engine = BackupEngine(LocalTarget("backups"))
+    name = engine.backup("news_articles.db")     # incremental after the first
+    engine.restore("restored.db")                # latest backup
+    engine.prune(keep=7)                         # per database; drops unreferenced chunks too
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+CHUNK_PREFIX = "chunks/"
+MANIFEST_PREFIX = "manifests/"
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+class LocalTarget:
+    """Backup target in a local directory (also what the tests use)."""
+
+    def __init__(self, root: str):
+        self.root = str(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{id(data)}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def list(self, prefix: str) -> List[str]:
+        base = self._path(prefix.rstrip("/"))
+        keys = []
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                if not filename.endswith(".tmp"):
+                    rel = os.path.relpath(os.path.join(dirpath, filename), self.root)
+                    keys.append(rel.replace(os.sep, "/"))
+        return sorted(keys)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def __str__(self) -> str:
+        return self.root
+
+
+class S3Target:
+    """Backup target under a prefix of an S3 (or compatible) bucket."""
+
+    def __init__(self, client, bucket: str, prefix: str = "backups/database/"):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+    def get(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+            return True
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def list(self, prefix: str) -> List[str]:
+        keys = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix + prefix):
+            keys.extend(obj["Key"][len(self.prefix):] for obj in page.get("Contents", []))
+        return sorted(keys)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+    def __str__(self) -> str:
+        return f"s3://{self.bucket}/{self.prefix}"
+
+
+# ---------------------------------------------------------------------------
+# Snapshot and chunking
+# ---------------------------------------------------------------------------
+
+def snapshot(db_path: str, dest_path: str, step_pages: int = 1024) -> int:
+    """
+    Copy a live database to dest_path with the online backup API.
+
+    Returns the number of backup steps taken.
+    """
+    source = sqlite3.connect(db_path, isolation_level=None, timeout=30.0)
+    target = sqlite3.connect(dest_path)
+    steps = 0
+
+    def progress(status, remaining, total):
+        nonlocal steps
+        steps += 1
+
+    try:
+        wal = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        if wal:
+            # A WAL reader does not block writers; holding it pins one
+            # consistent snapshot for every step.
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(target, pages=step_pages, progress=progress)
+        if wal:
+            source.execute("COMMIT")
+        # The copy inherits WAL mode; fold it back into a single file
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+        source.close()
+    return steps
+
+
+def chunk_pages(f: BinaryIO, page_size: int, avg_bytes: int = 1024 * 1024) -> Iterator[bytes]:
+    """
+    Split a database file into content-defined, page-aligned chunks.
+
+    A chunk ends after a page whose CRC32 has its low bits clear, once it
+    holds at least a quarter of avg_bytes, and always at four times
+    avg_bytes.
+    """
+    avg_pages = max(1, avg_bytes // page_size)
+    mask = (1 << max(0, avg_pages.bit_length() - 2)) - 1
+    min_pages = max(1, avg_pages // 4)
+    max_pages = avg_pages * 4
+
+    pages = []
+    while True:
+        page = f.read(page_size)
+        if not page:
+            break
+        pages.append(page)
+        if len(pages) >= max_pages or (len(pages) >= min_pages and not zlib.crc32(page) & mask):
+            yield b"".join(pages)
+            pages = []
+    if pages:
+        yield b"".join(pages)
+
+
+def chunk_key(digest: str) -> str:
+    return f"{CHUNK_PREFIX}{digest[:2]}/{digest}.z"
+
+
+def manifest_key(name: str) -> str:
+    return f"{MANIFEST_PREFIX}{name}.json"
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class BackupEngine:
+    """
+    Incremental, deduplicated backups of a SQLite database to a target.
+
+    Chunks default to about 64 KB: every crawled article touches a page in
+    each index (url and content_hash are effectively random keys), so
+    small chunks are what keeps a day's changes to a small share of them.
+    """
+
+    def __init__(self, target, workers: int = 4, avg_chunk_bytes: int = 64 * 1024,
+                 compress_level: int = 6, step_pages: int = 1024, scratch_dir: Optional[str] = None):
+        self.target = target
+        self.workers = max(1, workers)
+        self.avg_chunk_bytes = avg_chunk_bytes
+        self.compress_level = compress_level
+        self.step_pages = step_pages
+        self.scratch_dir = scratch_dir
+        self.stats = {
+            'chunks': 0, 'new_chunks': 0, 'bytes': 0, 'new_bytes': 0,
+            'stored_bytes': 0, 'snapshot_seconds': 0.0, 'elapsed': 0.0,
+        }
+
+    # ---- backup ----
+
+    def backup(self, db_path: str, name: Optional[str] = None) -> str:
+        """Take a backup of db_path. Returns the backup name."""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        started = time.perf_counter()
+        self.stats.update(dict.fromkeys(self.stats, 0))
+        base = os.path.splitext(os.path.basename(db_path))[0]
+        name = name or f"{base}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S_%f')}"
+
+        fd, scratch = tempfile.mkstemp(prefix=f"{base}.", suffix=".snapshot", dir=self.scratch_dir)
+        os.close(fd)
+        try:
+            snapshot(db_path, scratch, self.step_pages)
+            self.stats['snapshot_seconds'] = time.perf_counter() - started
+            conn = sqlite3.connect(scratch)
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            conn.close()
+
+            known = self._latest_chunks(db_path)
+            chunks = []
+            with open(scratch, "rb") as f, \
+                    ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backup") as pool:
+                in_flight = deque()
+                for data in chunk_pages(f, page_size, self.avg_chunk_bytes):
+                    in_flight.append(pool.submit(self._store, data, known))
+                    if len(in_flight) >= self.workers * 2:
+                        chunks.append(self._count(*in_flight.popleft().result()))
+                while in_flight:
+                    chunks.append(self._count(*in_flight.popleft().result()))
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "name": name,
+                "source": os.path.basename(db_path),
+                "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                "page_size": page_size,
+                "size": sum(length for _, length in chunks),
+                "chunks": chunks,
+            }
+            self.target.put(manifest_key(name), json.dumps(manifest).encode("utf-8"))
+        finally:
+            os.remove(scratch)
+
+        self.stats['elapsed'] = time.perf_counter() - started
+        logger.info(
+            f"Backup {name}: {self.stats['new_chunks']}/{self.stats['chunks']} chunks new, "
+            f"{self.stats['new_bytes'] / 1e6:.1f} of {self.stats['bytes'] / 1e6:.1f} MB uploaded "
+            f"({self.stats['stored_bytes'] / 1e6:.1f} MB compressed) in {self.stats['elapsed']:.1f}s"
+        )
+        return name
+
+    def _store(self, data: bytes, known: Set[str]) -> Tuple[str, int, int]:
+        """
+        Hash a chunk and upload it unless a previous backup has it.
+
+        Returns (digest, length, compressed bytes uploaded or 0).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in known:
+            return digest, len(data), 0
+        known.add(digest)
+        compressed = zlib.compress(data, self.compress_level)
+        self.target.put(chunk_key(digest), compressed)
+        return digest, len(data), len(compressed)
+
+    def _count(self, digest: str, length: int, stored: int) -> List:
+        self.stats['chunks'] += 1
+        self.stats['bytes'] += length
+        if stored:
+            self.stats['new_chunks'] += 1
+            self.stats['new_bytes'] += length
+            self.stats['stored_bytes'] += stored
+        return [digest, length]
+
+    def _latest_chunks(self, db_path: str) -> Set[str]:
+        catalogue = self._catalogue(db_path)
+        if not catalogue:
+            return set()
+        return {digest for digest, _ in catalogue[-1][1]["chunks"]}
+
+    # ---- restore ----
+
+    def restore(self, dest_path: str, name: Optional[str] = None, source: Optional[str] = None) -> Dict:
+        """
+        Restore a backup to dest_path. Returns its manifest.
+
+        Without a name, restores the latest backup of `source` (a database
+        path or file name), which may be omitted when the target only holds
+        backups of one database.
+        """
+        if name is None:
+            catalogue = self._catalogue(source)
+            if not catalogue:
+                raise FileNotFoundError(f"No backups in {self.target}")
+            sources = {manifest.get("source") for _, manifest in catalogue}
+            if len(sources) > 1:
+                raise ValueError(f"Backups of several databases in {self.target}, pick one of {sorted(sources)}")
+            name, manifest = catalogue[-1]
+        else:
+            manifest = self.manifest(name)
+
+        tmp = f"{dest_path}.restore-tmp"
+        written = 0
+        try:
+            with open(tmp, "wb") as f, \
+                    ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="restore") as pool:
+                in_flight = deque()
+                for digest, length in manifest["chunks"]:
+                    in_flight.append(pool.submit(self._fetch, digest, length))
+                    if len(in_flight) >= self.workers * 2:
+                        written += f.write(in_flight.popleft().result())
+                while in_flight:
+                    written += f.write(in_flight.popleft().result())
+            if written != manifest["size"]:
+                raise ValueError(f"Restored {written} bytes, manifest says {manifest['size']}")
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(dest_path + suffix):
+                os.remove(dest_path + suffix)
+        os.replace(tmp, dest_path)
+        logger.info(f"Restored {name} ({written / 1e6:.1f} MB) to {dest_path}")
+        return manifest
+
+    def _fetch(self, digest: str, length: int) -> bytes:
+        data = zlib.decompress(self.target.get(chunk_key(digest)))
+        if len(data) != length or hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    # ---- catalogue ----
+
+    def _catalogue(self, source: Optional[str] = None) -> List[Tuple[str, Dict]]:
+        """(name, manifest) of every backup, of `source` only if given, oldest first."""
+        source = os.path.basename(source) if source else None
+        catalogue = []
+        for key in self.target.list(MANIFEST_PREFIX):
+            if not key.endswith(".json"):
+                continue
+            name = key[len(MANIFEST_PREFIX):-len(".json")]
+            manifest = self.manifest(name)
+            if source is None or manifest.get("source") == source:
+                catalogue.append((name, manifest))
+        # created_at is ISO 8601 UTC, with or without microseconds
+        catalogue.sort(key=lambda entry: (datetime.fromisoformat(entry[1]["created_at"].replace("Z", "+00:00")),
+                                          entry[0]))
+        return catalogue
+
+    def names(self, source: Optional[str] = None) -> List[str]:
+        """Backup names (of `source` only, if given), oldest first."""
+        return [name for name, _ in self._catalogue(source)]
+
+    def manifest(self, name: str) -> Dict:
+        return json.loads(self.target.get(manifest_key(name)))
+
+    def backups(self, source: Optional[str] = None) -> List[Dict]:
+        """Backup summaries (of `source` only, if given), newest first."""
+        return [
+            {
+                "name": name,
+                "source": manifest.get("source"),
+                "created_at": manifest["created_at"],
+                "size": manifest["size"],
+                "chunks": len(manifest["chunks"]),
+            }
+            for name, manifest in reversed(self._catalogue(source))
+        ]
+
+    def prune(self, keep: int = 7, source: Optional[str] = None) -> int:
+        """
+        Delete all but the newest `keep` backups of each database (of
+        `source` only, if given) and the chunks only they used.
+        """
+        catalogue = self._catalogue()
+        by_source: Dict[str, List[str]] = {}
+        for name, manifest in catalogue:
+            by_source.setdefault(manifest.get("source"), []).append(name)
+        if source:
+            by_source = {os.path.basename(source): by_source.get(os.path.basename(source), [])}
+        doomed = set()
+        for names in by_source.values():
+            doomed.update(names[:-keep] if keep > 0 else names)
+        if not doomed:
+            return 0
+        for name in doomed:
+            self.target.delete(manifest_key(name))
+        live = set()
+        for name, manifest in catalogue:
+            if name not in doomed:
+                live.update(chunk_key(digest) for digest, _ in manifest["chunks"])
+        orphans = [key for key in self.target.list(CHUNK_PREFIX) if key not in live]
+        for key in orphans:
+            self.target.delete(key)
+        logger.info(f"Pruned {len(doomed)} backups and {len(orphans)} chunks")
+        return len(doomed)
@@ -17,7 +17,6 @@ Usage:
     # result = {"headline": "...", "body": "...", "author": "...", "date": "..."}
 """
 
-import json
 import re
 from typing import Dict, Optional, Any
 from dataclasses import dataclass, field
@@ -37,6 +36,7 @@ except ImportError:
     LXML_AVAILABLE = False
 
 from BDNewsPaper.enums import ExtractionSource
+from BDNewsPaper.structured_data import ARTICLE_TYPES, StructuredData
 
 logger = logging.getLogger(__name__)
 
@@ -74,35 +74,22 @@ class ExtractionResult:
 class JSONLDExtractor:
     """Extract content from JSON-LD structured data."""
     
-    ARTICLE_TYPES = [
-        "Article", "NewsArticle", "BlogPosting", "WebPage",
-        "ReportageNewsArticle", "AnalysisNewsArticle"
-    ]
+    ARTICLE_TYPES = list(ARTICLE_TYPES)
     
-    def extract(self, html: str, url: str = "") -> Optional[ExtractionResult]:
-        """Extract article data from JSON-LD."""
+    def extract(self, html: str, url: str = "",
+                data: Optional[StructuredData] = None) -> Optional[ExtractionResult]:
+        """
+        Extract article data from JSON-LD.
+        
+        Pass the page's StructuredData as `data` to reuse JSON-LD that a
+        spider has already parsed instead of decoding `html` again.
+        """
         try:
-            # Find all JSON-LD scripts
-            pattern = r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    # Handle array format
-                    if isinstance(data, list):
-                        for item in data:
-                            result = self._parse_jsonld(item)
-                            if result and result.is_valid():
-                                return result
-                    else:
-                        result = self._parse_jsonld(data)
-                        if result and result.is_valid():
-                            return result
-                            
-                except json.JSONDecodeError:
-                    continue
+            data = data or StructuredData.from_html(html)
+            for item in data.jsonld:
+                result = self._parse_jsonld(item)
+                if result and result.is_valid():
+                    return result
                     
         except Exception as e:
             logger.debug(f"JSON-LD extraction failed: {e}")
@@ -114,14 +101,6 @@ class JSONLDExtractor:
         if not isinstance(data, dict):
             return None
             
-        # Check @graph format
-        if "@graph" in data:
-            for item in data["@graph"]:
-                result = self._parse_jsonld(item)
-                if result:
-                    return result
-            return None
-        
         # Check if it's an article type
         schema_type = data.get("@type", "")
         if isinstance(schema_type, list):
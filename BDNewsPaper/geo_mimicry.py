@@ -32,7 +32,6 @@ Settings:
 
 import logging
 import random
-import re
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from dataclasses import dataclass
@@ -41,6 +40,8 @@ from scrapy import signals
 from scrapy.http import Request, Response
 from scrapy.exceptions import NotConfigured
 
+from BDNewsPaper.response_classifier import classify
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,38 +128,18 @@ def get_bd_geo_context() -> Dict:
 # GEO-BLOCK DETECTION
 # =============================================================================
 
-GEO_BLOCK_PATTERNS = [
-    r'not available in your region',
-    r'not available in your country',
-    r'access denied.*location',
-    r'sorry.*region',
-    r'geo.?restrict',
-    r'blocked.*your country',
-    r'this content is not available in bangladesh',
-    r'international edition',
-    r'viewing from outside',
-]
-
-
 def is_geo_blocked(response: Response) -> bool:
     """
     Detect if response indicates geo-blocking.
+
+    Geo-block wording is the response classifier's 'geo_block' flag.
     """
     # Check status codes
     if response.status in [403, 451]:  # 451 = Unavailable For Legal Reasons
         return True
     
-    # Check content - safely access response.text
-    try:
-        text = response.text[:5000].lower()
-        for pattern in GEO_BLOCK_PATTERNS:
-            if re.search(pattern, text, re.I):
-                return True
-    except Exception:
-        # Response is not text (e.g., binary response)
-        pass
-    
-    return False
+    # Check content (non-text responses classify as clean)
+    return classify(response).has('geo_block', within=5000)
 
 
 # =============================================================================
@@ -25,6 +25,8 @@ from scrapy import signals
 from scrapy.http import Request, Response
 from scrapy.exceptions import IgnoreRequest, NotConfigured
 
+from BDNewsPaper.response_classifier import classify
+
 logger = logging.getLogger(__name__)
 
 
@@ -129,9 +131,9 @@ class HoneypotDetectionMiddleware:
         if not self.enabled:
             return response
         
-        # Count links in response
+        # Count links in response (a byte count settles most pages)
         try:
-            link_count = len(response.css('a::attr(href)').getall())
+            link_count = classify(response).link_count(limit=self.max_links_per_page)
             
             if link_count > self.max_links_per_page:
                 self.stats['trap_pages_detected'] += 1
@@ -0,0 +1,269 @@
+"""
+Side-Channel HTML Store
+=======================
+Keeps raw response HTML out of items.
+
+Spiders register the response body once and attach only a small handle to
+the item (``_html_handle``). Pipelines that need the page (fallback
+extraction, AI repair) fetch it on demand, and the entry is released as
+soon as the item is stored or dropped.
+
+Storage is bounded:
+    - Memory tier: raw response bodies (bytes, no decode/copy) in LRU
+      order, capped in bytes
+    - Disk tier: least recently used bodies spill to files (optionally
+      zlib-compressed), also capped; the oldest spilled entries are
+      discarded when the cap is reached
+
+Settings:
+    - HTML_STORE_MEMORY_MB: Memory tier budget (default: 32)
+    - HTML_STORE_DISK_MB: Disk tier budget (default: 512)
+    - HTML_STORE_DIR: Spill directory (default: a private temp directory)
+    - HTML_STORE_COMPRESS_LEVEL: zlib level for spilled bodies (default: 0, off)
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Item field carrying the handle
+HTML_HANDLE_FIELD = '_html_handle'
+
+
+class HtmlStore:
+    """
+    Bounded, spill-to-disk cache of response HTML keyed by URL.
+
+    Thread-safe. Handles are the URLs the HTML was registered under.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        compress_level: int = 0,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.compress_level = compress_level
+
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+
+        # handle -> (body, encoding) in memory / (size on disk, encoding) on disk
+        self._memory: 'OrderedDict[str, Tuple[bytes, str]]' = OrderedDict()
+        self._disk: 'OrderedDict[str, Tuple[int, str]]' = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'stored': 0,
+            'spilled': 0,
+            'evicted': 0,
+            'hits': 0,
+            'misses': 0,
+            'released': 0,
+            'peak_memory_bytes': 0,
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'HtmlStore':
+        return cls(
+            max_memory_bytes=settings.getint('HTML_STORE_MEMORY_MB', 32) * 1024 * 1024,
+            max_disk_bytes=settings.getint('HTML_STORE_DISK_MB', 512) * 1024 * 1024,
+            spill_dir=settings.get('HTML_STORE_DIR') or None,
+            compress_level=settings.getint('HTML_STORE_COMPRESS_LEVEL', 0),
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def put(self, url: str, body: Union[bytes, str], encoding: str = 'utf-8') -> str:
+        """
+        Register a page for a URL and return its handle.
+
+        Args:
+            url: Page URL (becomes the handle)
+            body: Raw body bytes (``response.body``) or decoded text
+            encoding: Encoding of ``body`` (``response.encoding``)
+        """
+        if isinstance(body, str):
+            body, encoding = body.encode('utf-8'), 'utf-8'
+
+        with self._lock:
+            self._discard(url)
+            self._memory[url] = (body, encoding)
+            self._memory_bytes += len(body)
+            self.stats['stored'] += 1
+            self.stats['peak_memory_bytes'] = max(
+                self.stats['peak_memory_bytes'], self._memory_bytes
+            )
+            self._spill_overflow()
+
+        return url
+
+    def get(self, handle: Optional[str]) -> Optional[str]:
+        """Fetch HTML for a handle, or None if unknown/evicted."""
+        if not handle:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(handle)
+            if entry is not None:
+                self._memory.move_to_end(handle)
+            elif handle in self._disk:
+                entry = self._read_spilled(handle)
+
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+
+        body, encoding = entry
+        return body.decode(encoding, errors='replace')
+
+    def release(self, handle: Optional[str]) -> None:
+        """Drop the HTML for a handle (item stored or dropped)."""
+        if not handle:
+            return
+        with self._lock:
+            if self._discard(handle):
+                self.stats['released'] += 1
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._memory or handle in self._disk
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._disk_bytes
+
+    def close(self) -> None:
+        """Drop every entry and remove the spill directory if we created it."""
+        with self._lock:
+            for handle in list(self._disk):
+                self._remove_spilled(handle)
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._owns_spill_dir and self._spill_dir:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _discard(self, handle: str) -> bool:
+        entry = self._memory.pop(handle, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+            return True
+        if handle in self._disk:
+            self._remove_spilled(handle)
+            return True
+        return False
+
+    def _spill_overflow(self) -> None:
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            handle, (body, encoding) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(body)
+            self._write_spilled(handle, body, encoding)
+
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            handle = next(iter(self._disk))
+            self._remove_spilled(handle)
+            self.stats['evicted'] += 1
+
+    def _spill_path(self, handle: str) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='bdnews_html_')
+        os.makedirs(self._spill_dir, exist_ok=True)
+        name = hashlib.sha1(handle.encode('utf-8')).hexdigest()
+        return os.path.join(self._spill_dir, name)
+
+    def _write_spilled(self, handle: str, body: bytes, encoding: str) -> None:
+        data = zlib.compress(body, self.compress_level) if self.compress_level else body
+        try:
+            with open(self._spill_path(handle), 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"HTML store spill failed for {handle}: {e}")
+            self.stats['evicted'] += 1
+            return
+        self._disk[handle] = (len(data), encoding)
+        self._disk_bytes += len(data)
+        self.stats['spilled'] += 1
+
+    def _read_spilled(self, handle: str) -> Optional[Tuple[bytes, str]]:
+        try:
+            with open(self._spill_path(handle), 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.debug(f"HTML store read failed for {handle}: {e}")
+            self._disk_bytes -= self._disk.pop(handle, (0, ''))[0]
+            return None
+        body = zlib.decompress(data) if self.compress_level else data
+        return body, self._disk[handle][1]
+
+    def _remove_spilled(self, handle: str) -> None:
+        self._disk_bytes -= self._disk.pop(handle, (0, ''))[0]
+        try:
+            os.remove(self._spill_path(handle))
+        except OSError:
+            pass
+
+
+# Process-wide store shared by spiders and pipelines
+_default_store: Optional[HtmlStore] = None
+
+
+def get_html_store(settings=None) -> HtmlStore:
+    """Get the process-wide HTML store (configured from settings on first use)."""
+    global _default_store
+    if _default_store is None:
+        _default_store = HtmlStore.from_settings(settings) if settings is not None else HtmlStore()
+        atexit.register(_default_store.close)
+    return _default_store
+
+
+def get_item_html(adapter) -> str:
+    """
+    Raw HTML for an item: from its store handle, or legacy inline fields.
+
+    Args:
+        adapter: ItemAdapter wrapping the item
+    """
+    handle = adapter.get(HTML_HANDLE_FIELD)
+    if handle:
+        html = get_html_store().get(handle)
+        if html:
+            return html
+    return adapter.get('_raw_html', '') or adapter.get('response_body', '')
+
+
+def release_item_html(item: Any) -> None:
+    """Release the stored HTML referenced by an item, if any."""
+    try:
+        handle = item.get(HTML_HANDLE_FIELD)
+    except AttributeError:
+        return
+    if handle and _default_store is not None:
+        _default_store.release(handle)
@@ -23,6 +23,10 @@ from scrapy import signals
 from scrapy.http import Request, Response, HtmlResponse
 from scrapy.exceptions import NotConfigured, IgnoreRequest
 
+from BDNewsPaper.rate_control import parse_retry_after
+from BDNewsPaper.response_classifier import classify
+from BDNewsPaper.retry_queue import RETRY_DELAY_META_KEY, RETRY_SOURCE_META_KEY, backoff_delay
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,18 +38,9 @@ class HybridRequestMiddleware:
     automatically retries with Playwright for affected domains.
     """
     
-    # Patterns indicating JS challenge or protection
-    DEFAULT_CHALLENGE_PATTERNS = [
-        r'<title>Just a moment\.\.\.</title>',  # Cloudflare
-        r'_cf_chl_opt',  # Cloudflare challenge
-        r'challenge-platform',
-        r'Checking your browser',
-        r'Please enable JavaScript',
-        r'needs JavaScript',
-        r'turnstile',  # Cloudflare Turnstile
-        r'hcaptcha',
-        r'Please wait while we verify',
-    ]
+    # JS challenge and protection pages are recognised by the response
+    # classifier's 'js_challenge' flag unless HYBRID_CHALLENGE_PATTERNS
+    # replaces them with custom regexes
     
     def __init__(
         self,
@@ -58,9 +53,8 @@ class HybridRequestMiddleware:
         self.playwright_domains: Set[str] = set(playwright_domains or [])
         self.max_retries = max_retries
         
-        # Compile challenge patterns
-        patterns = challenge_patterns or self.DEFAULT_CHALLENGE_PATTERNS
-        self.challenge_patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        # Compile custom challenge patterns
+        self.challenge_patterns = [re.compile(p, re.IGNORECASE) for p in challenge_patterns or []]
         
         # Track domains that need Playwright
         self.learned_playwright_domains: Set[str] = set()
@@ -106,15 +100,18 @@ class HybridRequestMiddleware:
             return True
         
         # Check content length (challenge pages are usually small)
-        if len(response.body) < 5000:
-            try:
-                text = response.text
-                for pattern in self.challenge_patterns:
-                    if pattern.search(text):
-                        return True
-            except Exception:
-                # Response is not text (e.g., binary response)
-                pass
+        if len(response.body) >= 5000:
+            return False
+        if not self.challenge_patterns:
+            return classify(response).has('js_challenge')
+        try:
+            text = response.text
+            for pattern in self.challenge_patterns:
+                if pattern.search(text):
+                    return True
+        except Exception:
+            # Response is not text (e.g., binary response)
+            pass
         
         return False
     
@@ -161,9 +158,12 @@ class HybridRequestMiddleware:
                 self.stats['domains_learned'] += 1
                 spider.logger.info(f"Hybrid: Learned {domain} needs Playwright")
             
-            # Create new request with Playwright
+            # Create new request with Playwright, backing off first
+            # (honouring Retry-After) so the challenge has time to clear
             self.stats['playwright_switches'] += 1
-            spider.logger.info(f"Hybrid: Switching to Playwright for {request.url}")
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            delay = min(retry_after, 60.0) if retry_after else backoff_delay(retries)
+            spider.logger.info(f"Hybrid: Switching to Playwright for {request.url} in {delay:.1f}s")
             
             new_request = request.replace(
                 meta={
@@ -172,6 +172,8 @@ class HybridRequestMiddleware:
                     'playwright_include_page': False,
                     '_hybrid_playwright': True,
                     '_hybrid_retries': retries + 1,
+                    RETRY_DELAY_META_KEY: delay,
+                    RETRY_SOURCE_META_KEY: 'hybrid',
                 },
                 dont_filter=True,
             )
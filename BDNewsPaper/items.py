@@ -12,7 +12,9 @@ import scrapy
 from itemloaders.processors import TakeFirst, Compose, MapCompose, Identity
 from w3lib.html import remove_tags
 
+from BDNewsPaper.date_normalizer import get_normalizer
 from BDNewsPaper.enums import Language
+from BDNewsPaper.language_id import LANGUAGE_GUESS_ATTR, classify_script
 
 
 # ============================================================================
@@ -57,8 +59,8 @@ def validate_url(value: Any) -> Optional[str]:
     return None
 
 
-def normalize_date(value: Any) -> str:
-    """Normalize date to ISO format string."""
+def normalize_date(value: Any, loader_context: Optional[dict] = None) -> str:
+    """Normalize date to ISO format string (with the loader's spider's normalizer)."""
     if not value:
         return "Unknown"
     
@@ -69,22 +71,10 @@ def normalize_date(value: Any) -> str:
     if isinstance(value, datetime):
         return value.isoformat()
     
-    # Try to parse common formats
-    formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S%z',
-        '%B %d, %Y',
-        '%b %d, %Y',
-    ]
-    
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(str(value).strip(), fmt)
-            return dt.isoformat()
-        except ValueError:
-            continue
+    spider = (loader_context or {}).get('spider')
+    dt = get_normalizer(getattr(spider, 'name', None)).parse(str(value))
+    if dt is not None:
+        return dt.isoformat()
     
     return str(value).strip()
 
@@ -235,7 +225,11 @@ class NewsArticleItem(scrapy.Item):
     word_count = scrapy.Field()
     reading_time_minutes = scrapy.Field()
     content_hash = scrapy.Field()
-    
+
+    # ===== Internal Pipeline Fields =====
+    _html_handle = scrapy.Field()  # Handle into BDNewsPaper.html_store (not raw HTML)
+    _extraction_source = scrapy.Field()  # Set by fallback extraction pipelines
+
     def __setitem__(self, key: str, value: Any) -> None:
         """Override to add automatic metadata generation."""
         # Set the value first
@@ -261,9 +255,10 @@ class NewsArticleItem(scrapy.Item):
         # Estimate reading time (average 200 words per minute)
         super().__setitem__('reading_time_minutes', max(1, words // 200))
         
-        # Detect language (Bengali Unicode range: U+0980-U+09FF)
-        has_bengali = any('\u0980' <= char <= '\u09FF' for char in body)
-        super().__setitem__('source_language', Language.BENGALI if has_bengali else Language.ENGLISH)
+        # Detect language from the script histogram; cached for LanguageDetectionPipeline
+        guess = classify_script(body)
+        setattr(self, LANGUAGE_GUESS_ATTR, guess)
+        super().__setitem__('source_language', Language.BENGALI if guess.lang == 'bn' else Language.ENGLISH)
         
         # Generate content hash for deduplication
         content = f"{self.get('headline', '')}{body}".encode('utf-8')
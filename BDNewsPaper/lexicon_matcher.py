@@ -0,0 +1,238 @@
+"""
+Lexicon Matcher
+===============
+One-pass multi-term matching for the analysis lexicons.
+
+The feature extractor used one alternation regex per bias/sentiment
+category plus a giant alternation for locations. Every extra category
+meant another pass over the text, every extra term made each pass slower,
+and ``\\b`` does not treat Bengali vowel signs as word characters, so
+Bengali spellings never matched.
+
+``LexiconMatcher`` compiles a ``{term_id: [alias, ...]}`` lexicon into an
+Aho-Corasick automaton over words: text is split into words once (by the
+regex engine), and each word advances the automaton a single step, so the
+cost is one dict lookup per word regardless of lexicon size. Matches are
+word-aligned by construction. Aliases map to canonical ids, so
+"Chittagong", "Chattogram" and "চট্টগ্রাম" all count as ``chattogram``.
+
+Text is lowercased, NFC-normalized and curly apostrophes straightened.
+English possessives ("Dhaka's") and common Bengali case endings
+("ঢাকায়", "ঢাকার") resolve to the bare word.
+
+Compiled automata are cached as JSON under ``LEXICON_CACHE_DIR``
+(default ``~/.cache/bdnewspaper/lexicons``), keyed by a hash of the
+lexicon, so pool workers and short-lived scripts load rather than rebuild.
+
+Usage:
+    from BDNewsPaper.lexicon_matcher import load_matcher
+
+    matcher = load_matcher({"dhaka": ["dhaka", "ঢাকা"], "sylhet": ["sylhet"]})
+    matcher.counts("Rain in Dhaka and ঢাকায়")   # Counter({'dhaka': 2})
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization or the automaton layout changes; invalidates caches
+MATCHER_VERSION = 1
+
+# Words: letters/digits plus Bengali signs and joiners, with inner apostrophes
+_WORD_CHARS = "\\w\u0980-\u09ff\u200c\u200d"
+_WORD_PATTERN = re.compile(rf"[{_WORD_CHARS}]+(?:'[{_WORD_CHARS}]+)*")
+_BENGALI_PATTERN = re.compile("[\u0980-\u09ff]")
+
+# Case endings (locative, genitive, objective) folded back onto Bengali words
+_BENGALI_SUFFIXES = tuple(
+    unicodedata.normalize("NFC", suffix)
+    for suffix in ("র", "ের", "এর", "য়", "য়ের", "য়ে", "তে", "কে", "ে")
+)
+
+
+def default_cache_dir() -> Path:
+    return Path(os.getenv("LEXICON_CACHE_DIR", Path.home() / ".cache" / "bdnewspaper" / "lexicons"))
+
+
+def normalize(text: str) -> str:
+    """Lowercase, straighten apostrophes and NFC-normalize non-ASCII text."""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text.replace("\u2019", "'"))
+    return text
+
+
+def words(text: str) -> List[str]:
+    """Normalized words of text, as the automaton sees them."""
+    return _WORD_PATTERN.findall(normalize(text))
+
+
+def _inflections(word: str) -> Iterable[str]:
+    if word.isascii():
+        yield word + "'s"
+    elif _BENGALI_PATTERN.search(word):
+        for suffix in _BENGALI_SUFFIXES:
+            yield word + suffix
+
+
+def lexicon_key(terms: Mapping[str, Iterable[str]]) -> str:
+    """Stable hash of a lexicon, used as its cache key."""
+    canonical = sorted((term_id, sorted(set(aliases))) for term_id, aliases in terms.items())
+    payload = json.dumps([MATCHER_VERSION, canonical], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class LexiconMatcher:
+    """
+    Word-level Aho-Corasick automaton mapping aliases to term ids.
+
+    State 0 is the root; ``goto[state]`` maps the next word to a state,
+    ``fail[state]`` is the longest proper suffix state, and ``out[state]``
+    lists the ids of every alias ending there (suffix matches included).
+    ``forms`` maps each known word and its inflections to the word used
+    in the automaton; anything else resets to the root.
+    """
+
+    def __init__(self, goto: List[Dict[str, int]], fail: List[int], out: List[Tuple[str, ...]],
+                 forms: Dict[str, str], ids: List[str]):
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+        self.forms = forms
+        self.ids = ids
+
+    @classmethod
+    def build(cls, terms: Mapping[str, Iterable[str]]) -> "LexiconMatcher":
+        """Compile ``{term_id: aliases}``. An alias may belong to several ids."""
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[str]] = [[]]
+        vocabulary = set()
+
+        for term_id, aliases in terms.items():
+            for alias in aliases:
+                alias_words = words(alias)
+                if not alias_words:
+                    continue
+                state = 0
+                for word in alias_words:
+                    next_state = goto[state].get(word)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][word] = next_state
+                        goto.append({})
+                        out.append([])
+                    state = next_state
+                if term_id not in out[state]:
+                    out[state].append(term_id)
+                vocabulary.update(alias_words)
+
+        # Breadth-first failure links; outputs inherit their suffix's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and word not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(word, 0)
+                out[child].extend(i for i in out[fail[child]] if i not in out[child])
+
+        forms = {word: word for word in vocabulary}
+        for word in vocabulary:
+            for inflected in _inflections(word):
+                forms.setdefault(inflected, word)
+
+        return cls(goto, fail, [tuple(ids) for ids in out], forms, list(terms))
+
+    def findall(self, text: str) -> List[str]:
+        """Term ids of every alias occurrence, in text order."""
+        if not text:
+            return []
+        goto, fail, out, forms = self.goto, self.fail, self.out, self.forms
+        found = []
+        state = 0
+        for token in _WORD_PATTERN.findall(normalize(text)):
+            word = forms.get(token)
+            if word is None:
+                state = 0
+                continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+    def counts(self, text: str) -> Counter:
+        """Occurrences per term id."""
+        return Counter(self.findall(text))
+
+    def distinct(self, text: str) -> List[str]:
+        """Term ids mentioned in text, in order of first mention."""
+        return list(dict.fromkeys(self.findall(text)))
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": MATCHER_VERSION,
+            "goto": self.goto,
+            "fail": self.fail,
+            "out": self.out,
+            "forms": self.forms,
+            "ids": self.ids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LexiconMatcher":
+        if data.get("version") != MATCHER_VERSION:
+            raise ValueError(f"Unsupported matcher version: {data.get('version')}")
+        return cls(data["goto"], data["fail"], [tuple(ids) for ids in data["out"]],
+                   data["forms"], data["ids"])
+
+
+# Matchers already loaded in this process, by lexicon key
+_matchers: Dict[str, LexiconMatcher] = {}
+
+
+def load_matcher(terms: Mapping[str, Iterable[str]], cache_dir: Optional[Path] = None) -> LexiconMatcher:
+    """
+    Matcher for a lexicon, from memory, the disk cache, or a fresh build.
+
+    Cache failures are logged and fall back to building in memory.
+    """
+    key = lexicon_key(terms)
+    matcher = _matchers.get(key)
+    if matcher is not None:
+        return matcher
+
+    path = Path(cache_dir or default_cache_dir()) / f"lexicon-{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            matcher = LexiconMatcher.from_dict(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring lexicon cache {path}: {e}")
+
+    if matcher is None:
+        matcher = LexiconMatcher.build(terms)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(matcher.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not cache lexicon to {path}: {e}")
+
+    _matchers[key] = matcher
+    return matcher
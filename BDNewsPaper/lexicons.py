@@ -0,0 +1,145 @@
+"""
+Analysis Lexicons
+=================
+Word lists shared by the article feature worker and the analysis scripts
+(bias detection, geographical mapping, keyword trends). Lexicons mix
+English and Bengali terms; BDNewsPaper.lexicon_matcher matches them.
+"""
+
+# Bias indicators (simplified lexicon-based)
+BIAS_LEXICON = {
+    "left_leaning": [
+        "progressive", "reform", "equality", "rights", "justice",
+        "workers", "labor", "union", "protest", "activist",
+        "climate", "environment", "green", "social", "welfare",
+        "diversity", "inclusion", "marginalized", "oppressed",
+        "সংস্কার", "সমতা", "অধিকার", "ন্যায়বিচার", "শ্রমিক",
+        "বিক্ষোভ", "জলবায়ু", "পরিবেশ"
+    ],
+    "right_leaning": [
+        "traditional", "conservative", "patriot", "national",
+        "security", "law and order", "business", "economy",
+        "growth", "investment", "development", "heritage",
+        "family values", "religious", "sovereignty",
+        "ঐতিহ্য", "নিরাপত্তা", "আইনশৃঙ্খলা", "ব্যবসা", "অর্থনীতি",
+        "প্রবৃদ্ধি", "বিনিয়োগ", "উন্নয়ন", "সার্বভৌমত্ব"
+    ],
+    "sensational": [
+        "shocking", "explosive", "breaking", "exclusive",
+        "outrage", "scandal", "crisis", "disaster",
+        "bombshell", "unprecedented", "chaos", "fury",
+        "slam", "blast", "attack", "destroy",
+        "চাঞ্চল্যকর", "বিস্ফোরক", "ব্রেকিং", "এক্সক্লুসিভ", "কেলেঙ্কারি",
+        "সংকট", "বিপর্যয়", "নজিরবিহীন", "বিশৃঙ্খলা", "হামলা"
+    ],
+    "neutral": [
+        "report", "according to", "stated", "announced",
+        "official", "spokesperson", "data shows", "study",
+        "research", "analysis", "survey", "statistics",
+        "প্রতিবেদন", "জানিয়েছেন", "ঘোষণা", "কর্মকর্তা", "মুখপাত্র",
+        "গবেষণা", "জরিপ", "পরিসংখ্যান"
+    ]
+}
+
+# Sentiment words
+SENTIMENT_LEXICON = {
+    "positive": [
+        "good", "great", "excellent", "success", "achievement",
+        "progress", "growth", "improve", "benefit", "breakthrough",
+        "victory", "celebrate", "proud", "hope", "optimistic",
+        "সাফল্য", "অর্জন", "অগ্রগতি", "উন্নতি", "বিজয়", "আশা"
+    ],
+    "negative": [
+        "bad", "terrible", "failure", "crisis", "problem",
+        "decline", "loss", "damage", "concern", "threat",
+        "defeat", "condemn", "shame", "fear", "pessimistic",
+        "ব্যর্থতা", "সমস্যা", "ক্ষতি", "উদ্বেগ", "হুমকি", "সংকট",
+        "পরাজয়", "নিন্দা", "ভয়"
+    ]
+}
+
+# Bangladesh locations: canonical name -> (coordinates, other spellings).
+# Bengali spellings are matched with common case endings (ঢাকায়, ঢাকার).
+LOCATION_GAZETTEER = {
+    # Divisions
+    "dhaka": ((23.8103, 90.4125), ["ঢাকা"]),
+    "chattogram": ((22.3569, 91.7832), ["chittagong", "চট্টগ্রাম"]),
+    "rajshahi": ((24.3745, 88.6042), ["রাজশাহী"]),
+    "khulna": ((22.8456, 89.5403), ["খুলনা"]),
+    "sylhet": ((24.8949, 91.8687), ["সিলেট"]),
+    "barishal": ((22.7010, 90.3535), ["barisal", "বরিশাল"]),
+    "rangpur": ((25.7439, 89.2752), ["রংপুর"]),
+    "mymensingh": ((24.7471, 90.4203), ["ময়মনসিংহ"]),
+
+    # Major cities
+    "cumilla": ((23.4607, 91.1809), ["comilla", "কুমিল্লা"]),
+    "gazipur": ((23.9999, 90.4203), ["গাজীপুর"]),
+    "narayanganj": ((23.6238, 90.5000), ["নারায়ণগঞ্জ"]),
+    "bogura": ((24.8510, 89.3697), ["bogra", "বগুড়া"]),
+    "jashore": ((23.1634, 89.2182), ["jessore", "যশোর"]),
+    "dinajpur": ((25.6217, 88.6354), ["দিনাজপুর"]),
+    "tangail": ((24.2513, 89.9167), ["টাঙ্গাইল"]),
+    "brahmanbaria": ((23.9608, 91.1115), ["ব্রাহ্মণবাড়িয়া"]),
+    "cox's bazar": ((21.4272, 92.0058), ["coxs bazar", "coxsbazar", "কক্সবাজার"]),
+    "narsingdi": ((23.9322, 90.7151), ["নরসিংদী"]),
+    "faridpur": ((23.6070, 89.8429), ["ফরিদপুর"]),
+    "savar": ((23.8583, 90.2667), ["সাভার"]),
+    "tongi": ((23.8783, 90.4058), ["টঙ্গী"]),
+    "manikganj": ((23.8644, 90.0047), ["মানিকগঞ্জ"]),
+    "munshiganj": ((23.5422, 90.5305), ["মুন্সীগঞ্জ"]),
+    "chandpur": ((23.2333, 90.6500), ["চাঁদপুর"]),
+    "habiganj": ((24.3750, 91.4167), ["হবিগঞ্জ"]),
+    "moulvibazar": ((24.4833, 91.7667), ["মৌলভীবাজার"]),
+    "sunamganj": ((25.0667, 91.4000), ["সুনামগঞ্জ"]),
+    "netrokona": ((24.8833, 90.7333), ["নেত্রকোনা"]),
+    "jamalpur": ((24.9300, 89.9500), ["জামালপুর"]),
+    "sherpur": ((25.0167, 90.0167), ["শেরপুর"]),
+    "feni": ((23.0167, 91.4000), ["ফেনী"]),
+    "noakhali": ((22.8333, 91.1000), ["নোয়াখালী"]),
+    "lakshmipur": ((22.9500, 90.8167), ["লক্ষ্মীপুর"]),
+    "patuakhali": ((22.3500, 90.3500), ["পটুয়াখালী"]),
+    "bhola": ((22.6833, 90.6500), ["ভোলা"]),
+    "jhalokati": ((22.6500, 90.2000), ["ঝালকাঠি"]),
+    "barguna": ((22.1500, 90.1167), ["বরগুনা"]),
+    "pirojpur": ((22.5833, 89.9667), ["পিরোজপুর"]),
+    "satkhira": ((22.7167, 89.0667), ["সাতক্ষীরা"]),
+    "narail": ((23.1667, 89.5000), ["নড়াইল"]),
+    "magura": ((23.4833, 89.4333), ["মাগুরা"]),
+    "meherpur": ((23.7667, 88.6333), ["মেহেরপুর"]),
+    "chuadanga": ((23.6500, 88.8500), ["চুয়াডাঙ্গা"]),
+    "kushtia": ((23.9000, 89.1200), ["কুষ্টিয়া"]),
+    "jhenaidah": ((23.5500, 89.1667), ["ঝিনাইদহ"]),
+    "natore": ((24.4167, 89.0000), ["নাটোর"]),
+    "chapainawabganj": ((24.6000, 88.2667), ["চাঁপাইনবাবগঞ্জ"]),
+    "naogaon": ((24.8000, 88.9500), ["নওগাঁ"]),
+    "joypurhat": ((25.0833, 89.0167), ["জয়পুরহাট"]),
+    "gaibandha": ((25.3333, 89.5333), ["গাইবান্ধা"]),
+    "kurigram": ((25.8000, 89.6333), ["কুড়িগ্রাম"]),
+    "nilphamari": ((25.9333, 88.8500), ["নীলফামারী"]),
+    "lalmonirhat": ((25.9167, 89.4333), ["লালমনিরহাট"]),
+    "thakurgaon": ((26.0333, 88.4667), ["ঠাকুরগাঁও"]),
+    "panchagarh": ((26.3333, 88.5500), ["পঞ্চগড়"]),
+    "bandarban": ((22.1953, 92.2184), ["বান্দরবান"]),
+    "rangamati": ((22.6333, 92.2000), ["রাঙ্গামাটি", "রাঙামাটি"]),
+    "khagrachhari": ((23.1167, 91.9500), ["খাগড়াছড়ি"]),
+
+    # General terms
+    "bangladesh": ((23.6850, 90.3563), ["বাংলাদেশ"]),
+    "capital": ((23.8103, 90.4125), ["রাজধানী"]),
+}
+
+# Coordinates by canonical location name
+BANGLADESH_LOCATIONS = {name: coords for name, (coords, _) in LOCATION_GAZETTEER.items()}
+
+# Every spelling of each location, keyed by canonical name
+LOCATION_ALIASES = {name: [name, *spellings] for name, (_, spellings) in LOCATION_GAZETTEER.items()}
+
+
+# Words too common to say anything in headline keywords or word clouds
+STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+    'with', 'by', 'from', 'as', 'that', 'this', 'it', 'its', 'or', 'but',
+    'not', 'no', 'if', 'so', 'than', 'too', 'very', 'just', 'over', 'also',
+])
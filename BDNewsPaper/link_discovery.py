@@ -8,15 +8,63 @@ Key Features:
 - Smart filtering of non-article links
 - Multi-strategy link extraction
 - Works on any news site structure
+
+Patterns are compiled once per process into combined alternations, and
+``get_link_discovery(domain)`` keeps one discoverer per domain, whose
+memo of path scores turns repeated menu and section links into lookups.
 """
 
 import re
-from typing import Dict, List, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import Dict, List, NamedTuple, Optional, Pattern, Set, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Checked on every link that survives the exclusions
+_SLUG_RE = re.compile(r'/[a-z0-9]+-[a-z0-9]+-[a-z0-9]+')
+_NUMERIC_ID_RE = re.compile(r'/\d{4,}')
+
+# Anything else (javascript:, mailto:, tel:) is not an article; '' is a
+# bare path passed to score_url_as_article
+_WEB_SCHEMES = frozenset(['http', 'https', ''])
+
+
+class _Patterns(NamedTuple):
+    exclude_prefix: Pattern
+    exclude: Pattern
+    article: Pattern
+    extensions: Tuple[str, ...]
+
+
+_compiled: Dict[type, _Patterns] = {}
+
+
+def _combine(patterns: List[str]) -> Pattern:
+    """One alternation for a pattern list (never matches if empty)."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns) or r'(?!)', re.IGNORECASE)
+
+
+def _compiled_patterns(cls) -> _Patterns:
+    """
+    Compile a discovery class's pattern lists once per process.
+
+    Anchored exclusions become one prefix alternation tried with match();
+    the rest, and all article patterns, become single alternations so a
+    path is scanned once per list instead of once per pattern.
+    """
+    patterns = _compiled.get(cls)
+    if patterns is None:
+        anchored = [p[1:] for p in cls.EXCLUDE_PATTERNS if p.startswith('^')]
+        floating = [p for p in cls.EXCLUDE_PATTERNS if not p.startswith('^')]
+        patterns = _compiled[cls] = _Patterns(
+            exclude_prefix=_combine(anchored),
+            exclude=_combine(floating),
+            article=_combine(cls.ARTICLE_URL_PATTERNS),
+            extensions=tuple(cls.EXCLUDED_EXTENSIONS),
+        )
+    return patterns
+
 
 class ArticleLinkDiscovery:
     """
@@ -122,15 +170,23 @@ class ArticleLinkDiscovery:
         '.css', '.js', '.json', '.xml',
     }
     
+    # Entries kept in each instance's path score memo before it is reset
+    PATH_CACHE_SIZE = 50000
+
     def __init__(self, base_domain: str = ""):
         self.base_domain = base_domain
         self._compile_patterns()
-    
+        # path -> (score, reasons) before and after the link-text check
+        self._path_cache: Dict[str, Tuple[bool, int, Tuple[str, ...], int, Tuple[str, ...]]] = {}
+
     def _compile_patterns(self):
-        """Pre-compile regex patterns for performance."""
-        self.article_regexes = [re.compile(p, re.IGNORECASE) for p in self.ARTICLE_URL_PATTERNS]
-        self.exclude_regexes = [re.compile(p, re.IGNORECASE) for p in self.EXCLUDE_PATTERNS]
-    
+        """Use the class's combined patterns, compiled once per process."""
+        patterns = _compiled_patterns(type(self))
+        self.exclude_prefix_regex = patterns.exclude_prefix
+        self.exclude_regex = patterns.exclude
+        self.article_regex = patterns.article
+        self.excluded_extensions = patterns.extensions
+
     def discover_links(self, response, min_links: int = 5) -> List[Dict]:
         """
         Discover article links from a Scrapy response.
@@ -159,25 +215,27 @@ class ArticleLinkDiscovery:
         return article_links
     
     def _extract_all_links(self, response) -> List[Dict]:
-        """Extract all links with their text from the page."""
+        """Extract all links with their text from the page in one XPath pass."""
         links = []
+        seen_hrefs = set()
         seen_urls = set()
+        page_url = response.url
+        parts = urlsplit(page_url)
+        origin = f"{parts.scheme}://{parts.netloc}"
         
-        # Strategy 1: Standard anchor tags
-        for a_tag in response.css('a[href]'):
-            href = a_tag.css('::attr(href)').get()
-            if not href:
+        # lxml elements directly; a parsel Selector per anchor is most of the cost
+        for element in response.selector.root.xpath('//a[@href]'):
+            href = element.get('href')
+            if not href or href in seen_hrefs:
                 continue
-                
-            # Get link text
-            text = a_tag.css('::text').get() or ''
-            # Also try to get text from nested elements
-            if not text.strip():
-                text = ' '.join(a_tag.css('*::text').getall())
-            text = ' '.join(text.split())  # Normalize whitespace
+            seen_hrefs.add(href)
             
-            # Resolve relative URLs
-            full_url = urljoin(response.url, href)
+            # Resolve relative URLs (root-relative ones without dot
+            # segments need no parsing)
+            if href[0] == '/' and href[1:2] != '/' and '/.' not in href:
+                full_url = origin + href
+            else:
+                full_url = urljoin(page_url, href)
             
             # Skip duplicates
             if full_url in seen_urls:
@@ -187,58 +245,34 @@ class ArticleLinkDiscovery:
             links.append({
                 'url': full_url,
                 'href': href,
-                'text': text,
+                # All text inside the anchor, whitespace normalized
+                'text': ' '.join(''.join(element.itertext()).split()),
             })
         
         return links
     
-    def _score_links(self, links: List[Dict], page_url: str) -> List[Dict]:
-        """Score links based on article likelihood."""
-        page_domain = urlparse(page_url).netloc
+    def _score_path(self, path: str) -> Tuple[bool, int, Tuple[str, ...], int, Tuple[str, ...]]:
+        """
+        Score the URL path alone: (excluded, score and reasons before the
+        link-text check, score and reasons after it). Memoized, since
+        menus repeat the same links on every listing page.
+        """
+        cached = self._path_cache.get(path)
+        if cached is not None:
+            return cached
         
-        for link in links:
+        if self.exclude_prefix_regex.match(path) or self.exclude_regex.search(path):
+            result = (True, 0, ('excluded_pattern',), 0, ())
+        elif path.endswith(self.excluded_extensions):
+            result = (True, 0, ('excluded_extension',), 0, ())
+        else:
             score = 0
-            is_article = True
             reasons = []
             
-            url = link['url']
-            href = link.get('href', '')
-            text = link.get('text', '')
-            
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-            
-            # Check exclusion patterns first
-            for regex in self.exclude_regexes:
-                if regex.search(path):
-                    is_article = False
-                    reasons.append('excluded_pattern')
-                    break
-            
-            # Check file extension
-            for ext in self.EXCLUDED_EXTENSIONS:
-                if path.endswith(ext):
-                    is_article = False
-                    reasons.append('excluded_extension')
-                    break
-            
-            if not is_article:
-                link['score'] = 0
-                link['is_article'] = False
-                link['reasons'] = reasons
-                continue
-            
-            # Same domain check (+1)
-            if parsed.netloc == page_domain or not parsed.netloc:
-                score += 1
-                reasons.append('same_domain')
-            
-            # Article URL patterns (+2 each)
-            for regex in self.article_regexes:
-                if regex.search(path):
-                    score += 2
-                    reasons.append('article_pattern')
-                    break
+            # Article URL patterns (+2 once)
+            if self.article_regex.search(path):
+                score += 2
+                reasons.append('article_pattern')
             
             # Long URL path suggests article (+1)
             if len(path) > 20:
@@ -246,31 +280,72 @@ class ArticleLinkDiscovery:
                 reasons.append('long_path')
             
             # URL has slug-like structure (+2)
-            if re.search(r'/[a-z0-9]+-[a-z0-9]+-[a-z0-9]+', path):
+            if _SLUG_RE.search(path):
                 score += 2
                 reasons.append('slug_structure')
             
             # Has numeric ID in URL (+1)
-            if re.search(r'/\d{4,}', path):
+            if _NUMERIC_ID_RE.search(path):
                 score += 1
                 reasons.append('numeric_id')
             
+            post_score = 0
+            post_reasons = []
+            
+            # Penalize very short paths (-1)
+            if len(path) < 5:
+                post_score -= 1
+                post_reasons.append('short_path')
+            
+            # Penalize homepage links (-2)
+            if path in ('/', '', '/index.html', '/home'):
+                post_score -= 2
+                post_reasons.append('homepage')
+            
+            result = (False, score, tuple(reasons), post_score, tuple(post_reasons))
+        
+        if len(self._path_cache) >= self.PATH_CACHE_SIZE:
+            self._path_cache.clear()
+        self._path_cache[path] = result
+        return result
+    
+    def _score_links(self, links: List[Dict], page_url: str) -> List[Dict]:
+        """Score links based on article likelihood."""
+        page_domain = urlsplit(page_url).netloc
+        score_path = self._score_path
+        
+        for link in links:
+            parsed = urlsplit(link['url'])
+            if parsed.scheme not in _WEB_SCHEMES:
+                link['score'] = 0
+                link['is_article'] = False
+                link['reasons'] = ['excluded_pattern']
+                continue
+            
+            excluded, score, path_reasons, post_score, post_reasons = score_path(parsed.path.lower())
+            if excluded:
+                link['score'] = 0
+                link['is_article'] = False
+                link['reasons'] = list(path_reasons)
+                continue
+            
+            reasons = []
+            # Same domain check (+1)
+            if parsed.netloc == page_domain or not parsed.netloc:
+                score += 1
+                reasons.append('same_domain')
+            reasons.extend(path_reasons)
+            
             # Link text is headline-like (+2)
-            if text and len(text) > 20 and len(text) < 200:
+            text = link.get('text', '')
+            if text and 20 < len(text) < 200:
                 # Headline-like: starts with capital, no excessive punctuation
                 if text[0].isupper() or ord(text[0]) > 127:  # Allow Bengali
                     score += 2
                     reasons.append('headline_text')
             
-            # Penalize very short paths (-1)
-            if len(path) < 5:
-                score -= 1
-                reasons.append('short_path')
-            
-            # Penalize homepage links (-2)
-            if path in ['/', '', '/index.html', '/home']:
-                score -= 2
-                reasons.append('homepage')
+            score += post_score
+            reasons.extend(post_reasons)
             
             link['score'] = max(0, score)
             link['is_article'] = score >= 2
@@ -293,6 +368,18 @@ class ArticleLinkDiscovery:
         return [link['url'] for link in links[:limit]]
 
 
+# Discoverers by domain (see get_link_discovery)
+_discoverers: Dict[str, ArticleLinkDiscovery] = {}
+
+
+def get_link_discovery(domain: str = "") -> ArticleLinkDiscovery:
+    """Get the shared discoverer for a domain, creating it on first use."""
+    discoverer = _discoverers.get(domain)
+    if discoverer is None:
+        discoverer = _discoverers[domain] = ArticleLinkDiscovery(domain)
+    return discoverer
+
+
 def discover_article_links(response, limit: int = 50) -> List[str]:
     """
     Convenience function for quick article link discovery.
@@ -305,8 +392,7 @@ def discover_article_links(response, limit: int = 50) -> List[str]:
             for url in article_urls:
                 yield scrapy.Request(url, callback=self.parse_article)
     """
-    discoverer = ArticleLinkDiscovery()
-    return discoverer.get_article_urls(response, limit)
+    return get_link_discovery(urlparse(response.url).netloc).get_article_urls(response, limit)
 
 
 def score_url_as_article(url: str) -> int:
@@ -319,6 +405,6 @@ def score_url_as_article(url: str) -> int:
     Returns:
         Score (0-10, higher = more likely article)
     """
-    discoverer = ArticleLinkDiscovery()
+    discoverer = get_link_discovery(urlparse(url).netloc)
     links = discoverer._score_links([{'url': url, 'href': url, 'text': ''}], url)
     return links[0]['score'] if links else 0
@@ -10,10 +10,16 @@ import scrapy
 from scrapy import signals
 from scrapy.http import Request, Response
 from scrapy.exceptions import NotConfigured, IgnoreRequest
+from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.response import response_status_message
 from scrapy.downloadermiddlewares.retry import RetryMiddleware
 from itemadapter import is_item, ItemAdapter
 from BDNewsPaper.enums import CircuitState
+from BDNewsPaper.rate_control import domain_key, get_rate_controller, parse_retry_after
+from BDNewsPaper.retry_queue import RETRY_DELAY_META_KEY, RETRY_SOURCE_META_KEY, backoff_delay
+from BDNewsPaper.streaming_stats import (
+    QuantileSketch, RingBuffer, StreamingStats, get_streaming_stats, new_streaming_stats,
+)
 
 
 class BdnewspaperSpiderMiddleware:
@@ -97,7 +103,11 @@ class SmartRetryMiddleware(RetryMiddleware):
         - Exponential backoff (2^retries * base_delay)
         - Random jitter to prevent thundering herd
         - Per-domain retry tracking
+        - Honours Retry-After on 429/503 responses
         - Configurable via settings
+
+    The delay is set as meta['retry_delay']; DelayedRetryExtension parks
+    the retry until it is due.
     """
     
     def __init__(self, settings):
@@ -125,7 +135,10 @@ class SmartRetryMiddleware(RetryMiddleware):
         if response.status in self.retry_http_codes:
             reason = response_status_message(response.status)
             spider.logger.warning(f"Retrying {request.url} due to {response.status}: {reason}")
-            return self._retry_with_backoff(request, reason, spider) or response
+            retry_after = None
+            if response.status in (429, 503):
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            return self._retry_with_backoff(request, reason, spider, retry_after) or response
         
         # Track successful retry
         if request.meta.get('retry_times', 0) > 0:
@@ -143,7 +156,7 @@ class SmartRetryMiddleware(RetryMiddleware):
         
         return None
 
-    def _retry_with_backoff(self, request, reason, spider):
+    def _retry_with_backoff(self, request, reason, spider, retry_after: Optional[float] = None):
 
         domain = urlparse(request.url).netloc
         
@@ -151,20 +164,18 @@ class SmartRetryMiddleware(RetryMiddleware):
         self.domain_retries[domain]['total_retries'] += 1
         
         if retry_times <= self.max_retry_times:
-            # Calculate delay with exponential backoff
-            base_delay = self.backoff_factor ** retry_times
-            
-            # Add jitter to prevent thundering herd
-            jitter = random.uniform(-self.jitter_factor, self.jitter_factor) * base_delay
-            delay = min(base_delay + jitter, self.max_delay)
-            delay = max(delay, 0.1)  # Minimum delay
+            # Exponential backoff with jitter to prevent thundering herd
+            delay = backoff_delay(retry_times, self.backoff_factor, self.max_delay, self.jitter_factor)
+            if retry_after:
+                delay = max(delay, min(retry_after, self.max_delay))
             
             spider.logger.info(f"Retry {retry_times}/{self.max_retry_times} for {request.url} in {delay:.1f}s")
             
             retryreq = request.copy()
             retryreq.meta['retry_times'] = retry_times
             retryreq.dont_filter = True
-            retryreq.meta['download_delay'] = delay
+            retryreq.meta[RETRY_DELAY_META_KEY] = delay
+            retryreq.meta[RETRY_SOURCE_META_KEY] = 'smart_retry'
             
             return retryreq
         else:
@@ -218,20 +229,30 @@ class CircuitBreakerMiddleware:
             'last_failure_time': None,
             'half_open_calls': 0,
         })
+        # Pauses the domain's downloads while its circuit is open
+        self.rate_controller = None
     
     @classmethod
     def from_crawler(cls, crawler):
         settings = crawler.settings
-        return cls(
+        middleware = cls(
             failure_threshold=settings.getint('CIRCUIT_BREAKER_THRESHOLD', 5),
             recovery_timeout=settings.getfloat('CIRCUIT_BREAKER_RECOVERY_TIMEOUT', 60.0),
             half_open_max_calls=settings.getint('CIRCUIT_BREAKER_HALF_OPEN_CALLS', 3),
         )
+        if settings.getbool('RATE_CONTROL_ENABLED', True):
+            middleware.rate_controller = get_rate_controller(settings)
+        return middleware
     
     def _get_domain(self, url: str) -> str:
 
         return urlparse(url).netloc
     
+    def _set_state(self, domain: str, circuit: Dict, state: CircuitState) -> None:
+        circuit['state'] = state
+        if self.rate_controller is not None:
+            self.rate_controller.set_circuit(domain_key(domain), state, self.recovery_timeout)
+    
     def _check_half_open_transition(self, circuit: Dict) -> bool:
         """Check if circuit should transition from OPEN to HALF_OPEN."""
         if circuit['state'] != self.OPEN:
@@ -249,7 +270,7 @@ class CircuitBreakerMiddleware:
         
         # Check for OPEN -> HALF_OPEN transition
         if self._check_half_open_transition(circuit):
-            circuit['state'] = self.HALF_OPEN
+            self._set_state(domain, circuit, self.HALF_OPEN)
             circuit['half_open_calls'] = 0
             spider.logger.info(f"Circuit for {domain} transitioning to HALF_OPEN")
         
@@ -287,12 +308,12 @@ class CircuitBreakerMiddleware:
         
         if circuit['state'] == self.HALF_OPEN:
             # Any failure in half-open trips back to open
-            circuit['state'] = self.OPEN
+            self._set_state(domain, circuit, self.OPEN)
             spider.logger.warning(f"Circuit for {domain} tripped back to OPEN after half-open failure")
         
         elif circuit['state'] == self.CLOSED:
             if circuit['failures'] >= self.failure_threshold:
-                circuit['state'] = self.OPEN
+                self._set_state(domain, circuit, self.OPEN)
                 spider.logger.warning(
                     f"Circuit for {domain} OPENED after {circuit['failures']} consecutive failures"
                 )
@@ -304,7 +325,7 @@ class CircuitBreakerMiddleware:
         
         if circuit['state'] == self.HALF_OPEN:
             if circuit['successes'] >= self.half_open_max_calls:
-                circuit['state'] = self.CLOSED
+                self._set_state(domain, circuit, self.CLOSED)
                 spider.logger.info(f"Circuit for {domain} CLOSED after successful recovery")
 
 
@@ -320,7 +341,7 @@ class AdaptiveThrottlingMiddleware:
         - Tracks response times per domain
         - Auto-increases delay when responses are slow (> threshold)
         - Auto-decreases delay when responses normalize
-        - Provides per-domain delay adjustments
+        - Applies per-domain delays through the rate controller
     
     Settings:
         - ADAPTIVE_THROTTLE_ENABLED: Enable/disable (default: True)
@@ -352,7 +373,7 @@ class AdaptiveThrottlingMiddleware:
         
         # Per-domain tracking
         self.domain_stats: Dict[str, Dict] = defaultdict(lambda: {
-            'response_times': [],  # Rolling window of response times
+            'response_times': RingBuffer(self.window_size),  # Rolling window of response times
             'current_delay': 1.0,  # Current delay for this domain
             'adjustments': 0,      # Number of adjustments made
             'last_avg_ms': 0,      # Last calculated average
@@ -365,6 +386,8 @@ class AdaptiveThrottlingMiddleware:
         }
         
         self.logger = logging.getLogger(__name__)
+        # Enforces current_delay as the domain's minimum request interval
+        self.rate_controller = None
     
     @classmethod
     def from_crawler(cls, crawler):
@@ -381,6 +404,8 @@ class AdaptiveThrottlingMiddleware:
             max_delay=crawler.settings.getfloat('ADAPTIVE_THROTTLE_MAX_DELAY', 30.0),
             window_size=crawler.settings.getint('ADAPTIVE_THROTTLE_WINDOW_SIZE', 10),
         )
+        if crawler.settings.getbool('RATE_CONTROL_ENABLED', True):
+            middleware.rate_controller = get_rate_controller(crawler.settings)
         
         crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
         return middleware
@@ -390,22 +415,18 @@ class AdaptiveThrottlingMiddleware:
 
         return urlparse(url).netloc
     
+    def _apply_delay(self, domain: str, delay: float) -> None:
+        """Enforce a domain's delay as its minimum request interval."""
+        if self.rate_controller is not None:
+            self.rate_controller.set_min_interval(domain_key(domain), delay if delay > 1.0 else 0.0)
+    
     def process_request(self, request, spider):
-        """Add timing metadata and apply domain-specific delay."""
+        """Add timing metadata."""
         if not self.enabled:
             return None
         
         # Mark request start time
         request.meta['_adaptive_throttle_start'] = time.time()
-        
-        # Apply domain-specific delay (handled by Scrapy's autothrottle or manually)
-        domain = self._get_domain(request.url)
-        stats = self.domain_stats[domain]
-        
-        if stats['current_delay'] > 1.0:
-            # Store recommended delay in meta for other middlewares
-            request.meta['download_delay'] = stats['current_delay']
-        
         return None
     
     def process_response(self, request, response, spider):
@@ -424,11 +445,7 @@ class AdaptiveThrottlingMiddleware:
         
         # Add to rolling window
         stats['response_times'].append(response_time_ms)
-        if len(stats['response_times']) > self.window_size:
-            stats['response_times'].pop(0)
-        
-        # Calculate average
-        avg_ms = sum(stats['response_times']) / len(stats['response_times'])
+        avg_ms = stats['response_times'].mean
         stats['last_avg_ms'] = avg_ms
         
         # Adjust delay based on average response time
@@ -449,6 +466,7 @@ class AdaptiveThrottlingMiddleware:
                     f"increasing delay {stats['current_delay']:.1f}s → {new_delay:.1f}s"
                 )
                 stats['current_delay'] = new_delay
+                self._apply_delay(domain, new_delay)
                 
         elif len(stats['response_times']) >= self.window_size:
             # Only decrease if we have enough samples
@@ -466,6 +484,7 @@ class AdaptiveThrottlingMiddleware:
                         f"decreasing delay {stats['current_delay']:.1f}s → {new_delay:.1f}s"
                     )
                     stats['current_delay'] = new_delay
+                    self._apply_delay(domain, new_delay)
         
         return response
     
@@ -490,76 +509,112 @@ class AdaptiveThrottlingMiddleware:
 
 
 class StatisticsMiddleware:
-    def __init__(self):
+    """
+    Per-spider request and response totals, plus per-domain latency
+    percentiles, bytes/sec and status mix in fixed memory
+    (streaming_stats.StreamingStats).
+
+    Latency is Scrapy's download_latency when the download set it, else
+    the time since this middleware saw the request. Per-domain figures go
+    to the crawl stats under ``domain/<domain>/`` at close and are served
+    live by PrometheusMetricsExtension.
+    """
+
+    def __init__(self, crawler_stats=None):
+        self.crawler_stats = crawler_stats
         self.stats: Dict[str, Dict] = defaultdict(lambda: {
             'requests_total': 0,
             'responses_received': 0,
             'items_scraped': 0,
             'bytes_downloaded': 0,
-            'response_times': [],
             'status_codes': defaultdict(int),
-            'domains': defaultdict(int),
             'start_time': time.time()
         })
+        self.streams: Dict[str, StreamingStats] = {}
 
     @classmethod
     def from_crawler(cls, crawler):
-        middleware = cls()
+        middleware = cls(crawler_stats=crawler.stats)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
         crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
         return middleware
 
+    def _streams(self, spider) -> StreamingStats:
+        streams = self.streams.get(spider.name)
+        if streams is None:
+            streams = self.streams[spider.name] = get_streaming_stats(spider.name)
+        return streams
+
+    def spider_opened(self, spider):
+        self.streams[spider.name] = new_streaming_stats(spider.name)
+
     def process_request(self, request, spider):
         self.stats[spider.name]['requests_total'] += 1
         request.meta['request_start_time'] = time.time()
-        
-
-        domain = urlparse(request.url).netloc
-        self.stats[spider.name]['domains'][domain] += 1
-        
+        self._streams(spider).note_request(urlparse_cached(request).hostname or '')
         return None
 
     def process_response(self, request, response, spider):
         stats = self.stats[spider.name]
         stats['responses_received'] += 1
         stats['status_codes'][response.status] += 1
-        
-        if hasattr(response, 'body'):
-            stats['bytes_downloaded'] += len(response.body)
-        
-        if 'request_start_time' in request.meta:
-            response_time = time.time() - request.meta['request_start_time']
-            stats['response_times'].append(response_time)
-        
+        size = len(response.body)
+        stats['bytes_downloaded'] += size
+
+        latency = request.meta.get('download_latency')
+        if latency is None and 'request_start_time' in request.meta:
+            latency = time.time() - request.meta['request_start_time']
+        self._streams(spider).observe(urlparse_cached(request).hostname or '', latency, response.status, size)
+
         return response
 
     def spider_closed(self, spider, reason):
         stats = self.stats[spider.name]
+        streams = self._streams(spider)
         runtime = time.time() - stats['start_time']
-        
-        avg_response_time = 0
-        if stats['response_times']:
-            avg_response_time = sum(stats['response_times']) / len(stats['response_times'])
-        
+
+        latency = QuantileSketch()
+        for domain_stats in streams.domains.values():
+            latency.merge(domain_stats.latency)
+        p50, p95, p99 = latency.quantiles()
+
         spider.logger.info(f"=== Detailed Statistics for {spider.name} ===")
         spider.logger.info(f"Runtime: {runtime:.1f}s")
         spider.logger.info(f"Requests made: {stats['requests_total']}")
         spider.logger.info(f"Responses received: {stats['responses_received']}")
         spider.logger.info(f"Bytes downloaded: {stats['bytes_downloaded']:,}")
-        spider.logger.info(f"Average response time: {avg_response_time:.3f}s")
-        
+        spider.logger.info(
+            f"Response time: avg {latency.mean:.3f}s, p50 {p50:.3f}s, p95 {p95:.3f}s, p99 {p99:.3f}s"
+        )
+
         spider.logger.info("Status codes:")
         for code, count in sorted(stats['status_codes'].items()):
             spider.logger.info(f"  {code}: {count}")
-        
+
         spider.logger.info("Top domains:")
-        for domain, count in sorted(stats['domains'].items(), key=lambda x: x[1], reverse=True)[:5]:
-            spider.logger.info(f"  {domain}: {count}")
+        top = sorted(streams.domains.items(), key=lambda x: x[1].requests, reverse=True)[:5]
+        for domain, domain_stats in top:
+            q50, q95, q99 = domain_stats.latency.quantiles()
+            spider.logger.info(
+                f"  {domain}: {domain_stats.requests} requests, "
+                f"p50/p95/p99 {q50:.3f}/{q95:.3f}/{q99:.3f}s, "
+                f"{domain_stats.bytes_per_second / 1024:.1f} KB/s"
+            )
+
+        if self.crawler_stats is not None:
+            streams.export(self.crawler_stats)
 
 
 class RateLimitMiddleware:
-    def __init__(self, delay=1.0, randomize=True):
+    """
+    Fixed per-domain request interval, enforced as the minimum interval of
+    the domain's rate controller gate.
+    """
+
+    def __init__(self, delay=1.0, randomize=True, rate_controller=None):
         self.delay = delay
         self.randomize = randomize
+        self.rate_controller = rate_controller
         self.last_request_time = defaultdict(float)
 
     @classmethod
@@ -567,7 +622,10 @@ class RateLimitMiddleware:
         settings = crawler.settings
         delay = settings.getfloat('RATELIMIT_DELAY', 1.0)
         randomize = settings.getbool('RATELIMIT_RANDOMIZE', True)
-        return cls(delay=delay, randomize=randomize)
+        rate_controller = None
+        if settings.getbool('RATE_CONTROL_ENABLED', True):
+            rate_controller = get_rate_controller(settings)
+        return cls(delay=delay, randomize=randomize, rate_controller=rate_controller)
 
     def process_request(self, request, spider):
 
@@ -575,18 +633,17 @@ class RateLimitMiddleware:
         
         now = time.time()
         last_time = self.last_request_time[domain]
+        delay = self.delay
         
-        if last_time > 0:
-            elapsed = now - last_time
-            delay = self.delay
-            
-            if self.randomize:
-                delay *= random.uniform(0.5, 1.5)
-            
-            if elapsed < delay:
-                sleep_time = delay - elapsed
-                spider.logger.debug(f"Rate limiting {domain}: delaying next request by {sleep_time:.2f}s")
-                request.meta['download_delay'] = sleep_time
+        if self.randomize:
+            delay *= random.uniform(0.5, 1.5)
+        
+        if last_time > 0 and now - last_time < delay:
+            spider.logger.debug(f"Rate limiting {domain}: delaying next request by {delay - (now - last_time):.2f}s")
+        
+        # The gate spaces this domain's downloads at least `delay` apart
+        if self.rate_controller is not None:
+            self.rate_controller.set_min_interval(domain_key(domain), delay)
 
         self.last_request_time[domain] = time.time()
         return None
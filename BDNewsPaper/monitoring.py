@@ -13,6 +13,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import urllib.request
 
+from BDNewsPaper.stats_rollup import StatsRollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -167,6 +169,9 @@ class MetricsCollector:
         - Error counts
         - Response times
         - Database size
+    
+    Counts come from the stats rollup, so they cost the same on any
+    archive size.
     """
     
     def __init__(self, db_path: str = 'news_articles.db'):
@@ -182,15 +187,19 @@ class MetricsCollector:
         }
         return metrics
     
+    def _open_rollup(self) -> StatsRollup:
+        """Connect and bring the rollup up to date."""
+        conn = sqlite3.connect(self.db_path)
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+        return rollup
+    
     def _get_database_metrics(self) -> Dict:
         """Get database metrics."""
-        conn = None
+        rollup = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT COUNT(*) FROM articles")
-            total = cursor.fetchone()[0]
+            rollup = self._open_rollup()
+            total = rollup.totals()["articles"]
 
             size_bytes = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
 
@@ -202,53 +211,42 @@ class MetricsCollector:
         except Exception as e:
             return {"error": str(e)}
         finally:
-            if conn:
-                conn.close()
+            if rollup:
+                rollup.conn.close()
 
     def _get_paper_metrics(self) -> Dict:
         """Get per-paper article counts."""
-        conn = None
+        rollup = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT paper_name, COUNT(*) as count
-                FROM articles GROUP BY paper_name
-            """)
-            return {row[0]: row[1] for row in cursor.fetchall()}
+            rollup = self._open_rollup()
+            return rollup.counts_by("paper_name")
         except Exception as e:
             return {"error": str(e)}
         finally:
-            if conn:
-                conn.close()
+            if rollup:
+                rollup.conn.close()
 
     def _get_recent_metrics(self) -> Dict:
         """Get recent activity metrics."""
-        conn = None
+        rollup = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            rollup = self._open_rollup()
 
             periods = {
-                "last_1h": "-1 hour",
-                "last_24h": "-24 hours",
-                "last_7d": "-7 days",
+                "last_1h": 1,
+                "last_24h": 24,
+                "last_7d": 7 * 24,
             }
 
-            result = {}
-            for name, delta in periods.items():
-                cursor.execute(
-                    "SELECT COUNT(*) FROM articles WHERE scraped_at >= datetime('now', ?)",
-                    (delta,)
-                )
-                result[name] = cursor.fetchone()[0]
-
-            return result
+            return {
+                name: rollup.totals(hours=hours)["articles"]
+                for name, hours in periods.items()
+            }
         except Exception as e:
             return {"error": str(e)}
         finally:
-            if conn:
-                conn.close()
+            if rollup:
+                rollup.conn.close()
 
 
 def run_health_check():
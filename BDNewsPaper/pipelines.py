@@ -12,16 +12,29 @@ from datetime import datetime
 from typing import Optional
 
 from itemadapter.adapter import ItemAdapter
+from scrapy import signals
 from scrapy.exceptions import DropItem
+from twisted.internet.defer import Deferred, maybeDeferred
+from twisted.internet.threads import deferToThread
+from twisted.python.failure import Failure
 from w3lib.html import remove_tags
 
+from BDNewsPaper.article_partitions import ARTICLE_COLUMNS, ArticlePartitions
 from BDNewsPaper.config import MIN_ARTICLE_LENGTH, MIN_HEADLINE_LENGTH, DHAKA_TZ
+from BDNewsPaper.date_normalizer import get_normalizer
+from BDNewsPaper.html_store import get_html_store, get_item_html, release_item_html
 from BDNewsPaper.items import clean_text, validate_url
+from BDNewsPaper.language_id import LANGUAGE_GUESS_ATTR, classify_script, get_identifier
+from BDNewsPaper.stats_rollup import StatsRollup
 
 
 logger = logging.getLogger(__name__)
 
 
+class NeutralDropItem(DropItem):
+    """Drop that says nothing about whether the page was an article (duplicates, date range, storage errors)."""
+
+
 # ============================================================================
 # Validation Pipeline
 # ============================================================================
@@ -99,6 +112,8 @@ class FallbackExtractionPipeline:
     content using the fallback extraction chain (JSON-LD, trafilatura, heuristics).
     
     Enable by adding to ITEM_PIPELINES before ValidationPipeline with lower priority.
+    Raw HTML is fetched on demand from the side-channel HTML store (items
+    carry only ``_html_handle``) and released once the item is stored or dropped.
     Configurable via settings:
         - FALLBACK_EXTRACTION_ENABLED: Enable/disable (default: True)
         - FALLBACK_MIN_BODY_LENGTH: Minimum body to trigger fallback (default: 50)
@@ -116,10 +131,21 @@ class FallbackExtractionPipeline:
     
     @classmethod
     def from_crawler(cls, crawler):
-        return cls(
+        pipeline = cls(
             enabled=crawler.settings.getbool('FALLBACK_EXTRACTION_ENABLED', True),
             min_body_length=crawler.settings.getint('FALLBACK_MIN_BODY_LENGTH', 50),
         )
+        
+        # Release stored HTML once the item leaves the pipeline chain
+        crawler.signals.connect(pipeline.release_html, signal=signals.item_scraped)
+        crawler.signals.connect(pipeline.release_html, signal=signals.item_dropped)
+        crawler.signals.connect(pipeline.release_html, signal=signals.item_error)
+        
+        return pipeline
+    
+    def release_html(self, item, **kwargs):
+        """Signal handler: free the item's side-channel HTML."""
+        release_item_html(item)
     
     def _get_extractor(self):
         """Lazy load the extractor to avoid import issues."""
@@ -147,14 +173,10 @@ class FallbackExtractionPipeline:
         if not (needs_body or needs_headline):
             return item  # Content is sufficient
         
-        # Get the raw HTML if available
-        raw_html = adapter.get('_raw_html', '')
+        # Get the raw HTML from the HTML store (or legacy inline fields)
+        raw_html = get_item_html(adapter)
         url = adapter.get('url', '')
         
-        if not raw_html:
-            # Try to get from response if stored
-            raw_html = adapter.get('response_body', '')
-            
         if not raw_html:
             return item  # No HTML to extract from
         
@@ -208,6 +230,17 @@ class FallbackExtractionPipeline:
                 f"Success={self.stats['fallback_success']}, "
                 f"Failed={self.stats['fallback_failed']}"
             )
+        
+        store = get_html_store()
+        if store.stats['stored'] > 0:
+            spider.logger.info(
+                f"HTML Store Stats: "
+                f"Stored={store.stats['stored']}, "
+                f"Released={store.stats['released']}, "
+                f"Spilled={store.stats['spilled']}, "
+                f"Evicted={store.stats['evicted']}, "
+                f"PeakMemory={store.stats['peak_memory_bytes'] // 1024}KB"
+            )
 
 
 # ============================================================================
@@ -312,29 +345,47 @@ class LanguageDetectionPipeline:
     """
     Detect and validate article language.
     
-    Uses langdetect library to identify language and optionally
-    reject articles that don't match the expected language.
+    Most articles are decided from their script histogram (see
+    BDNewsPaper.language_id), reusing the guess NewsArticleItem cached when
+    article_body was set. Only mixed-script text goes to langdetect, in
+    seeded batches run off the reactor thread; those items are held back
+    until their batch is identified.
     
     Configure via settings:
         - LANGUAGE_DETECTION_ENABLED: Enable/disable (default: True)
         - LANGUAGE_DETECTION_STRICT: Drop non-matching articles (default: False)
         - EXPECTED_LANGUAGES: List of allowed languages (default: ['en'])
+        - LANGUAGE_DETECTION_BATCH_SIZE: Mixed-script items per model batch (default: 32)
+        - LANGUAGE_DETECTION_BATCH_TIMEOUT: Max seconds an item waits for its batch (default: 0.5)
     """
     
     def __init__(self, enabled: bool = True, strict: bool = False,
-                 expected_languages: list = None):
+                 expected_languages: list = None, batch_size: int = 32,
+                 batch_timeout: float = 0.5):
         self.enabled = enabled
         self.strict = strict
         self.expected_languages = expected_languages or ['en']
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
         self._langdetect_available = False
+        self._identifier = get_identifier()
+        
+        # (item, text, deferred) waiting for the model
+        self._pending = []
+        self._flush_call = None
+        
+        self.stats = {
+            'script': 0,
+            'model': 0,
+            'undetected': 0,
+            'dropped': 0,
+        }
         
         try:
-            from langdetect import detect, LangDetectException
-            self._detect = detect
-            self._LangDetectException = LangDetectException
+            import langdetect  # noqa: F401
             self._langdetect_available = True
         except ImportError:
-            logger.warning("langdetect not installed. Language detection disabled.")
+            logger.warning("langdetect not installed. Mixed-script articles use the script majority.")
     
     @classmethod
     def from_crawler(cls, crawler):
@@ -342,15 +393,15 @@ class LanguageDetectionPipeline:
             enabled=crawler.settings.getbool('LANGUAGE_DETECTION_ENABLED', True),
             strict=crawler.settings.getbool('LANGUAGE_DETECTION_STRICT', False),
             expected_languages=crawler.settings.getlist('EXPECTED_LANGUAGES', ['en']),
+            batch_size=crawler.settings.getint('LANGUAGE_DETECTION_BATCH_SIZE', 32),
+            batch_timeout=crawler.settings.getfloat('LANGUAGE_DETECTION_BATCH_TIMEOUT', 0.5),
         )
     
     def process_item(self, item, spider):
-        if not self.enabled or not self._langdetect_available:
+        if not self.enabled:
             return item
         
         adapter = ItemAdapter(item)
-        
-        # Get text for detection (headline + first 500 chars of body)
         headline = adapter.get('headline', '')
         body = adapter.get('article_body', '')
         text_sample = f"{headline} {body[:500]}"
@@ -359,23 +410,90 @@ class LanguageDetectionPipeline:
             # Not enough text to detect language
             return item
         
-        try:
-            detected_lang = self._detect(text_sample)
-            item['detected_language'] = detected_lang
-            
-            # Log detection
-            spider.logger.debug(f"Detected language: {detected_lang} for {adapter.get('url', 'unknown')}")
-            
-            # Check if language matches expected
-            if self.strict and detected_lang not in self.expected_languages:
-                raise DropItem(
-                    f"Language mismatch: detected '{detected_lang}', "
-                    f"expected {self.expected_languages} for {adapter.get('url')}"
-                )
-            
-        except self._LangDetectException as e:
-            spider.logger.debug(f"Language detection failed: {e}")
-            item['detected_language'] = 'unknown'
+        # Script guess cached by NewsArticleItem for the current body
+        guess = getattr(item, LANGUAGE_GUESS_ATTR, None)
+        if guess is None or not guess.certain:
+            guess = classify_script(f"{headline} {body}")
+        
+        if guess.certain or not self._langdetect_available:
+            # Without langdetect, mixed-script text keeps the script majority
+            self.stats['script'] += 1
+            return self._apply(item, guess.lang or 'unknown', guess.method, spider)
+        
+        from twisted.internet import reactor
+        
+        d = Deferred()
+        self._pending.append((item, text_sample, d, spider))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_call is None and reactor.running:
+            self._flush_call = reactor.callLater(self.batch_timeout, self._flush)
+        return d
+    
+    def close_spider(self, spider):
+        # Pending items must resolve before the engine finishes closing
+        while self._pending:
+            self._flush(in_thread=False)
+        logger.info(
+            f"Language detection: {self.stats['script']} by script, "
+            f"{self.stats['model']} by model, {self.stats['undetected']} undetected, "
+            f"{self.stats['dropped']} dropped"
+        )
+    
+    def _flush(self, in_thread: bool = True) -> None:
+        """Identify the pending batch with the model and fire its deferreds."""
+        from twisted.internet import reactor
+        
+        if self._flush_call is not None and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
+        
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        if not batch:
+            return
+        
+        texts = [text for _, text, _, _ in batch]
+        if in_thread and reactor.running:
+            result = deferToThread(self._identifier.identify_many, texts)
+        else:
+            result = maybeDeferred(self._identifier.identify_many, texts)
+        result.addCallbacks(
+            lambda guesses: self._resolve(batch, guesses),
+            lambda failure: self._resolve(batch, [failure] * len(batch)),
+        )
+    
+    def _resolve(self, batch, guesses) -> None:
+        for (item, _, d, spider), guess in zip(batch, guesses):
+            if isinstance(guess, Failure) or guess.method != 'model':
+                reason = guess.value if isinstance(guess, Failure) else 'no model result'
+                spider.logger.debug(f"Language detection failed: {reason}")
+                item['detected_language'] = 'unknown'
+                self.stats['undetected'] += 1
+                d.callback(item)
+                continue
+            self.stats['model'] += 1
+            try:
+                result = self._apply(item, guess.lang, guess.method, spider)
+            except DropItem:
+                d.errback(Failure())
+            else:
+                d.callback(result)
+    
+    def _apply(self, item, detected_lang: str, method: str, spider):
+        """Record the detected language and enforce strict mode."""
+        adapter = ItemAdapter(item)
+        item['detected_language'] = detected_lang
+        spider.logger.debug(
+            f"Detected language: {detected_lang} ({method}) for {adapter.get('url', 'unknown')}"
+        )
+        
+        # Check if language matches expected
+        if self.strict and detected_lang not in self.expected_languages:
+            self.stats['dropped'] += 1
+            raise DropItem(
+                f"Language mismatch: detected '{detected_lang}', "
+                f"expected {self.expected_languages} for {adapter.get('url')}"
+            )
         
         return item
 
@@ -521,16 +639,16 @@ class DateFilterPipeline:
             return item
         
         try:
-            pub_date = self._parse_date(pub_date_str)
+            pub_date = self._parse_date(pub_date_str, spider)
             if not pub_date:
                 return item
             
             # Check date range
             if self.start_date and pub_date < self.start_date:
-                raise DropItem(f"Article date {pub_date} before start date {self.start_date}")
+                raise NeutralDropItem(f"Article date {pub_date} before start date {self.start_date}")
             
             if self.end_date and pub_date > self.end_date:
-                raise DropItem(f"Article date {pub_date} after end date {self.end_date}")
+                raise NeutralDropItem(f"Article date {pub_date} after end date {self.end_date}")
             
         except DropItem:
             raise
@@ -539,25 +657,9 @@ class DateFilterPipeline:
         
         return item
     
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """Parse date string to datetime."""
-        formats = [
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str.split('+')[0].split('Z')[0], fmt)
-                if dt.tzinfo is None:
-                    dt = DHAKA_TZ.localize(dt)
-                return dt
-            except ValueError:
-                continue
-        
-        return None
+    def _parse_date(self, date_str: str, spider=None) -> Optional[datetime]:
+        """Parse date string to datetime (naive dates are Dhaka time)."""
+        return get_normalizer(getattr(spider, 'name', None)).parse_localized(date_str)
 
 
 # ============================================================================
@@ -573,17 +675,22 @@ class SharedSQLitePipeline:
         - WAL mode for better concurrency
         - Automatic schema creation
         - Duplicate URL detection
+        - Stats rollup maintained in the insert transaction
+        - Optional monthly partitions (SQLITE_PARTITIONED, see
+          BDNewsPaper.article_partitions)
     """
     
-    def __init__(self, db_path: str = 'news_articles.db'):
+    def __init__(self, db_path: str = 'news_articles.db', partitioned: bool = False):
         self.db_path = db_path
+        self.partitioned = partitioned
         self._local = threading.local()
         self._lock = threading.Lock()
     
     @classmethod
     def from_crawler(cls, crawler):
         db_path = crawler.settings.get('DATABASE_PATH', 'news_articles.db')
-        return cls(db_path=db_path)
+        partitioned = crawler.settings.getbool('SQLITE_PARTITIONED', False)
+        return cls(db_path=db_path, partitioned=partitioned)
     
     def _get_connection(self):
         """Get thread-local database connection."""
@@ -605,6 +712,15 @@ class SharedSQLitePipeline:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # A database partitioned earlier stays partitioned
+        partitions = ArticlePartitions(conn)
+        if self.partitioned or partitions.is_partitioned():
+            self.partitioned = True
+            partitions.ensure()
+            StatsRollup(conn).ensure()
+            spider.logger.info(f"Database initialized at {self.db_path} (monthly partitions)")
+            return
+        
         # Create articles table with all fields
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS articles (
@@ -634,7 +750,17 @@ class SharedSQLitePipeline:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON articles(category);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON articles(content_hash);")
         
+        # Recent-window readers filter on scraped_at; index it (one-off on old databases)
+        if not cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_scraped_at'"
+        ).fetchone():
+            spider.logger.info("Indexing articles.scraped_at")
+            cursor.execute("CREATE INDEX idx_scraped_at ON articles(scraped_at);")
+        
         conn.commit()
+        
+        # Create (and backfill, on an existing archive) the stats rollup
+        StatsRollup(conn).ensure()
         spider.logger.info(f"Database initialized at {self.db_path}")
     
     def close_spider(self, spider):
@@ -644,11 +770,7 @@ class SharedSQLitePipeline:
             cursor = conn.cursor()
             
             # Get count for this spider
-            cursor.execute(
-                "SELECT COUNT(*) FROM articles WHERE paper_name = ?",
-                (spider.name,)
-            )
-            count = cursor.fetchone()[0]
+            count = StatsRollup(conn).counts_by('paper_name').get(spider.name, 0)
             spider.logger.info(f"Spider {spider.name} has {count} articles in database")
             
             # Optimize database
@@ -671,12 +793,17 @@ class SharedSQLitePipeline:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        partitions = ArticlePartitions(conn) if self.partitioned else None
+        
         # Check for duplicate URL
         with self._lock:
-            cursor.execute("SELECT id FROM articles WHERE url = ?", (url,))
-            if cursor.fetchone():
+            if partitions:
+                duplicate = partitions.url_exists(url)
+            else:
+                duplicate = cursor.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()
+            if duplicate:
                 spider.logger.debug(f"Duplicate URL skipped: {url}")
-                raise DropItem(f"Duplicate URL: {url}")
+                raise NeutralDropItem(f"Duplicate URL: {url}")
             
             # Also check content hash if available
             content_hash = adapter.get("content_hash")
@@ -684,36 +811,42 @@ class SharedSQLitePipeline:
                 cursor.execute("SELECT id FROM articles WHERE content_hash = ?", (content_hash,))
                 if cursor.fetchone():
                     spider.logger.debug(f"Duplicate content skipped: {url}")
-                    raise DropItem(f"Duplicate content: {url}")
+                    raise NeutralDropItem(f"Duplicate content: {url}")
+            
+            values = {
+                "url": url,
+                "paper_name": adapter.get("paper_name", spider.name),
+                "headline": adapter.get("headline", ""),
+                "article": adapter.get("article_body", ""),
+                "sub_title": adapter.get("sub_title"),
+                "category": adapter.get("category"),
+                "author": adapter.get("author"),
+                "publication_date": adapter.get("publication_date"),
+                "modification_date": adapter.get("modification_date"),
+                "image_url": adapter.get("image_url"),
+                "keywords": adapter.get("keywords"),
+                "source_language": adapter.get("source_language"),
+                "word_count": adapter.get("word_count"),
+                "content_hash": content_hash,
+            }
             
             try:
-                cursor.execute("""
-                    INSERT INTO articles (
-                        url, paper_name, headline, article, sub_title, category,
-                        author, publication_date, modification_date, image_url,
-                        keywords, source_language, word_count, content_hash
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    url,
-                    adapter.get("paper_name", spider.name),
-                    adapter.get("headline", ""),
-                    adapter.get("article_body", ""),
-                    adapter.get("sub_title"),
-                    adapter.get("category"),
-                    adapter.get("author"),
-                    adapter.get("publication_date"),
-                    adapter.get("modification_date"),
-                    adapter.get("image_url"),
-                    adapter.get("keywords"),
-                    adapter.get("source_language"),
-                    adapter.get("word_count"),
-                    content_hash,
-                ))
+                if partitions:
+                    article_id = partitions.insert(values)
+                else:
+                    cursor.execute(
+                        f"INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)})"
+                        f" VALUES ({', '.join('?' * len(ARTICLE_COLUMNS))})",
+                        tuple(values[column] for column in ARTICLE_COLUMNS)
+                    )
+                    article_id = cursor.lastrowid
+                StatsRollup(conn).record(article_id)
                 conn.commit()
                 spider.logger.debug(f"Saved: {adapter.get('headline', '')[:50]}...")
                 
             except sqlite3.Error as e:
+                conn.rollback()
                 spider.logger.error(f"Database error for {url}: {e}")
-                raise DropItem(f"Database error: {e}")
+                raise NeutralDropItem(f"Database error: {e}")
         
         return item
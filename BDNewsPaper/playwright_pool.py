@@ -0,0 +1,268 @@
+"""
+Playwright Page Pool and Resource Blocking
+==========================================
+Lean rendering mode for the Playwright spiders.
+
+By default every Playwright request opens a fresh page in the shared
+``default`` context and downloads everything the site references (images,
+fonts, video, ad and analytics scripts). The pooled mode instead:
+
+    1. Keeps one browser context per domain and a bounded set of warm,
+       idle pages inside it. PagePoolMiddleware hands one to the next
+       request for the domain as it goes to the download handler.
+    2. Installs a route handler on every new page that aborts
+       non-essential resource types and requests to known ad hosts.
+    3. For listing pages that only need links, returns the DOM as soon as
+       the configured selector is attached instead of waiting for ``load``.
+
+Settings:
+    - PLAYWRIGHT_POOL_ENABLED: Enable the pooled mode (default: False)
+    - PLAYWRIGHT_POOL_PAGES_PER_DOMAIN: Idle pages kept per domain (default: 2)
+    - PLAYWRIGHT_BLOCK_RESOURCE_TYPES: Resource types to abort
+    - PLAYWRIGHT_BLOCK_AD_HOSTS: Extra ad/analytics host suffixes to abort
+
+Usage:
+    scrapy crawl kalerkantho_playwright -s PLAYWRIGHT_POOL_ENABLED=true
+"""
+
+import logging
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+# Resource types that never contribute to the text we extract
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({
+    'image',
+    'media',
+    'font',
+    'imageset',
+    'texttrack',
+    'beacon',
+    'csp_report',
+})
+
+# Ad, analytics and tracking hosts seen on Bangladeshi news sites.
+# Matched as domain suffixes, so subdomains are blocked as well.
+DEFAULT_AD_HOSTS = frozenset({
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googletagservices.com',
+    'googletagmanager.com',
+    'google-analytics.com',
+    'googleadservices.com',
+    'adservice.google.com',
+    'pagead2.googlesyndication.com',
+    'amazon-adsystem.com',
+    'adnxs.com',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'facebook.net',
+    'connect.facebook.net',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'chartbeat.com',
+    'chartbeat.net',
+    'hotjar.com',
+    'clarity.ms',
+    'onesignal.com',
+    'pubmatic.com',
+    'rubiconproject.com',
+    'openx.net',
+    'teads.tv',
+    'yandex.ru',
+    'mc.yandex.ru',
+    'histats.com',
+    'statcounter.com',
+    'vdo.ai',
+    'izooto.com',
+})
+
+
+def _host_matches(hostname: str, hosts: FrozenSet[str]) -> bool:
+    """Check hostname and each of its parent domains against a host set."""
+    labels = hostname.split('.')
+    for i in range(len(labels) - 1):
+        if '.'.join(labels[i:]) in hosts:
+            return True
+    return False
+
+
+def should_abort_request(
+    request: Any,
+    resource_types: FrozenSet[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+    ad_hosts: FrozenSet[str] = DEFAULT_AD_HOSTS,
+) -> bool:
+    """
+    Decide whether a Playwright request should be aborted.
+
+    Args:
+        request: Playwright Request (needs ``resource_type`` and ``url``)
+        resource_types: Resource types to abort
+        ad_hosts: Host suffixes to abort regardless of resource type
+
+    Returns:
+        True if the request is non-essential for text extraction
+    """
+    if request.resource_type in resource_types:
+        return True
+
+    hostname = urlparse(request.url).hostname
+    if hostname and _host_matches(hostname.lower(), ad_hosts):
+        return True
+
+    return False
+
+
+class PagePool:
+    """
+    Bounded pool of warm Playwright pages, one browser context per domain.
+
+    Pages are never shared: ``acquire`` pops an idle page (or returns None so
+    scrapy-playwright opens a new one) and ``release`` puts it back. When the
+    domain already holds ``max_pages_per_domain`` idle pages, ``release``
+    returns False and the caller closes the page.
+    """
+
+    def __init__(
+        self,
+        max_pages_per_domain: int = 2,
+        resource_types: Optional[Iterable[str]] = None,
+        ad_hosts: Optional[Iterable[str]] = None,
+        context_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.max_pages_per_domain = max(1, max_pages_per_domain)
+        self.resource_types = frozenset(
+            resource_types if resource_types is not None
+            else DEFAULT_BLOCKED_RESOURCE_TYPES
+        )
+        self.ad_hosts = DEFAULT_AD_HOSTS | frozenset(h.lower() for h in (ad_hosts or []))
+        self.context_kwargs = dict(context_kwargs or {})
+
+        self._idle: Dict[str, Deque[Any]] = defaultdict(deque)
+        self._contexts: Dict[int, Any] = {}
+
+        self.stats = {
+            'pages_reused': 0,
+            'pages_released': 0,
+            'pages_discarded': 0,
+            'requests_blocked': 0,
+            'requests_allowed': 0,
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'PagePool':
+        contexts = settings.getdict('PLAYWRIGHT_CONTEXTS', {})
+        return cls(
+            max_pages_per_domain=settings.getint('PLAYWRIGHT_POOL_PAGES_PER_DOMAIN', 2),
+            resource_types=settings.getlist('PLAYWRIGHT_BLOCK_RESOURCE_TYPES') or None,
+            ad_hosts=settings.getlist('PLAYWRIGHT_BLOCK_AD_HOSTS'),
+            context_kwargs=contexts.get('default', {}),
+        )
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Pool key for a URL (hostname without ``www.``)."""
+        hostname = (urlparse(url).hostname or '').lower()
+        return hostname[4:] if hostname.startswith('www.') else hostname
+
+    def context_name(self, url: str) -> str:
+        """Name of the per-domain browser context for a URL."""
+        return f"pool:{self.domain_of(url)}"
+
+    def acquire(self, url: str) -> Optional[Any]:
+        """Pop a warm idle page for the URL's domain, if any is open."""
+        idle = self._idle.get(self.domain_of(url))
+        while idle:
+            page = idle.popleft()
+            if not page.is_closed():
+                self.stats['pages_reused'] += 1
+                return page
+        return None
+
+    def release(self, url: str, page: Any) -> bool:
+        """
+        Return a page to the pool.
+
+        Returns:
+            True if the page was kept, False if the caller must close it
+        """
+        if page is None or page.is_closed():
+            return True
+
+        idle = self._idle[self.domain_of(url)]
+        if len(idle) >= self.max_pages_per_domain:
+            self.stats['pages_discarded'] += 1
+            return False
+
+        idle.append(page)
+        self.stats['pages_released'] += 1
+        return True
+
+    def idle_count(self, url: Optional[str] = None) -> int:
+        """Number of idle pages for one domain, or across all domains."""
+        if url is not None:
+            return len(self._idle.get(self.domain_of(url), ()))
+        return sum(len(idle) for idle in self._idle.values())
+
+    async def block_route(self, route) -> None:
+        """Route handler: abort non-essential requests, pass the rest on."""
+        if should_abort_request(route.request, self.resource_types, self.ad_hosts):
+            self.stats['requests_blocked'] += 1
+            await route.abort()
+        else:
+            self.stats['requests_allowed'] += 1
+            await route.fallback()
+
+    async def init_page(self, page, request) -> None:
+        """``playwright_page_init_callback``: install the blocking route."""
+        context = getattr(page, 'context', None)
+        if context is not None:
+            self._contexts[id(context)] = context
+        await page.route("**/*", self.block_route)
+
+    async def close_all(self) -> None:
+        """Close every idle page, then the per-domain contexts."""
+        for idle in self._idle.values():
+            while idle:
+                page = idle.popleft()
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled page: {e}")
+        self._idle.clear()
+
+        for context in self._contexts.values():
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing pooled context: {e}")
+        self._contexts.clear()
+
+
+class PagePoolMiddleware:
+    """
+    Downloader middleware that takes a warm page from the spider's pool for
+    requests marked with ``playwright_pool_url`` meta.
+
+    It sits right after the rate gate, so a page is only taken once the
+    request is about to be rendered, not while it waits in the scheduler.
+    Requests it has no idle page for get a new one from scrapy-playwright.
+    """
+
+    def process_request(self, request, spider):
+        url = request.meta.get('playwright_pool_url')
+        if not url or request.meta.get('playwright_page') is not None:
+            return None
+
+        get_pool = getattr(spider, '_get_page_pool', None)
+        pool = get_pool() if get_pool is not None else None
+        if pool is not None:
+            page = pool.acquire(url)
+            if page is not None:
+                request.meta['playwright_page'] = page
+        return None
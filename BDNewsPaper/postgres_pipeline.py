@@ -15,6 +15,8 @@ from contextlib import contextmanager
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
 
+from BDNewsPaper.pipelines import NeutralDropItem
+
 logger = logging.getLogger(__name__)
 
 
@@ -179,14 +181,14 @@ class PostgreSQLPipeline:
             # Check for duplicate
             cursor.execute("SELECT id FROM articles WHERE url = %s", (url,))
             if cursor.fetchone():
-                raise DropItem(f"Duplicate URL: {url}")
+                raise NeutralDropItem(f"Duplicate URL: {url}")
             
             # Check content hash
             content_hash = adapter.get('content_hash')
             if content_hash:
                 cursor.execute("SELECT id FROM articles WHERE content_hash = %s", (content_hash,))
                 if cursor.fetchone():
-                    raise DropItem(f"Duplicate content: {url}")
+                    raise NeutralDropItem(f"Duplicate content: {url}")
             
             # Parse publication date
             pub_date = None
@@ -0,0 +1,250 @@
+"""
+Component Profiler
+==================
+Per-component cost of the downloader middleware chain and item pipelines.
+
+ComponentProfiler wraps every method the downloader middleware manager
+and the item pipeline manager call (process_request, process_response,
+process_exception, process_item) once the spider is open, Scrapy's own
+components included. Each wrapper counts calls; one call in
+1/PROFILE_SAMPLE_RATE is also timed:
+
+    wall    - perf_counter around the call, kept in a QuantileSketch
+              (fixed memory, 1% relative error)
+    cpu     - thread CPU time of the call
+    objects - net GC-tracked objects (lists, dicts, instances) the call
+              left alive, from the collector's allocation counter, so a
+              component that grows a per-request list shows up as a
+              steady positive number; samples spanning a collection are
+              left out
+
+Async methods (RateControlMiddleware.process_request) are timed until
+their coroutine finishes, so their wall time includes pacing waits and
+no CPU or object figures are kept for them.
+
+At close the report is logged, summary figures go to the crawl stats
+under ``profile/``, and with PROFILE_OUTPUT_DIR set a text report and a
+folded-stack file (flamegraph.pl, speedscope, inferno) are written there.
+
+An unsampled call costs one counter increment and a modulo; a sampled
+one about 1µs. PROFILE_SAMPLE_RATE = 0.01 keeps production overhead
+well under 1% of a middleware chain that already costs milliseconds.
+
+Usage:
+    # settings.py (the extension is listed in EXTENSIONS, off by default)
+    PROFILE_COMPONENTS = True
+    PROFILE_SAMPLE_RATE = 0.01
+    PROFILE_OUTPUT_DIR = 'logs/profile'
+
+    flamegraph.pl logs/profile/prothomalo-components.folded > chain.svg
+"""
+
+import functools
+import gc
+import inspect
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+from BDNewsPaper.streaming_stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+# Manager methods called once per request or item
+DOWNLOADER_METHODS = ('process_request', 'process_response', 'process_exception')
+PIPELINE_METHODS = ('process_item',)
+
+
+class ComponentRecord:
+    """Counts and samples for one method of one component."""
+
+    def __init__(self, chain: str, component: str, method: str):
+        self.chain = chain
+        self.component = component
+        self.method = method
+        self.calls = 0
+        self.wall = QuantileSketch()
+        self.cpu_ns = 0
+        self.cpu_samples = 0
+        self.objects = 0
+        self.object_samples = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.component}.{self.method}"
+
+    @property
+    def estimated_total_ns(self) -> float:
+        """Wall time of all calls, extrapolated from the samples."""
+        return self.wall.mean * self.calls
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'calls': self.calls,
+            'sampled': self.wall.count,
+            'wall_mean_us': round(self.wall.mean / 1000, 1),
+            'wall_p50_us': round(self.wall.quantile(0.5) / 1000, 1),
+            'wall_p95_us': round(self.wall.quantile(0.95) / 1000, 1),
+            'wall_p99_us': round(self.wall.quantile(0.99) / 1000, 1),
+            'wall_max_us': round(self.wall.max / 1000, 1),
+            'cpu_mean_us': round(self.cpu_ns / (self.cpu_samples or 1) / 1000, 1),
+            'objects_per_call': round(self.objects / (self.object_samples or 1), 2),
+        }
+
+
+class ComponentProfiler:
+    """
+    Extension that times each downloader middleware and item pipeline
+    method, sampling one call in `every`.
+    """
+
+    def __init__(self, crawler, sample_rate: float = 1.0, output_dir: Optional[str] = None):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 1
+        self.output_dir = output_dir
+        self.records: List[ComponentRecord] = []
+        self.collections = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('PROFILE_COMPONENTS', False):
+            raise NotConfigured("Component profiling disabled")
+        profiler = cls(
+            crawler,
+            sample_rate=settings.getfloat('PROFILE_SAMPLE_RATE', 1.0),
+            output_dir=settings.get('PROFILE_OUTPUT_DIR'),
+        )
+        crawler.signals.connect(profiler.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(profiler.spider_closed, signal=signals.spider_closed)
+        return profiler
+
+    def _count_collection(self, phase, info):
+        if phase == 'start':
+            self.collections += 1
+
+    def spider_opened(self, spider):
+        engine = self.crawler.engine
+        self.instrument(engine.downloader.middleware, 'downloader', DOWNLOADER_METHODS)
+        self.instrument(engine.scraper.itemproc, 'pipeline', PIPELINE_METHODS)
+        spider.logger.info(
+            f"Profiling {len(self.records)} component methods, 1 call in {self.every} sampled"
+        )
+
+    def instrument(self, manager, chain: str, method_names: Tuple[str, ...]) -> None:
+        """Replace the manager's method chains with timed wrappers."""
+        if self._count_collection not in gc.callbacks:
+            gc.callbacks.append(self._count_collection)
+        # Methods taking a spider argument are looked up in this set by identity
+        needs_spider = getattr(manager, '_mw_methods_requiring_spider', set())
+        for name in method_names:
+            if name not in manager.methods:
+                continue
+            timed_methods = []
+            for method in manager.methods[name]:
+                if method is None:
+                    timed_methods.append(None)
+                    continue
+                timed = self._wrap(chain, name, method)
+                if method in needs_spider:
+                    needs_spider.add(timed)
+                timed_methods.append(timed)
+            manager.methods[name] = type(manager.methods[name])(timed_methods)
+
+    def _wrap(self, chain: str, name: str, method):
+        component = type(getattr(method, '__self__', method)).__name__
+        record = ComponentRecord(chain, component, name)
+        self.records.append(record)
+        every = self.every
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed_async(*args, **kwargs):
+                record.calls += 1
+                if record.calls % every:
+                    return await method(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    record.wall.add(time.perf_counter_ns() - start)
+            return timed_async
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            record.calls += 1
+            if record.calls % every:
+                return method(*args, **kwargs)
+            collections = self.collections
+            objects = gc.get_count()[0]
+            cpu = time.thread_time_ns()
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record.wall.add(time.perf_counter_ns() - start)
+                record.cpu_ns += time.thread_time_ns() - cpu
+                record.cpu_samples += 1
+                if self.collections == collections:
+                    record.objects += gc.get_count()[0] - objects
+                    record.object_samples += 1
+        return timed
+
+    def report(self) -> str:
+        """Plain-text table of every instrumented method, costliest first."""
+        records = sorted(self.records, key=lambda r: r.estimated_total_ns, reverse=True)
+        grand_total = sum(r.estimated_total_ns for r in records) or 1
+        lines = [
+            f"{'chain':<10} {'component.method':<48} {'calls':>8} {'share':>6} {'mean':>8} {'p50':>8} "
+            f"{'p95':>8} {'p99':>8} {'max':>9} {'cpu':>8} {'objects':>8}",
+        ]
+        for record in records:
+            if not record.calls:
+                continue
+            s = record.summary()
+            cpu = f"{s['cpu_mean_us']:>8}" if record.cpu_samples else f"{'-':>8}"
+            objects = f"{s['objects_per_call']:>8}" if record.object_samples else f"{'-':>8}"
+            lines.append(
+                f"{record.chain:<10} {record.name:<48} {s['calls']:>8} "
+                f"{record.estimated_total_ns / grand_total:>6.1%} {s['wall_mean_us']:>8} "
+                f"{s['wall_p50_us']:>8} {s['wall_p95_us']:>8} {s['wall_p99_us']:>8} "
+                f"{s['wall_max_us']:>9} {cpu} {objects}"
+            )
+        lines.append("(times in µs per call; objects = net GC-tracked objects left alive per call)")
+        return "\n".join(lines)
+
+    def folded_stacks(self, root: str = 'crawl') -> str:
+        """
+        Folded stacks (``root;chain;method;component microseconds``) for
+        flame graph tools, extrapolated from the samples to all calls.
+        """
+        lines = []
+        for record in self.records:
+            micros = int(record.estimated_total_ns / 1000)
+            if micros:
+                lines.append(f"{root};{record.chain};{record.method};{record.component} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def spider_closed(self, spider, reason):
+        if self._count_collection in gc.callbacks:
+            gc.callbacks.remove(self._count_collection)
+        for record in self.records:
+            if not record.calls:
+                continue
+            for key, value in record.summary().items():
+                self.stats.set_value(f'profile/{record.chain}/{record.name}/{key}', value)
+        report = self.report()
+        spider.logger.info(f"Component profile (1 call in {self.every} sampled):\n{report}")
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, f"{spider.name}-components")
+            with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+                f.write(report + "\n")
+            with open(f"{base}.folded", 'w', encoding='utf-8') as f:
+                f.write(self.folded_stacks(spider.name))
+            spider.logger.info(f"Component profile written to {base}.txt and {base}.folded")
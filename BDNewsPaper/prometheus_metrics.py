@@ -8,6 +8,8 @@ Features:
     - Requests/responses per domain
     - Error counts by type
     - Response time histograms
+    - Per-domain latency p50/p95/p99, bytes/sec and status mix from
+      StatisticsMiddleware's streaming stats
     - Optional Pushgateway integration
 
 Usage:
@@ -35,6 +37,7 @@ try:
         Counter, Gauge, Histogram, Summary, 
         start_http_server, push_to_gateway, CollectorRegistry, REGISTRY
     )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
@@ -42,8 +45,54 @@ except ImportError:
 from scrapy import signals
 from scrapy.exceptions import NotConfigured
 
+from BDNewsPaper.streaming_stats import all_streaming_stats
+
 logger = logging.getLogger(__name__)
 
+# Quantiles exported per domain
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class StreamingStatsCollector:
+    """
+    Custom collector reading every spider's StreamingStats at scrape time,
+    so percentiles come from the fixed-size sketches instead of
+    per-observation metric updates.
+    """
+
+    def collect(self):
+        latency = GaugeMetricFamily(
+            'scrapy_domain_latency_seconds', 'Response latency quantile per domain',
+            labels=['spider', 'domain', 'quantile'],
+        )
+        throughput = GaugeMetricFamily(
+            'scrapy_domain_bytes_per_second', 'Body bytes per second per domain',
+            labels=['spider', 'domain'],
+        )
+        body_bytes = CounterMetricFamily(
+            'scrapy_domain_bytes', 'Body bytes downloaded per domain',
+            labels=['spider', 'domain'],
+        )
+        responses = CounterMetricFamily(
+            'scrapy_domain_responses', 'Responses per domain and status',
+            labels=['spider', 'domain', 'status_code'],
+        )
+        for spider, streams in all_streaming_stats().items():
+            for domain, stats in list(streams.domains.items()):
+                for q, value in zip(QUANTILES, stats.latency.quantiles(QUANTILES)):
+                    latency.add_metric([spider, domain, str(q)], value)
+                throughput.add_metric([spider, domain], stats.bytes_per_second)
+                body_bytes.add_metric([spider, domain], stats.bytes)
+                for status, count in list(stats.statuses.items()):
+                    responses.add_metric([spider, domain, str(status)], count)
+        yield latency
+        yield throughput
+        yield body_bytes
+        yield responses
+
+
+_streaming_collector: Optional[StreamingStatsCollector] = None
+
 
 class PrometheusMetricsExtension:
     """
@@ -135,6 +184,12 @@ class PrometheusMetricsExtension:
             ['spider'],
             buckets=[100, 500, 1000, 5000, 10000, 50000]
         )
+        
+        # Per-domain streaming stats, registered once per process
+        global _streaming_collector
+        if _streaming_collector is None:
+            _streaming_collector = StreamingStatsCollector()
+            self.registry.register(_streaming_collector)
     
     @classmethod
     def from_crawler(cls, crawler):
@@ -0,0 +1,287 @@
+"""
+Proxy Pool
+==========
+Latency-weighted proxy selection with health scoring and cool-downs.
+
+ProxyMiddleware rebuilt its list of usable proxies on every request,
+sorted all of them by failure count for the ``smart`` strategy, gave a
+slow proxy as much traffic as a fast one and banned a proxy for the
+rest of the crawl after PROXY_BAN_THRESHOLD failures. ProxyPool keeps
+per-proxy health instead:
+
+    latency     EWMA of download latency (and probe latency)
+    success     EWMA of outcomes (1 success, 0 failure or ban response)
+    in_flight   requests sent through the proxy and not yet answered
+
+Selection (``smart``) is power-of-two-choices: two random usable
+proxies, the one with the lower expected cost
+``latency * (in_flight + 1) / success`` wins. It follows the fastest
+healthy proxies without herding onto a single one. Proxies without a
+latency sample score zero, so each is tried early.
+
+A proxy that fails PROXY_BAN_THRESHOLD times in a row cools down for
+PROXY_COOLDOWN seconds, doubling on every repeat up to
+PROXY_MAX_COOLDOWN, and comes back on probation: one more failure sends
+it straight back. Cooling proxies sit in a heap keyed by the time they
+come back, so re-admission is O(log n) and nothing is rebuilt per
+request. If every proxy is cooling, the one due back first is used.
+
+``probe()`` sends one request through every usable proxy concurrently
+with asyncio streams (no blocking ``requests.get``). The middleware runs
+a probe round every PROXY_PROBE_INTERVAL seconds; results feed the same
+latency and success figures.
+
+Usage:
+    pool = ProxyPool(['http://10.0.0.1:3128', 'http://10.0.0.2:3128'])
+    proxy = pool.select()
+    pool.acquire(proxy)
+    ...
+    pool.release(proxy, latency=0.8, ok=True)
+"""
+
+import asyncio
+import base64
+import heapq
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PROBE_URL = 'http://httpbin.org/ip'
+
+# Proxy schemes probe_proxy() can speak; others are left to real traffic
+PROBE_SCHEMES = ('http', 'https')
+
+
+class ProxyState:
+    """Health of one proxy."""
+
+    __slots__ = ('url', 'latency', 'success', 'in_flight', 'streak', 'cooldowns',
+                 'cooling_until', 'requests', 'failures')
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.success = 1.0
+        self.in_flight = 0
+        self.streak = 0          # Consecutive failures
+        self.cooldowns = 0       # Cool-downs since the last success
+        self.cooling_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def cost(self) -> float:
+        """Expected cost of one more request: lower is better."""
+        return (self.latency or 0.0) * (self.in_flight + 1) / max(self.success, 0.05)
+
+
+class ProxyPool:
+    """
+    Usable proxies in an indexable list (O(1) random pick, removal and
+    re-admission) plus a heap of cooling proxies.
+    """
+
+    def __init__(self, proxies: List[str], alpha: float = 0.2, failure_threshold: int = 5,
+                 cooldown: float = 30.0, max_cooldown: float = 600.0, clock=None, rng=None):
+        self.alpha = alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self.rng = rng or random.Random()
+        self.states: Dict[str, ProxyState] = {}
+        self.usable: List[ProxyState] = []
+        self._positions: Dict[str, int] = {}
+        self.cooling: List = []
+        self._next = 0
+        for url in proxies:
+            if url not in self.states:
+                self.states[url] = state = ProxyState(url)
+                self._admit(state)
+
+    @property
+    def clock(self):
+        if self._clock is None:
+            from twisted.internet import reactor
+            self._clock = reactor
+        return self._clock
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.states
+
+    def _admit(self, state: ProxyState) -> None:
+        self._positions[state.url] = len(self.usable)
+        self.usable.append(state)
+
+    def _remove(self, state: ProxyState) -> None:
+        index = self._positions.pop(state.url)
+        last = self.usable.pop()
+        if last is not state:
+            self.usable[index] = last
+            self._positions[last.url] = index
+
+    def _readmit_due(self) -> None:
+        if not self.cooling:
+            return
+        now = self.clock.seconds()
+        while self.cooling and self.cooling[0][0] <= now:
+            _, url = heapq.heappop(self.cooling)
+            state = self.states[url]
+            # Probation: the next failure cools it down again
+            state.streak = self.failure_threshold - 1
+            self._admit(state)
+            logger.info(f"Proxy back from cool-down: {mask_proxy(url)}")
+
+    def _fallback(self) -> Optional[str]:
+        if not self.cooling:
+            return None
+        logger.error("No available proxies! Using the one due back first")
+        return self.cooling[0][1]
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def select(self) -> Optional[str]:
+        """Power of two choices on expected cost."""
+        self._readmit_due()
+        usable = self.usable
+        if len(usable) < 2:
+            return usable[0].url if usable else self._fallback()
+        first, second = self.rng.sample(usable, 2)
+        return (first if first.cost <= second.cost else second).url
+
+    def round_robin(self) -> Optional[str]:
+        self._readmit_due()
+        if not self.usable:
+            return self._fallback()
+        self._next = (self._next + 1) % len(self.usable)
+        return self.usable[self._next].url
+
+    def random(self) -> Optional[str]:
+        self._readmit_due()
+        return self.rng.choice(self.usable).url if self.usable else self._fallback()
+
+    # ------------------------------------------------------------------
+    # Outcomes
+    # ------------------------------------------------------------------
+
+    def acquire(self, url: str) -> None:
+        """Count a request sent through the proxy."""
+        state = self.states.get(url)
+        if state is not None:
+            state.in_flight += 1
+            state.requests += 1
+
+    def release(self, url: str, latency: Optional[float] = None, ok: bool = True,
+                in_flight: bool = True) -> None:
+        """Record a request's (or probe's) outcome."""
+        state = self.states.get(url)
+        if state is None:
+            return
+        if in_flight:
+            state.in_flight = max(0, state.in_flight - 1)
+        state.success += self.alpha * ((1.0 if ok else 0.0) - state.success)
+        if ok:
+            if latency is not None:
+                state.latency = latency if state.latency is None else (
+                    state.latency + self.alpha * (latency - state.latency))
+            state.streak = 0
+            state.cooldowns = 0
+            return
+        state.failures += 1
+        state.streak += 1
+        if state.streak >= self.failure_threshold and url in self._positions:
+            self._cool(state)
+
+    def _cool(self, state: ProxyState) -> None:
+        duration = min(self.cooldown * 2 ** state.cooldowns, self.max_cooldown)
+        state.cooldowns += 1
+        state.cooling_until = self.clock.seconds() + duration
+        self._remove(state)
+        heapq.heappush(self.cooling, (state.cooling_until, state.url))
+        logger.warning(f"Proxy cooling down for {duration:.0f}s: {mask_proxy(state.url)}")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-proxy figures, keyed by proxy host:port."""
+        return {
+            proxy_label(url): {
+                'requests': state.requests,
+                'failures': state.failures,
+                'latency_s': round(state.latency or 0.0, 3),
+                'success': round(state.success, 3),
+                'cooldowns': state.cooldowns,
+            }
+            for url, state in self.states.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Health probes
+    # ------------------------------------------------------------------
+
+    async def probe(self, url: str = PROBE_URL, timeout: float = 10.0) -> Dict[str, Optional[float]]:
+        """
+        Probe every usable HTTP(S) proxy concurrently; returns latency (None
+        on failure) by proxy. Proxies of other schemes (SOCKS) are skipped.
+        """
+        self._readmit_due()
+        proxies = [state.url for state in self.usable if urlparse(state.url).scheme in PROBE_SCHEMES]
+        latencies = await asyncio.gather(*(probe_proxy(proxy, url, timeout) for proxy in proxies))
+        for proxy, latency in zip(proxies, latencies):
+            self.release(proxy, latency, ok=latency is not None, in_flight=False)
+        return dict(zip(proxies, latencies))
+
+
+async def probe_proxy(proxy: str, url: str = PROBE_URL, timeout: float = 10.0) -> Optional[float]:
+    """
+    Seconds for an HTTP(S) proxy to answer a GET for `url` with a non-error
+    status, or None. SOCKS proxies are not probed (None).
+    """
+    parsed = urlparse(proxy)
+    if parsed.scheme not in PROBE_SCHEMES or not parsed.hostname:
+        return None
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    headers = [f"GET {url} HTTP/1.1", f"Host: {urlparse(url).netloc}", "Connection: close"]
+    if parsed.username:
+        credentials = f"{parsed.username}:{parsed.password or ''}".encode()
+        headers.append(f"Proxy-Authorization: Basic {base64.b64encode(credentials).decode()}")
+    start = time.monotonic()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed.hostname, port, ssl=parsed.scheme == 'https'), timeout)
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode())
+        status_line = await asyncio.wait_for(reader.readline(), max(0.0, timeout - (time.monotonic() - start)))
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit() or int(parts[1]) >= 400:
+            return None
+        return time.monotonic() - start
+    except (OSError, asyncio.TimeoutError, ValueError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def proxy_label(proxy: str) -> str:
+    """host:port of a proxy URL, without scheme or credentials."""
+    parsed = urlparse(proxy)
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else str(parsed.hostname)
+
+
+def mask_proxy(proxy: str) -> str:
+    """Mask proxy credentials for logging."""
+    try:
+        parsed = urlparse(proxy)
+        if parsed.password:
+            return proxy.replace(parsed.password, "***")
+    except Exception:
+        return "<unparseable proxy URL>"
+    return proxy
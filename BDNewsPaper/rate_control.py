@@ -0,0 +1,443 @@
+"""
+Per-Domain Rate Control
+=======================
+One subsystem that owns the pacing of every download: a token bucket per
+domain, AIMD concurrency and circuit-breaker pauses.
+
+Scrapy only honours delays set on its downloader slots, so the
+``request.meta['download_delay']`` values the retry, rate-limit and
+adaptive-throttle middlewares used to set were never applied. Instead:
+
+    RateControlMiddleware   runs last before the download, waits (without
+                            blocking the reactor) for the domain's gate,
+                            and reports every response back to it
+    DomainGate              token bucket at the configured rate (burst of
+                            RATE_CONTROL_BURST) plus a concurrency limit
+                            that grows by 1/limit per good response and is
+                            cut by RATE_CONTROL_DECREASE_FACTOR on slow
+                            responses, 5xx, 429/503 and errors
+    RateController          process-wide registry of gates, so spiders
+                            sharing a site in one process share its pace
+
+The configured rate is 1/DOWNLOAD_DELAY (including per-spider
+custom_settings and DOWNLOAD_SLOTS delays) unless RATE_CONTROL_RATE is
+set. 429/503 responses also lower the rate (recovering 5% per good
+response) and a Retry-After header pauses the domain. Other middlewares
+feed the same gates: AdaptiveThrottling and RateLimit set a minimum
+interval, CircuitBreaker pauses the domain while its circuit is open and
+allows a single probe at a time while half-open.
+
+Scrapy's own slot delay and AutoThrottle are switched off while this
+middleware is enabled, so the gate is the only place a delay comes from.
+
+Retry backoff is not a gate delay: DelayedRetryExtension (retry_queue.py)
+parks retries until they are due.
+
+Stats (per domain):
+    - rate_control/<domain>/rate: effective request rate at close (req/s)
+    - rate_control/<domain>/observed_rate: requests sent per second
+    - rate_control/<domain>/concurrency: concurrency limit at close
+    - rate_control/<domain>/requests, wait_s (average wait at the gate),
+      backoffs
+
+Settings:
+    - RATE_CONTROL_ENABLED: Enable the middleware (default: True)
+    - RATE_CONTROL_RATE: Requests per second per domain (default: 1/DOWNLOAD_DELAY)
+    - RATE_CONTROL_BURST: Requests allowed back to back after idling (default: 2)
+    - RATE_CONTROL_START_CONCURRENCY: Initial per-domain concurrency (default: 4)
+    - RATE_CONTROL_MIN_CONCURRENCY: Floor for the AIMD decrease (default: 1)
+    - RATE_CONTROL_MAX_CONCURRENCY: Ceiling (default: CONCURRENT_REQUESTS_PER_DOMAIN)
+    - RATE_CONTROL_TARGET_LATENCY: Slower responses count as congestion (default: 3.0s)
+    - RATE_CONTROL_DECREASE_FACTOR: Multiplicative decrease (default: 0.5)
+    - RATE_CONTROL_MAX_PAUSE: Cap for Retry-After pauses (default: 300s)
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.defer import Deferred
+
+from BDNewsPaper.enums import CircuitState
+
+logger = logging.getLogger(__name__)
+
+_GATE_META_KEY = '_rate_control_key'
+
+_THROTTLE_STATUSES = (429, 503)
+
+
+def domain_key(url_or_netloc: str) -> str:
+    """Gate key for a URL or netloc: its hostname, as Scrapy keys download slots."""
+    if '//' not in url_or_netloc:
+        url_or_netloc = '//' + url_or_netloc
+    return urlparse(url_or_netloc).hostname or ''
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds from a Retry-After header value (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('latin-1')
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class DomainGate:
+    """Token bucket and AIMD concurrency limit for one domain."""
+
+    def __init__(self, rate: float = 0.0, burst: float = 2.0, start_concurrency: float = 4.0,
+                 min_concurrency: float = 1.0, max_concurrency: float = 16.0):
+        self.base_rate = rate                 # Configured requests/second (0 = unlimited)
+        self.rate_factor = 1.0                # Lowered by 429/503 responses
+        self.min_interval = 0.0               # Floor set by other middlewares
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.refilled_at: Optional[float] = None
+        self.min_concurrency = max(1.0, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.concurrency = min(max(start_concurrency, self.min_concurrency), self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.probe_only = False               # Circuit half-open: one request at a time
+        self.last_decrease = -math.inf
+        self.waiters: deque = deque()
+        self.timer = None
+
+        self.requests = 0
+        self.wait_total = 0.0
+        self.first_sent: Optional[float] = None
+        self.last_sent: Optional[float] = None
+        self.backoffs = 0
+
+    @property
+    def rate(self) -> float:
+        """Effective requests/second (0 = unlimited)."""
+        rate = self.base_rate * self.rate_factor
+        if self.min_interval > 0:
+            rate = min(rate, 1.0 / self.min_interval) if rate else 1.0 / self.min_interval
+        return rate
+
+    @property
+    def limit(self) -> int:
+        return 1 if self.probe_only else int(self.concurrency)
+
+    def _refill(self, now: float) -> None:
+        if self.refilled_at is not None and self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a request may be sent; 0 when it may go now."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if not self.rate or self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        if self.rate:
+            self.tokens -= 1.0
+        self.in_flight += 1
+        self.requests += 1
+        if self.first_sent is None:
+            self.first_sent = now
+        self.last_sent = now
+
+    def on_response(self, now: float, latency: Optional[float], status: Optional[int],
+                    target_latency: float, decrease_factor: float) -> None:
+        """AIMD update from one finished request (status None for an error)."""
+        congested = (
+            status is None or status >= 500 or status == 429
+            or (latency is not None and latency > target_latency)
+        )
+        if not congested:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+            self.rate_factor = min(1.0, self.rate_factor + 0.05)
+            return
+        # Decrease at most once per round trip: responses already in flight
+        # reflect the same congestion
+        if now - self.last_decrease < max(latency or 0.0, 1.0):
+            return
+        self.last_decrease = now
+        self.backoffs += 1
+        self.concurrency = max(self.min_concurrency, self.concurrency * decrease_factor)
+        if status in _THROTTLE_STATUSES:
+            self.rate_factor = max(0.05, self.rate_factor * decrease_factor)
+
+    def observed_rate(self, requests: Optional[int] = None, first_sent: Optional[float] = None) -> float:
+        """Requests/second from `first_sent` to the last send (default: the gate's lifetime)."""
+        requests = self.requests if requests is None else requests
+        first_sent = self.first_sent if first_sent is None else first_sent
+        if requests < 2 or not self.last_sent or self.last_sent <= first_sent:
+            return 0.0
+        return (requests - 1) / (self.last_sent - first_sent)
+
+
+class RateController:
+    """
+    Registry of per-domain gates.
+
+    ``acquire`` returns None when a request may be sent immediately,
+    otherwise a Deferred fired (FIFO per domain) once the gate lets it
+    through. Every acquired request must be matched by a ``release``.
+    """
+
+    def __init__(self, burst: float = 2.0, start_concurrency: float = 4.0, min_concurrency: float = 1.0,
+                 target_latency: float = 3.0, decrease_factor: float = 0.5, max_pause: float = 300.0,
+                 clock=None):
+        self.burst = burst
+        self.start_concurrency = start_concurrency
+        self.min_concurrency = min_concurrency
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.max_pause = max_pause
+        self._clock = clock
+        self.gates: Dict[str, DomainGate] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> 'RateController':
+        return cls(
+            burst=settings.getfloat('RATE_CONTROL_BURST', 2.0),
+            start_concurrency=settings.getfloat('RATE_CONTROL_START_CONCURRENCY', 4.0),
+            min_concurrency=settings.getfloat('RATE_CONTROL_MIN_CONCURRENCY', 1.0),
+            target_latency=settings.getfloat('RATE_CONTROL_TARGET_LATENCY', 3.0),
+            decrease_factor=settings.getfloat('RATE_CONTROL_DECREASE_FACTOR', 0.5),
+            max_pause=settings.getfloat('RATE_CONTROL_MAX_PAUSE', 300.0),
+        )
+
+    @property
+    def clock(self):
+        if self._clock is None:
+            from twisted.internet import reactor
+            self._clock = reactor
+        return self._clock
+
+    def gate(self, key: str, rate: Optional[float] = None, max_concurrency: Optional[float] = None) -> DomainGate:
+        """The gate for a domain, created on first use; the slowest configured rate wins."""
+        gate = self.gates.get(key)
+        if gate is None:
+            gate = self.gates[key] = DomainGate(
+                rate=rate or 0.0, burst=self.burst, start_concurrency=self.start_concurrency,
+                min_concurrency=self.min_concurrency,
+                max_concurrency=max_concurrency or max(16.0, self.start_concurrency),
+            )
+        elif rate and (not gate.base_rate or rate < gate.base_rate):
+            gate.base_rate = rate
+        return gate
+
+    def acquire(self, key: str) -> Optional[Deferred]:
+        gate = self.gate(key)
+        now = self.clock.seconds()
+        if not gate.waiters and gate.in_flight < gate.limit and gate.wait_time(now) == 0:
+            gate.take(now)
+            return None
+        d = Deferred()
+        gate.waiters.append((d, now))
+        self._pump(gate)
+        return d
+
+    def _pump(self, gate: DomainGate) -> None:
+        if gate.timer is not None and gate.timer.active():
+            gate.timer.cancel()
+        gate.timer = None
+        now = self.clock.seconds()
+        while gate.waiters and gate.in_flight < gate.limit:
+            wait = gate.wait_time(now)
+            if wait > 0:
+                gate.timer = self.clock.callLater(wait, self._pump, gate)
+                return
+            d, queued_at = gate.waiters.popleft()
+            gate.take(now)
+            gate.wait_total += now - queued_at
+            d.callback(None)
+
+    def release(self, key: str, latency: Optional[float] = None, status: Optional[int] = None,
+                retry_after: Optional[float] = None) -> None:
+        """Report a finished request: its latency and status, or status None for an error."""
+        gate = self.gates.get(key)
+        if gate is None:
+            return
+        now = self.clock.seconds()
+        gate.in_flight = max(0, gate.in_flight - 1)
+        gate.on_response(now, latency, status, self.target_latency, self.decrease_factor)
+        if retry_after:
+            gate.paused_until = max(gate.paused_until, now + min(retry_after, self.max_pause))
+        self._pump(gate)
+
+    def set_min_interval(self, key: str, seconds: float) -> None:
+        """Lower bound on the gap between requests to a domain (0 to clear)."""
+        gate = self.gate(key)
+        gate.min_interval = max(0.0, seconds)
+        self._pump(gate)
+
+    def set_circuit(self, key: str, state, recovery_timeout: float = 0.0) -> None:
+        """Mirror a circuit breaker: pause while open, one probe at a time while half-open."""
+        gate = self.gate(key)
+        state = CircuitState(state)
+        if state == CircuitState.OPEN:
+            gate.paused_until = max(gate.paused_until, self.clock.seconds() + recovery_timeout)
+            gate.probe_only = True
+        elif state == CircuitState.HALF_OPEN:
+            gate.probe_only = True
+        else:
+            gate.probe_only = False
+        self._pump(gate)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current counters of every gate, to pass back to stats() as `since`."""
+        return {
+            key: {'requests': gate.requests, 'wait_total': gate.wait_total, 'backoffs': gate.backoffs}
+            for key, gate in self.gates.items()
+        }
+
+    def stats(self, key: str, since: Optional[Dict[str, float]] = None,
+              first_sent: Optional[float] = None) -> Dict[str, float]:
+        """
+        Gate stats. Gates outlive crawls, so counters are taken relative to
+        a snapshot() entry `since`, and the observed rate from `first_sent`.
+        """
+        gate = self.gates[key]
+        since = since or {}
+        requests = gate.requests - since.get('requests', 0)
+        wait_total = gate.wait_total - since.get('wait_total', 0.0)
+        return {
+            'rate': round(gate.rate, 3),
+            'observed_rate': round(gate.observed_rate(requests, first_sent), 3),
+            'concurrency': round(gate.concurrency, 1),
+            'requests': requests,
+            'wait_s': round(wait_total / requests, 3) if requests else 0.0,
+            'backoffs': gate.backoffs - since.get('backoffs', 0),
+        }
+
+
+_default_controller: Optional[RateController] = None
+_default_controller_lock = threading.Lock()
+
+
+def get_rate_controller(settings=None) -> RateController:
+    """Get or create the process-wide rate controller."""
+    global _default_controller
+    with _default_controller_lock:
+        if _default_controller is None:
+            _default_controller = RateController.from_settings(settings) if settings else RateController()
+        return _default_controller
+
+
+class RateControlMiddleware:
+    """
+    Downloader middleware that sends every request through its domain's
+    gate.
+    """
+
+    def __init__(self, controller: RateController, rate: float = 0.0, max_concurrency: float = 16.0,
+                 slot_rates: Optional[Dict[str, float]] = None, stats=None):
+        self.controller = controller
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self.slot_rates = slot_rates or {}
+        self.stats = stats
+        self.crawler = None
+        self.keys: Set[str] = set()
+        # This crawl's share of the process-wide gates
+        self.baseline: Dict[str, Dict[str, float]] = {}
+        self.first_sent: Dict[str, float] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('RATE_CONTROL_ENABLED', True):
+            raise NotConfigured("Rate control disabled")
+        rate = settings.getfloat('RATE_CONTROL_RATE', 0.0)
+        delay = settings.getfloat('DOWNLOAD_DELAY', 0.0)
+        if not rate and delay > 0:
+            rate = 1.0 / delay
+        slot_rates = {}
+        for key, slot in settings.getdict('DOWNLOAD_SLOTS').items():
+            if slot.get('delay'):
+                slot_rates[key] = 1.0 / float(slot['delay'])
+        max_concurrency = settings.getfloat(
+            'RATE_CONTROL_MAX_CONCURRENCY', settings.getfloat('CONCURRENT_REQUESTS_PER_DOMAIN', 16.0))
+
+        middleware = cls(get_rate_controller(settings), rate, max_concurrency, slot_rates, crawler.stats)
+        middleware.crawler = crawler
+        middleware._detach_autothrottle()
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def _detach_autothrottle(self) -> None:
+        """Stop AutoThrottle from adjusting slot delays behind the gate's back."""
+        from scrapy.extensions.throttle import AutoThrottle
+        extensions = getattr(self.crawler, 'extensions', None)
+        for extension in getattr(extensions, 'middlewares', ()):
+            if isinstance(extension, AutoThrottle):
+                self.crawler.signals.disconnect(extension._spider_opened, signal=signals.spider_opened)
+                self.crawler.signals.disconnect(extension._response_downloaded, signal=signals.response_downloaded)
+                logger.info("AutoThrottle disabled: per-domain rate control is enabled")
+
+    def spider_opened(self, spider):
+        self.baseline = self.controller.snapshot()
+        # The gate paces requests; Scrapy's slots only need to let them through
+        downloader = self.crawler.engine.downloader
+        downloader._delay = 0.0
+        for slot_settings in downloader.per_slot_settings.values():
+            slot_settings['delay'] = 0.0
+        for slot in downloader.slots.values():
+            slot.delay = 0.0
+
+    async def process_request(self, request, spider=None):
+        key = domain_key(request.url)
+        if key not in self.keys:
+            self.keys.add(key)
+            self.controller.gate(key, self.slot_rates.get(key, self.rate), self.max_concurrency)
+        waiting = self.controller.acquire(key)
+        if waiting is not None:
+            await maybe_deferred_to_future(waiting)
+        request.meta[_GATE_META_KEY] = key
+        if key not in self.first_sent:
+            self.first_sent[key] = self.controller.clock.seconds()
+        return None
+
+    def process_response(self, request, response, spider=None):
+        key = request.meta.pop(_GATE_META_KEY, None)
+        if key is not None:
+            retry_after = None
+            if response.status in _THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.controller.release(key, request.meta.get('download_latency'), response.status, retry_after)
+        return response
+
+    def process_exception(self, request, exception, spider=None):
+        key = request.meta.pop(_GATE_META_KEY, None)
+        if key is not None:
+            self.controller.release(key, request.meta.get('download_latency'), None)
+        return None
+
+    def spider_closed(self, spider, reason):
+        for key in sorted(self.keys):
+            domain_stats = self.controller.stats(key, self.baseline.get(key), self.first_sent.get(key))
+            if self.stats:
+                for name, value in domain_stats.items():
+                    self.stats.set_value(f'rate_control/{key}/{name}', value)
+            spider.logger.info(
+                f"Rate control {key}: {domain_stats['observed_rate']:.2f}/{domain_stats['rate']:.2f} req/s "
+                f"observed/allowed, concurrency {domain_stats['concurrency']}, "
+                f"{domain_stats['requests']} requests, {domain_stats['backoffs']} backoffs"
+            )
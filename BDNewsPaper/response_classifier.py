@@ -0,0 +1,249 @@
+"""
+Response Classifier
+===================
+One scan of a response's head that every detecting middleware reads.
+
+CloudflareBypassMiddleware, CaptchaBypassMiddleware (Akamai, DataDome,
+PerimeterX, Incapsula, CAPTCHA), HybridRequestMiddleware,
+BangladeshProxyMiddleware and ProxyMiddleware each decoded
+``response.text``, sliced it, often lowercased it and ran their own list
+of regexes over it, so an ordinary article response was decoded and
+scanned a dozen times on its way through the downloader middlewares.
+
+``classify(response)`` lowercases the first SCAN_BYTES of the raw body
+once and runs a single combined pattern over it, built as a trie of all
+signatures. Signatures inside a longer match ("turnstile" inside
+"cf-turnstile") are implied by it. The Verdict records the first byte
+offset of each signature; flags group signatures the way the detectors
+did, and ``verdict.has(flag, within=N)`` keeps each detector's own
+window. Verdicts are memoized per response.
+
+Windows are counted in bytes rather than decoded characters; the
+signatures are ASCII and sit in the page head, so the difference only
+matters for signatures deep inside non-ASCII text.
+
+``A ... B`` signatures (``access denied.*location``) are kept as ordered
+pairs: both parts seen, B after A. Unlike the old regexes they may span
+lines.
+
+Usage:
+    from BDNewsPaper.response_classifier import classify
+
+    verdict = classify(response)
+    if verdict.has('cf_challenge', within=5000):
+        ...
+"""
+
+import re
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from scrapy.http import TextResponse
+
+# Bytes of the body scanned; the widest detector window
+SCAN_BYTES = 10240
+
+_LINK_RE = re.compile(rb'<a\s[^>]*?href\s*=', re.I)
+
+# Signatures per flag, lowercase. KEYWORDS are literals; PATTERNS are a
+# literal prefix plus a regex tail (no capturing groups), so the prefix can
+# share the keyword trie; SEQUENCES are (a, b) literal pairs with b
+# somewhere after a.
+FLAG_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'cf_challenge': (
+        '<title>just a moment...</title>', '_cf_chl_opt', 'challenge-platform',
+        'cf-browser-verification', 'cf-turnstile', 'checking your browser',
+        'please wait... | cloudflare', 'attention required! | cloudflare', 'ray id:', 'cf-ray',
+    ),
+    'cf_block': (
+        'access denied', 'error 1020', 'sorry, you have been blocked',
+        'this website is using a security service',
+    ),
+    'cf_ratelimit': ('error 1015', 'rate limit', 'too many requests'),
+    'js_challenge': (
+        '<title>just a moment...</title>', '_cf_chl_opt', 'challenge-platform',
+        'checking your browser', 'please enable javascript', 'needs javascript',
+        'turnstile', 'hcaptcha', 'please wait while we verify',
+    ),
+    'geo_block': (
+        'not available in your region', 'not available in your country',
+        'georestrict', 'geo-restrict', 'geo restrict', 'geo_restrict',
+        'this content is not available in bangladesh', 'international edition',
+        'viewing from outside',
+    ),
+    'ban': ('blocked', 'banned', 'captcha', 'access denied', 'too many requests'),
+    'captcha': (
+        'google.com/recaptcha/api', 'grecaptcha.execute', 'hcaptcha.com/1/api.js',
+        'cf-turnstile', 'challenges.cloudflare.com/turnstile',
+    ),
+    'akamai': ('_abck', 'bmak.js'),
+    'datadome': ('js.datadome.co', 'datadome.co/captcha'),
+    'datadome_redirect': ('captcha-delivery.com',),
+    'perimeterx': (
+        'client.perimeterx.net', 'captcha.px-cdn.net', 'block.perimeterx.net',
+        'access to this page has been denied', 'press & hold', '_pxcaptcha',
+    ),
+    'incapsula': ('/_incapsula_resource', 'incapsula.com', 'reese84'),
+}
+
+FLAG_PATTERNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'captcha': (
+        ('class=', r'["\']g-recaptcha["\']'), ('class=', r'["\']h-captcha["\']'),
+        ('data-sitekey=', r'["\'][^"\']+["\']'),
+    ),
+    'akamai': (('/akam/', r'\d+/\w+'),),
+    'datadome': (('dd.', r'\w+\.js'),),
+    'perimeterx': (('/api/v', r'\d+/collector'),),
+}
+
+FLAG_SEQUENCES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'geo_block': (('access denied', 'location'), ('sorry', 'region'), ('blocked', 'your country')),
+    'incapsula': (('request unsuccessful', 'incapsula'), ('robots.txt', 'incapsula')),
+}
+
+
+def _signature(pattern: Tuple[str, str]) -> str:
+    return pattern[0] + pattern[1]
+
+
+class _Matcher:
+    """
+    All signatures as one regex shaped like a trie of their literals.
+
+    A flat alternation is tried branch by branch at every position; as a
+    trie, a position that cannot start any signature costs one byte-class
+    test, and a partial match costs one branch per byte. A match spans
+    the longest signature starting at its position. Every literal inside
+    a literal span is implied by it; a pattern span (g-recaptcha,
+    dd.blocked.js) is rescanned for the literals it contains.
+    """
+
+    def __init__(self):
+        literals = set()
+        for group in FLAG_KEYWORDS.values():
+            literals.update(group)
+        for group in FLAG_SEQUENCES.values():
+            for pair in group:
+                literals.update(pair)
+        self.patterns: List[Tuple[str, 're.Pattern']] = [
+            (_signature(pattern), re.compile(re.escape(pattern[0]).encode() + pattern[1].encode()))
+            for group in FLAG_PATTERNS.values() for pattern in group
+        ]
+        self.implied: Dict[bytes, Tuple[str, ...]] = {
+            literal.encode(): tuple(other for other in literals if other in literal)
+            for literal in literals
+        }
+
+        trie: dict = {}
+        for literal in literals:
+            self._insert(trie, literal.encode()).setdefault(None, []).append(b'')
+        self.literal_regex = re.compile(self._build(trie))
+        for group in FLAG_PATTERNS.values():
+            for prefix, tail in group:
+                self._insert(trie, prefix.encode()).setdefault(None, []).append(tail.encode())
+        self.regex = re.compile(self._build(trie))
+
+    @staticmethod
+    def _insert(trie: dict, word: bytes) -> dict:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        return node
+
+    def _build(self, node: dict) -> bytes:
+        # Continuations before the optional end, so the longest signature wins
+        branches = [re.escape(bytes([byte])) + self._build(child)
+                    for byte, child in sorted((k, v) for k, v in node.items() if k is not None)]
+        tails = node.get(None, [])
+        branches += [tail for tail in tails if tail]
+        optional = b'' in tails
+        if not branches:
+            return b''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return b'(?:' + b'|'.join(branches) + (b')?' if optional else b')')
+
+    def signatures(self, matched: bytes) -> Tuple[str, ...]:
+        implied = self.implied.get(matched)
+        if implied is not None:
+            return implied
+        found = [name for name, regex in self.patterns if regex.fullmatch(matched)]
+        for match in self.literal_regex.finditer(matched):
+            found += self.implied[match.group()]
+        return tuple(dict.fromkeys(found))
+
+
+_matcher: Optional[_Matcher] = None
+_verdicts: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _get_matcher() -> _Matcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = _Matcher()
+    return _matcher
+
+
+class Verdict:
+    """Signatures found in the head of one response."""
+
+    def __init__(self, body: bytes = b''):
+        self.body = body
+        self._first: Optional[Dict[str, int]] = None
+        self._last: Dict[str, int] = {}
+
+    @property
+    def first(self) -> Dict[str, int]:
+        """First byte offset of each signature found; scans on first use."""
+        if self._first is None:
+            self._first = {}
+            matcher = _get_matcher()
+            for match in matcher.regex.finditer(self.body[:SCAN_BYTES].lower()):
+                offset = match.start()
+                for signature in matcher.signatures(match.group()):
+                    self._first.setdefault(signature, offset)
+                    self._last[signature] = offset
+        return self._first
+
+    def offset(self, flag: str) -> Optional[int]:
+        """Byte offset of the flag's first signature, or None."""
+        offsets = [self.first[s] for s in FLAG_KEYWORDS.get(flag, ()) if s in self.first]
+        offsets += [
+            self.first[_signature(p)] for p in FLAG_PATTERNS.get(flag, ()) if _signature(p) in self.first
+        ]
+        offsets += [
+            self.first[a] for a, b in FLAG_SEQUENCES.get(flag, ())
+            if a in self.first and b in self._last and self._last[b] > self.first[a]
+        ]
+        return min(offsets) if offsets else None
+
+    def has(self, flag: str, within: int = SCAN_BYTES) -> bool:
+        """Whether the flag's signatures appear in the first `within` bytes."""
+        offset = self.offset(flag)
+        return offset is not None and offset < within
+
+    @property
+    def flags(self) -> List[str]:
+        names = set(FLAG_KEYWORDS) | set(FLAG_PATTERNS) | set(FLAG_SEQUENCES)
+        return sorted(flag for flag in names if self.offset(flag) is not None)
+
+    def link_count(self, limit: Optional[int] = None) -> int:
+        """
+        <a href> tags in the whole body. With `limit`, a page with at most
+        `limit` b"href"s returns that count (an upper bound) without a
+        regex scan, which is all a "more than `limit` links?" check needs.
+        """
+        if limit is not None:
+            hrefs = self.body.count(b'href')
+            if hrefs <= limit:
+                return hrefs
+        return sum(1 for _ in _LINK_RE.finditer(self.body))
+
+
+def classify(response) -> Verdict:
+    """The response's Verdict, computed on first use and reused after."""
+    verdict = _verdicts.get(response)
+    if verdict is None:
+        body = response.body if isinstance(response, TextResponse) else b''
+        verdict = _verdicts[response] = Verdict(body)
+    return verdict
@@ -0,0 +1,274 @@
+"""
+Delayed Retry Queue
+===================
+Parks retries until their backoff has elapsed instead of putting them
+straight back into the scheduler.
+
+SmartRetryMiddleware, ProxyMiddleware.process_exception and
+HybridRequestMiddleware.process_response return retry requests with
+``meta['retry_delay']`` (seconds) and ``meta['retry_source']``. Returned
+requests are rescheduled by the engine, so DelayedRetryExtension catches
+them on the request_scheduled signal and parks them in a heap keyed by
+due time; one reactor timer, armed for the earliest due request,
+re-injects them with ``engine.crawl``. A flapping site then gets real
+backoff, and hot retries no longer queue ahead of fresh work.
+
+Per-domain retry budgets: a domain may have at most
+RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO x (first attempts scheduled for it)
+retries parked in total. Retries over budget are dropped, which is what
+keeps a site that fails most requests from doubling or tripling the
+crawl's traffic to it.
+
+When RETRY_QUEUE_MAX_PARKED requests are parked, further ones spill to a
+pickled disk queue (requests with unpicklable callbacks stay in memory)
+and move back into the heap as it drains. Spilled retries may go out
+late, never early.
+
+Stats:
+    - retry_queue/parked, retry_queue/parked/<source>: retries parked
+    - retry_queue/released, retry_queue/spilled, retry_queue/peak_parked
+    - retry_queue/saved_by_budget, retry_queue/saved_by_budget/<domain>:
+      retries dropped by the per-domain budget (requests saved)
+    - retry_queue/delay_p50_s, delay_p90_s, delay_max_s and
+      retry_queue/delay_hist/<bucket>: distribution of retry delays
+    - retry_queue/discarded: still parked when the spider closed
+
+Settings:
+    - RETRY_QUEUE_ENABLED: Enable the extension (default: True)
+    - RETRY_QUEUE_MAX_PARKED: Parked requests held in memory (default: 10000)
+    - RETRY_QUEUE_DIR: Parent directory for the spill queue (default: system temp)
+    - RETRY_BUDGET_RATIO: Retries allowed per first attempt (default: 0.2)
+    - RETRY_BUDGET_MIN: Retries always allowed per domain (default: 10)
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import shutil
+import statistics
+import tempfile
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
+from scrapy.http import Request
+from scrapy.squeues import PickleFifoDiskQueue
+
+from BDNewsPaper.rate_control import domain_key
+
+logger = logging.getLogger(__name__)
+
+# Request meta keys set by middlewares that return a retry request
+RETRY_DELAY_META_KEY = 'retry_delay'
+RETRY_SOURCE_META_KEY = 'retry_source'
+_DUE_META_KEY = '_retry_due'
+
+# Upper bounds (seconds) of the retry delay histogram buckets
+DELAY_BUCKETS = (1, 5, 15, 60)
+
+
+def backoff_delay(attempt: int, factor: float = 2.0, max_delay: float = 60.0,
+                  jitter: float = 0.3, base: float = 1.0) -> float:
+    """Exponential backoff with jitter: base x factor^attempt, +/- jitter."""
+    delay = base * factor ** attempt
+    delay += random.uniform(-jitter, jitter) * delay
+    return max(0.1, min(delay, max_delay))
+
+
+def delay_bucket(delay: float) -> str:
+    for bound in DELAY_BUCKETS:
+        if delay <= bound:
+            return f'le_{bound}s'
+    return f'gt_{DELAY_BUCKETS[-1]}s'
+
+
+class DelayedRetryQueue:
+    """
+    Due-time heap of parked requests with per-domain budgets and a disk spill.
+
+    ``release`` is called with each request once it is due.
+    """
+
+    def __init__(self, release: Callable[[Request], None], clock=None, max_parked: int = 10000,
+                 budget_ratio: float = 0.2, budget_min: int = 10, spill=None):
+        self.release = release
+        self._clock = clock
+        self.max_parked = max_parked
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.spill = spill
+        self.heap: List = []
+        self._seq = itertools.count()
+        self.timer = None
+        self.first_attempts: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.delays: List[float] = []
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    @property
+    def clock(self):
+        if self._clock is None:
+            from twisted.internet import reactor
+            self._clock = reactor
+        return self._clock
+
+    def __len__(self) -> int:
+        return len(self.heap) + (len(self.spill) if self.spill is not None else 0)
+
+    def note_request(self, domain: str) -> None:
+        """Count a first attempt, which grows the domain's retry budget."""
+        self.first_attempts[domain] += 1
+
+    def budget(self, domain: str) -> int:
+        return self.budget_min + int(self.budget_ratio * self.first_attempts[domain])
+
+    def park(self, request: Request, delay: float, domain: str, source: str = 'retry') -> bool:
+        """Park a retry for `delay` seconds; False when the domain is over budget."""
+        if self.retries[domain] >= self.budget(domain):
+            self.stats['saved_by_budget'] += 1
+            self.stats[f'saved_by_budget/{domain}'] += 1
+            return False
+        self.retries[domain] += 1
+        self.delays.append(delay)
+        self.stats['parked'] += 1
+        self.stats[f'parked/{source}'] += 1
+        self.stats[f'delay_hist/{delay_bucket(delay)}'] += 1
+        due = self.clock.seconds() + delay
+        request.meta[_DUE_META_KEY] = due
+
+        if len(self.heap) >= self.max_parked and self.spill is not None:
+            try:
+                self.spill.push(request)
+            except ValueError:  # not serializable (e.g. a lambda callback)
+                pass
+            else:
+                self.stats['spilled'] += 1
+                return True
+        heapq.heappush(self.heap, (due, next(self._seq), request))
+        self.stats['peak_parked'] = max(self.stats['peak_parked'], len(self))
+        if self.heap[0][2] is request:
+            self._arm()
+        return True
+
+    def _refill(self) -> None:
+        while self.spill is not None and len(self.spill) and len(self.heap) < self.max_parked:
+            request = self.spill.pop()
+            heapq.heappush(self.heap, (request.meta[_DUE_META_KEY], next(self._seq), request))
+
+    def _arm(self) -> None:
+        if self.timer is not None and self.timer.active():
+            self.timer.cancel()
+        self.timer = None
+        if self.heap:
+            wait = max(0.0, self.heap[0][0] - self.clock.seconds())
+            self.timer = self.clock.callLater(wait, self._release_due)
+
+    def _release_due(self) -> None:
+        self.timer = None
+        now = self.clock.seconds()
+        while self.heap and self.heap[0][0] <= now:
+            _, _, request = heapq.heappop(self.heap)
+            self.stats['released'] += 1
+            self.release(request)
+            self._refill()
+        self._arm()
+
+    def delay_stats(self) -> Dict[str, float]:
+        if not self.delays:
+            return {}
+        ordered = sorted(self.delays)
+        p90 = statistics.quantiles(ordered, n=10)[-1] if len(ordered) > 1 else ordered[0]
+        return {
+            'delay_p50_s': round(statistics.median(ordered), 2),
+            'delay_p90_s': round(p90, 2),
+            'delay_max_s': round(ordered[-1], 2),
+        }
+
+    def close(self) -> int:
+        """Stop the timer and drop everything still parked; returns how many."""
+        if self.timer is not None and self.timer.active():
+            self.timer.cancel()
+        left = len(self)
+        self.heap.clear()
+        if self.spill is not None:
+            self.spill.close()
+        return left
+
+
+class DelayedRetryExtension:
+    """
+    Extension that parks retries carrying ``meta['retry_delay']`` and keeps
+    the spider open until they have been re-injected.
+    """
+
+    def __init__(self, crawler, max_parked: int = 10000, budget_ratio: float = 0.2,
+                 budget_min: int = 10, spill_parent: Optional[str] = None):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.spill_parent = spill_parent
+        self.spill_dir: Optional[str] = None
+        self.queue = DelayedRetryQueue(
+            self._reinject, max_parked=max_parked, budget_ratio=budget_ratio, budget_min=budget_min,
+        )
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('RETRY_QUEUE_ENABLED', True):
+            raise NotConfigured("Delayed retry queue disabled")
+        extension = cls(
+            crawler,
+            max_parked=settings.getint('RETRY_QUEUE_MAX_PARKED', 10000),
+            budget_ratio=settings.getfloat('RETRY_BUDGET_RATIO', 0.2),
+            budget_min=settings.getint('RETRY_BUDGET_MIN', 10),
+            spill_parent=settings.get('RETRY_QUEUE_DIR'),
+        )
+        crawler.signals.connect(extension.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extension.request_scheduled, signal=signals.request_scheduled)
+        crawler.signals.connect(extension.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def spider_opened(self, spider):
+        self.spill_dir = tempfile.mkdtemp(prefix='bdnews-retries-', dir=self.spill_parent)
+        self.queue.spill = PickleFifoDiskQueue.from_crawler(self.crawler, key=self.spill_dir)
+
+    def _reinject(self, request: Request) -> None:
+        self.crawler.engine.crawl(request)
+
+    def request_scheduled(self, request, spider):
+        domain = domain_key(request.url)
+        delay = request.meta.pop(RETRY_DELAY_META_KEY, None)
+        if delay is None:
+            # Re-injected retries still carry their due time
+            if request.meta.pop(_DUE_META_KEY, None) is None:
+                self.queue.note_request(domain)
+            return
+        source = request.meta.get(RETRY_SOURCE_META_KEY, 'retry')
+        if not self.queue.park(request, max(0.0, float(delay)), domain, source):
+            spider.logger.debug(f"Retry budget exhausted for {domain}, dropping {request.url}")
+            raise IgnoreRequest(f"Retry budget exhausted for {domain}")
+        raise IgnoreRequest(f"Retry parked for {delay:.1f}s")
+
+    def spider_idle(self, spider):
+        if len(self.queue):
+            raise DontCloseSpider
+
+    def spider_closed(self, spider, reason):
+        left = self.queue.close()
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        stats = dict(self.queue.stats, **self.queue.delay_stats())
+        if left:
+            stats['discarded'] = left
+            spider.logger.info(f"Discarded {left} parked retries on close")
+        for name, value in stats.items():
+            self.stats.set_value(f'retry_queue/{name}', value)
+        if self.queue.stats['parked'] or self.queue.stats['saved_by_budget']:
+            spider.logger.info(
+                f"Delayed retries: {self.queue.stats['parked']} parked, "
+                f"{self.queue.stats['saved_by_budget']} saved by budgets, "
+                f"median delay {stats.get('delay_p50_s', 0)}s"
+            )
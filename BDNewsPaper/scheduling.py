@@ -0,0 +1,302 @@
+"""
+Request Scheduling
+==================
+Priorities for fresh vs. backfill requests, per-domain queues with a disk
+overflow, and a time-to-ingest stat.
+
+Spiders yield feed, sitemap, listing-page, API and article requests with
+no priorities, so in a daily run a deep backfill page can sit in front of
+today's articles. RequestPriorityMiddleware classifies every request the
+spiders yield (from meta['discovery'] when set, otherwise from the source
+meta and the callback name) and adds a priority:
+
+    feed      RSS/Atom feeds                          100
+    sitemap   sitemaps and sitemap indexes             80
+    article   article pages                            60
+    listing   category/homepage/API pages              50, minus 5 per
+                                                       page/offset step
+
+Articles with a known publication date (rss_pub_date, sitemap_pub_date or
+publication_date in meta) get up to +40 the closer they were published to
+the end of the spider's date range (now, for daily runs), and -100 when
+the date falls outside start_date/end_date. Articles without a date sit
+as deep as the listing page they were found on.
+
+PriorityScheduler keeps Scrapy's per-domain queues
+(DownloaderAwarePriorityQueue: one priority queue per download slot) and,
+when no JOBDIR is set, spills requests below SCHEDULER_OVERFLOW_PRIORITY
+to pickled disk queues once SCHEDULER_MEMORY_LIMIT requests are held in
+memory, so a multi-year backfill does not hold millions of requests in RAM.
+
+Stats:
+    - scheduler/priority/<kind>: requests prioritized per kind
+    - scheduler/enqueued/overflow, scheduler/dequeued/overflow
+    - ingest/time_to_ingest_median_s: median seconds from publication to
+      storage for articles published within INGEST_FRESH_HOURS
+
+Settings:
+    - REQUEST_PRIORITY_ENABLED: Enable the priority middleware (default: True)
+    - SCHEDULER_MEMORY_LIMIT: Requests held in memory before overflow (default: 50000)
+    - SCHEDULER_OVERFLOW_PRIORITY: Only requests below this priority overflow (default: 0)
+    - SCHEDULER_OVERFLOW_DIR: Parent directory for overflow queues (default: system temp)
+    - INGEST_FRESH_HOURS: Articles newer than this count as newly published (default: 24)
+"""
+
+import logging
+import shutil
+import statistics
+import tempfile
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.core.scheduler import Scheduler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Request
+from scrapy.utils.misc import build_from_crawler
+
+from BDNewsPaper.date_normalizer import DateNormalizer, get_normalizer
+
+logger = logging.getLogger(__name__)
+
+# Request meta key a spider can set to classify a request explicitly
+DISCOVERY_META_KEY = 'discovery'
+
+_PAGE_META_KEYS = ('page', 'page_number', 'page_num', 'page_no')
+_DATE_META_KEYS = ('rss_pub_date', 'sitemap_pub_date', 'publication_date')
+
+
+class RequestPrioritizer:
+    """Assigns Scrapy request priorities from discovery source and dates."""
+
+    KIND_PRIORITY = {'feed': 100, 'sitemap': 80, 'article': 60, 'listing': 50}
+    DEPTH_STEP = 5            # Per listing page / API offset step
+    MAX_DEPTH_PENALTY = 100   # Backfill floor: listing pages bottom out at -50
+    FRESH_BONUS = 40          # Published at the end of the date range
+    FRESH_HALF_LIFE_HOURS = 6.0
+    OUT_OF_RANGE_PENALTY = 100
+    API_PAGE_SIZE = 20        # Offset step when the request carries no page number
+
+    def __init__(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                 normalizer: Optional[DateNormalizer] = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.normalizer = normalizer or get_normalizer()
+
+    @classmethod
+    def for_spider(cls, spider) -> 'RequestPrioritizer':
+        return cls(getattr(spider, 'start_date', None), getattr(spider, 'end_date', None),
+                   get_normalizer(getattr(spider, 'name', None)))
+
+    def classify(self, request: Request) -> str:
+        """feed, sitemap, listing or article."""
+        kind = request.meta.get(DISCOVERY_META_KEY)
+        if kind in self.KIND_PRIORITY:
+            return kind
+        callback = getattr(request.callback, '__name__', '') or ''
+        if 'article' in callback:
+            return 'article'
+        if 'rss' in callback or 'feed' in callback or request.meta.get('source') == 'rss':
+            return 'feed'
+        if 'sitemap' in callback or request.meta.get('source') == 'sitemap':
+            return 'sitemap'
+        return 'listing'
+
+    def depth(self, meta) -> int:
+        """Pagination depth of a listing/API request (0 for the first page)."""
+        for key in _PAGE_META_KEYS:
+            page = meta.get(key)
+            if isinstance(page, int) or (isinstance(page, str) and page.isdigit()):
+                return max(0, int(page) - 1)
+        offset = meta.get('offset')
+        if isinstance(offset, int):
+            limit = meta.get('limit')
+            return offset // (limit if isinstance(limit, int) and limit > 0 else self.API_PAGE_SIZE)
+        return 0
+
+    def freshness(self, published: datetime, now: datetime) -> int:
+        """Date adjustment: bonus near the end of the range, penalty outside it."""
+        if self.start_date and published < self.start_date:
+            return -self.OUT_OF_RANGE_PENALTY
+        if self.end_date and published > self.end_date:
+            return -self.OUT_OF_RANGE_PENALTY
+        reference = min(now, self.end_date) if self.end_date else now
+        age_hours = max(0.0, (reference - published).total_seconds() / 3600)
+        bonus = self.FRESH_BONUS / (1 + age_hours / self.FRESH_HALF_LIFE_HOURS)
+        # Steps of 5 keep the number of per-priority queues small
+        return int(bonus // 5 * 5)
+
+    def priority(self, request: Request, response=None, now: Optional[datetime] = None) -> int:
+        kind = self.classify(request)
+        priority = self.KIND_PRIORITY[kind]
+        if kind == 'listing':
+            return priority - min(self.MAX_DEPTH_PENALTY, self.DEPTH_STEP * self.depth(request.meta))
+
+        published = _published(request.meta, self.normalizer)
+        if published is not None:
+            return priority + self.freshness(published, now or datetime.now(timezone.utc))
+        if kind == 'article' and response is not None:
+            parent = getattr(response, 'request', None)
+            if parent is not None:
+                depth = self.depth(parent.meta)
+                return priority - min(self.MAX_DEPTH_PENALTY, self.DEPTH_STEP * depth)
+        return priority
+
+
+def _published(meta, normalizer: DateNormalizer) -> Optional[datetime]:
+    for key in _DATE_META_KEYS:
+        value = meta.get(key)
+        if isinstance(value, datetime):
+            return normalizer.parse_localized(value.isoformat())
+        if value:
+            return normalizer.parse_localized(str(value))
+    return None
+
+
+class RequestPriorityMiddleware:
+    """
+    Spider middleware that prioritizes yielded requests and records how
+    long newly published articles took to reach storage.
+    """
+
+    def __init__(self, stats=None, fresh_hours: float = 24.0):
+        self.stats = stats
+        self.fresh_seconds = fresh_hours * 3600
+        self.ingest_seconds: List[float] = []
+        self.crawler = None
+        self._prioritizer: Optional[RequestPrioritizer] = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('REQUEST_PRIORITY_ENABLED', True):
+            raise NotConfigured("Request prioritization disabled")
+        middleware = cls(crawler.stats, crawler.settings.getfloat('INGEST_FRESH_HOURS', 24.0))
+        middleware.crawler = crawler
+        crawler.signals.connect(middleware.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def _prioritize(self, request: Request, spider, response=None) -> None:
+        if self._prioritizer is None:
+            self._prioritizer = RequestPrioritizer.for_spider(spider)
+        kind = self._prioritizer.classify(request)
+        request.priority += self._prioritizer.priority(request, response)
+        if self.stats:
+            self.stats.inc_value(f'scheduler/priority/{kind}')
+
+    async def process_start(self, start):
+        spider = self.crawler.spider if self.crawler else None
+        async for entry in start:
+            if isinstance(entry, Request):
+                self._prioritize(entry, spider)
+            yield entry
+
+    def process_spider_output(self, response, result, spider):
+        for entry in result:
+            if isinstance(entry, Request):
+                self._prioritize(entry, spider, response)
+            yield entry
+
+    async def process_spider_output_async(self, response, result, spider):
+        async for entry in result:
+            if isinstance(entry, Request):
+                self._prioritize(entry, spider, response)
+            yield entry
+
+    def item_scraped(self, item, response, spider):
+        value = ItemAdapter(item).get('publication_date')
+        if not value or value == 'Unknown':
+            return
+        published = get_normalizer(getattr(spider, 'name', None)).parse_localized(str(value))
+        if published is None:
+            return
+        elapsed = (datetime.now(timezone.utc) - published).total_seconds()
+        if 0 <= elapsed <= self.fresh_seconds:
+            self.ingest_seconds.append(elapsed)
+
+    def spider_closed(self, spider, reason):
+        if not self.ingest_seconds:
+            return
+        median = statistics.median(self.ingest_seconds)
+        if self.stats:
+            self.stats.set_value('ingest/time_to_ingest_median_s', round(median, 1))
+            self.stats.set_value('ingest/fresh_articles', len(self.ingest_seconds))
+        spider.logger.info(
+            f"Median time to ingest: {median / 60:.1f} min over {len(self.ingest_seconds)} newly published articles"
+        )
+
+
+class PriorityScheduler(Scheduler):
+    """
+    Scrapy's scheduler with a disk overflow for low-priority requests.
+
+    With JOBDIR set, Scrapy already keeps every request on disk and this
+    behaves exactly like the default scheduler.
+    """
+
+    memory_limit = 50000
+    overflow_priority = 0
+    overflow_parent: Optional[str] = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        scheduler = super().from_crawler(crawler)
+        scheduler.memory_limit = crawler.settings.getint('SCHEDULER_MEMORY_LIMIT', cls.memory_limit)
+        scheduler.overflow_priority = crawler.settings.getint('SCHEDULER_OVERFLOW_PRIORITY', cls.overflow_priority)
+        scheduler.overflow_parent = crawler.settings.get('SCHEDULER_OVERFLOW_DIR')
+        return scheduler
+
+    def open(self, spider):
+        result = super().open(spider)
+        self.overflow = None
+        self.overflow_dir: Optional[str] = None
+        if self.dqs is None:
+            self.overflow_dir = tempfile.mkdtemp(prefix='bdnews-overflow-', dir=self.overflow_parent)
+            self.overflow = build_from_crawler(
+                self.pqclass,
+                self.crawler,
+                downstream_queue_cls=self.dqclass,
+                key=self.overflow_dir,
+                start_queue_cls=self._sdqclass,
+            )
+        return result
+
+    def close(self, reason):
+        if self.overflow is not None:
+            left = len(self.overflow)
+            self.overflow.close()
+            shutil.rmtree(self.overflow_dir, ignore_errors=True)
+            if left:
+                logger.info(f"Discarded {left} overflowed requests (set JOBDIR to keep them)")
+        return super().close(reason)
+
+    def enqueue_request(self, request: Request) -> bool:
+        if (self.overflow is None or request.priority >= self.overflow_priority
+                or len(self.mqs) < self.memory_limit):
+            return super().enqueue_request(request)
+        if not request.dont_filter and self.df.request_seen(request):
+            self.df.log(request, self.spider)
+            return False
+        try:
+            self.overflow.push(request)
+        except ValueError:  # not serializable (e.g. a lambda callback)
+            self._mqpush(request)
+            self.stats.inc_value('scheduler/enqueued/memory')
+        else:
+            self.stats.inc_value('scheduler/enqueued/overflow')
+        self.stats.inc_value('scheduler/enqueued')
+        return True
+
+    def next_request(self) -> Optional[Request]:
+        request = super().next_request()
+        if request is None and self.overflow is not None:
+            request = self.overflow.pop()
+            if request is not None:
+                self.stats.inc_value('scheduler/dequeued/overflow')
+                self.stats.inc_value('scheduler/dequeued')
+        return request
+
+    def __len__(self) -> int:
+        overflow = getattr(self, 'overflow', None)
+        return super().__len__() + (len(overflow) if overflow is not None else 0)
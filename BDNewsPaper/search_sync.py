@@ -0,0 +1,457 @@
+"""
+Search Index Sync
+=================
+Incremental SQLite -> Elasticsearch sync for the article search index.
+
+Searches go through an alias (``bdnews_articles``) that points at one
+concrete index. Two operations keep it current:
+
+    sync()     - retry documents that failed before, then index articles
+                 past a persisted high-water mark (the last article id sent)
+    reindex()  - build a fresh ``<alias>_<timestamp>`` index from the whole
+                 archive, then atomically move the alias onto it and drop
+                 the old index; searches never see a missing or half-built
+                 index
+
+Documents are serialized once and packed into bulk requests capped by
+payload bytes and document count. Several requests are in flight at once
+on a thread pool. Only the documents that fail are retried: per-item 429
+and 5xx responses, or the whole request after a transport error. Those
+retries back off exponentially. Documents that still fail are recorded in
+``search_sync_failures`` and retried on later syncs, up to
+``max_sync_attempts`` times. Documents rejected with a permanent 4xx
+status (mapping or validation errors) are parked there at once: sync()
+stops sending them, and the next reindex() gives them another try.
+
+State lives next to ``articles`` in the same database:
+
+    search_sync_state       alias, last_article_id, last_scraped_at, index
+    search_sync_failures    alias, article_id, error, attempts
+
+The client is any object with the ``elasticsearch`` client's ``bulk`` and
+``indices`` methods, so tests and benchmarks can pass a stand-in.
+
+Usage:
+    from elasticsearch import Elasticsearch
+    from BDNewsPaper.search_sync import SearchSync
+
+    sync = SearchSync(Elasticsearch("http://localhost:9200"), "news_articles.db")
+    sync.sync()       # new articles only (full reindex the first time)
+    sync.reindex()    # zero-downtime rebuild
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALIAS = "bdnews_articles"
+
+# Per-item bulk statuses worth retrying (rejected or unavailable shards)
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+
+def is_permanent(status: int) -> bool:
+    """Whether a per-item bulk status will fail the same way when re-sent (4xx but 429)."""
+    return 400 <= status < 500 and status not in RETRY_STATUSES
+
+ARTICLE_INDEX = {
+    "settings": {
+        "number_of_shards": 1,
+        "number_of_replicas": 0,
+        "analysis": {
+            "analyzer": {
+                "bangla_analyzer": {
+                    "type": "custom",
+                    "tokenizer": "standard",
+                    "filter": ["lowercase"]
+                }
+            }
+        }
+    },
+    "mappings": {
+        "properties": {
+            "headline": {
+                "type": "text",
+                "analyzer": "standard",
+                "fields": {
+                    "keyword": {"type": "keyword"},
+                    "suggest": {"type": "completion"}
+                }
+            },
+            "article_body": {
+                "type": "text",
+                "analyzer": "standard"
+            },
+            "paper_name": {"type": "keyword"},
+            "category": {"type": "keyword"},
+            "author": {"type": "keyword"},
+            "source_language": {"type": "keyword"},
+            "url": {"type": "keyword"},
+            "publication_date": {"type": "date", "ignore_malformed": True},
+            "scraped_at": {"type": "date"},
+            "word_count": {"type": "integer"}
+        }
+    }
+}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS search_sync_state (
+        alias TEXT PRIMARY KEY,
+        last_article_id INTEGER NOT NULL,
+        last_scraped_at TEXT,
+        index_name TEXT,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS search_sync_failures (
+        alias TEXT NOT NULL,
+        article_id INTEGER NOT NULL,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (alias, article_id)
+    ) WITHOUT ROWID;
+"""
+
+_COLUMNS = """
+    id, url, headline, article, paper_name, category, author,
+    publication_date, source_language, word_count, scraped_at
+"""
+
+
+def article_document(row: sqlite3.Row) -> Dict:
+    """Search document for one articles row."""
+    scraped_at = row["scraped_at"]
+    if scraped_at and " " in scraped_at:
+        # SQLite CURRENT_TIMESTAMP is UTC 'YYYY-MM-DD HH:MM:SS'
+        scraped_at = scraped_at.replace(" ", "T") + "Z"
+    return {
+        "headline": row["headline"],
+        "article_body": row["article"] or "",
+        "paper_name": row["paper_name"],
+        "category": row["category"],
+        "author": row["author"],
+        "url": row["url"],
+        "source_language": row["source_language"],
+        "word_count": row["word_count"],
+        "publication_date": row["publication_date"],
+        "scraped_at": scraped_at,
+    }
+
+
+class _Chunk(NamedTuple):
+    ids: List[int]
+    docs: List[Tuple[str, str]]   # (action line, source line)
+    size: int
+    last_scraped_at: Optional[str]
+
+
+class _Sent(NamedTuple):
+    failures: Dict[int, Tuple[str, bool]]   # article id -> (error, permanent)
+    requests: int
+    retried: int
+
+
+class SearchSync:
+    """
+    Keep an Elasticsearch alias in step with the articles table.
+
+    ``streams`` bulk requests run concurrently, each at most
+    ``chunk_bytes`` of payload and ``chunk_docs`` documents. Chunks are
+    committed in id order, so the stored high-water mark only moves past
+    articles that were indexed or recorded as failures.
+    """
+
+    def __init__(self, client, db_path: str, alias: str = DEFAULT_ALIAS, streams: int = 4,
+                 chunk_bytes: int = 5 * 1024 * 1024, chunk_docs: int = 1000,
+                 max_retries: int = 3, retry_backoff: float = 0.5, read_batch: int = 2000,
+                 max_sync_attempts: int = 5):
+        self.client = client
+        self.db_path = db_path
+        self.alias = alias
+        self.streams = max(1, streams)
+        self.chunk_bytes = chunk_bytes
+        self.chunk_docs = chunk_docs
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.read_batch = read_batch
+        self.max_sync_attempts = max(1, max_sync_attempts)
+
+        self.stats = {
+            'indexed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'retried': 0,
+            'requests': 0,
+            'bytes': 0,
+            'elapsed': 0.0,
+        }
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.stats['indexed'] / self.stats['elapsed'] if self.stats['elapsed'] else 0.0
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    def sync(self, limit: Optional[int] = None) -> int:
+        """
+        Retry documents that failed before, then index articles added since
+        the last sync.
+
+        Falls back to ``reindex()`` while the alias does not exist yet.
+        Returns documents indexed.
+        """
+        if not self._alias_targets():
+            return self.reindex()
+
+        conn = self._connect()
+        start = time.perf_counter()
+        try:
+            if not self._create_schema(conn):
+                return 0
+            conn.execute(
+                "DELETE FROM search_sync_failures WHERE alias = ? AND article_id NOT IN (SELECT id FROM articles)",
+                (self.alias,)
+            )
+            retry = self._rows(conn, 0, where="id IN (SELECT article_id FROM search_sync_failures"
+                                              " WHERE alias = ? AND attempts < ?)",
+                               params=(self.alias, self.max_sync_attempts))
+            self._index_rows(conn, retry, self.alias, self.alias, advance=False)
+
+            after_id = self.last_article_id(conn)
+            self._index_rows(conn, self._rows(conn, after_id, limit=limit), self.alias, self.alias, advance=True)
+        finally:
+            self.stats['elapsed'] += time.perf_counter() - start
+            conn.close()
+        return self.stats['indexed']
+
+    def reindex(self) -> int:
+        """
+        Rebuild the index from scratch and swap the alias onto it.
+
+        The alias keeps serving the old index until the new one is
+        complete; on failure the new index is deleted and the alias is
+        left alone. Returns documents indexed.
+        """
+        conn = self._connect()
+        start = time.perf_counter()
+        try:
+            if not self._create_schema(conn):
+                return 0
+            index = f"{self.alias}_{datetime.now(timezone.utc):%Y%m%d%H%M%S%f}"
+            body = json.loads(json.dumps(ARTICLE_INDEX))
+            # No refreshes while bulk loading; restored before the swap
+            body["settings"]["refresh_interval"] = "-1"
+            self.client.indices.create(index=index, body=body)
+
+            max_id, max_scraped = conn.execute("SELECT COALESCE(MAX(id), 0), MAX(scraped_at) FROM articles").fetchone()
+            try:
+                self._index_rows(conn, self._rows(conn, 0, where="id <= ?", params=(max_id,)),
+                                 index, index, advance=False)
+                self.client.indices.put_settings(index=index, settings={"index": {"refresh_interval": "1s"}})
+                self.client.indices.refresh(index=index)
+                old = self._swap_alias(index)
+            except BaseException:
+                self.client.indices.delete(index=index)
+                conn.execute("DELETE FROM search_sync_failures WHERE alias = ?", (index,))
+                conn.commit()
+                raise
+
+            for name in old:
+                self.client.indices.delete(index=name)
+            conn.execute("DELETE FROM search_sync_failures WHERE alias = ?", (self.alias,))
+            conn.execute("UPDATE search_sync_failures SET alias = ? WHERE alias = ?", (self.alias, index))
+            conn.execute("""
+                INSERT OR REPLACE INTO search_sync_state (alias, last_article_id, last_scraped_at, index_name, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (self.alias, max_id, max_scraped, index))
+            conn.commit()
+            logger.info(f"Reindexed {self.stats['indexed']} articles into {index} (alias {self.alias})")
+        finally:
+            self.stats['elapsed'] += time.perf_counter() - start
+            conn.close()
+        return self.stats['indexed']
+
+    def last_article_id(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT last_article_id FROM search_sync_state WHERE alias = ?", (self.alias,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def pending_failures(self, conn: sqlite3.Connection) -> int:
+        """Failed documents the next sync will retry."""
+        return conn.execute(
+            "SELECT COUNT(*) FROM search_sync_failures WHERE alias = ? AND attempts < ?",
+            (self.alias, self.max_sync_attempts)
+        ).fetchone()[0]
+
+    def parked_failures(self, conn: sqlite3.Connection) -> int:
+        """Failed documents sync() no longer sends: rejected, or out of attempts."""
+        return conn.execute(
+            "SELECT COUNT(*) FROM search_sync_failures WHERE alias = ? AND attempts >= ?",
+            (self.alias, self.max_sync_attempts)
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Alias handling
+    # ------------------------------------------------------------------
+
+    def _alias_targets(self) -> List[str]:
+        """Concrete indices behind the alias (empty if it does not exist)."""
+        if not self.client.indices.exists_alias(name=self.alias):
+            return []
+        return list(self.client.indices.get_alias(name=self.alias))
+
+    def _swap_alias(self, index: str) -> List[str]:
+        """Point the alias at index in one atomic update. Returns the indices it left."""
+        old = self._alias_targets()
+        actions = [{"add": {"index": index, "alias": self.alias}}]
+        actions += [{"remove": {"index": name, "alias": self.alias}} for name in old]
+        if not old and self.client.indices.exists(index=self.alias):
+            # A concrete index under the alias name, from before aliases were used
+            actions.append({"remove_index": {"index": self.alias}})
+        self.client.indices.update_aliases(actions=actions)
+        return old
+
+    # ------------------------------------------------------------------
+    # Reading, chunking and sending
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        """Create the sync tables. Returns False if there is no articles table."""
+        has_articles = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name='articles'"
+        ).fetchone()
+        if not has_articles:
+            return False
+        conn.executescript(_SCHEMA)
+        return True
+
+    def _rows(self, conn: sqlite3.Connection, after_id: int, where: str = "1", params: tuple = (),
+              limit: Optional[int] = None) -> Iterator[sqlite3.Row]:
+        """Articles past after_id matching where, in id order, read_batch at a time."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.read_batch if remaining is None else min(self.read_batch, remaining)
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM articles WHERE id > ? AND {where} ORDER BY id LIMIT ?",
+                (after_id,) + params + (size,)
+            ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            after_id = rows[-1]["id"]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def _chunks(self, rows: Iterable[sqlite3.Row], index: str) -> Iterator[_Chunk]:
+        """Serialize each document once and pack them into size-capped chunks."""
+        ids, docs, size, scraped_at = [], [], 0, None
+        for row in rows:
+            action = json.dumps({"index": {"_index": index, "_id": str(row["id"])}})
+            source = json.dumps(article_document(row), ensure_ascii=False)
+            doc_size = len(action) + len(source.encode("utf-8")) + 2
+            if ids and (size + doc_size > self.chunk_bytes or len(ids) >= self.chunk_docs):
+                yield _Chunk(ids, docs, size, scraped_at)
+                ids, docs, size = [], [], 0
+            ids.append(row["id"])
+            docs.append((action, source))
+            size += doc_size
+            scraped_at = row["scraped_at"]
+        if ids:
+            yield _Chunk(ids, docs, size, scraped_at)
+
+    def _send(self, chunk: _Chunk) -> _Sent:
+        """Bulk-index a chunk, retrying only the documents that failed."""
+        pending = list(range(len(chunk.ids)))
+        errors: Dict[int, Tuple[str, bool]] = {}
+        requests = retried = 0
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                retried += len(pending)
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            operations = [line for i in pending for line in chunk.docs[i]]
+            requests += 1
+            try:
+                response = self.client.bulk(operations=operations)
+            except Exception as e:
+                # Transport failure: nothing is known to be indexed
+                errors.update((i, (f"{type(e).__name__}: {e}", False)) for i in pending)
+                continue
+
+            retry = []
+            for i, item in zip(pending, response["items"]):
+                result = next(iter(item.values()))
+                status = result.get("status", 500)
+                if status < 300:
+                    errors.pop(i, None)
+                    continue
+                errors[i] = (json.dumps(result.get("error") or status)[:500], is_permanent(status))
+                if status in RETRY_STATUSES:
+                    retry.append(i)
+            pending = retry
+            if not pending:
+                break
+        return _Sent({chunk.ids[i]: error for i, error in errors.items()}, requests, retried)
+
+    def _index_rows(self, conn: sqlite3.Connection, rows: Iterable[sqlite3.Row], index: str,
+                    state_key: str, advance: bool) -> None:
+        """Send rows to index over the stream pool and record results in order."""
+        with ThreadPoolExecutor(max_workers=self.streams, thread_name_prefix="es-bulk") as pool:
+            in_flight = deque()
+            for chunk in self._chunks(rows, index):
+                in_flight.append((chunk, pool.submit(self._send, chunk)))
+                if len(in_flight) >= self.streams * 2:
+                    chunk, future = in_flight.popleft()
+                    self._record(conn, chunk, future.result(), state_key, advance)
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                self._record(conn, chunk, future.result(), state_key, advance)
+
+    def _record(self, conn: sqlite3.Connection, chunk: _Chunk, sent: _Sent, state_key: str,
+                advance: bool) -> None:
+        """Store failures, clear recovered ones and move the high-water mark."""
+        indexed = [(state_key, article_id) for article_id in chunk.ids if article_id not in sent.failures]
+        conn.executemany("DELETE FROM search_sync_failures WHERE alias = ? AND article_id = ?", indexed)
+        # Permanent rejections start at the attempt cap, so sync() parks them
+        conn.executemany("""
+            INSERT INTO search_sync_failures (alias, article_id, error, attempts) VALUES (?, ?, ?, ?)
+            ON CONFLICT (alias, article_id) DO UPDATE SET
+                error = excluded.error, attempts = MAX(attempts + 1, excluded.attempts)
+        """, [(state_key, article_id, error, self.max_sync_attempts if permanent else 1)
+              for article_id, (error, permanent) in sent.failures.items()])
+        if advance:
+            conn.execute("""
+                INSERT INTO search_sync_state (alias, last_article_id, last_scraped_at, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (alias) DO UPDATE SET
+                    last_article_id = MAX(last_article_id, excluded.last_article_id),
+                    last_scraped_at = excluded.last_scraped_at,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (state_key, chunk.ids[-1], chunk.last_scraped_at))
+        conn.commit()
+
+        self.stats['indexed'] += len(indexed)
+        self.stats['failed'] += len(sent.failures)
+        rejected = sum(permanent for _, permanent in sent.failures.values())
+        self.stats['rejected'] += rejected
+        self.stats['retried'] += sent.retried
+        self.stats['requests'] += sent.requests
+        self.stats['bytes'] += chunk.size
+        if sent.failures:
+            logger.warning(f"{len(sent.failures)} of {len(chunk.ids)} documents failed to index"
+                           f" ({rejected} rejected, not retried by sync)")
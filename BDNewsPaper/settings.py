@@ -46,6 +46,14 @@ PLAYWRIGHT_CONTEXTS = {
     },
 }
 
+# Pooled rendering mode for the Playwright spiders (playwright_pool.py):
+# warm per-domain contexts/pages, blocked images/fonts/media/ad hosts, and
+# early DOM capture on listing pages. Enable with -s PLAYWRIGHT_POOL_ENABLED=true
+PLAYWRIGHT_POOL_ENABLED = False
+PLAYWRIGHT_POOL_PAGES_PER_DOMAIN = 2  # Idle warm pages kept per domain
+# PLAYWRIGHT_BLOCK_RESOURCE_TYPES = ['image', 'media', 'font']  # Override defaults
+PLAYWRIGHT_BLOCK_AD_HOSTS = []  # Extra ad/analytics host suffixes to abort
+
 # NOTE: TWISTED_REACTOR is set at the bottom of this file (asyncio reactor).
 # It is required for Playwright spiders and compatible with normal HTTP spiders.
 
@@ -80,8 +88,20 @@ DOWNLOAD_TIMEOUT = 180  # 3 minutes for slow Bangladesh news sites
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 SPIDER_MIDDLEWARES = {
     "BDNewsPaper.middlewares.BdnewspaperSpiderMiddleware": 543,
+    "BDNewsPaper.scheduling.RequestPriorityMiddleware": 545,
+    "BDNewsPaper.url_shapes.UrlShapeMiddleware": 550,
 }
 
+# Per-domain priority queues with a disk overflow for backfill requests
+# (scheduling.py). Priorities come from RequestPriorityMiddleware.
+SCHEDULER = "BDNewsPaper.scheduling.PriorityScheduler"
+SCHEDULER_PRIORITY_QUEUE = "scrapy.pqueues.DownloaderAwarePriorityQueue"
+REQUEST_PRIORITY_ENABLED = True
+SCHEDULER_MEMORY_LIMIT = 50000     # Requests held in memory before overflow
+SCHEDULER_OVERFLOW_PRIORITY = 0    # Only requests below this priority overflow to disk
+# SCHEDULER_OVERFLOW_DIR = '.scheduler_overflow'  # Default: system temp directory
+INGEST_FRESH_HOURS = 24            # Window for the median time-to-ingest stat
+
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
@@ -100,8 +120,9 @@ DOWNLOADER_MIDDLEWARES = {
     # === ROBUSTNESS LAYER 2: Traffic Control (450-550) ===
     "BDNewsPaper.middlewares.CircuitBreakerMiddleware": 451,           # Circuit breaker
     "BDNewsPaper.middlewares.StatisticsMiddleware": 460,               # Statistics tracking
-    "BDNewsPaper.middlewares.AdaptiveThrottlingMiddleware": 470,       # Dynamic throttling
-    "BDNewsPaper.middlewares.RateLimitMiddleware": 500,                # Rate limiting
+    # Superseded by RateControlMiddleware's AIMD; both feed its gate if re-enabled
+    # "BDNewsPaper.middlewares.AdaptiveThrottlingMiddleware": 470,     # Dynamic throttling
+    # "BDNewsPaper.middlewares.RateLimitMiddleware": 500,              # Rate limiting
     
     # === ROBUSTNESS LAYER 3: Request Processing (550-650) ===
     "BDNewsPaper.hybrid_request.HybridRequestMiddleware": 540,         # Auto HTTP/Playwright
@@ -111,6 +132,10 @@ DOWNLOADER_MIDDLEWARES = {
     
     # === ROBUSTNESS LAYER 4: Response Fallbacks (650+) ===
     "BDNewsPaper.middlewares.ArchiveFallbackMiddleware": 650,          # Wayback fallback
+
+    # === Pacing: last before the download, first to see the response ===
+    "BDNewsPaper.rate_control.RateControlMiddleware": 950,             # Per-domain rate + concurrency
+    "BDNewsPaper.playwright_pool.PagePoolMiddleware": 960,             # Warm Playwright page (pooled mode)
 }
 
 # =============================================================================
@@ -150,11 +175,23 @@ SOCKS5_PORT = '1080'
 PROXY_MAX_RETRIES = 3
 PROXY_BAN_THRESHOLD = 5
 
+# Rotating proxies (BDNewsPaper/proxy_pool.py): a proxy failing
+# PROXY_BAN_THRESHOLD times in a row cools down for PROXY_COOLDOWN seconds,
+# doubling on repeats up to PROXY_MAX_COOLDOWN. Usable proxies are probed
+# concurrently every PROXY_PROBE_INTERVAL seconds (0 disables probes).
+PROXY_COOLDOWN = 30
+PROXY_MAX_COOLDOWN = 600
+PROXY_PROBE_INTERVAL = 60
+PROXY_PROBE_URL = 'http://httpbin.org/ip'
+PROXY_PROBE_TIMEOUT = 10
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-# EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-# }
+EXTENSIONS = {
+    # "scrapy.extensions.telnet.TelnetConsole": None,
+    "BDNewsPaper.retry_queue.DelayedRetryExtension": 500,  # Parks retries until their backoff is due
+    "BDNewsPaper.profiling.ComponentProfiler": 0,  # Per-component cost report (PROFILE_COMPONENTS)
+}
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -205,6 +242,8 @@ DATE_FILTER_ENABLED = False
 LANGUAGE_DETECTION_ENABLED = True
 LANGUAGE_DETECTION_STRICT = False  # Set True to drop non-English articles
 EXPECTED_LANGUAGES = ['en']  # Languages to tag; only enforced when strict=True
+LANGUAGE_DETECTION_BATCH_SIZE = 32  # Mixed-script articles per langdetect batch
+LANGUAGE_DETECTION_BATCH_TIMEOUT = 0.5  # Max seconds an article waits for its batch
 
 # Content Quality settings
 MIN_ARTICLE_WORDS = 20
@@ -218,6 +257,7 @@ CHECKPOINT_DIR = '.checkpoints'
 
 # Database settings
 DATABASE_PATH = 'news_articles.db'
+SQLITE_PARTITIONED = False  # Store articles in monthly tables behind an 'articles' view
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -245,6 +285,18 @@ HTTPCACHE_ENABLED = False
 DNSCACHE_ENABLED = True
 DNSCACHE_SIZE = 10000
 
+# One DNS cache and one HTTP connection pool for all spiders in the process
+# (BDNewsPaper/shared_network.py). Cached addresses live DNS_CACHE_TTL
+# seconds, failed lookups DNS_CACHE_NEGATIVE_TTL. Playwright spiders set
+# their own DOWNLOAD_HANDLERS, which take precedence over these.
+TWISTED_DNS_RESOLVER = "BDNewsPaper.shared_network.SharedDNSResolver"
+DNS_CACHE_TTL = 300
+DNS_CACHE_NEGATIVE_TTL = 30
+DOWNLOAD_HANDLERS = {
+    "http": "BDNewsPaper.shared_network.SharedHTTP11DownloadHandler",
+    "https": "BDNewsPaper.shared_network.SharedHTTP11DownloadHandler",
+}
+
 # Enable compression to reduce bandwidth
 COMPRESSION_ENABLED = True
 
@@ -282,6 +334,33 @@ CIRCUIT_BREAKER_HALF_OPEN_CALLS = 3  # Successful calls to close circuit
 RATELIMIT_DELAY = 1.0
 RATELIMIT_RANDOMIZE = True
 
+# Per-domain rate control (rate_control.py): token bucket at 1/DOWNLOAD_DELAY
+# plus AIMD concurrency. Replaces AutoThrottle and Scrapy's slot delays while
+# enabled, and parks delayed retries until they are due.
+RATE_CONTROL_ENABLED = True
+# RATE_CONTROL_RATE = 2.0          # Requests/second per domain (default: 1/DOWNLOAD_DELAY)
+RATE_CONTROL_BURST = 2             # Requests allowed back to back after idling
+RATE_CONTROL_START_CONCURRENCY = 4
+RATE_CONTROL_MIN_CONCURRENCY = 1
+# RATE_CONTROL_MAX_CONCURRENCY = 16  # Default: CONCURRENT_REQUESTS_PER_DOMAIN
+RATE_CONTROL_TARGET_LATENCY = 3.0  # Slower responses halve the concurrency
+RATE_CONTROL_DECREASE_FACTOR = 0.5
+RATE_CONTROL_MAX_PAUSE = 300.0     # Cap for Retry-After pauses (seconds)
+
+# Delayed retries (retry_queue.py): retries wait out their backoff in a
+# due-time heap instead of going straight back into the scheduler.
+RETRY_QUEUE_ENABLED = True
+RETRY_QUEUE_MAX_PARKED = 10000     # Parked in memory before spilling to disk
+# RETRY_QUEUE_DIR = '.retry_queue'  # Default: system temp directory
+RETRY_BUDGET_RATIO = 0.2           # Retries allowed per first attempt, per domain
+RETRY_BUDGET_MIN = 10              # Retries always allowed per domain
+
+# Component profiler (profiling.py): per-middleware and per-pipeline timing
+# report plus flame graph stacks at close. Off by default; sample in production.
+PROFILE_COMPONENTS = False
+PROFILE_SAMPLE_RATE = 1.0          # Share of calls timed (0.01 in production)
+# PROFILE_OUTPUT_DIR = 'logs/profile'  # Writes <spider>-components.txt and .folded
+
 # =============================================================================
 # ROBUSTNESS FEATURES CONFIGURATION
 # =============================================================================
@@ -295,6 +374,25 @@ RATELIMIT_RANDOMIZE = True
 FALLBACK_EXTRACTION_ENABLED = True
 FALLBACK_MIN_BODY_LENGTH = 50  # Trigger fallback if body shorter than this
 
+# Side-channel HTML store (html_store.py): auto-extracted items carry only a
+# handle; raw HTML lives in a bounded, spill-to-disk cache until the item is
+# stored or dropped.
+HTML_STORE_MEMORY_MB = 32   # Raw page bytes kept in memory
+HTML_STORE_DISK_MB = 512    # Spill budget; oldest entries discarded beyond it
+# HTML_STORE_DIR = '.html_store'  # Default: private temp directory
+HTML_STORE_COMPRESS_LEVEL = 0  # zlib level for spilled pages (0 = off)
+
+# -----------------------------------------------------------------------------
+# URL SHAPE LEARNING (url_shapes.py)
+# -----------------------------------------------------------------------------
+# Learn per domain which URL shapes produce stored articles and skip the
+# ones that don't when following auto-discovered links. Persists in the
+# url_shape_yield table of DATABASE_PATH.
+URL_SHAPE_LEARNING = True
+URL_SHAPE_MIN_SAMPLES = 20     # Fetches of a shape before it can be skipped
+URL_SHAPE_MIN_YIELD = 0.05     # Skip shapes storing fewer than this share
+URL_SHAPE_EXPLORE_EVERY = 20   # Still request 1 in N skipped candidates
+
 # -----------------------------------------------------------------------------
 # HYBRID REQUEST ENGINE (hybrid_request.py)
 # -----------------------------------------------------------------------------
@@ -408,7 +506,9 @@ CF_SCRAPLING_ENABLED = True             # Use Scrapling in CF bypass escalation
 # ADAPTIVE THROTTLING (middlewares.py)
 # -----------------------------------------------------------------------------
 # Dynamic delay adjustment based on server response times.
-ADAPTIVE_THROTTLE_ENABLED = True
+# Off by default: RateControlMiddleware adapts per-domain concurrency itself.
+# To re-enable, set this and uncomment the middleware in DOWNLOADER_MIDDLEWARES.
+ADAPTIVE_THROTTLE_ENABLED = False
 ADAPTIVE_THROTTLE_THRESHOLD_MS = 500  # Slow response threshold
 ADAPTIVE_THROTTLE_INCREASE_FACTOR = 1.5  # Delay multiplier on slow
 ADAPTIVE_THROTTLE_DECREASE_FACTOR = 0.9  # Delay multiplier on fast
@@ -0,0 +1,334 @@
+"""
+Shared Network
+==============
+One DNS cache and one HTTP connection pool for every crawler in the process.
+
+``bdnews scrape`` runs all spiders in one CrawlerProcess, and many of the
+papers sit behind the same CDNs. Scrapy gives each crawler's HTTP/1.1
+download handler its own connection pool, so a keep-alive connection
+opened by one spider can never serve another. Scrapy's resolver cache is
+process-wide already, but it keeps an address forever, caches no failures
+and starts empty, so the first request to every site waits for DNS.
+
+    SharedDNSResolver         TTL-aware cache (DNS_CACHE_TTL; failures for
+                              DNS_CACHE_NEGATIVE_TTL), one lookup per name
+                              however many requests wait on it, and the
+                              stale address kept when a refresh fails
+    prefetch()                resolve every spider's allowed_domains as
+                              the reactor starts
+    SharedConnectionPool      one persistent HTTPConnectionPool for all
+                              crawlers, keeping as many idle connections
+                              per host as the crawlers using it would
+                              have kept; open for the life of the process
+    SharedHTTP11DownloadHandler
+                              Scrapy's HTTP/1.1 handler on the shared pool
+
+getaddrinfo() does not return record TTLs, so DNS_CACHE_TTL is a fixed
+lifetime, not the record's own.
+
+``network_report()`` gives the lookups and connections saved and the time
+they would have cost: each cache hit is priced at that name's last lookup
+time, each reused connection at the median connect time to its host (TCP
+connect as the reactor saw it; a TLS handshake comes on top).
+
+Usage (settings.py):
+    TWISTED_DNS_RESOLVER = 'BDNewsPaper.shared_network.SharedDNSResolver'
+    DOWNLOAD_HANDLERS = {
+        'http': 'BDNewsPaper.shared_network.SharedHTTP11DownloadHandler',
+        'https': 'BDNewsPaper.shared_network.SharedHTTP11DownloadHandler',
+    }
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from twisted.internet import defer
+from twisted.internet.base import ThreadedResolver
+from twisted.internet.error import DNSLookupError
+from twisted.internet.interfaces import IResolverSimple
+from twisted.web.client import HTTPConnectionPool
+from zope.interface import implementer
+
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler, _LenientHTTP11ClientFactory
+
+from BDNewsPaper.streaming_stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# DNS
+# =============================================================================
+
+class DNSCache:
+    """
+    LRU of name -> (address or None for a failed lookup, expires at,
+    seconds the lookup took).
+    """
+
+    def __init__(self, size: int = 10000, ttl: float = 300.0, negative_ttl: float = 30.0):
+        self.size = size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries: 'OrderedDict[str, Tuple[Optional[str], float, float]]' = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.joined = 0          # Requests that waited on a lookup already running
+        self.stale_served = 0
+        self.saved_seconds = 0.0
+
+    def get(self, name: str) -> Optional[Tuple[Optional[str], float, float]]:
+        entry = self.entries.get(name)
+        if entry is not None:
+            self.entries.move_to_end(name)
+        return entry
+
+    def put(self, name: str, address: Optional[str], now: float, took: float) -> None:
+        ttl = self.ttl if address is not None else self.negative_ttl
+        self.entries[name] = (address, now + ttl, took)
+        self.entries.move_to_end(name)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+_default_dns_cache: Optional[DNSCache] = None
+_default_dns_cache_lock = threading.Lock()
+
+
+def get_dns_cache(size: int = 10000, ttl: float = 300.0, negative_ttl: float = 30.0) -> DNSCache:
+    """Get the process-wide DNS cache; arguments only apply when it is created."""
+    global _default_dns_cache
+    with _default_dns_cache_lock:
+        if _default_dns_cache is None:
+            _default_dns_cache = DNSCache(size, ttl, negative_ttl)
+        return _default_dns_cache
+
+
+@implementer(IResolverSimple)
+class SharedDNSResolver(ThreadedResolver):
+    """
+    Caching resolver for TWISTED_DNS_RESOLVER: a drop-in for Scrapy's
+    CachingThreadedResolver (IPv4, DNS_TIMEOUT) with TTLs, negative
+    caching and coalesced lookups.
+    """
+
+    def __init__(self, reactor, cache: DNSCache, timeout: float):
+        super().__init__(reactor)
+        self.cache = cache
+        self.timeout = timeout
+        self._waiting: Dict[str, List[defer.Deferred]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler, reactor):
+        settings = crawler.settings
+        cache = get_dns_cache(
+            size=settings.getint('DNSCACHE_SIZE') if settings.getbool('DNSCACHE_ENABLED') else 0,
+            ttl=settings.getfloat('DNS_CACHE_TTL', 300.0),
+            negative_ttl=settings.getfloat('DNS_CACHE_NEGATIVE_TTL', 30.0),
+        )
+        return cls(reactor, cache, settings.getfloat('DNS_TIMEOUT'))
+
+    def install_on_reactor(self) -> None:
+        self.reactor.installResolver(self)
+
+    def getHostByName(self, name: str, timeout=()) -> defer.Deferred:
+        cache = self.cache
+        now = self.reactor.seconds()
+        entry = cache.get(name)
+        if entry is not None and entry[1] > now:
+            address, _, took = entry
+            if address is None:
+                cache.negative_hits += 1
+                return defer.fail(DNSLookupError(name))
+            cache.hits += 1
+            cache.saved_seconds += took
+            return defer.succeed(address)
+
+        waiting = self._waiting.get(name)
+        if waiting is not None:
+            cache.joined += 1
+            d = defer.Deferred()
+            waiting.append(d)
+            return d
+
+        self._waiting[name] = []
+        cache.lookups += 1
+        d = self._lookup(name)
+        d.addCallbacks(self._resolved, self._failed,
+                       callbackArgs=(name, now), errbackArgs=(name, now, entry))
+        return d
+
+    def _lookup(self, name: str) -> defer.Deferred:
+        # DNS_TIMEOUT overrides Twisted's (1, 3, 11, 45) default, as in Scrapy
+        return super().getHostByName(name, (self.timeout,))
+
+    def _resolved(self, address: str, name: str, started: float) -> str:
+        if self.cache.size:
+            self.cache.put(name, address, self.reactor.seconds(), self.reactor.seconds() - started)
+        for d in self._waiting.pop(name, ()):
+            d.callback(address)
+        return address
+
+    def _failed(self, failure, name: str, started: float, stale):
+        waiting = self._waiting.pop(name, ())
+        if stale is not None and stale[0] is not None:
+            # Keep crawling on the last known address; retry after the negative TTL
+            self.cache.stale_served += 1
+            self.cache.entries[name] = (stale[0], self.reactor.seconds() + self.cache.negative_ttl, stale[2])
+            logger.warning(f"DNS refresh failed for {name}, using cached address: {failure.value}")
+            for d in waiting:
+                d.callback(stale[0])
+            return stale[0]
+        if self.cache.size:
+            self.cache.put(name, None, self.reactor.seconds(), self.reactor.seconds() - started)
+        for d in waiting:
+            d.errback(failure)
+        return failure
+
+
+def prefetch(names: Iterable[str], resolver=None) -> defer.Deferred:
+    """
+    Resolve `names` (e.g. every spider's allowed_domains) into the cache;
+    fires with the number that resolved. A no-op without SharedDNSResolver.
+    """
+    if resolver is None:
+        from twisted.internet import reactor
+        resolver = reactor.resolver
+    if not isinstance(resolver, SharedDNSResolver):
+        return defer.succeed(0)
+    names = sorted(set(names))
+
+    def done(results):
+        resolved = sum(ok for ok, _ in results)
+        logger.info(f"Prefetched DNS for {resolved}/{len(names)} domains")
+        return resolved
+
+    lookups = [resolver.getHostByName(name) for name in names]
+    return defer.DeferredList(lookups, consumeErrors=True).addCallback(done)
+
+
+# =============================================================================
+# HTTP connections
+# =============================================================================
+
+class SharedConnectionPool(HTTPConnectionPool):
+    """HTTPConnectionPool that counts new and reused connections and times connects."""
+
+    def __init__(self, reactor, persistent: bool = True):
+        super().__init__(reactor, persistent)
+        self.requests: Dict = {}
+        self.attempts: Dict = {}
+        self.connects: Dict[object, QuantileSketch] = {}   # Connect seconds by key
+
+    def attach(self, max_per_host: int) -> None:
+        """A crawler starts using the pool: keep up to `max_per_host` more idle connections per host."""
+        self.maxPersistentPerHost += max_per_host
+
+    def detach(self, max_per_host: int) -> None:
+        self.maxPersistentPerHost = max(0, self.maxPersistentPerHost - max_per_host)
+
+    def getConnection(self, key, endpoint):
+        self.requests[key] = self.requests.get(key, 0) + 1
+        return super().getConnection(key, endpoint)
+
+    def _newConnection(self, key, endpoint):
+        self.attempts[key] = self.attempts.get(key, 0) + 1
+        started = self._reactor.seconds()
+        d = super()._newConnection(key, endpoint)
+        d.addCallback(self._connected, key, started)
+        return d
+
+    def _connected(self, protocol, key, started: float):
+        connects = self.connects.get(key)
+        if connects is None:
+            connects = self.connects[key] = QuantileSketch()
+        connects.add(self._reactor.seconds() - started)
+        return protocol
+
+    def summary(self) -> Dict[str, float]:
+        overall = QuantileSketch()
+        for connects in self.connects.values():
+            overall.merge(connects)
+        median = overall.quantile(0.5)
+        reused = saved = 0
+        for key, requests in self.requests.items():
+            connects = self.connects.get(key)
+            key_reused = requests - self.attempts.get(key, 0)
+            reused += key_reused
+            saved += key_reused * (connects.quantile(0.5) if connects else median)
+        return {
+            'connections_opened': overall.count,
+            'connections_reused': reused,
+            'connect_p50_ms': round(median * 1000, 1),
+            'connect_saved_s': round(saved, 3),
+        }
+
+
+_default_connection_pool: Optional[SharedConnectionPool] = None
+_default_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool(reactor=None) -> SharedConnectionPool:
+    """Get the process-wide connection pool."""
+    global _default_connection_pool
+    with _default_connection_pool_lock:
+        pool = _default_connection_pool
+        if pool is None:
+            if reactor is None:
+                from twisted.internet import reactor
+            pool = _default_connection_pool = SharedConnectionPool(reactor, persistent=True)
+            pool.maxPersistentPerHost = 0
+            pool._factory = _LenientHTTP11ClientFactory
+            # Kept open between crawlers; closed with the reactor
+            reactor.addSystemEventTrigger('before', 'shutdown', _close_pool, reactor, pool)
+        return pool
+
+
+def _close_pool(reactor, pool: SharedConnectionPool, timeout: float = 1.0) -> defer.Deferred:
+    # closeCachedConnections can hang on network errors; give up after
+    # `timeout` as HTTP11DownloadHandler.close() does
+    d = pool.closeCachedConnections()
+    delayed_call = reactor.callLater(timeout, d.callback, None)
+    d.addBoth(lambda result: delayed_call.active() and delayed_call.cancel())
+    return d
+
+
+class SharedHTTP11DownloadHandler(HTTP11DownloadHandler):
+    """Scrapy's HTTP/1.1 download handler on the process-wide connection pool."""
+
+    def __init__(self, crawler):
+        super().__init__(crawler)
+        from twisted.internet import reactor
+        self._max_per_host = crawler.settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN')
+        self._pool = get_connection_pool(reactor)
+        self._pool.attach(self._max_per_host)
+
+    async def close(self) -> None:
+        # Other crawlers (or the next job) may still use the pool's connections
+        self._pool.detach(self._max_per_host)
+        stats = getattr(self._crawler, 'stats', None)
+        if stats is not None:
+            for key, value in network_report().items():
+                stats.set_value(f'shared_network/{key}', value)
+
+
+def network_report() -> Dict[str, float]:
+    """DNS and connection reuse so far in this process, with the time saved."""
+    report: Dict[str, float] = {}
+    cache = _default_dns_cache
+    if cache is not None:
+        report.update({
+            'dns_lookups': cache.lookups,
+            'dns_hits': cache.hits,
+            'dns_joined': cache.joined,
+            'dns_negative_hits': cache.negative_hits,
+            'dns_stale_served': cache.stale_served,
+            'dns_saved_s': round(cache.saved_seconds, 3),
+        })
+    pool = _default_connection_pool
+    if pool is not None:
+        report.update(pool.summary())
+    return report
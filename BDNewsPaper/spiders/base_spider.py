@@ -4,13 +4,13 @@ Base Spider Class for BDNewsPaper Scrapers
 Common functionality shared by all newspaper spiders.
 """
 
-import json
 import re
 import sqlite3
 import threading
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Any, Dict, Generator, List, Optional, Set
+from datetime import datetime
+from typing import Any, Dict, Generator, Iterable, List, Optional, Set
+from urllib.parse import urlparse
 
 import scrapy
 from scrapy.http import Request, Response
@@ -20,8 +20,13 @@ from BDNewsPaper.config import (
     DEFAULT_START_DATE,
     get_default_end_date,
 )
+from BDNewsPaper.article_partitions import url_table
+from BDNewsPaper.date_normalizer import get_normalizer
+from BDNewsPaper.html_store import HTML_HANDLE_FIELD, get_html_store
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.link_discovery import discover_article_links
+from BDNewsPaper.structured_data import ARTICLE_TYPES, structured_data
+from BDNewsPaper.url_shapes import SHAPE_META_KEY, get_url_shape_learner
 
 
 @dataclass
@@ -39,6 +44,8 @@ class SpiderStats:
     duplicates_skipped: int = 0
     date_filtered: int = 0
     search_filtered: int = 0
+    known_pages: int = 0
+    pages_saved: int = 0
     errors: int = 0
     start_time: datetime = field(default_factory=datetime.now)
 
@@ -73,6 +80,7 @@ class BaseNewsSpider(scrapy.Spider):
         - Standardized date range parsing
         - Category filtering support
         - Database duplicate checking
+        - Stop-on-known pagination for incremental runs
         - Statistics tracking
         - Common error handling
     
@@ -92,6 +100,11 @@ class BaseNewsSpider(scrapy.Spider):
     # Filtering capabilities
     supports_api_date_filter = False
     supports_api_category_filter = False
+
+    # Stop paginating a listing after this many consecutive pages whose
+    # articles are all stored already (0 = walk up to max_pages). Override
+    # per spider, or pass -a stop_on_known_pages=0 to backfill a gap.
+    stop_on_known_pages = 3
     
     # Default custom settings
     custom_settings = {
@@ -123,6 +136,9 @@ class BaseNewsSpider(scrapy.Spider):
         # Initialize timezone
         self.dhaka_tz = DHAKA_TZ
         
+        # Date parser that learns this site's date formats
+        self.date_normalizer = get_normalizer(getattr(self, 'name', None))
+        
         # Parse date arguments
         self._parse_date_args(kwargs)
         
@@ -148,6 +164,7 @@ class BaseNewsSpider(scrapy.Spider):
         # Thread safety for database operations
         self._db_lock = threading.Lock()
         self._local = threading.local()
+        self._url_table: Optional[str] = None
         
         self.logger.info(f"Spider {self.name} initialized")
         self.logger.info(f"Date range: {self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}")
@@ -194,104 +211,20 @@ class BaseNewsSpider(scrapy.Spider):
 
         Handles ISO 8601, common English date formats, relative times
         ("X hours ago"), and various newspaper-specific patterns found
-        across all scraped sites.
+        across all scraped sites. Dispatch goes through this spider's
+        DateNormalizer, which remembers the format that parsed each input
+        shape (see BDNewsPaper.date_normalizer).
 
         Returns:
             datetime object (timezone-aware) or None on failure.
         """
-        if not date_str:
+        if not date_str or not date_str.strip():
             return None
 
-        date_str = date_str.strip()
-        if not date_str:
-            return None
-
-        # ---- ISO 8601 via fromisoformat (handles +06:00, Z, etc.) ----
-        if 'T' in date_str:
-            try:
-                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                return dt
-            except ValueError:
-                pass
-
-        # ---- Relative times: "X hours/minutes/days/weeks ago" ----
-        relative_match = re.match(
-            r'(\d+)\s+(hour|minute|day|week|month|second)s?\s+ago',
-            date_str,
-            re.I,
-        )
-        if relative_match:
-            amount = int(relative_match.group(1))
-            unit = relative_match.group(2).lower()
-            now = datetime.now(self.dhaka_tz)
-            if unit == 'second':
-                return now - timedelta(seconds=amount)
-            elif unit == 'minute':
-                return now - timedelta(minutes=amount)
-            elif unit == 'hour':
-                return now - timedelta(hours=amount)
-            elif unit == 'day':
-                return now - timedelta(days=amount)
-            elif unit == 'week':
-                return now - timedelta(weeks=amount)
-            elif unit == 'month':
-                return now - timedelta(days=amount * 30)
-
-        # ---- Comprehensive strptime format list ----
-        # Ordered from most specific to least specific to avoid
-        # ambiguous partial matches.
-        formats = [
-            # ISO-like with microseconds
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%dT%H:%M:%S',
-            # Standard datetime
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            # Day-first with time and AM/PM
-            '%d %B, %Y %I:%M:%S %p',   # 30 January, 2022 11:12:21 AM
-            '%d %B, %Y %H:%M:%S',       # 30 January, 2022 14:30:00
-            # Day-of-week with time
-            '%A, %d %B, %Y at %I:%M %p',  # Thursday, 25 December, 2025 at 10:12 PM
-            '%A, %d %B, %Y',              # Thursday, 26 December, 2024
-            '%A, %d %B %Y',               # Thursday, 26 December 2024
-            # Full/abbreviated month name
-            '%d %B, %Y',                   # 26 December, 2024
-            '%B %d, %Y',                   # December 26, 2024
-            '%d %b %Y, %I:%M %p',         # 26 Dec 2025, 12:28 AM
-            '%d %B %Y, %I:%M %p',         # 26 December 2025, 12:28 AM
-            '%d %b %Y',                    # 26 Dec 2024
-            '%b %d, %Y',                   # Dec 26, 2024
-            # Slash-separated
-            '%d/%m/%Y',                    # 26/12/2024
-            '%m/%d/%Y',                    # 12/26/2024
-            # Dash-separated day-first
-            '%d-%m-%Y',                    # 26-12-2024
-        ]
-
-        # First, try the raw date_str against all formats
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return self.dhaka_tz.localize(dt) if dt.tzinfo is None else dt
-            except ValueError:
-                continue
-
-        # ---- Fallback: strip timezone suffix and retry ----
-        # Handles strings like "2024-12-26T10:00:00+06:00" when
-        # fromisoformat and %z both failed.
-        cleaned = date_str.split('+')[0].split('Z')[0]
-        if cleaned != date_str:
-            for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
-                try:
-                    dt = datetime.strptime(cleaned, fmt)
-                    return self.dhaka_tz.localize(dt)
-                except ValueError:
-                    continue
-
-        self.logger.warning(f"Failed to parse date string: {date_str!r}")
-        return None
+        dt = self.date_normalizer.parse_localized(date_str)
+        if dt is None:
+            self.logger.warning(f"Failed to parse date string: {date_str!r}")
+        return dt
 
     def _parse_category_args(self, kwargs: Dict[str, Any]) -> None:
         """Parse category filter arguments."""
@@ -314,6 +247,14 @@ class BaseNewsSpider(scrapy.Spider):
             self.page_limit = int(kwargs.get('page_limit', 100))
         except (ValueError, TypeError):
             self.page_limit = 100
+        
+        try:
+            self.stop_on_known_pages = max(0, int(kwargs.get('stop_on_known_pages', self.stop_on_known_pages)))
+        except (ValueError, TypeError):
+            pass
+        # Consecutive fully-known pages per listing, and listings stopped early
+        self._known_streak: Dict[str, int] = {}
+        self._stopped_listings: Set[str] = set()
     
     def _parse_search_args(self, kwargs: Dict[str, Any]) -> None:
         """Parse search query arguments."""
@@ -338,8 +279,16 @@ class BaseNewsSpider(scrapy.Spider):
                 check_same_thread=False,
                 timeout=30.0
             )
+            self._url_table = url_table(self._local.connection)
         return self._local.connection
     
+    def _get_url_table(self, conn) -> str:
+        """Where stored URLs are looked up (partitioned DBs keep archived URLs in article_partition_ids)."""
+        if self._url_table is None:
+            # No articles relation when the connection opened; the pipeline may have created it since
+            self._url_table = url_table(conn)
+        return self._url_table or 'articles'
+    
     def is_url_in_db(self, url: str) -> bool:
         """Check if URL already exists in database."""
         # Check in-memory cache first
@@ -350,7 +299,7 @@ class BaseNewsSpider(scrapy.Spider):
             with self._db_lock:
                 conn = self._get_db_connection()
                 cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM articles WHERE url = ? LIMIT 1", (url,))
+                cursor.execute(f"SELECT 1 FROM {self._get_url_table(conn)} WHERE url = ? LIMIT 1", (url,))
                 result = cursor.fetchone() is not None
                 
                 if result:
@@ -364,6 +313,82 @@ class BaseNewsSpider(scrapy.Spider):
             self.logger.warning(f"Database check failed for {url}: {e}")
             return False
     
+    def _urls_in_db(self, urls: List[str]) -> Set[str]:
+        """Return the subset of urls stored in the database, in one query per 500 URLs."""
+        known: Set[str] = set()
+        with self._db_lock:
+            conn = self._get_db_connection()
+            table = self._get_url_table(conn)
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"SELECT url FROM {table} WHERE url IN ({placeholders})", chunk)
+                known.update(row[0] for row in rows)
+        return known
+    
+    # ================================================================
+    # Incremental Crawl Frontier
+    # ================================================================
+    
+    def filter_new_urls(self, urls: Iterable[str], listing: Optional[str] = None) -> List[str]:
+        """
+        Batch version of is_url_in_db for a whole listing page.
+        
+        Returns the URLs that are neither stored nor already requested in
+        this run, in page order. When `listing` (a category name or any
+        key identifying the paginated listing) is given, a page with no
+        new URLs counts towards stopping that listing's pagination; see
+        should_paginate().
+        
+        Usage in spider:
+            for url in self.filter_new_urls(urls, listing=category):
+                yield scrapy.Request(url, callback=self.parse_article)
+            if self.should_paginate(category, page):
+                yield next_page_request
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        candidates = [url for url in urls if url not in self.processed_urls]
+        try:
+            stored = self._urls_in_db(candidates) if candidates else set()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Database check failed for {len(candidates)} URLs: {e}")
+            stored = set()
+        
+        new_urls = [url for url in candidates if url not in stored]
+        self.processed_urls.update(new_urls)
+        self.stats.duplicates_skipped += len(stored)
+        
+        if listing is not None and urls:
+            if new_urls:
+                self._known_streak[listing] = 0
+            else:
+                self._known_streak[listing] = self._known_streak.get(listing, 0) + 1
+                self.stats.known_pages += 1
+        return new_urls
+    
+    def should_paginate(self, listing: str, page: int, last_page: Optional[int] = None) -> bool:
+        """
+        Whether to request the page after `page` of a listing.
+        
+        False past max_pages (or `last_page`, when the site reports it),
+        and once stop_on_known_pages consecutive pages of the listing had
+        nothing new. Pages skipped that way are counted as saved requests.
+        """
+        last = min(self.max_pages, last_page) if last_page else self.max_pages
+        if page >= last:
+            return False
+        streak = self._known_streak.get(listing, 0)
+        if self.stop_on_known_pages and streak >= self.stop_on_known_pages:
+            if listing not in self._stopped_listings:
+                self._stopped_listings.add(listing)
+                self.stats.pages_saved += last - page
+                self.logger.info(
+                    f"Stopping {listing} at page {page}: {streak} consecutive pages already stored "
+                    f"({last - page} pages saved)"
+                )
+            return False
+        return True
+    
     # ================================================================
     # Date Validation
     # ================================================================
@@ -430,69 +455,51 @@ class BaseNewsSpider(scrapy.Spider):
         Returns:
             Dictionary with extracted fields, or None if not found
         """
-        scripts = response.css('script[type="application/ld+json"]::text').getall()
-        
-        for script in scripts:
+        for item in structured_data(response).jsonld:
             try:
-                data = json.loads(script)
+                item_type = item.get('@type', '')
+                if isinstance(item_type, list):
+                    item_type = item_type[0] if item_type else ''
                 
-                # Handle @graph format
-                if isinstance(data, dict) and '@graph' in data:
-                    items = data['@graph']
-                elif isinstance(data, list):
-                    items = data
-                else:
-                    items = [data]
+                # Check for article types
+                if not any(t in str(item_type) for t in ARTICLE_TYPES):
+                    continue
                 
-                for item in items:
-                    if not isinstance(item, dict):
-                        continue
-                    
-                    item_type = item.get('@type', '')
-                    if isinstance(item_type, list):
-                        item_type = item_type[0] if item_type else ''
-                    
-                    # Check for article types
-                    article_types = ['NewsArticle', 'Article', 'BlogPosting', 'WebPage', 
-                                    'ReportageNewsArticle', 'AnalysisNewsArticle']
-                    if not any(t in str(item_type) for t in article_types):
-                        continue
-                    
-                    # Extract fields
-                    result = {
-                        'headline': item.get('headline') or item.get('name'),
-                        'article_body': item.get('articleBody') or item.get('description'),
-                        'publication_date': item.get('datePublished'),
-                        'modification_date': item.get('dateModified'),
-                    }
-                    
-                    # Extract author
-                    author = item.get('author')
-                    if isinstance(author, dict):
-                        result['author'] = author.get('name')
-                    elif isinstance(author, list) and author:
-                        names = [a.get('name') if isinstance(a, dict) else a for a in author]
-                        result['author'] = ', '.join(filter(None, names))
-                    elif isinstance(author, str):
-                        result['author'] = author
-                    
-                    # Extract image
-                    image = item.get('image')
-                    if isinstance(image, dict):
-                        result['image_url'] = image.get('url')
-                    elif isinstance(image, list) and image:
-                        first_img = image[0]
-                        result['image_url'] = first_img.get('url') if isinstance(first_img, dict) else first_img
-                    elif isinstance(image, str):
-                        result['image_url'] = image
+                # Extract fields
+                result = {
+                    'headline': item.get('headline') or item.get('name'),
+                    'article_body': item.get('articleBody') or item.get('description'),
+                    'publication_date': item.get('datePublished'),
+                    'modification_date': item.get('dateModified'),
+                }
+                
+                # Extract author
+                author = item.get('author')
+                if isinstance(author, dict):
+                    result['author'] = author.get('name')
+                elif isinstance(author, list) and author:
+                    names = [a.get('name') if isinstance(a, dict) else a for a in author]
+                    result['author'] = ', '.join(filter(None, names))
+                elif isinstance(author, str):
+                    result['author'] = author
+                
+                # Extract image
+                image = item.get('image')
+                if isinstance(image, dict):
+                    result['image_url'] = image.get('url')
+                elif isinstance(image, list) and image:
+                    first_img = image[0]
+                    result['image_url'] = first_img.get('url') if isinstance(first_img, dict) else first_img
+                elif isinstance(image, str):
+                    result['image_url'] = image
+                
+                # Only return if we have at least headline
+                if result.get('headline'):
+                    self.logger.debug(f"Extracted from JSON-LD: {result.get('headline')[:50]}")
+                    return result
                     
-                    # Only return if we have at least headline
-                    if result.get('headline'):
-                        self.logger.debug(f"Extracted from JSON-LD: {result.get('headline')[:50]}")
-                        return result
-                        
-            except (json.JSONDecodeError, TypeError, AttributeError) as e:
-                self.logger.debug(f"JSON-LD parse error: {e}")
+            except (TypeError, AttributeError) as e:
+                self.logger.debug(f"JSON-LD field error: {e}")
                 continue
         
         return None
@@ -567,35 +574,39 @@ class BaseNewsSpider(scrapy.Spider):
                     result['article_body'] = body
                     break
         
-        # Date selectors
+        # Date: <time datetime> and meta tags from the shared structured
+        # data view, then on-page markup
+        data = structured_data(response)
         date_selectors = [
-            'time[datetime]::attr(datetime)',
             '[itemprop="datePublished"]::attr(content)',
-            'meta[property="article:published_time"]::attr(content)',
             '.post-date::text',
             '.entry-date::text',
             '.published::text',
         ]
         
+        date = next((t['datetime'] for t in data.times if t['datetime'].strip()), None)
+        date = date or data.meta.get('article:published_time')
         for selector in date_selectors:
-            date = response.css(selector).get()
             if date and date.strip():
-                result['publication_date'] = date.strip()
                 break
+            date = response.css(selector).get()
+        if date and date.strip():
+            result['publication_date'] = date.strip()
         
-        # Image selectors
+        # Image: og:image, then on-page images
         image_selectors = [
-            'meta[property="og:image"]::attr(content)',
             'article img::attr(src)',
             '.featured-image img::attr(src)',
             '.post-thumbnail img::attr(src)',
         ]
         
+        image = data.meta.get('og:image')
         for selector in image_selectors:
-            image = response.css(selector).get()
             if image and image.strip():
-                result['image_url'] = response.urljoin(image.strip())
                 break
+            image = response.css(selector).get()
+        if image and image.strip():
+            result['image_url'] = response.urljoin(image.strip())
         
         if result:
             self.logger.debug(f"Generic selectors found: {list(result.keys())}")
@@ -696,8 +707,9 @@ class BaseNewsSpider(scrapy.Spider):
             image_url=extracted.get('image_url'),
         )
         
-        # Store raw HTML for fallback pipeline
-        item['_raw_html'] = response.text
+        # Register raw HTML in the side-channel store; the item carries a handle
+        store = get_html_store(getattr(self, 'settings', None))
+        item[HTML_HANDLE_FIELD] = store.put(response.url, response.body, response.encoding)
         
         self.stats.articles_processed += 1
         self.logger.info(f"Auto-extracted: {extracted.get('headline', '')[:50]}")
@@ -725,18 +737,22 @@ class BaseNewsSpider(scrapy.Spider):
         
         self.logger.info(f"Discovered {len(article_urls)} article links on {response.url}")
         
-        for url in article_urls:
-            # Skip if already in database
-            if self.is_url_in_db(url):
-                continue
-            
+        # Skip if already in database
+        new_urls = self.filter_new_urls(article_urls)
+        
+        # Drop URL shapes that have not been producing articles on this
+        # domain and request the best-yielding shapes first
+        domain = urlparse(response.url).netloc
+        learner = get_url_shape_learner(getattr(self, 'settings', None))
+        for url, shape, priority in learner.rank(domain, new_urls, owner=self.name):
             self.stats.articles_found += 1
 
             yield Request(
                 url=url,
                 callback=self.parse_article_auto,
                 errback=self.handle_request_failure,
-                meta={'auto_parse': True},
+                priority=priority,
+                meta={'auto_parse': True, SHAPE_META_KEY: (domain, shape)},
             )
     
     # ================================================================
@@ -789,25 +805,7 @@ class BaseNewsSpider(scrapy.Spider):
         if not date_str or date_str == "Unknown":
             return None
         
-        formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d',
-            '%B %d, %Y',
-            '%b %d, %Y',
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str.strip(), fmt)
-                if dt.tzinfo is None:
-                    dt = self.dhaka_tz.localize(dt)
-                return dt
-            except ValueError:
-                continue
-        
-        return None
+        return self.date_normalizer.parse_localized(date_str)
     
     # ================================================================
     # Author Extraction
@@ -831,44 +829,25 @@ class BaseNewsSpider(scrapy.Spider):
         """
         author = None
         
+        data = structured_data(response)
+        
         # Strategy 1: JSON-LD structured data
-        try:
-            json_ld_scripts = response.css('script[type="application/ld+json"]::text').getall()
-            for script_text in json_ld_scripts:
-                try:
-                    data = json.loads(script_text)
-                    
-                    # Handle @graph format
-                    if isinstance(data, dict) and '@graph' in data:
-                        data = data['@graph']
-                    
-                    # Handle list of items
-                    if isinstance(data, list):
-                        for item in data:
-                            author = self._extract_author_from_jsonld(item)
-                            if author:
-                                return author
-                    else:
-                        author = self._extract_author_from_jsonld(data)
-                        if author:
-                            return author
-                except (json.JSONDecodeError, TypeError):
-                    continue
-        except Exception as e:
-            self.logger.debug(f"JSON-LD author extraction failed: {e}")
+        for item in data.jsonld:
+            author = self._extract_author_from_jsonld(item)
+            if author:
+                return author
         
         # Strategy 2: Meta tags
-        meta_selectors = [
-            'meta[name="author"]::attr(content)',
-            'meta[property="article:author"]::attr(content)',
-            'meta[name="article:author"]::attr(content)',
-            'meta[property="og:article:author"]::attr(content)',
-            'meta[name="dcterms.creator"]::attr(content)',
-            'meta[name="dc.creator"]::attr(content)',
+        meta_keys = [
+            'author',
+            'article:author',
+            'og:article:author',
+            'dcterms.creator',
+            'dc.creator',
         ]
         
-        for selector in meta_selectors:
-            author = response.css(selector).get()
+        for key in meta_keys:
+            author = data.meta.get(key)
             if author and author.strip():
                 return self._clean_author_name(author)
         
@@ -1034,6 +1013,16 @@ class BaseNewsSpider(scrapy.Spider):
         self.logger.info(f"Articles processed: {self.stats.articles_processed}")
         self.logger.info(f"Duplicates skipped: {self.stats.duplicates_skipped}")
         self.logger.info(f"Date filtered: {self.stats.date_filtered}")
+        if self.stats.known_pages:
+            self.logger.info(
+                f"Listing pages already stored: {self.stats.known_pages} "
+                f"({len(self._stopped_listings)} listings stopped, {self.stats.pages_saved} page requests saved)"
+            )
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.set_value('frontier/known_pages', self.stats.known_pages)
+            crawler.stats.set_value('frontier/listings_stopped', len(self._stopped_listings))
+            crawler.stats.set_value('frontier/pages_saved', self.stats.pages_saved)
         if self.search_query:
             self.logger.info(f"Search filtered: {self.stats.search_filtered}")
         self.logger.info(f"Errors: {self.stats.errors}")
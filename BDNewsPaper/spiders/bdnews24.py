@@ -15,7 +15,6 @@ Features:
     - Client-side date filtering
 """
 
-import json
 from datetime import datetime
 from typing import Generator, Optional
 
@@ -25,6 +24,7 @@ from scrapy.selector import Selector
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 
 
 class BDNews24Spider(BaseNewsSpider):
@@ -325,24 +325,8 @@ class BDNews24Spider(BaseNewsSpider):
     
     def _extract_from_jsonld(self, response: Response) -> Optional[NewsArticleItem]:
         """Extract article data from JSON-LD."""
-        scripts = response.xpath("//script[@type='application/ld+json']/text()").getall()
-        
-        for script in scripts:
+        for data in structured_data(response).of_type("Article", "NewsArticle", "WebPage"):
             try:
-                data = json.loads(script)
-                
-                if isinstance(data, list):
-                    data = next(
-                        (item for item in data 
-                         if item.get("@type") in ["Article", "NewsArticle"]),
-                        None
-                    )
-                    if not data:
-                        continue
-                
-                if data.get("@type") not in ["Article", "NewsArticle", "WebPage"]:
-                    continue
-                
                 headline = data.get("headline", "")
                 body = data.get("articleBody", "") or data.get("description", "")
                 
@@ -382,7 +366,7 @@ class BDNews24Spider(BaseNewsSpider):
                     publisher="BD News 24",
                 )
                 
-            except (json.JSONDecodeError, KeyError, TypeError):
+            except (KeyError, TypeError):
                 continue
         
         return None
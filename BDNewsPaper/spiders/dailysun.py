@@ -32,6 +32,7 @@ from scrapy.http import Request, Response
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 from scrapy.selector import Selector
 from w3lib.html import remove_tags
 from html import unescape
@@ -315,6 +316,8 @@ class DailySunSpider(BaseNewsSpider):
             self.consecutive_empty[category] = 0
         
         # Process articles from JSON data
+        candidates = []
+        reached_start = False
         for article_data in articles:
             url = article_data.get('url', '')
             if not url:
@@ -327,10 +330,15 @@ class DailySunSpider(BaseNewsSpider):
             if pub_date and not self._is_date_valid(pub_date):
                 if self._is_before_start(pub_date):
                     self.logger.info(f"Stopping {category}: Article before start date")
-                    return
+                    reached_start = True
+                    break
                 continue
-            
-            if not self.is_url_in_db(full_url):
+            candidates.append((full_url, article_data))
+        
+        # One database query for the whole page
+        new_urls = set(self.filter_new_urls([full_url for full_url, _ in candidates], listing=category))
+        for full_url, article_data in candidates:
+            if full_url in new_urls:
                 self.stats['articles_found'] += 1
                 
                 # Try to create item from AJAX data
@@ -350,8 +358,11 @@ class DailySunSpider(BaseNewsSpider):
                         errback=self.handle_request_failure,
                     )
         
-        # Pagination
-        if articles and page < self.max_pages:
+        if reached_start:
+            return
+        
+        # Pagination (stops early once pages are already stored)
+        if articles and self.should_paginate(category, page):
             next_page = page + 1
             if request_type == "ajax_latest":
                 # Get last ID from response
@@ -372,6 +383,8 @@ class DailySunSpider(BaseNewsSpider):
         
         self.logger.info(f"Category '{category}' page {page}: Found {len(articles)} HTML articles")
         
+        candidates = []
+        reached_start = False
         for article in articles:
             # Extract basic info
             title_el = article.css('h3::text, h4::text, .title::text').get()
@@ -390,10 +403,20 @@ class DailySunSpider(BaseNewsSpider):
             # Check date
             if date_el and not self._is_date_valid(date_el):
                 if self._is_before_start(date_el):
-                    return
+                    reached_start = True
+                    break
                 continue
-            
-            if not self.is_url_in_db(full_url):
+            candidates.append((full_url, {
+                "title": title_el,
+                "summary": summary_el,
+                "date": date_el,
+                "image": img_el,
+            }))
+        
+        # One database query for the whole page
+        new_urls = set(self.filter_new_urls([full_url for full_url, _ in candidates], listing=category))
+        for full_url, preview_data in candidates:
+            if full_url in new_urls:
                 self.stats['articles_found'] += 1
                 
                 yield scrapy.Request(
@@ -401,18 +424,16 @@ class DailySunSpider(BaseNewsSpider):
                     callback=self.parse_article,
                     meta={
                         "category": category,
-                        "preview_data": {
-                            "title": title_el,
-                            "summary": summary_el,
-                            "date": date_el,
-                            "image": img_el,
-                        },
+                        "preview_data": preview_data,
                     },
                     errback=self.handle_request_failure,
                 )
         
-        # Pagination for HTML response
-        if len(articles) >= 10 and page < self.max_pages:
+        if reached_start:
+            return
+        
+        # Pagination for HTML response (stops early once pages are already stored)
+        if len(articles) >= 10 and self.should_paginate(category, page):
             category_info = response.meta.get("category_info", {})
             yield self._make_ajax_category_request(category, category_info, page + 1)
     
@@ -739,25 +760,10 @@ class DailySunSpider(BaseNewsSpider):
     
     def _extract_from_jsonld(self, response: Response) -> Optional[NewsArticleItem]:
         """Extract from JSON-LD structured data."""
-        scripts = response.xpath("//script[@type='application/ld+json']/text()").getall()
-        
-        for script in scripts:
+        for data in structured_data(response).of_type("Article", "NewsArticle"):
             try:
-                data = json.loads(script)
-                
-                if isinstance(data, list):
-                    data = next(
-                        (item for item in data if item.get("@type") in ["Article", "NewsArticle"]),
-                        None
-                    )
-                    if not data:
-                        continue
-                elif data.get("@type") not in ["Article", "NewsArticle"]:
-                    continue
-                
                 return self._create_item_from_jsonld(data, response)
-                
-            except (json.JSONDecodeError, KeyError):
+            except (KeyError):
                 continue
         
         return None
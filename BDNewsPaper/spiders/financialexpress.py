@@ -14,7 +14,6 @@ Features:
     - Client-side date filtering
 """
 
-import json
 from datetime import datetime
 from typing import Generator, Optional
 
@@ -23,6 +22,7 @@ from scrapy.http import Request, Response
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 from scrapy.selector import Selector
 from w3lib.html import remove_tags
 from html import unescape
@@ -411,24 +411,8 @@ class FinancialExpressSpider(BaseNewsSpider):
     
     def _extract_from_jsonld(self, response: Response) -> Optional[NewsArticleItem]:
         """Extract article data from JSON-LD."""
-        scripts = response.xpath("//script[@type='application/ld+json']/text()").getall()
-        
-        for script in scripts:
+        for data in structured_data(response).of_type("Article", "NewsArticle", "WebPage"):
             try:
-                data = json.loads(script)
-                
-                if isinstance(data, list):
-                    data = next(
-                        (item for item in data 
-                         if item.get("@type") in ["Article", "NewsArticle"]),
-                        None
-                    )
-                    if not data:
-                        continue
-                
-                if data.get("@type") not in ["Article", "NewsArticle", "WebPage"]:
-                    continue
-                
                 headline = data.get("headline", "")
                 body = data.get("articleBody", "") or data.get("description", "")
                 
@@ -468,7 +452,7 @@ class FinancialExpressSpider(BaseNewsSpider):
                     publisher="The Financial Express",
                 )
                 
-            except (json.JSONDecodeError, KeyError, TypeError):
+            except (KeyError, TypeError):
                 continue
         
         return None
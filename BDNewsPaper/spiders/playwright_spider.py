@@ -17,6 +17,9 @@ Setup:
 Usage:
     scrapy crawl kalerkantho_playwright  # Specific spider for Kaler Kantho
     scrapy crawl generic_playwright -a url=https://example.com -a selector=".article"
+
+    # Pooled pages, resource blocking and early DOM capture on listings
+    scrapy crawl kalerkantho_playwright -s PLAYWRIGHT_POOL_ENABLED=true
 """
 
 import scrapy
@@ -37,6 +40,8 @@ try:
 except ImportError:
     ArticleItem = dict
 
+from BDNewsPaper.playwright_pool import PagePool
+
 # Import PageMethod for Playwright actions
 try:
     from scrapy_playwright.page import PageMethod
@@ -60,13 +65,30 @@ class PlaywrightMixin:
     wait_for_cloudflare = True
     cf_wait_time = 8000  # 8 seconds for Cloudflare challenge
     
-    def get_playwright_meta(self, wait_for: str = None, timeout: int = None) -> Dict:
+    def _get_page_pool(self) -> Optional[PagePool]:
+        """Page pool for the pooled rendering mode, or None when disabled."""
+        if not hasattr(self, "_page_pool"):
+            settings = getattr(self, "settings", None)
+            enabled = settings is not None and settings.getbool("PLAYWRIGHT_POOL_ENABLED", False)
+            self._page_pool = PagePool.from_settings(settings) if enabled else None
+        return self._page_pool
+    
+    def get_playwright_meta(
+        self,
+        wait_for: str = None,
+        timeout: int = None,
+        url: str = None,
+        links_only: bool = False,
+    ) -> Dict:
         """
         Get Playwright meta dictionary for request.
         
         Args:
             wait_for: CSS selector to wait for before returning
             timeout: Custom timeout in milliseconds
+            url: Request URL (enables the per-domain page pool when configured)
+            links_only: Page is only scanned for links; in pooled mode the DOM
+                is returned as soon as ``wait_for`` is attached
         """
         meta = {
             "playwright": True,
@@ -74,17 +96,39 @@ class PlaywrightMixin:
             "playwright_context": "default",
         }
         
+        pool = self._get_page_pool() if url else None
+        early_dom = bool(pool and links_only and wait_for)
+        
+        if pool:
+            meta["playwright_context"] = pool.context_name(url)
+            meta["playwright_context_kwargs"] = pool.context_kwargs
+            meta["playwright_page_init_callback"] = pool.init_page
+            # PagePoolMiddleware hands over a warm page at download time
+            meta["playwright_pool_url"] = url
+            
+            if early_dom:
+                meta["playwright_links_only"] = True
+                meta["playwright_page_goto_kwargs"] = {"wait_until": "domcontentloaded"}
+        
         # Page methods to execute (must be PageMethod objects, not dicts)
         page_methods = []
         
         if PLAYWRIGHT_AVAILABLE and PageMethod:
-            if self.wait_for_cloudflare:
+            if self.wait_for_cloudflare and not early_dom:
                 # Wait for Cloudflare challenge to complete
                 page_methods.append(
                     PageMethod("wait_for_timeout", self.cf_wait_time)
                 )
             
-            if wait_for:
+            if early_dom:
+                # The selector only appears once any challenge has cleared
+                page_methods.append(
+                    PageMethod(
+                        "wait_for_selector", wait_for,
+                        state="attached", timeout=timeout or self.timeout,
+                    )
+                )
+            elif wait_for:
                 page_methods.append(
                     PageMethod("wait_for_selector", wait_for, timeout=timeout or self.timeout)
                 )
@@ -93,6 +137,39 @@ class PlaywrightMixin:
             meta["playwright_page_methods"] = page_methods
         
         return meta
+    
+    async def release_playwright_page(self, response) -> None:
+        """Return the page of a response (or failed request) to the pool, or close it."""
+        page = response.meta.get("playwright_page")
+        if not page:
+            return
+        
+        pool = self._get_page_pool()
+        pool_url = response.meta.get("playwright_pool_url")
+        try:
+            if pool is None or not pool_url or not pool.release(pool_url, page):
+                await page.close()
+        except Exception as e:
+            self.logger.debug(f"Error releasing page: {e}")
+    
+    async def close_page_pool(self) -> None:
+        """Close pooled pages and per-domain contexts (pooled mode only)."""
+        pool = self._get_page_pool()
+        if pool is not None:
+            await pool.close_all()
+    
+    def log_page_pool_stats(self) -> None:
+        """Log page pool statistics (pooled mode only)."""
+        pool = self._get_page_pool()
+        if pool is None:
+            return
+        self.logger.info(
+            f"Page pool: reused={pool.stats['pages_reused']}, "
+            f"released={pool.stats['pages_released']}, "
+            f"discarded={pool.stats['pages_discarded']}, "
+            f"blocked={pool.stats['requests_blocked']}, "
+            f"allowed={pool.stats['requests_allowed']}"
+        )
 
 
 class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
@@ -189,7 +266,9 @@ class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
                 callback=self.parse_category,
                 meta={
                     # Updated wait_for selectors for 2024-2025 layout
-                    **self.get_playwright_meta(wait_for=".container, .catLead, .row, h4"),
+                    **self.get_playwright_meta(
+                        wait_for=".container, .catLead, .row, h4", url=url, links_only=True
+                    ),
                     "category": cat_name
                 },
                 errback=self.errback_playwright,
@@ -205,13 +284,14 @@ class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         
         if page:
             try:
-                # Scroll to load more content
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(2000)
+                # Scroll to load more content (links-only pages are already captured)
+                if not response.meta.get("playwright_links_only"):
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.wait_for_timeout(2000)
             except Exception as e:
                 self.logger.warning(f"Error scrolling page: {e}")
             finally:
-                await page.close()
+                await self.release_playwright_page(response)
         
         # Extract article links - updated selectors based on current site layout
         article_links = set()
@@ -253,7 +333,7 @@ class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
                 callback=self.parse_article,
                 meta={
                     # Updated: use generic selectors that exist on article pages
-                    **self.get_playwright_meta(wait_for=".container, h1, .row"),
+                    **self.get_playwright_meta(wait_for=".container, h1, .row", url=url),
                     "category": category
                 },
                 errback=self.errback_playwright
@@ -270,7 +350,7 @@ class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
             except Exception:
                 pass
             finally:
-                await page.close()
+                await self.release_playwright_page(response)
         
         # Extract headline
         headline = (
@@ -330,18 +410,14 @@ class KalerKanthoPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         """Handle Playwright errors gracefully."""
         self.logger.error(f"Playwright error: {failure}")
         
-        # Try to close page if it exists
-        try:
-            page = failure.request.meta.get("playwright_page")
-            if page:
-                await page.close()
-        except Exception:
-            pass
+        await self.release_playwright_page(failure.request)
 
     def closed(self, reason):
         """Log statistics when spider closes."""
         self.logger.info(f"Spider closed: {reason}")
         self.logger.info(f"Total articles scraped: {self.articles_scraped}")
+        self.log_page_pool_stats()
+        return self.close_page_pool()
 
 
 class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
@@ -442,7 +518,7 @@ class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         yield Request(
             url=self.target_url,
             callback=self.parse,
-            meta=self.get_playwright_meta(wait_for=self.content_selector),
+            meta=self.get_playwright_meta(wait_for=self.content_selector, url=self.target_url),
             errback=self.errback_playwright
         )
     
@@ -467,7 +543,7 @@ class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
             except Exception as e:
                 self.logger.warning(f"Page interaction error: {e}")
             finally:
-                await page.close()
+                await self.release_playwright_page(response)
         
         # Follow links if enabled
         if self.follow_links:
@@ -480,7 +556,7 @@ class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
                     yield Request(
                         url=full_url,
                         callback=self.parse_article,
-                        meta=self.get_playwright_meta(wait_for=self.content_selector),
+                        meta=self.get_playwright_meta(wait_for=self.content_selector, url=full_url),
                         errback=self.errback_playwright
                     )
         
@@ -530,7 +606,7 @@ class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
             except Exception:
                 pass
             finally:
-                await page.close()
+                await self.release_playwright_page(response)
         
         for item in self.extract_articles(response):
             yield item
@@ -575,17 +651,14 @@ class GenericPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         """Handle Playwright errors."""
         self.logger.error(f"❌ Playwright error: {failure}")
         
-        try:
-            page = failure.request.meta.get("playwright_page")
-            if page:
-                await page.close()
-        except Exception:
-            pass
+        await self.release_playwright_page(failure.request)
 
     def closed(self, reason):
         """Log statistics."""
         self.logger.info(f"Spider closed: {reason}")
         self.logger.info(f"Total articles scraped: {self.articles_scraped}")
+        self.log_page_pool_stats()
+        return self.close_page_pool()
 
 
 class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
@@ -682,7 +755,9 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
                 errback=self.errback_playwright,
                 meta={
                     # Updated wait_for selectors for 2024-2025 layout
-                    **self.get_playwright_meta(wait_for=".container, .row, h4, h5"),
+                    **self.get_playwright_meta(
+                        wait_for=".container, .row, h4, h5", url=url, links_only=True
+                    ),
                     "category": cat_name,
                 }
             )
@@ -693,13 +768,8 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         
         self.logger.info(f"📑 Parsing category: {category}")
         
-        # Close the page after getting content
-        page = response.meta.get("playwright_page")
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
+        # Release the page after getting content
+        await self.release_playwright_page(response)
 
         # Extract article links - UPDATED selectors for current Daily Sun layout (2024-2025)
         # NOTE: Site changed from /post/{id} to /{category}/{id}/{slug} pattern
@@ -742,7 +812,10 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
                 callback=self.parse_article,
                 errback=self.errback_playwright,
                 meta={
-                    **self.get_playwright_meta(wait_for=".article-content, .post-content, .detail-content, .news-details"),
+                    **self.get_playwright_meta(
+                        wait_for=".article-content, .post-content, .detail-content, .news-details",
+                        url=article_url,
+                    ),
                     "category": category,
                 }
             )
@@ -751,13 +824,8 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         """Parse individual article with Playwright."""
         category = response.meta.get("category", "Unknown")
         
-        # Close the page
-        page = response.meta.get("playwright_page")
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
+        # Release the page
+        await self.release_playwright_page(response)
 
         # Extract headline
         headline = (
@@ -822,12 +890,7 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         """Handle Playwright errors gracefully."""
         self.logger.error(f"❌ Playwright error: {failure}")
         
-        try:
-            page = failure.request.meta.get("playwright_page")
-            if page:
-                await page.close()
-        except Exception:
-            pass
+        await self.release_playwright_page(failure.request)
 
     def closed(self, reason):
         """Log statistics when spider closes."""
@@ -837,4 +900,6 @@ class DailySunPlaywrightSpider(scrapy.Spider, PlaywrightMixin):
         self.logger.info(f"Spider closed: {reason}")
         self.logger.info(f"Total articles scraped: {self.articles_scraped}")
         self.logger.info(f"URLs processed: {len(self.processed_urls)}")
+        self.log_page_pool_stats()
         self.logger.info("=" * 50)
+        return self.close_page_pool()
@@ -27,6 +27,7 @@ from scrapy.http import Response
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 
 
 class ProthomaloSpider(BaseNewsSpider):
@@ -305,8 +306,9 @@ class ProthomaloSpider(BaseNewsSpider):
         )
         
         # Process articles
+        listing = category if request_type == "category" else "search"
+        candidates = []
         for item in items:
-            slug = item.get("slug")
             url = item.get("url")
             
             # Validate URL - skip invalid patterns
@@ -315,8 +317,12 @@ class ProthomaloSpider(BaseNewsSpider):
                 continue
             
             full_url = f"https://en.prothomalo.com{url}" if not url.startswith('http') else url
-            
-            if not self.is_url_in_db(full_url):
+            candidates.append((full_url, url, item))
+        
+        # One database query for the whole page
+        new_urls = set(self.filter_new_urls([full_url for full_url, _, _ in candidates], listing=listing))
+        for full_url, url, item in candidates:
+            if full_url in new_urls:
                 self.stats['articles_found'] += 1
                 
                 # Use route-data.json API for full article content
@@ -338,11 +344,12 @@ class ProthomaloSpider(BaseNewsSpider):
                     errback=self._handle_route_data_error,
                 )
         
-        # Handle pagination
+        # Handle pagination (stops early once pages are already stored)
+        last_page = -(-total_results // self.page_limit) if total_results else None
         if request_type == "category":
             section_id = response.meta.get("section_id")
             if (offset + self.page_limit < total_results and 
-                page_num < self.max_pages and 
+                self.should_paginate(listing, page_num, last_page) and 
                 len(items) > 0):
                 
                 next_offset = offset + self.page_limit
@@ -350,7 +357,7 @@ class ProthomaloSpider(BaseNewsSpider):
         else:
             # Search pagination
             if (offset + self.page_limit < total_results and 
-                page_num < self.max_pages and 
+                self.should_paginate(listing, page_num, last_page) and 
                 len(items) > 0):
                 
                 next_offset = offset + self.page_limit
@@ -552,25 +559,10 @@ class ProthomaloSpider(BaseNewsSpider):
     
     def _extract_from_jsonld(self, response: Response) -> Optional[NewsArticleItem]:
         """Extract from JSON-LD structured data."""
-        scripts = response.xpath("//script[@type='application/ld+json']/text()").getall()
-        
-        for script in scripts:
+        for data in structured_data(response).of_type("Article", "NewsArticle"):
             try:
-                data = json.loads(script)
-                
-                if isinstance(data, list):
-                    data = next(
-                        (item for item in data if item.get("@type") in ["Article", "NewsArticle"]),
-                        None
-                    )
-                    if not data:
-                        continue
-                elif data.get("@type") not in ["Article", "NewsArticle"]:
-                    continue
-                
                 return self._create_item_from_jsonld(data, response)
-                
-            except (json.JSONDecodeError, KeyError):
+            except (KeyError):
                 continue
         
         return None
@@ -18,7 +18,6 @@ Features:
     - TLS client headers for Cloudflare handling
 """
 
-import json
 import re
 import xml.etree.ElementTree as ET
 from datetime import datetime
@@ -30,6 +29,7 @@ from scrapy.http import Response
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 
 
 class TheDailyStarSpider(BaseNewsSpider):
@@ -497,30 +497,10 @@ class TheDailyStarSpider(BaseNewsSpider):
     
     def _extract_from_jsonld(self, response: Response) -> Optional[NewsArticleItem]:
         """Extract from JSON-LD structured data."""
-        scripts = response.xpath("//script[@type='application/ld+json']/text()").getall()
-        
-        for script in scripts:
+        for data in structured_data(response).of_type("Article", "NewsArticle", "WebPage"):
             try:
-                data = json.loads(script)
-                
-                # Handle array format
-                if isinstance(data, list):
-                    data = next(
-                        (item for item in data 
-                         if item.get("@type") in ["Article", "NewsArticle", "WebPage"]),
-                        None
-                    )
-                    if not data:
-                        continue
-                
-                # Check for NewsArticle type
-                item_type = data.get("@type", "")
-                if item_type not in ["Article", "NewsArticle", "WebPage"]:
-                    continue
-                
                 return self._create_item_from_jsonld(data, response)
-                
-            except (json.JSONDecodeError, KeyError, TypeError):
+            except (KeyError, TypeError):
                 continue
         
         return None
@@ -21,6 +21,7 @@ from scrapy.http import Request, Response, XmlResponse
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import structured_data
 
 
 class VOABanglaSpider(BaseNewsSpider):
@@ -269,23 +270,7 @@ class VOABanglaSpider(BaseNewsSpider):
     
     def _extract_json_ld(self, response: Response) -> Optional[dict]:
         """Extract JSON-LD structured data."""
-        scripts = response.css('script[type="application/ld+json"]::text').getall()
-        
-        for script in scripts:
-            try:
-                data = json.loads(script)
-                # Look for NewsArticle type
-                if isinstance(data, dict):
-                    if data.get('@type') == 'NewsArticle':
-                        return data
-                elif isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and item.get('@type') == 'NewsArticle':
-                            return item
-            except json.JSONDecodeError:
-                continue
-        
-        return None
+        return structured_data(response).first_of_type('NewsArticle')
     
     def _extract_article_body(self, response: Response) -> str:
         """Extract article body from HTML."""
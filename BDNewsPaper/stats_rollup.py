@@ -0,0 +1,361 @@
+"""
+Article Statistics Rollup
+=========================
+Materialized counters for stats endpoints, dashboards and monitors.
+
+Counting articles with ``COUNT(*)``/``GROUP BY paper_name`` over the whole
+``articles`` table gets slower with every article archived. This module
+keeps one row per (grain, bucket, paper, category, language) in the
+``article_rollup`` table instead:
+
+    grain 'all'   - bucket ''                  (all-time totals)
+    grain 'day'   - bucket 'YYYY-MM-DD'        (calendar day of scraped_at)
+    grain 'hour'  - bucket 'YYYY-MM-DD HH'     (hour of scraped_at, kept 8 days)
+
+Each row holds the article count, total article length, the publication
+date range and the latest scraped_at. Readers touch a number of rows that
+depends on papers x categories x buckets in the window, never on how many
+articles there are. Windows are hour-aligned ("last 24 hours" includes the
+whole hour the cutoff falls in); windows longer than the hourly retention
+are day-aligned.
+
+SharedSQLitePipeline folds every article in within the insert's
+transaction. Rows written by anything else are picked up on the next
+``ensure()``, which folds articles past the last one seen (the REST API
+only reads the rollup and never runs it). Deleting
+articles needs a rebuild (ArticlePartitions.archive() runs one):
+
+    python -m BDNewsPaper.stats_rollup --rebuild
+    python -m BDNewsPaper.stats_rollup --show
+
+Usage:
+    from BDNewsPaper.stats_rollup import StatsRollup
+
+    rollup = StatsRollup(conn)
+    rollup.ensure()
+    rollup.counts_by('paper_name', hours=24)
+"""
+
+import argparse
+import logging
+import sqlite3
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Dimensions a rollup can be grouped by
+DIMENSIONS = ('paper_name', 'category', 'language')
+
+# Hourly buckets older than this are dropped; longer windows use day buckets
+HOURLY_RETENTION_HOURS = 8 * 24
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS article_rollup (
+        grain TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        paper_name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        language TEXT NOT NULL,
+        articles INTEGER NOT NULL,
+        total_length INTEGER NOT NULL,
+        first_published TEXT,
+        last_published TEXT,
+        last_scraped TEXT,
+        PRIMARY KEY (grain, bucket, paper_name, category, language)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS article_rollup_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_article_id INTEGER NOT NULL
+    );
+"""
+
+# Folds articles with first < id <= last into every grain (the hour grain
+# only within retention). Missing category/language become '' so they
+# still take part in the primary key.
+_FOLD = """
+    INSERT INTO article_rollup (
+        grain, bucket, paper_name, category, language, articles,
+        total_length, first_published, last_published, last_scraped
+    )
+    SELECT
+        g.grain,
+        CASE g.grain
+            WHEN 'hour' THEN COALESCE(substr(a.scraped_at, 1, 13), '')
+            WHEN 'day' THEN COALESCE(substr(a.scraped_at, 1, 10), '')
+            ELSE ''
+        END,
+        a.paper_name,
+        COALESCE(a.category, ''),
+        COALESCE(a.source_language, ''),
+        COUNT(*),
+        COALESCE(SUM(LENGTH(a.article)), 0),
+        MIN(a.publication_date),
+        MAX(a.publication_date),
+        MAX(a.scraped_at)
+    FROM articles a
+    CROSS JOIN (SELECT 'all' AS grain UNION ALL SELECT 'day' UNION ALL SELECT 'hour') g
+    WHERE a.id > ? AND a.id <= ?
+      AND (g.grain != 'hour' OR a.scraped_at >= strftime('%Y-%m-%d %H', 'now', ?))
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (grain, bucket, paper_name, category, language) DO UPDATE SET
+        articles = articles + excluded.articles,
+        total_length = total_length + excluded.total_length,
+        first_published = COALESCE(
+            MIN(first_published, excluded.first_published), first_published, excluded.first_published),
+        last_published = COALESCE(
+            MAX(last_published, excluded.last_published), last_published, excluded.last_published),
+        last_scraped = COALESCE(
+            MAX(last_scraped, excluded.last_scraped), last_scraped, excluded.last_scraped)
+"""
+
+
+# First hour bucket of a window (parameter: '-N hours')
+_HOUR_CUTOFF = "strftime('%Y-%m-%d %H', 'now', ?)"
+
+
+class StatsRollup:
+    """
+    Reader and maintainer of the article rollup on an open connection.
+
+    The caller owns the connection. ``record`` runs inside the caller's
+    transaction; ``ensure``, ``catch_up`` and ``rebuild`` commit their own.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='article_rollup_state'"
+        ).fetchone() is not None
+
+    def create_schema(self) -> bool:
+        """Create the rollup tables. Returns True if they did not exist."""
+        if self.exists():
+            return False
+        self.conn.executescript(_SCHEMA)
+        return True
+
+    def ensure(self) -> bool:
+        """
+        Make the rollup usable: create and backfill it if missing, otherwise
+        fold in articles it has not seen. Returns False if the articles
+        table does not exist.
+        """
+        has_articles = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name='articles'"
+        ).fetchone()
+        if not has_articles:
+            return False
+        try:
+            if self.create_schema():
+                logger.info("Backfilling stats rollup from the articles table")
+                self.rebuild()
+            else:
+                self.catch_up()
+                self.prune()
+        except sqlite3.OperationalError as e:
+            # Read-only database or a writer holding the lock: serve what is there
+            logger.warning(f"Stats rollup not refreshed: {e}")
+        return True
+
+    def record(self, article_id: int) -> None:
+        """Fold a just-inserted article in, inside the caller's transaction."""
+        last = self._last_article_id()
+        if article_id > last:
+            self._fold(last, article_id)
+
+    def catch_up(self) -> int:
+        """Fold in articles inserted since the rollup last saw one."""
+        last = self._last_article_id()
+        if self._max_article_id(last) == last:
+            return 0
+        own_transaction = not self.conn.in_transaction
+        if own_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock; another writer may have caught up
+            last = self._last_article_id()
+            newest = self._max_article_id(last)
+            if newest > last:
+                self._fold(last, newest)
+        except Exception:
+            if own_transaction:
+                self.conn.rollback()
+            raise
+        if own_transaction:
+            self.conn.commit()
+        return max(0, newest - last)
+
+    def prune(self) -> int:
+        """Drop hourly buckets past retention. Returns rows deleted."""
+        where = f"grain = 'hour' AND bucket < {_HOUR_CUTOFF}"
+        params = (f"-{HOURLY_RETENTION_HOURS} hours",)
+        if not self.conn.execute(f"SELECT 1 FROM article_rollup WHERE {where} LIMIT 1", params).fetchone():
+            return 0
+        deleted = self.conn.execute(f"DELETE FROM article_rollup WHERE {where}", params).rowcount
+        self.conn.commit()
+        return deleted
+
+    def rebuild(self) -> int:
+        """Recompute the rollup from the articles table. Returns rows folded."""
+        self.create_schema()
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM article_rollup")
+            self.conn.execute("DELETE FROM article_rollup_state")
+            newest = self._max_article_id()
+            self._fold(0, newest)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(articles), 0) FROM article_rollup WHERE grain = 'all'"
+        ).fetchone()[0]
+
+    def _fold(self, first: int, last: int) -> None:
+        self.conn.execute(_FOLD, (first, last, f"-{HOURLY_RETENTION_HOURS} hours"))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO article_rollup_state (id, last_article_id) VALUES (1, ?)",
+            (last,)
+        )
+
+    def _last_article_id(self) -> int:
+        row = self.conn.execute(
+            "SELECT last_article_id FROM article_rollup_state WHERE id = 1"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _max_article_id(self, after: int = 0) -> int:
+        # Bounded below so a partitioned (UNION ALL) articles view only
+        # range-scans the newest ids instead of every partition
+        return self.conn.execute(
+            "SELECT COALESCE(MAX(id), ?) FROM articles WHERE id > ?", (after, after)
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _window(hours: Optional[float], day: Optional[str]):
+        """WHERE clause and parameters selecting the grain and buckets."""
+        if day is not None:
+            if day == 'today':
+                return "grain = 'day' AND bucket = date('now')", ()
+            return "grain = 'day' AND bucket = ?", (day,)
+        if hours is not None:
+            if hours >= HOURLY_RETENTION_HOURS:
+                return "grain = 'day' AND bucket >= date('now', ?)", (f"-{float(hours)} hours",)
+            return f"grain = 'hour' AND bucket >= {_HOUR_CUTOFF}", (f"-{float(hours)} hours",)
+        return "grain = 'all'", ()
+
+    def totals(self, hours: Optional[float] = None, day: Optional[str] = None) -> Dict:
+        """
+        Article count, average length and publication date range.
+
+        ``hours`` limits to articles scraped in the last N hours; ``day`` to
+        one UTC calendar day ('YYYY-MM-DD' or 'today'). Neither means all time.
+        """
+        where, params = self._window(hours, day)
+        row = self.conn.execute(f"""
+            SELECT COALESCE(SUM(articles), 0), COALESCE(SUM(total_length), 0),
+                   MIN(first_published), MAX(last_published), MAX(last_scraped),
+                   COUNT(DISTINCT paper_name),
+                   COUNT(DISTINCT NULLIF(category, ''))
+            FROM article_rollup WHERE {where}
+        """, params).fetchone()
+        articles, length = row[0], row[1]
+        return {
+            "articles": articles,
+            "avg_length": length / articles if articles else 0,
+            "earliest_published": row[2],
+            "latest_published": row[3],
+            "last_scraped": row[4],
+            "papers": row[5],
+            "categories": row[6],
+        }
+
+    def counts_by(self, dimension: str, hours: Optional[float] = None,
+                  day: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Article counts per paper_name, category or language, largest first.
+
+        Articles without a value for the dimension are left out.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+        where, params = self._window(hours, day)
+        query = f"""
+            SELECT {dimension}, SUM(articles) AS count
+            FROM article_rollup
+            WHERE {where} AND {dimension} != ''
+            GROUP BY {dimension}
+            ORDER BY count DESC
+        """
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return {row[0]: row[1] for row in self.conn.execute(query, params).fetchall()}
+
+    def papers(self) -> List[Dict]:
+        """All-time per-paper count, latest publication date and last scrape."""
+        rows = self.conn.execute("""
+            SELECT paper_name, SUM(articles) AS count,
+                   MAX(last_published) AS latest_article,
+                   MAX(last_scraped) AS last_scraped,
+                   SUM(total_length) AS total_length
+            FROM article_rollup
+            WHERE grain = 'all'
+            GROUP BY paper_name
+            ORDER BY count DESC
+        """).fetchall()
+        return [
+            {
+                "paper_name": row[0],
+                "count": row[1],
+                "latest_article": row[2],
+                "last_scraped": row[3],
+                "avg_length": row[4] / row[1] if row[1] else 0,
+            }
+            for row in rows
+        ]
+
+
+def main():
+    """Command line interface for the stats rollup."""
+    parser = argparse.ArgumentParser(description="Article statistics rollup")
+    parser.add_argument("--db", default="news_articles.db", help="SQLite database path")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the rollup from articles")
+    parser.add_argument("--show", action="store_true", help="Print rollup totals")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30.0)
+    rollup = StatsRollup(conn)
+    try:
+        if args.rebuild:
+            folded = rollup.rebuild()
+            print(f"Rebuilt rollup from {folded:,} articles")
+        elif not rollup.ensure():
+            print(f"No articles table in {args.db}")
+            return
+
+        if args.show or not args.rebuild:
+            totals = rollup.totals()
+            print(f"Articles:   {totals['articles']:,}")
+            print(f"Last 24h:   {rollup.totals(hours=24)['articles']:,}")
+            print(f"Published:  {totals['earliest_published']} .. {totals['latest_published']}")
+            for paper in rollup.papers():
+                print(f"  {paper['paper_name']:<24} {paper['count']:>10,}  last scraped {paper['last_scraped']}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Streaming Statistics
+====================
+Fixed-memory latency percentiles, throughput and status mix per domain.
+
+StatisticsMiddleware used to append every response time to a list per
+spider (and reported only a mean), and AdaptiveThrottlingMiddleware kept
+its window in a list trimmed with ``pop(0)``. On a million-request
+backfill that is millions of floats held until close. The pieces here
+keep memory constant however long the crawl runs:
+
+    QuantileSketch   relative-error quantiles (DDSketch-style log
+                     buckets): p50/p95/p99 within RELATIVE_ACCURACY of
+                     the true value, at most MAX_BUCKETS counters
+    RingBuffer       the last N values and their running sum, for
+                     windowed means
+    DomainStats      one domain's latency sketch, bytes, request and
+                     response counts and status mix
+    StreamingStats   DomainStats by domain for one spider
+
+``get_streaming_stats(name)`` returns the process-wide StreamingStats of
+a spider (``new_streaming_stats`` starts a fresh one when the spider
+opens). StatisticsMiddleware feeds it and exports it to the crawl stats
+at close; PrometheusMetricsExtension serves it live.
+
+Usage:
+    from BDNewsPaper.streaming_stats import get_streaming_stats
+
+    stats = get_streaming_stats('prothomalo')
+    stats.observe('www.prothomalo.com', latency=0.42, status=200, size=81234)
+    stats.summary('www.prothomalo.com')['latency_p95_s']
+"""
+
+import math
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+
+RELATIVE_ACCURACY = 0.01
+MAX_BUCKETS = 512
+
+# Values at or below this count as zero (no log bucket)
+_MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Quantiles with bounded relative error in bounded memory.
+
+    A value lands in log bucket ceil(log_gamma(value)), gamma =
+    (1 + a) / (1 - a), and is reported back as the bucket's midpoint,
+    within relative accuracy `a`. Past `max_buckets` the lowest buckets
+    are folded together, so only the smallest values lose accuracy.
+    """
+
+    __slots__ = ('gamma', 'log_gamma', 'max_buckets', 'bins', 'zeros', 'count', 'total', 'min', 'max')
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_buckets: int = MAX_BUCKETS):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= _MIN_VALUE:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        bins = self.bins
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_buckets
+        into = keys[excess]
+        for key in keys[:excess]:
+            self.bins[into] += self.bins.pop(key)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Add another sketch's values (same relative accuracy) to this one."""
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)) -> List[float]:
+        return [self.quantile(q) for q in qs]
+
+
+class RingBuffer:
+    """The last `size` values with their running sum, in a fixed list."""
+
+    __slots__ = ('values', 'size', 'index', 'count', 'total')
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self.values = [0.0] * self.size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def append(self, value: float) -> None:
+        if self.count == self.size:
+            self.total -= self.values[self.index]
+        else:
+            self.count += 1
+        self.values[self.index] = value
+        self.total += value
+        self.index = (self.index + 1) % self.size
+        if self.index == 0:
+            # Once per lap: drop the float drift of the running sum
+            self.total = sum(self.values[:self.count])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[float]:
+        """Oldest first."""
+        start = self.index if self.count == self.size else 0
+        for i in range(self.count):
+            yield self.values[(start + i) % self.size]
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class DomainStats:
+    """Latency, throughput and status mix of one domain."""
+
+    __slots__ = ('latency', 'requests', 'responses', 'bytes', 'statuses', 'first_seen', 'last_seen')
+
+    def __init__(self):
+        self.latency = QuantileSketch()
+        self.requests = 0
+        self.responses = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+        self.first_seen: Optional[float] = None
+        self.last_seen: Optional[float] = None
+
+    def observe(self, latency: Optional[float], status: int, size: int, now: float) -> None:
+        self.responses += 1
+        self.bytes += size
+        self.statuses[status] += 1
+        if latency is not None:
+            self.latency.add(latency)
+        if self.first_seen is None:
+            self.first_seen = now
+        self.last_seen = now
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Body bytes per second between the first and last response (at least 1s)."""
+        if self.first_seen is None:
+            return 0.0
+        return self.bytes / max(self.last_seen - self.first_seen, 1.0)
+
+
+class StreamingStats:
+    """DomainStats by domain for one spider."""
+
+    def __init__(self, clock=time.monotonic):
+        self.domains: Dict[str, DomainStats] = {}
+        self.clock = clock
+
+    def _domain(self, domain: str) -> DomainStats:
+        stats = self.domains.get(domain)
+        if stats is None:
+            stats = self.domains[domain] = DomainStats()
+        return stats
+
+    def note_request(self, domain: str) -> None:
+        self._domain(domain).requests += 1
+
+    def observe(self, domain: str, latency: Optional[float], status: int, size: int = 0) -> None:
+        """Record one response: latency in seconds (None if unknown), status and body size."""
+        self._domain(domain).observe(latency, status, size, self.clock())
+
+    def summary(self, domain: str) -> Dict[str, float]:
+        stats = self.domains[domain]
+        p50, p95, p99 = stats.latency.quantiles()
+        summary = {
+            'requests': stats.requests,
+            'responses': stats.responses,
+            'bytes': stats.bytes,
+            'bytes_per_s': round(stats.bytes_per_second),
+            'latency_p50_s': round(p50, 3),
+            'latency_p95_s': round(p95, 3),
+            'latency_p99_s': round(p99, 3),
+        }
+        for status, count in sorted(stats.statuses.items()):
+            summary[f'status_{status}'] = count
+        return summary
+
+    def export(self, stats, prefix: str = 'domain') -> None:
+        """Write every domain's summary to a Scrapy stats collector."""
+        for domain in self.domains:
+            for key, value in self.summary(domain).items():
+                stats.set_value(f'{prefix}/{domain}/{key}', value)
+
+
+_default_streams: Dict[str, StreamingStats] = {}
+_default_streams_lock = threading.Lock()
+
+
+def get_streaming_stats(name: str) -> StreamingStats:
+    """Get or create the process-wide StreamingStats of a spider."""
+    with _default_streams_lock:
+        stats = _default_streams.get(name)
+        if stats is None:
+            stats = _default_streams[name] = StreamingStats()
+        return stats
+
+
+def new_streaming_stats(name: str) -> StreamingStats:
+    """Start a fresh process-wide StreamingStats for a spider, replacing an earlier run's."""
+    with _default_streams_lock:
+        stats = _default_streams[name] = StreamingStats()
+        return stats
+
+
+def all_streaming_stats() -> Dict[str, StreamingStats]:
+    """Every spider's StreamingStats, by spider name."""
+    with _default_streams_lock:
+        return dict(_default_streams)
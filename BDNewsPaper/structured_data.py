@@ -0,0 +1,151 @@
+"""
+Structured Data View
+====================
+Parsed JSON-LD, OpenGraph/Twitter meta tags and <time> elements of a page,
+computed once and shared by every extractor that needs them.
+
+``structured_data(response)`` memoizes a StructuredData per response, so
+BaseNewsSpider.extract_from_jsonld, extract_author, try_generic_selectors,
+the spiders' own ``_extract_from_jsonld`` and JSONLDExtractor run one CSS
+query and one ``json.loads`` per ld+json block between them instead of
+one each. Every part is computed on first access; a page whose JSON-LD
+answers everything never has its meta tags collected.
+
+Usage:
+    from BDNewsPaper.structured_data import structured_data
+
+    data = structured_data(response)
+    article = data.first_of_type(*ARTICLE_TYPES)
+    image = data.meta.get('og:image')
+"""
+
+import json
+import logging
+import re
+import weakref
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional
+
+from parsel import Selector
+
+logger = logging.getLogger(__name__)
+
+# schema.org types that describe an article page
+ARTICLE_TYPES = (
+    'Article', 'NewsArticle', 'BlogPosting', 'WebPage',
+    'ReportageNewsArticle', 'AnalysisNewsArticle',
+)
+
+_JSONLD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+_views: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def node_types(node: Dict[str, Any]) -> List[str]:
+    """A JSON-LD node's @type as a list (it may be a string or a list)."""
+    types = node.get('@type', '')
+    if isinstance(types, list):
+        return [t for t in types if isinstance(t, str)]
+    return [types] if isinstance(types, str) and types else []
+
+
+def _flatten(data: Any) -> Iterator[Dict[str, Any]]:
+    """Yield the nodes of a decoded block: lists and @graph are unrolled."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _flatten(item)
+    elif isinstance(data, dict):
+        if '@graph' in data:
+            yield from _flatten(data['@graph'])
+        else:
+            yield data
+
+
+class StructuredData:
+    """
+    Lazily parsed structured data of one page.
+
+    Built from a response's selector (sharing Scrapy's parsed tree) or
+    from a raw HTML string, in which case JSON-LD is found with a regex
+    and the tree is only built if meta tags or times are asked for.
+    """
+
+    def __init__(self, selector: Optional[Selector] = None, html: Optional[str] = None):
+        self._selector = selector
+        self._html = html
+
+    @classmethod
+    def from_html(cls, html: str) -> 'StructuredData':
+        return cls(html=html)
+
+    @property
+    def selector(self) -> Selector:
+        if self._selector is None:
+            self._selector = Selector(text=self._html or '')
+        return self._selector
+
+    @cached_property
+    def jsonld_blocks(self) -> List[str]:
+        """Raw text of the page's ld+json script blocks."""
+        if self._selector is None and self._html is not None:
+            return _JSONLD_RE.findall(self._html)
+        return self.selector.css('script[type="application/ld+json"]::text').getall()
+
+    @cached_property
+    def jsonld(self) -> List[Dict[str, Any]]:
+        """Every JSON-LD node on the page, in document order."""
+        nodes = []
+        for block in self.jsonld_blocks:
+            try:
+                nodes.extend(_flatten(json.loads(block.strip())))
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.debug(f"JSON-LD parse error: {e}")
+        return nodes
+
+    def of_type(self, *types: str) -> List[Dict[str, Any]]:
+        """JSON-LD nodes with any of the given @types."""
+        wanted = set(types)
+        return [node for node in self.jsonld if wanted.intersection(node_types(node))]
+
+    def first_of_type(self, *types: str) -> Optional[Dict[str, Any]]:
+        nodes = self.of_type(*types)
+        return nodes[0] if nodes else None
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """
+        <meta> content keyed by lower-cased property or name (og:*,
+        twitter:*, article:*, author, ...); the first tag for a key wins.
+        """
+        meta: Dict[str, str] = {}
+        # Walk lxml elements directly: a parsel Selector per tag costs more
+        # than the CSS queries this replaces
+        for tag in self._iter('meta'):
+            key = tag.get('property') or tag.get('name')
+            content = tag.get('content')
+            if key and content is not None:
+                meta.setdefault(key.strip().lower(), content)
+        return meta
+
+    @cached_property
+    def times(self) -> List[Dict[str, str]]:
+        """<time> elements as {'datetime': ..., 'text': ...}, in document order."""
+        return [
+            {'datetime': time.get('datetime', ''), 'text': ' '.join(time.itertext()).strip()}
+            for time in self._iter('time')
+        ]
+
+    def _iter(self, tag: str):
+        root = self.selector.root
+        return root.iter(tag) if hasattr(root, 'iter') else iter(())
+
+
+def structured_data(response) -> StructuredData:
+    """The response's StructuredData, created on first use and reused after."""
+    view = _views.get(response)
+    if view is None:
+        view = _views[response] = StructuredData(selector=response.selector)
+    return view
@@ -0,0 +1,344 @@
+"""
+URL Shape Learning
+==================
+Per-domain article yield of URL shapes, learned from crawl outcomes.
+
+Link discovery scores candidate links with fixed heuristics, so the same
+non-article shapes (video pages, galleries, topic hubs) keep getting
+fetched and dropped every run. This module records, per domain and URL
+shape, how many fetched pages ended up stored as articles. Discovery then
+uses that yield:
+
+    - shapes with at least URL_SHAPE_MIN_SAMPLES fetches and a yield
+      below URL_SHAPE_MIN_YIELD are skipped (one candidate in every
+      URL_SHAPE_EXPLORE_EVERY still goes through, so a shape that starts
+      producing articles after a redesign recovers)
+    - the rest are requested highest yield first (request priority 0-10)
+
+A shape is the URL path with variable parts abstracted:
+
+    /politics/news/123456                    -> /politics/news/{n}
+    /2024/12/27/metro-rail-extends-hours     -> /{yyyy}/{n}/{n}/{slug}
+    /details/article-title-98765.html?id=3   -> /details/{slug}-{n}.html?id
+
+Outcomes come from UrlShapeMiddleware: a request tagged with
+``meta['url_shape']`` counts as stored when its item reaches
+``item_scraped``, and as a non-article when its callback yields no item or
+the item is dropped (NeutralDropItem drops - duplicates, date filter,
+storage errors - are not counted). Counts persist in the
+``url_shape_yield`` table of DATABASE_PATH; the ``url_shapes/*`` crawl
+stats cover the closing spider only.
+
+Settings:
+    - URL_SHAPE_LEARNING: Enable the learner and middleware (default: True)
+    - URL_SHAPE_MIN_SAMPLES: Fetches before a shape can be skipped (default: 20)
+    - URL_SHAPE_MIN_YIELD: Skip shapes storing fewer than this share (default: 0.05)
+    - URL_SHAPE_EXPLORE_EVERY: Let 1 in N skipped candidates through (default: 20)
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from itemadapter import is_item
+
+from BDNewsPaper.pipelines import NeutralDropItem
+
+logger = logging.getLogger(__name__)
+
+# Request meta key carrying (domain, shape) for outcome tracking
+SHAPE_META_KEY = 'url_shape'
+
+_YEAR_RE = re.compile(r'(?:19|20)\d\d$')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+_SLUG_ID_RE = re.compile(r'(.+?)[-_](\d+)$')
+_ID_RE = re.compile(r'(?=.*\d)[a-z0-9]{6,}$')
+
+
+def _segment_shape(segment: str) -> str:
+    """Abstract one path segment."""
+    stem, dot, ext = segment.rpartition('.')
+    if not dot or not ext.isalpha() or len(ext) > 5:
+        stem, ext = segment, ''
+    suffix = f'.{ext}' if ext else ''
+
+    if not stem:
+        return segment
+    if stem.isdigit():
+        return ('{yyyy}' if _YEAR_RE.match(stem) else '{n}') + suffix
+    if _DATE_RE.match(stem):
+        return '{date}' + suffix
+    if not stem.isascii() or stem.count('-') + stem.count('_') >= 2:
+        match = _SLUG_ID_RE.match(stem)
+        if match and stem.isascii():
+            return '{slug}-{n}' + suffix
+        return '{slug}' + suffix
+    if _ID_RE.match(stem):
+        return '{id}' + suffix
+    return stem + suffix
+
+
+def url_shape(url: str) -> str:
+    """Path template of a URL (query parameter names kept, values dropped)."""
+    parts = urlsplit(url)
+    shape = '/'.join(_segment_shape(segment) for segment in parts.path.lower().split('/'))
+    if parts.query:
+        shape += '?' + '&'.join(sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)}))
+    return shape or '/'
+
+
+_STAT_KEYS = ('candidates', 'requests_saved', 'explored', 'fetched', 'stored', 'non_article')
+
+
+class UrlShapeLearner:
+    """
+    Tracks fetched/stored counts per (domain, shape) and ranks candidates.
+
+    Counts are loaded from SQLite per domain on first use and written back
+    (as increments, so concurrent crawls add up) by flush(). `stats` are
+    totals for the learner's lifetime; rank() and record() also count per
+    `owner` (the spider name), read back with pop_stats().
+    """
+
+    def __init__(self, db_path: Optional[str] = None, min_samples: int = 20,
+                 min_yield: float = 0.05, explore_every: int = 20):
+        self.db_path = db_path
+        self.min_samples = min_samples
+        self.min_yield = min_yield
+        self.explore_every = max(1, explore_every)
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+        self._pending: Dict[Tuple[str, str], List[int]] = {}
+        self._skipped: Dict[Tuple[str, str], int] = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(_STAT_KEYS, 0)
+        self._owner_stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> 'UrlShapeLearner':
+        return cls(
+            db_path=settings.get('DATABASE_PATH', 'news_articles.db'),
+            min_samples=settings.getint('URL_SHAPE_MIN_SAMPLES', 20),
+            min_yield=settings.getfloat('URL_SHAPE_MIN_YIELD', 0.05),
+            explore_every=settings.getint('URL_SHAPE_EXPLORE_EVERY', 20),
+        )
+
+    @staticmethod
+    def settings_key(settings) -> Tuple:
+        """Everything from_settings() reads, to share one learner per configuration."""
+        return (
+            settings.get('DATABASE_PATH', 'news_articles.db'),
+            settings.getint('URL_SHAPE_MIN_SAMPLES', 20),
+            settings.getfloat('URL_SHAPE_MIN_YIELD', 0.05),
+            settings.getint('URL_SHAPE_EXPLORE_EVERY', 20),
+        )
+
+    # ---- stats ----
+
+    def _count(self, key: str, owner: Optional[str]) -> None:
+        self.stats[key] += 1
+        if owner is not None:
+            self._owner_stats.setdefault(owner, dict.fromkeys(_STAT_KEYS, 0))[key] += 1
+
+    def pop_stats(self, owner: str) -> Dict[str, int]:
+        """Counts made for `owner` since its last pop_stats() (zeros if none)."""
+        with self._lock:
+            return self._owner_stats.pop(owner, None) or dict.fromkeys(_STAT_KEYS, 0)
+
+    # ---- persistence ----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_shape_yield (
+                domain TEXT NOT NULL,
+                shape TEXT NOT NULL,
+                fetched INTEGER NOT NULL DEFAULT 0,
+                stored INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (domain, shape)
+            ) WITHOUT ROWID
+        """)
+        return conn
+
+    def _ensure_loaded(self, domain: str) -> None:
+        if domain in self._loaded:
+            return
+        self._loaded.add(domain)
+        if not self.db_path:
+            return
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT shape, fetched, stored FROM url_shape_yield WHERE domain = ?", (domain,)
+            ).fetchall()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not load URL shape stats for {domain}: {e}")
+            return
+        for shape, fetched, stored in rows:
+            counts = self._counts.setdefault((domain, shape), [0, 0])
+            counts[0] += fetched
+            counts[1] += stored
+
+    def flush(self) -> None:
+        """Write counts gathered since the last flush."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or not self.db_path:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO url_shape_yield (domain, shape, fetched, stored) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (domain, shape) DO UPDATE SET
+                        fetched = fetched + excluded.fetched,
+                        stored = stored + excluded.stored,
+                        updated_at = CURRENT_TIMESTAMP
+                """, [(domain, shape, fetched, stored) for (domain, shape), (fetched, stored) in pending.items()])
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save URL shape stats: {e}")
+
+    # ---- learning ----
+
+    def estimate(self, domain: str, shape: str) -> Tuple[float, int]:
+        """(yield estimate, fetches seen) with a uniform prior: unseen shapes are 0.5."""
+        with self._lock:
+            self._ensure_loaded(domain)
+            fetched, stored = self._counts.get((domain, shape), (0, 0))
+        return (stored + 1) / (fetched + 2), fetched
+
+    def record(self, domain: str, shape: str, stored: bool, owner: Optional[str] = None) -> None:
+        """Count one fetched page of a shape and whether it was stored."""
+        with self._lock:
+            self._ensure_loaded(domain)
+            for table in (self._counts, self._pending):
+                counts = table.setdefault((domain, shape), [0, 0])
+                counts[0] += 1
+                counts[1] += stored
+            self._count('fetched', owner)
+            self._count('stored' if stored else 'non_article', owner)
+
+    def rank(self, domain: str, urls: Iterable[str], owner: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        Filter candidate URLs by learned yield.
+
+        Returns (url, shape, priority) for the URLs worth requesting,
+        highest expected yield first.
+        """
+        ranked = []
+        for url in urls:
+            shape = url_shape(url)
+            estimate, fetched = self.estimate(domain, shape)
+            with self._lock:
+                self._count('candidates', owner)
+                if fetched >= self.min_samples and estimate < self.min_yield:
+                    key = (domain, shape)
+                    self._skipped[key] = self._skipped.get(key, 0) + 1
+                    if self._skipped[key] % self.explore_every:
+                        self._count('requests_saved', owner)
+                        continue
+                    self._count('explored', owner)
+            ranked.append((url, shape, int(round(estimate * 10))))
+        ranked.sort(key=lambda entry: entry[2], reverse=True)
+        return ranked
+
+    def shapes(self, domain: str) -> List[Dict]:
+        """Learned shapes for a domain, most fetched first."""
+        with self._lock:
+            self._ensure_loaded(domain)
+            rows = [
+                {'shape': shape, 'fetched': fetched, 'stored': stored,
+                 'yield': (stored + 1) / (fetched + 2)}
+                for (d, shape), (fetched, stored) in self._counts.items() if d == domain
+            ]
+        return sorted(rows, key=lambda row: row['fetched'], reverse=True)
+
+
+_learners: Dict[Optional[Tuple], UrlShapeLearner] = {}
+
+
+def get_url_shape_learner(settings=None) -> UrlShapeLearner:
+    """Get the process-wide learner for these settings (one per database and thresholds)."""
+    key = UrlShapeLearner.settings_key(settings) if settings is not None else None
+    if key not in _learners:
+        _learners[key] = UrlShapeLearner.from_settings(settings) if settings is not None else UrlShapeLearner()
+    return _learners[key]
+
+
+class UrlShapeMiddleware:
+    """
+    Spider middleware feeding crawl outcomes back to the URL shape learner.
+
+    Responses to requests tagged with meta['url_shape'] count as stored when
+    their item is scraped, and as non-articles when the callback yields no
+    item or the item is dropped for its content.
+    """
+
+    def __init__(self, learner: UrlShapeLearner, stats=None):
+        self.learner = learner
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('URL_SHAPE_LEARNING', True):
+            raise NotConfigured("URL shape learning disabled")
+        middleware = cls(get_url_shape_learner(crawler.settings), crawler.stats)
+        crawler.signals.connect(middleware.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(middleware.item_dropped, signal=signals.item_dropped)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    @staticmethod
+    def _tag(response):
+        request = getattr(response, 'request', None)
+        return request.meta.get(SHAPE_META_KEY) if request is not None else None
+
+    def process_spider_output(self, response, result, spider):
+        tagged = self._tag(response)
+        produced_item = False
+        for entry in result:
+            if is_item(entry):
+                produced_item = True
+            yield entry
+        if tagged and not produced_item:
+            self.learner.record(*tagged, stored=False, owner=spider.name)
+
+    async def process_spider_output_async(self, response, result, spider):
+        tagged = self._tag(response)
+        produced_item = False
+        async for entry in result:
+            if is_item(entry):
+                produced_item = True
+            yield entry
+        if tagged and not produced_item:
+            self.learner.record(*tagged, stored=False, owner=spider.name)
+
+    def item_scraped(self, item, response, spider):
+        tagged = self._tag(response)
+        if tagged:
+            self.learner.record(*tagged, stored=True, owner=spider.name)
+
+    def item_dropped(self, item, response, exception, spider):
+        tagged = self._tag(response)
+        if tagged and not isinstance(exception, NeutralDropItem):
+            self.learner.record(*tagged, stored=False, owner=spider.name)
+
+    def spider_closed(self, spider, reason):
+        self.learner.flush()
+        stats = self.learner.pop_stats(spider.name)
+        if self.stats:
+            for key, value in stats.items():
+                self.stats.set_value(f'url_shapes/{key}', value)
+        if stats['candidates']:
+            spider.logger.info(
+                f"URL shapes: {stats['requests_saved']} of {stats['candidates']} candidate requests saved, "
+                f"{stats['stored']}/{stats['fetched']} tracked pages stored"
+            )
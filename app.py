@@ -583,7 +583,7 @@ def get_database_stats() -> Dict:
     try:
         cursor = conn.cursor()
 
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='articles'")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='articles'")
         if not cursor.fetchone():
             return {"total": 0, "by_paper": {}, "date_range": ("N/A", "N/A")}
 
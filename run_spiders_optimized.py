@@ -3,10 +3,17 @@
 Enhanced spider runner with performance monitoring - Cross-platform Python version
 Supports Windows, macOS, and Linux
 
+Date ranges longer than 30 days are split into chunks. By default the
+chunks run as jobs in long-lived crawl workers (BDNewsPaper/crawl_worker.py),
+up to one per CPU and one per spider, so each site is crawled by one process
+at a time; --subprocess starts a `scrapy crawl` process per chunk instead.
+
 Usage: python run_spiders_optimized.py [spider_name] [--monitor] [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+                                       [--workers N] [--subprocess]
 """
 
 import argparse
+import importlib.util
 import os
 import subprocess
 import sys
@@ -17,10 +24,23 @@ from pathlib import Path
 import shutil
 
 
+# Settings for chunked runs, passed as -s to `scrapy crawl` or to the workers
+CHUNK_SETTINGS = {
+    "CONCURRENT_REQUESTS": 32,
+    "DOWNLOAD_DELAY": 0.1,
+    "AUTOTHROTTLE_TARGET_CONCURRENCY": 4.0,
+    "MEMUSAGE_LIMIT_MB": 4096,
+    "LOG_LEVEL": "INFO",
+}
+
+# Chunks a crawl worker runs before it is replaced by a fresh process
+WORKER_MAX_JOBS = 25
+
+
 class SpiderRunner:
     """Cross-platform spider runner with monitoring and optimization features"""
     
-    def __init__(self):
+    def __init__(self, workers=None, use_workers=True):
         self.spiders = [
             "prothomalo",
             "BDpratidin", 
@@ -38,6 +58,10 @@ class SpiderRunner:
         self.uv_cmd = self._check_uv()
         self.scrapy_available = self._check_scrapy()
         
+        # Crawl workers need Scrapy importable in this interpreter
+        self.workers = workers or os.cpu_count() or 1
+        self.use_workers = use_workers and importlib.util.find_spec("scrapy") is not None
+        
     def _check_uv(self):
         """Check if UV is available"""
         if shutil.which("uv"):
@@ -147,6 +171,9 @@ class SpiderRunner:
     
     def run_spider_chunked(self, spider_name, start_date, end_date, chunk_days=30):
         """Run spider with chunking for large date ranges"""
+        if self.use_workers:
+            return self.run_chunks_in_workers([spider_name], start_date, end_date, chunk_days)[spider_name]
+        
         print(f"🔄 Running {spider_name} with {chunk_days}-day chunks from {start_date} to {end_date}")
         
         chunks = self.generate_date_chunks(start_date, end_date, chunk_days)
@@ -245,6 +272,66 @@ class SpiderRunner:
             print(f"❌ Spider {spider_name} chunked operation had low success rate ({success_rate}%)")
             return False
     
+    def run_chunks_in_workers(self, spiders, start_date, end_date, chunk_days=30):
+        """Run the date chunks of one or more spiders as jobs in long-lived crawl workers"""
+        from BDNewsPaper.crawl_worker import CrawlJob, CrawlWorkerPool
+        
+        chunks = self.generate_date_chunks(start_date, end_date, chunk_days)
+        total_chunks = len(chunks) * len(spiders)
+        completed = {spider: 0 for spider in spiders}
+        failed = {spider: 0 for spider in spiders}
+        jobs = []
+        for spider in spiders:
+            for chunk_start, chunk_end in chunks:
+                if self.is_range_completed(spider, chunk_start, chunk_end):
+                    completed[spider] += 1
+                else:
+                    jobs.append(CrawlJob(spider, chunk_start, chunk_end))
+        
+        # Workers take one chunk per spider at a time, so more than one per spider would sit idle
+        workers = min(self.workers, len({job.spider for job in jobs})) or 1
+        print(f"🔄 Running {', '.join(spiders)} with {chunk_days}-day chunks from {start_date} to {end_date}")
+        print(f"📊 Total chunks: {total_chunks} ({total_chunks - len(jobs)} already completed)")
+        print(f"🕐 Operation started at: {datetime.now().strftime('%H:%M:%S')}")
+        
+        operation_start = time.time()
+        results = []
+        if jobs:
+            print(f"🧵 Starting {workers} crawl worker(s), logging to {self.logs_dir}/crawl_worker_<n>.log")
+            with CrawlWorkerPool(workers, settings=CHUNK_SETTINGS, log_dir=str(self.logs_dir),
+                                 max_jobs=WORKER_MAX_JOBS) as pool:
+                print(f"   Workers ready in {pool.startup_s:.1f}s")
+                for job in jobs:
+                    pool.submit(job)
+                for done, result in enumerate(pool.results(), 1):
+                    results.append(result)
+                    job = result.job
+                    label = f"{job.spider} {job.start_date} to {job.end_date}"
+                    if result.ok:
+                        self.mark_range_completed(job.spider, job.start_date, job.end_date)
+                        completed[job.spider] += 1
+                        print(f"✅ [{done}/{len(jobs)}] {label}: {result.items} articles in {result.wall_s:.1f}s "
+                              f"(worker {result.worker})")
+                    else:
+                        failed[job.spider] += 1
+                        reason = result.error or result.finish_reason
+                        print(f"❌ [{done}/{len(jobs)}] {label} failed: {reason}")
+        
+        total_duration = time.time() - operation_start
+        print("\n📈 Chunked run summary:")
+        for spider in spiders:
+            articles = sum(r.items for r in results if r.job.spider == spider)
+            print(f"   {spider}: {completed[spider]}/{len(chunks)} chunks completed, "
+                  f"{failed[spider]} failed, {articles} articles")
+        print(f"   🕐 Total operation time: {total_duration:.1f}s ({total_duration/60:.1f}m)")
+        if results:
+            overhead = sum(r.overhead_s for r in results) / len(results)
+            print(f"   ⚡ Average chunk time: {sum(r.wall_s for r in results) / len(results):.1f}s "
+                  f"({overhead:.2f}s of it crawler setup and shutdown)")
+        
+        # A spider succeeds if more than 80% of its chunks completed
+        return {spider: completed[spider] * 100 // len(chunks) >= 80 if chunks else False for spider in spiders}
+    
     def run_spider_chunk(self, spider_name, start_date, end_date, chunk_num, total_chunks):
         """Run spider for a specific date chunk"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -262,13 +349,10 @@ class SpiderRunner:
         cmd.extend(["-a", f"end_date={end_date}"])
         
         # Optimized settings for chunked operations
-        cmd.extend([
-            "-s", "CONCURRENT_REQUESTS=32",
-            "-s", "DOWNLOAD_DELAY=0.1", 
-            "-s", "AUTOTHROTTLE_TARGET_CONCURRENCY=4.0",
-            "-s", "MEMUSAGE_LIMIT_MB=4096",
-            "-L", "INFO"
-        ])
+        for name, value in CHUNK_SETTINGS.items():
+            if name != "LOG_LEVEL":
+                cmd.extend(["-s", f"{name}={value}"])
+        cmd.extend(["-L", CHUNK_SETTINGS["LOG_LEVEL"]])
         
         try:
             with open(log_file, 'w', encoding='utf-8') as log_f:
@@ -426,8 +510,15 @@ class SpiderRunner:
         
         success_count = 0
         total_spiders = len(self.spiders)
+        sequential = self.spiders
         
-        for i, spider in enumerate(self.spiders, 1):
+        if use_chunking and start_date and end_date and self.use_workers:
+            # Every spider's chunks share one job queue
+            outcome = self.run_chunks_in_workers(self.spiders, start_date, end_date, chunk_days)
+            success_count = sum(outcome.values())
+            sequential = []
+        
+        for i, spider in enumerate(sequential, 1):
             print()
             print(f"📰 Running spider: {spider}")
             print(f"Progress: {i}/{total_spiders}")
@@ -520,6 +611,8 @@ class SpiderRunner:
         print("Date filtering options:")
         print("  --start-date YYYY-MM-DD  Scrape articles from this date onwards")
         print("  --end-date YYYY-MM-DD    Scrape articles up to this date")
+        print("  --workers N              Crawl workers for chunked runs (default: one per CPU, at most one per spider)")
+        print("  --subprocess             Run each date chunk in its own scrapy process")
         print()
         print("Examples:")
         print("  python run_spiders_optimized.py                                           # Run all spiders")
@@ -556,6 +649,16 @@ def main():
         '--end-date', 
         help='End date for scraping (YYYY-MM-DD format)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Crawl workers for chunked runs (default: one per CPU, at most one per spider)'
+    )
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run each date chunk in its own scrapy process instead of crawl workers'
+    )
     
     # Handle help manually to show custom usage
     if '--help' in sys.argv or '-h' in sys.argv:
@@ -566,7 +669,7 @@ def main():
     args = parser.parse_args()
     
     # Initialize runner
-    runner = SpiderRunner()
+    runner = SpiderRunner(workers=args.workers, use_workers=not args.subprocess)
     
     # Check if scrapy is available
     if not runner.scrapy_available:
@@ -22,30 +22,26 @@ Usage:
 import argparse
 import sqlite3
 import json
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import Counter
-import re
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
-REPORTS_DIR = Path(__file__).parent / "reports"
+from BDNewsPaper.article_features import TEXTBLOB_AVAILABLE, FeatureStore, update_features
 
 
-# Try to import NLP libraries
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
+REPORTS_DIR = Path(__file__).parent / "reports"
 
-try:
-    import nltk
-    from nltk import word_tokenize, pos_tag, ne_chunk
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
+# Headline words too generic to be a trend (on top of the shared stop words)
+TREND_STOP_WORDS = [
+    'said', 'says', 'year', 'time', 'people', 'first', 'after', 'more', 'made',
+    'about', 'against', 'during', 'before', 'between', 'such',
+    'bangladesh', 'dhaka', 'news', 'report', 'according',
+]
 
 
 def get_articles(days: int = 7, limit: int = 1000) -> List[Dict]:
@@ -73,13 +69,41 @@ def get_articles(days: int = 7, limit: int = 1000) -> List[Dict]:
     return articles
 
 
+def open_feature_store() -> FeatureStore:
+    """Process new articles and open the feature store."""
+    update_features(str(DB_PATH))
+    return FeatureStore(sqlite3.connect(DB_PATH))
+
+
+def get_article_features(days: int = 7) -> List[Dict]:
+    """Stored per-article features (no bodies) for the period."""
+    if not DB_PATH.exists():
+        print("❌ Database not found")
+        return []
+    
+    store = open_feature_store()
+    store.conn.row_factory = sqlite3.Row
+    cursor = store.conn.execute("""
+        SELECT a.id, a.headline, f.paper_name, f.category, f.polarity
+        FROM article_features f JOIN articles a ON a.id = f.article_id
+        WHERE f.scraped_at >= datetime('now', ?)
+        ORDER BY f.scraped_at DESC
+    """, (f"-{days} days",))
+    
+    articles = [dict(row) for row in cursor.fetchall()]
+    store.conn.close()
+    
+    return articles
+
+
 def analyze_sentiment(articles: List[Dict]) -> Dict:
-    """Analyze sentiment of articles using TextBlob."""
-    if not TEXTBLOB_AVAILABLE:
+    """Summarize the TextBlob polarity stored for each article."""
+    scored = [a for a in articles if a.get("polarity") is not None]
+    if not scored and not TEXTBLOB_AVAILABLE:
         print("❌ TextBlob not installed. Run: pip install textblob")
         return {}
     
-    print(f"📊 Analyzing sentiment for {len(articles)} articles...")
+    print(f"📊 Analyzing sentiment for {len(scored)} articles...")
     
     results = {
         "positive": [],
@@ -89,13 +113,9 @@ def analyze_sentiment(articles: List[Dict]) -> Dict:
         "by_category": {}
     }
     
-    for article in articles:
+    for article in scored:
         headline = article.get("headline", "")
-        body = article.get("article_body", "") or ""
-        text = f"{headline}. {body[:500]}"
-        
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        polarity = article["polarity"]
         
         paper = article.get("paper_name", "Unknown")
         category = article.get("category", "Unknown")
@@ -136,78 +156,42 @@ def analyze_sentiment(articles: List[Dict]) -> Dict:
     return results
 
 
-def extract_entities(articles: List[Dict], limit: int = 100) -> Dict:
-    """Extract named entities from articles."""
-    print(f"🔍 Extracting entities from {min(len(articles), limit)} articles...")
-    
-    people = Counter()
-    places = Counter()
-    organizations = Counter()
-    
-    # Simple pattern-based extraction (works without NLTK)
-    # Patterns for capitalized words/phrases
-    name_pattern = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b')
+def extract_entities(days: int = 7, top_n: int = 30) -> Dict:
+    """Most mentioned people, places and organizations in the period."""
+    if not DB_PATH.exists():
+        return {"people": [], "places": [], "organizations": []}
     
-    for article in articles[:limit]:
-        text = f"{article.get('headline', '')} {article.get('article_body', '')[:1000]}"
-        
-        # Extract capitalized phrases (potential names/places)
-        matches = name_pattern.findall(text)
-        for match in matches:
-            words = match.split()
-            if len(words) >= 2:
-                # Heuristic classification
-                if any(title in words[0] for title in ['Mr', 'Mrs', 'Dr', 'PM', 'President', 'Minister']):
-                    people[match] += 1
-                elif words[-1] in ['University', 'College', 'Bank', 'Corporation', 'Ltd', 'Inc', 'Company']:
-                    organizations[match] += 1
-                else:
-                    # Could be person or place - add to both for simplicity
-                    people[match] += 1
+    store = open_feature_store()
+    print(f"🔍 Aggregating entities from {store.article_count(days=days)} articles...")
     
-    return {
-        "people": people.most_common(30),
-        "places": places.most_common(30),
-        "organizations": organizations.most_common(30)
+    entities = {
+        "people": store.term_counts("person", days=days, limit=top_n),
+        "places": store.term_counts("location", days=days, limit=top_n, articles=True),
+        "organizations": store.term_counts("organization", days=days, limit=top_n),
     }
+    store.conn.close()
+    return entities
 
 
-def analyze_trends(articles: List[Dict], top_n: int = 20) -> Dict:
-    """Analyze trending keywords over time."""
-    print(f"🔥 Analyzing trends from {len(articles)} articles...")
-    
-    # Stop words to filter
-    stop_words = set([
-        'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'is', 'are',
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
-        'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-        'with', 'by', 'from', 'as', 'that', 'this', 'it', 'its', 'or', 'but',
-        'not', 'no', 'if', 'so', 'than', 'too', 'very', 'just', 'over', 'also',
-        'said', 'says', 'new', 'year', 'day', 'time', 'people', 'first', 'after',
-        'more', 'made', 'about', 'against', 'during', 'before', 'between', 'such',
-        'bangladesh', 'dhaka', 'news', 'report', 'according'
-    ])
+def analyze_trends(days: int = 7, top_n: int = 20) -> Dict:
+    """Analyze trending headline keywords over time."""
+    if not DB_PATH.exists():
+        return {"overall": [], "by_date": {}}
     
-    all_words = Counter()
-    by_date = {}
+    store = open_feature_store()
+    print(f"🔥 Analyzing trends from {store.article_count(days=days)} articles...")
     
-    for article in articles:
-        headline = article.get("headline", "")
-        date = article.get("scraped_at", "")[:10]
-        
-        # Extract words
-        words = re.findall(r'\b[a-z]{4,}\b', headline.lower())
-        filtered = [w for w in words if w not in stop_words]
-        
-        all_words.update(filtered)
-        
-        if date not in by_date:
-            by_date[date] = Counter()
-        by_date[date].update(filtered)
+    filters = dict(days=days, min_length=4, exclude=TREND_STOP_WORDS)
+    overall = store.term_counts("token", limit=top_n, **filters)
+    by_date = store.term_counts_by("day", "token", **filters)
+    store.conn.close()
     
     return {
-        "overall": all_words.most_common(top_n),
-        "by_date": {date: counter.most_common(10) for date, counter in sorted(by_date.items())[-7:]}
+        "overall": overall,
+        "by_date": {
+            date: Counter(counts).most_common(10)
+            for date, counts in sorted(by_date.items())[-7:]
+        }
     }
 
 
@@ -256,10 +240,10 @@ def generate_report(days: int = 7) -> str:
     
     print(f"\n📊 Generating report for {len(articles)} articles from last {days} days...\n")
     
-    # Run analyses
-    sentiment = analyze_sentiment(articles) if TEXTBLOB_AVAILABLE else {}
-    entities = extract_entities(articles)
-    trends = analyze_trends(articles)
+    # Run analyses (sentiment, entities and trends cover the whole period)
+    sentiment = analyze_sentiment(get_article_features(days))
+    entities = extract_entities(days)
+    trends = analyze_trends(days)
     duplicates = find_duplicates(articles)
     
     # Build report
@@ -360,19 +344,16 @@ def main():
         report = generate_report(args.days)
         print(report)
     elif args.sentiment:
-        articles = get_articles(args.days)
-        results = analyze_sentiment(articles)
+        results = analyze_sentiment(get_article_features(args.days))
         print(f"\n✅ Positive: {len(results.get('positive', []))}")
         print(f"❌ Negative: {len(results.get('negative', []))}")
         print(f"➖ Neutral: {len(results.get('neutral', []))}")
     elif args.entities:
-        articles = get_articles(args.days)
-        entities = extract_entities(articles)
+        entities = extract_entities(args.days)
         print("\n👤 People:", [e[0] for e in entities.get('people', [])[:10]])
         print("🏢 Organizations:", [e[0] for e in entities.get('organizations', [])[:10]])
     elif args.trends:
-        articles = get_articles(args.days)
-        trends = analyze_trends(articles)
+        trends = analyze_trends(args.days)
         print("\n🔥 Trending Keywords:")
         for word, count in trends.get("overall", [])[:15]:
             print(f"  {word}: {count}")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: article feature worker and feature-store queries.
+
+Builds a synthetic archive and compares:
+
+    recompute   - running FeatureExtractor over every body, as the analysis
+                  scripts did on each invocation
+    worker      - FeatureWorker filling article_features (inline and pooled)
+    query       - FeatureStore aggregates the scripts now run instead
+                  (per-paper lexicon totals, location counts, keywords)
+
+Usage:
+    python scripts/benchmark_article_features.py
+    python scripts/benchmark_article_features.py --articles 100000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.article_features import FeatureExtractor, FeatureStore, FeatureWorker
+from BDNewsPaper.lexicons import BANGLADESH_LOCATIONS, BIAS_LEXICON, SENTIMENT_LEXICON
+
+FILLER = (
+    "the government said on monday that the new budget would cover roads schools and hospitals "
+    "while officials from several ministries met local leaders to discuss the plan in detail"
+).split()
+
+
+def build_archive(path: str, articles: int, words: int) -> None:
+    rng = random.Random(42)
+    vocab = FILLER * 4 + list(BANGLADESH_LOCATIONS) + [w for ws in BIAS_LEXICON.values() for w in ws] \
+        + [w for ws in SENTIMENT_LEXICON.values() for w in ws] + ["Prime Minister Sheikh", "Sonali Bank"]
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL, headline TEXT NOT NULL, article TEXT NOT NULL,
+            category TEXT, scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO articles (url, paper_name, headline, article, category) VALUES (?, ?, ?, ?, ?)",
+        (
+            (f"https://example.com/{i}", f"paper{i % 20}",
+             " ".join(rng.choice(vocab) for _ in range(10)).capitalize(),
+             " ".join(rng.choice(vocab) for _ in range(words)), "National")
+            for i in range(articles)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=20000, help="Articles in the archive")
+    parser.add_argument("--words", type=int, default=400, help="Words per article body")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "features.db")
+    build_archive(path, args.articles, args.words)
+
+    def recompute():
+        extractor = FeatureExtractor()
+        conn = sqlite3.connect(path)
+        for headline, body in conn.execute("SELECT headline, article FROM articles"):
+            extractor.extract(headline, body)
+        conn.close()
+
+    results = [("recompute", timed(recompute))]
+    results.append(("worker x1", timed(lambda: FeatureWorker(path, workers=1).rebuild())))
+    results.append((f"worker x{args.workers}", timed(lambda: FeatureWorker(path, workers=args.workers).rebuild())))
+    results.append(("worker, no new", timed(lambda: FeatureWorker(path, workers=args.workers).run())))
+
+    def query():
+        store = FeatureStore(sqlite3.connect(path))
+        store.article_counts_by_paper(days=30)
+        store.term_counts_by("paper", "lexicon", days=30)
+        store.term_counts("location", days=30, articles=True)
+        store.term_counts("token", days=30, limit=100)
+        store.conn.close()
+
+    results.append(("query", timed(query)))
+
+    print(f"{args.articles:,} articles x {args.words} words\n")
+    print(f"{'step':<16} {'s':>8} {'articles/s':>12}")
+    for name, elapsed in results:
+        rate = f"{args.articles / elapsed:>12,.0f}" if name.startswith(("recompute", "worker x")) else ""
+        print(f"{name:<16} {elapsed:>8.3f} {rate}")
+
+
+if __name__ == "__main__":
+    main()
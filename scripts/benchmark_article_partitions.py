@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recent-window queries on plain, indexed and partitioned storage.
+
+Builds the same synthetic archive (scraped over --months months) three
+ways and times the scraped_at windows the dashboards, monitors and
+analysis scripts run:
+
+    plain        - articles table as before (no scraped_at index)
+    indexed      - plus idx_scraped_at (what SharedSQLitePipeline now adds)
+    partitioned  - BDNewsPaper.article_partitions monthly tables behind
+                   the articles view
+
+Usage:
+    python scripts/benchmark_article_partitions.py
+    python scripts/benchmark_article_partitions.py --rows 2000000 --months 36
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.article_partitions import ArticlePartitions
+
+SCHEMA = """
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL,
+        paper_name TEXT NOT NULL, headline TEXT NOT NULL, article TEXT NOT NULL,
+        sub_title TEXT, category TEXT, author TEXT, publication_date TEXT,
+        modification_date TEXT, image_url TEXT, keywords TEXT, source_language TEXT,
+        word_count INTEGER, content_hash TEXT, scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_paper_name ON articles(paper_name);
+    CREATE INDEX idx_category ON articles(category);
+"""
+
+QUERIES = {
+    "count 24h": "SELECT COUNT(*) FROM articles WHERE scraped_at >= datetime('now', '-24 hours')",
+    "by paper 7d": """SELECT paper_name, COUNT(*) FROM articles
+                      WHERE scraped_at >= datetime('now', '-7 days') GROUP BY paper_name""",
+    "rows 1h": "SELECT id, headline, url FROM articles WHERE scraped_at >= datetime('now', '-1 hour')",
+    # The stats rollup's catch-up probe
+    "max id": "SELECT COALESCE(MAX(id), {recent_id}) FROM articles WHERE id > {recent_id}",
+}
+
+
+def build(path: str, rows: int, months: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    seconds = months * 30 * 86400
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (url, paper_name, headline, article, category, scraped_at)
+        SELECT 'https://example.com/' || i, 'paper' || (i % 30), 'Headline ' || i,
+               substr(hex(randomblob(1000)), 1, 600 + i % 1400), 'category' || (i % 12),
+               datetime('now', '-' || ((? - i) * ? / ?) || ' seconds')
+        FROM n
+    """, (rows, rows, seconds, rows))
+    conn.commit()
+    conn.close()
+
+
+def timed(conn: sqlite3.Connection, sql: str, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=500000, help="Articles in the archive")
+    parser.add_argument("--months", type=int, default=24, help="Months the archive spans")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    layouts = {}
+    for layout in ("plain", "indexed", "partitioned"):
+        path = os.path.join(workdir, f"{layout}.db")
+        build(path, args.rows, args.months)
+        conn = sqlite3.connect(path)
+        start = time.perf_counter()
+        if layout == "indexed":
+            conn.execute("CREATE INDEX idx_scraped_at ON articles(scraped_at)")
+            conn.commit()
+        elif layout == "partitioned":
+            ArticlePartitions(conn).migrate()
+        setup = time.perf_counter() - start
+        layouts[layout] = conn
+        print(f"{layout:<12} built, setup {setup:.1f}s")
+
+    print(f"\n{args.rows:,} articles over {args.months} months (ms, best of 5)\n")
+    print(f"{'query':<14}" + "".join(f"{name:>13}" for name in layouts))
+    for label, sql in QUERIES.items():
+        sql = sql.format(recent_id=args.rows - 100)
+        print(f"{label:<14}" + "".join(f"{timed(conn, sql) * 1e3:>13.2f}" for conn in layouts.values()))
+
+    partitions = ArticlePartitions(layouts["partitioned"])
+    oldest = partitions.partitions()[0]["month"]
+    start = time.perf_counter()
+    partitions.archive(oldest, os.path.join(workdir, "archive"))
+    print(f"\nArchived {oldest} in {time.perf_counter() - start:.2f}s")
+
+    for conn in layouts.values():
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
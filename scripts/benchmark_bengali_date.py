@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Bengali date parsing throughput.
+
+The corpus is every Bengali date string in tests/test_bengali_date.py,
+repeated the way listing pages repeat the same few dates.
+
+    cold        - convert_bengali_date_to_english with the memo cleared per call
+    memoized    - convert_bengali_date_to_english with the LRU memo
+    parse_many  - BengaliDateParser.parse_many over the whole batch
+    legacy      - the converter at a git revision (--legacy-ref), if given
+
+Usage:
+    python scripts/benchmark_bengali_date.py
+    python scripts/benchmark_bengali_date.py --repeat 200 --legacy-ref HEAD~1
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+from BDNewsPaper import bengalidate_to_englishdate as dates
+from BDNewsPaper.bengalidate_to_englishdate import BengaliDateParser, convert_bengali_date_to_english
+
+TEST_FILE = os.path.join(ROOT, 'tests', 'test_bengali_date.py')
+
+
+def load_corpus() -> list:
+    """Collect the string literals in the test module that look like Bengali dates."""
+    with open(TEST_FILE, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    strings = {
+        node.value for node in ast.walk(tree)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    }
+    return sorted(s for s in strings if dates.validate_bengali_date_format(s))
+
+
+def load_legacy(ref: str):
+    """Import bengalidate_to_englishdate as it was at a git revision."""
+    source = subprocess.run(
+        ['git', 'show', f'{ref}:BDNewsPaper/bengalidate_to_englishdate.py'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    path = os.path.join(tempfile.mkdtemp(), 'legacy_bengalidate.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location('legacy_bengalidate', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=100, help="Times each string repeats")
+    parser.add_argument("--legacy-ref", help="Git revision to compare against (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    workload = corpus * args.repeat
+
+    def cold():
+        for s in workload:
+            dates._parse_cached.cache_clear()
+            convert_bengali_date_to_english(s)
+
+    def memoized():
+        for s in workload:
+            convert_bengali_date_to_english(s)
+
+    results = [("cold", timed(cold))]
+    dates._parse_cached.cache_clear()
+    results.append(("memoized", timed(memoized)))
+    date_parser = BengaliDateParser()
+    results.append(("parse_many", timed(lambda: date_parser.parse_many(workload))))
+
+    if args.legacy_ref:
+        legacy = load_legacy(args.legacy_ref)
+        results.append(("legacy", timed(
+            lambda: [legacy.convert_bengali_date_to_english(s) for s in workload]
+        )))
+
+    print(f"{len(corpus)} distinct strings x {args.repeat} = {len(workload)} parses\n")
+    print(f"{'mode':<11} {'total s':>9} {'us/date':>9}")
+    for mode, elapsed in results:
+        print(f"{mode:<11} {elapsed:>9.3f} {elapsed / len(workload) * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
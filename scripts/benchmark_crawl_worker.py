@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: date-chunk crawls in long-lived workers vs one process per chunk.
+
+Replays a year-long backfill as run_spiders_optimized.py splits it
+(--days split into 30-day chunks for each of --spiders spiders) against a
+local HTTP server, one request per day of each chunk, with the project
+settings plus the runner's CHUNK_SETTINGS:
+
+    subprocess  - `python -m scrapy crawl` per chunk, one after another
+                  (--subprocess; the runner also sleeps 1 s between chunks,
+                  which is left out here)
+    workers     - CrawlWorkerPool with --workers processes (crawl_worker.py)
+
+Prints total wall time and the mean per-job overhead: job wall time minus
+the crawl itself (spider opened to closed), i.e. process startup, imports
+and crawler setup/shutdown. Worker startup is reported separately.
+
+Usage:
+    python scripts/benchmark_crawl_worker.py
+    python scripts/benchmark_crawl_worker.py --spiders 2 --days 90 --workers 2
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from statistics import mean
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import scrapy
+
+from BDNewsPaper.crawl_worker import CrawlJob, CrawlWorkerPool
+from run_spiders_optimized import CHUNK_SETTINGS
+
+BODY = b"<html><body>" + b"<p>news</p>" * 200 + b"</body></html>"
+
+
+class BackfillSpider(scrapy.Spider):
+    """One page per day of its date range."""
+    name = "backfill"
+    custom_settings = {
+        # Project middleware that predates async spider output
+        "SPIDER_MIDDLEWARES": {"BDNewsPaper.middlewares.BdnewspaperSpiderMiddleware": None},
+        "ITEM_PIPELINES": {},
+    }
+
+    async def start(self):
+        first, last = date.fromisoformat(self.start_date), date.fromisoformat(self.end_date)
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            yield scrapy.Request(f"http://127.0.0.1:{self.port}/{self.paper}/{date.fromordinal(ordinal)}")
+
+    def parse(self, response):
+        yield {"url": response.url}
+
+
+def serve():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_subprocesses(jobs, settings, log_dir):
+    """(total wall, per-job overheads) with a scrapy process per job."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(__file__), os.environ.get("PYTHONPATH", "")]))
+    overheads = []
+    start = time.perf_counter()
+    for index, job in enumerate(jobs):
+        log_file = Path(log_dir) / f"chunk_{index}.log"
+        cmd = [sys.executable, "-m", "scrapy", "crawl", job.spider, "-s", f"LOG_FILE={log_file}"]
+        cmd += [arg for name, value in settings.items() for arg in ("-s", f"{name}={value}")]
+        cmd += [arg for name, value in job.kwargs.items() for arg in ("-a", f"{name}={value}")]
+        cmd += ["-a", f"start_date={job.start_date}", "-a", f"end_date={job.end_date}"]
+        job_start = time.perf_counter()
+        subprocess.run(cmd, check=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall = time.perf_counter() - job_start
+        stats = log_file.read_text(encoding="utf-8")
+        crawl = float(re.search(r"'elapsed_time_seconds': ([\d.]+)", stats).group(1))
+        overheads.append(wall - crawl)
+    return time.perf_counter() - start, overheads
+
+
+def run_workers(jobs, settings, workers, log_dir):
+    """(total wall, per-job overheads, worker startup) with a CrawlWorkerPool."""
+    start = time.perf_counter()
+    # Every "paper" is the one backfill spider on a local server, so let
+    # all workers run it at once as they would run different spiders
+    with CrawlWorkerPool(workers, settings=settings, log_dir=log_dir, max_per_spider=workers) as pool:
+        for job in jobs:
+            pool.submit(job)
+        results = list(pool.results())
+    failed = [result for result in results if not result.ok]
+    if failed:
+        raise RuntimeError(f"{len(failed)} jobs failed, first: {failed[0]}")
+    return time.perf_counter() - start, [result.overhead_s for result in results], pool.startup_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--spiders", type=int, default=6, help="Spiders backfilled")
+    parser.add_argument("--days", type=int, default=365, help="Days in the backfill")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Crawl workers")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help=f"DOWNLOAD_DELAY (runner uses {CHUNK_SETTINGS['DOWNLOAD_DELAY']})")
+    args = parser.parse_args()
+
+    server = serve()
+    port = server.server_address[1]
+    last = date(2024, 12, 31)
+    chunks, start = [], last - timedelta(days=args.days - 1)
+    while start <= last:
+        end = min(start + timedelta(days=29), last)
+        chunks.append((start.isoformat(), end.isoformat()))
+        start = end + timedelta(days=1)
+    jobs = [CrawlJob(BackfillSpider.name, start, end, {"port": port, "paper": f"paper{paper}"})
+            for paper in range(args.spiders) for start, end in chunks]
+    # This script's directory is on the path of both kinds of process
+    settings = dict(CHUNK_SETTINGS, DOWNLOAD_DELAY=args.delay, TELNETCONSOLE_ENABLED=False,
+                    SPIDER_MODULES="benchmark_crawl_worker")
+    print(f"{args.spiders} spiders x {args.days} days in 30-day chunks: {len(jobs)} jobs, "
+          f"{args.workers} worker(s), {os.cpu_count()} CPU(s)")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        legacy_wall, legacy_overheads = run_subprocesses(jobs, settings, log_dir)
+        worker_wall, worker_overheads, startup = run_workers(
+            jobs, dict(settings, SPIDER_MODULES=[settings["SPIDER_MODULES"]]), args.workers, log_dir)
+    print(f"subprocess {legacy_wall:>8.2f} s  overhead/job {mean(legacy_overheads):.3f} s"
+          f"  (max {max(legacy_overheads):.3f} s)")
+    print(f"workers    {worker_wall:>8.2f} s  overhead/job {mean(worker_overheads):.3f} s"
+          f"  (max {max(worker_overheads):.3f} s, worker startup {startup:.2f} s)")
+    print(f"\n{legacy_wall / worker_wall:.1f}x faster, {legacy_wall - worker_wall:.1f} s saved")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dataset export time and peak memory, list-then-write vs streaming.
+
+Builds a synthetic archive and exports it the way the publishers used to
+and the way they do now:
+
+    list + jsonl  - the old load_articles/export_to_jsonl path: every row
+                    (full bodies) into a Python list, then one data.jsonl
+    stream full   - BDNewsPaper.dataset_export, all articles into shards
+    stream delta  - the next export after --new articles were crawled
+
+Peak memory is measured with tracemalloc (Python allocations only, which
+also slows every run by a similar factor).
+
+Usage:
+    python scripts/benchmark_dataset_export.py
+    python scripts/benchmark_dataset_export.py --articles 200000 --format jsonl.zst
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.dataset_export import FORMATS, DatasetExporter, default_format
+
+
+def add_articles(path: str, start: int, count: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL, headline TEXT NOT NULL, article TEXT NOT NULL,
+            category TEXT, author TEXT, publication_date TEXT, source_language TEXT,
+            word_count INTEGER, scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (url, paper_name, headline, article, category, publication_date,
+                              source_language, word_count)
+        SELECT 'https://example.com/' || i, 'paper' || (i % 30), 'Headline ' || i,
+               replace(substr(hex(randomblob(2000)), 1, 1500 + i % 2500), 'A', ' the news '),
+               'National', '2024-12-25', 'English', 300
+        FROM n
+    """, (start + 1, start + count))
+    conn.commit()
+    conn.close()
+
+
+def list_then_write(db_path: str, out_dir: str) -> int:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    articles = [dict(row) for row in conn.execute("""
+        SELECT id, url, paper_name, headline, article, category, author, publication_date,
+               source_language, word_count, scraped_at
+        FROM articles ORDER BY scraped_at DESC
+    """).fetchall()]
+    conn.close()
+    with open(os.path.join(out_dir, "data.jsonl"), "w", encoding="utf-8") as f:
+        for article in articles:
+            f.write(json.dumps({
+                "id": article["id"], "url": article["url"], "newspaper": article["paper_name"],
+                "headline": article["headline"], "content": article["article"],
+                "category": article["category"] or "", "author": article["author"] or "",
+                "date": article["publication_date"] or "", "language": article["source_language"] or "en",
+                "word_count": article["word_count"] or 0,
+            }, ensure_ascii=False) + "\n")
+    return len(articles)
+
+
+def measured(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=50000, help="Articles in the archive")
+    parser.add_argument("--new", type=int, default=500, help="Articles added before the delta export")
+    parser.add_argument("--format", choices=FORMATS, default=default_format(), help="Shard format")
+    parser.add_argument("--shard-mb", type=int, default=32, help="Shard size in MB")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "news.db")
+    add_articles(db_path, 0, args.articles)
+    print(f"{args.articles:,} articles, {os.path.getsize(db_path) / 1e6:.0f} MB, {args.format} shards\n")
+    print(f"{'run':<14} {'rows':>9} {'s':>8} {'peak MB':>9}")
+
+    def report(label, result):
+        rows, elapsed, peak = result
+        print(f"{label:<14} {rows:>9,} {elapsed:>8.2f} {peak / 1e6:>9.1f}")
+
+    report("list + jsonl", measured(lambda: list_then_write(db_path, workdir)))
+
+    exporter = DatasetExporter(db_path, os.path.join(workdir, "export"), args.format,
+                               shard_bytes=args.shard_mb * 1024 * 1024)
+    report("stream full", measured(lambda: sum(s["rows"] for s in exporter.export(full=True))))
+    add_articles(db_path, args.articles, args.new)
+    report("stream delta", measured(lambda: sum(s["rows"] for s in exporter.export())))
+
+    shards = exporter.manifest()["shards"]
+    print(f"\n{len(shards)} shards, {sum(s['bytes'] for s in shards) / 1e6:.1f} MB")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: date string normalization.
+
+The corpus uses the date formats each site publishes (as documented in the
+spiders), with random dates:
+
+    legacy      - previous BaseNewsSpider._parse_date_string: fromisoformat,
+                  relative regex, then strptime over the format list in order
+    normalizer  - BDNewsPaper.date_normalizer.DateNormalizer, one per site
+
+Usage:
+    python scripts/benchmark_date_normalizer.py
+    python scripts/benchmark_date_normalizer.py --per-site 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.config import DHAKA_TZ
+from BDNewsPaper.date_normalizer import DateNormalizer
+
+# Site -> strftime pattern of the dates it publishes
+SITE_FORMATS = {
+    'dailysun': '%Y-%m-%dT%H:%M:%S+06:00',
+    'thebusinesspost': '%Y-%m-%d %H:%M:%S',
+    'observerbd': '%A, %d %B, %Y at %I:%M %p',
+    'theindependent': '%d %b %Y, %I:%M %p',
+    'dhakatimes24': '%d %B, %Y %I:%M:%S %p',
+    'dailyasianage': '%d %B %Y, %I:%M %p',
+    'samakal': '%B %d, %Y',
+    'ctgtimes': '%A, %d %B %Y',
+    'sarabangla': '%d %b %Y',
+    'news24bd': '%m/%d/%Y',
+}
+
+LEGACY_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d',
+    '%d %B, %Y %I:%M:%S %p', '%d %B, %Y %H:%M:%S',
+    '%A, %d %B, %Y at %I:%M %p', '%A, %d %B, %Y', '%A, %d %B %Y',
+    '%d %B, %Y', '%B %d, %Y', '%d %b %Y, %I:%M %p', '%d %B %Y, %I:%M %p',
+    '%d %b %Y', '%b %d, %Y', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y',
+]
+
+
+def legacy_parse(date_str: str):
+    """The format loop _parse_date_string ran before the shared engine."""
+    date_str = date_str.strip()
+    if 'T' in date_str:
+        try:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    if re.match(r'(\d+)\s+(hour|minute|day|week|month|second)s?\s+ago', date_str, re.I):
+        return datetime.now(DHAKA_TZ)
+    for fmt in LEGACY_FORMATS:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return DHAKA_TZ.localize(dt) if dt.tzinfo is None else dt
+        except ValueError:
+            continue
+    return None
+
+
+def make_corpus(rng: random.Random, per_site: int) -> dict:
+    start = datetime(2023, 1, 1)
+    return {
+        site: [
+            (start + timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60))).strftime(fmt)
+            for _ in range(per_site)
+        ]
+        for site, fmt in SITE_FORMATS.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--per-site", type=int, default=2000, help="Date strings per site")
+    args = parser.parse_args()
+
+    corpus = make_corpus(random.Random(42), args.per_site)
+
+    print(f"{'site':<16} {'legacy us':>10} {'engine us':>10} {'speedup':>8}")
+    total_legacy = total_engine = 0.0
+    for site, dates in corpus.items():
+        start = time.perf_counter()
+        expected = [legacy_parse(d) for d in dates]
+        legacy = time.perf_counter() - start
+
+        normalizer = DateNormalizer()
+        start = time.perf_counter()
+        got = [normalizer.parse_localized(d) for d in dates]
+        engine = time.perf_counter() - start
+
+        # month-first sites: the legacy loop misreads day <= 12 as day-first
+        mismatches = sum(1 for a, b in zip(expected, got) if a != b)
+        total_legacy += legacy
+        total_engine += engine
+        note = f"  ({mismatches} legacy misparses)" if mismatches else ""
+        print(f"{site:<16} {legacy / len(dates) * 1e6:>10.2f} {engine / len(dates) * 1e6:>10.2f} "
+              f"{legacy / engine:>7.1f}x{note}")
+
+    print(f"\n{'all sites':<16} {'':>10} {'':>10} {total_legacy / total_engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
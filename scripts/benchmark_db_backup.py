@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full gzip backups vs online incremental chunked backups.
+
+Builds a synthetic WAL-mode archive with the pipeline's indexes and
+backs it up to a local directory:
+
+    gzip full     - the old S3Storage path: gzip the main file (the WAL
+                    is ignored) with shutil.copyfileobj on one thread
+    chunked full  - BDNewsPaper.db_backup, first backup (every chunk new)
+    incremental   - the next backup after --new articles were crawled,
+                    as a daily backup now runs
+    restore       - stream the incremental backup back into a fresh file
+
+Usage:
+    python scripts/benchmark_db_backup.py
+    python scripts/benchmark_db_backup.py --articles 500000 --new 2000 --chunk-kb 256
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.db_backup import BackupEngine, LocalTarget
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL,
+        paper_name TEXT NOT NULL, headline TEXT NOT NULL, article TEXT NOT NULL,
+        category TEXT, content_hash TEXT, scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_paper_name ON articles(paper_name);
+    CREATE INDEX IF NOT EXISTS idx_category ON articles(category);
+    CREATE INDEX IF NOT EXISTS idx_content_hash ON articles(content_hash);
+    CREATE INDEX IF NOT EXISTS idx_scraped_at ON articles(scraped_at);
+"""
+
+
+def add_articles(path: str, start: int, count: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    # Article text compresses roughly like real prose would (repeated words)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (url, paper_name, headline, article, category, content_hash)
+        SELECT 'https://example.com/' || i, 'paper' || (i % 30), 'Headline ' || i,
+               replace(substr(hex(randomblob(400)), 1, 300 + i % 500), 'A', ' the news '),
+               'category' || (i % 12), hex(randomblob(16))
+        FROM n
+    """, (start + 1, start + count))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=200000, help="Articles in the archive")
+    parser.add_argument("--new", type=int, default=500, help="Articles added before the incremental backup")
+    parser.add_argument("--workers", type=int, default=4, help="Compress/upload threads")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="Average chunk size in KB")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "news_articles.db")
+    add_articles(db_path, 0, args.articles)
+    print(f"{args.articles:,} articles, {os.path.getsize(db_path) / 1e6:.0f} MB, "
+          f"{args.workers} workers, {args.chunk_kb} KB chunks\n")
+    print(f"{'run':<14} {'s':>8} {'uploaded MB':>12} {'chunks new':>12}")
+
+    start = time.perf_counter()
+    gz_path = os.path.join(workdir, "full.db.gz")
+    with open(db_path, "rb") as f_in, gzip.open(gz_path, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    print(f"{'gzip full':<14} {time.perf_counter() - start:>8.2f} "
+          f"{os.path.getsize(gz_path) / 1e6:>12.1f} {'-':>12}")
+
+    engine = BackupEngine(LocalTarget(os.path.join(workdir, "backups")), workers=args.workers,
+                          avg_chunk_bytes=args.chunk_kb * 1024)
+
+    def run(label: str) -> None:
+        engine.backup(db_path)
+        stats = engine.stats
+        print(f"{label:<14} {stats['elapsed']:>8.2f} {stats['stored_bytes'] / 1e6:>12.1f} "
+              f"{stats['new_chunks']:>5}/{stats['chunks']:<6}")
+
+    run("chunked full")
+    add_articles(db_path, args.articles, args.new)
+    run("incremental")
+
+    start = time.perf_counter()
+    engine.restore(os.path.join(workdir, "restored.db"))
+    print(f"{'restore':<14} {time.perf_counter() - start:>8.2f}")
+
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
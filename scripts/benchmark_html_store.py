@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: raw HTML on items vs. the side-channel HTML store.
+
+Simulates a large crawl in which every auto-extracted item sits in the
+CONCURRENT_ITEMS queue while the pipeline chain runs. A fraction of items
+needs fallback extraction and reads its page back.
+
+    inline  - item carries the full page (previous ``_raw_html`` behavior)
+    store   - item carries a handle into BDNewsPaper.html_store.HtmlStore
+
+Each mode runs in its own process; peak Python heap (tracemalloc) and peak
+RSS are reported.
+
+Usage:
+    python scripts/benchmark_html_store.py
+    python scripts/benchmark_html_store.py --items 5000 --page-kb 600
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.html_store import HtmlStore
+
+WORDS = (
+    "Dhaka Chattogram government minister election budget river flood "
+    "cricket parliament economy garment export police court university "
+    "ঢাকা সরকার নির্বাচন বাজেট বন্যা ক্রিকেট সংসদ অর্থনীতি পুলিশ আদালত"
+).split()
+
+
+def make_page(rng: random.Random, size_kb: int) -> str:
+    """Build a news-like page: boilerplate markup plus article text."""
+    parts = ['<html><head><script>var cfg = {"ads": true};</script></head><body>']
+    size = 0
+    while size < size_kb * 1024:
+        text = " ".join(rng.choice(WORDS) for _ in range(40))
+        chunk = f'<div class="row"><a href="/news/{rng.randint(1, 10**6)}">{text}</a></div>'
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def run_mode(mode: str, items: int, page_kb: int, queue_depth: int,
+             fallback_ratio: float, result_queue) -> None:
+    rng = random.Random(42)
+    pages = [make_page(rng, page_kb).encode("utf-8") for _ in range(8)]
+    store = HtmlStore(max_memory_bytes=16 * 1024 * 1024) if mode == "store" else None
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    inflight = deque()
+
+    def finish(item):
+        if rng.random() < fallback_ratio:
+            html = item["_raw_html"] if store is None else store.get(item["_html_handle"])
+            assert html
+        if store is not None:
+            store.release(item["_html_handle"])
+
+    for i in range(items):
+        url = f"https://example.com/news/{i}"
+        # Each response owns its body; the old flow also kept the decoded text
+        body = pages[i % len(pages)] + f"<!-- {i} -->".encode("utf-8")
+        item = {"url": url, "headline": f"Headline {i}", "article_body": "x" * 2000}
+        if store is None:
+            item["_raw_html"] = body.decode("utf-8")
+        else:
+            item["_html_handle"] = store.put(url, body, "utf-8")
+        del body
+
+        inflight.append(item)
+        if len(inflight) >= queue_depth:
+            finish(inflight.popleft())
+
+    while inflight:
+        finish(inflight.popleft())
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if store is not None:
+        store.close()
+
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result_queue.put((mode, peak, max_rss_kb, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=2000, help="Items to simulate")
+    parser.add_argument("--page-kb", type=int, default=400, help="HTML size per page (KB)")
+    parser.add_argument("--queue-depth", type=int, default=100,
+                        help="Items in flight (CONCURRENT_ITEMS)")
+    parser.add_argument("--fallback-ratio", type=float, default=0.05,
+                        help="Fraction of items needing fallback extraction")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    results = {}
+    for mode in ("inline", "store"):
+        proc = ctx.Process(target=run_mode, args=(
+            mode, args.items, args.page_kb, args.queue_depth,
+            args.fallback_ratio, result_queue,
+        ))
+        proc.start()
+        mode, peak, max_rss_kb, elapsed = result_queue.get()
+        proc.join()
+        results[mode] = (peak, max_rss_kb, elapsed)
+
+    print(f"{'mode':<8} {'peak heap MB':>13} {'peak RSS MB':>12} {'items/s':>10}")
+    for mode, (peak, max_rss_kb, elapsed) in results.items():
+        print(f"{mode:<8} {peak / 2**20:>13.1f} {max_rss_kb / 1024:>12.1f} "
+              f"{args.items / elapsed:>10.0f}")
+
+    inline_rss = results["inline"][1]
+    store_rss = results["store"][1]
+    print(f"\nPeak RSS reduction: {(inline_rss - store_rss) / 1024:.1f} MB "
+          f"({(1 - store_rss / inline_rss) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: language identification per article.
+
+    langdetect  - previous behavior: a generator scan for Bengali code points
+                  in NewsArticleItem plus langdetect.detect() on headline +
+                  500 chars in LanguageDetectionPipeline
+    script      - BDNewsPaper.language_id: one script histogram per article,
+                  langdetect only for mixed-script text, in seeded batches
+
+Usage:
+    python scripts/benchmark_language_id.py
+    python scripts/benchmark_language_id.py --articles 2000 --mixed-ratio 0.1
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.language_id import LanguageIdentifier, classify_script
+
+BENGALI_WORDS = "ঢাকা সরকার নির্বাচন বাজেট বন্যা ক্রিকেট সংসদ অর্থনীতি পুলিশ আদালত মন্ত্রী জেলা".split()
+ENGLISH_WORDS = (
+    "Dhaka government minister election budget river flood cricket "
+    "parliament economy garment export police court university"
+).split()
+
+
+def make_corpus(rng: random.Random, articles: int, words: int, mixed_ratio: float):
+    corpus = []
+    for i in range(articles):
+        roll = rng.random()
+        if roll < mixed_ratio:
+            vocab = BENGALI_WORDS + ENGLISH_WORDS
+        elif i % 2:
+            vocab = BENGALI_WORDS
+        else:
+            vocab = ENGLISH_WORDS
+        headline = " ".join(rng.choice(vocab) for _ in range(8))
+        body = " ".join(rng.choice(vocab) for _ in range(words))
+        corpus.append((headline, body))
+    return corpus
+
+
+def run_langdetect(corpus):
+    from langdetect import DetectorFactory, detect
+    DetectorFactory.seed = 0
+    results = []
+    for headline, body in corpus:
+        has_bengali = any('\u0980' <= char <= '\u09FF' for char in body)
+        results.append((has_bengali, detect(f"{headline} {body[:500]}")))
+    return results
+
+
+def run_script(corpus, identifier: LanguageIdentifier, batch_size: int):
+    results, pending = [], []
+    by_script = 0
+    for headline, body in corpus:
+        guess = classify_script(body)
+        if not guess.certain:
+            guess = classify_script(f"{headline} {body}")
+        if guess.certain:
+            results.append((guess.lang == 'bn', guess.lang))
+            by_script += 1
+            continue
+        pending.append(f"{headline} {body[:500]}")
+        if len(pending) >= batch_size:
+            results.extend((g.lang == 'bn', g.lang) for g in identifier.identify_many(pending))
+            pending = []
+    results.extend((g.lang == 'bn', g.lang) for g in identifier.identify_many(pending))
+    return results, by_script, identifier.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=1000, help="Articles to identify")
+    parser.add_argument("--words", type=int, default=600, help="Words per article body")
+    parser.add_argument("--mixed-ratio", type=float, default=0.05,
+                        help="Fraction of mixed-script articles")
+    parser.add_argument("--batch-size", type=int, default=32, help="Model batch size")
+    args = parser.parse_args()
+
+    corpus = make_corpus(random.Random(42), args.articles, args.words, args.mixed_ratio)
+
+    # Load langdetect profiles outside the timed region for both modes
+    run_langdetect(corpus[:1])
+    identifier = LanguageIdentifier(seed=0)
+    identifier.identify_many(["Dhaka ঢাকা " * 5])
+    identifier.stats.update(model=0, batches=0)
+
+    start = time.perf_counter()
+    run_langdetect(corpus)
+    old_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, by_script, stats = run_script(corpus, identifier, args.batch_size)
+    new_elapsed = time.perf_counter() - start
+
+    print(f"{'mode':<11} {'total s':>9} {'us/article':>11}")
+    for mode, elapsed in (("langdetect", old_elapsed), ("script", new_elapsed)):
+        print(f"{mode:<11} {elapsed:>9.3f} {elapsed / args.articles * 1e6:>11.1f}")
+    print(f"\nDecided by script: {by_script}, by model: {stats['model']} "
+          f"in {stats['batches']} batches")
+    print(f"Speedup: {old_elapsed / new_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
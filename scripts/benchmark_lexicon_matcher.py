@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lexicon matching throughput (MB/s).
+
+Compares, over synthetic English and Bengali article text:
+
+    regex    - one alternation regex per bias/sentiment category plus one for
+               locations, as FeatureExtractor used to run
+    matcher  - BDNewsPaper.lexicon_matcher automata (lexicon + locations)
+
+for the shipped lexicons and for a synthetic gazetteer of --terms entries,
+and reports the automaton build time against loading it from the disk cache.
+
+Usage:
+    python scripts/benchmark_lexicon_matcher.py
+    python scripts/benchmark_lexicon_matcher.py --mb 20 --terms 20000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper import lexicon_matcher
+from BDNewsPaper.lexicon_matcher import LexiconMatcher, load_matcher
+from BDNewsPaper.lexicons import BIAS_LEXICON, LOCATION_ALIASES, SENTIMENT_LEXICON
+
+ENGLISH_FILLER = (
+    "the government said on monday that the new budget would cover roads schools and hospitals "
+    "while officials from several ministries met local leaders to discuss the plan in detail"
+).split()
+BENGALI_FILLER = (
+    "সরকার সোমবার জানিয়েছে নতুন বাজেটে সড়ক স্কুল ও হাসপাতালের জন্য বরাদ্দ থাকবে "
+    "বিভিন্ন মন্ত্রণালয়ের কর্মকর্তারা স্থানীয় নেতাদের সঙ্গে পরিকল্পনা নিয়ে বৈঠক করেছেন"
+).split()
+
+
+def lexicon_terms():
+    return {**BIAS_LEXICON, **SENTIMENT_LEXICON}
+
+
+def synthetic_gazetteer(count: int, rng: random.Random):
+    """`count` made-up place names, each with an English and a Bengali alias."""
+    syllables = ["ra", "pur", "gan", "ja", "dha", "kha", "li", "ba", "zar", "ti", "na", "ghat"]
+    bengali = ["রা", "পুর", "গঞ্জ", "জা", "ঢা", "খা", "লি", "বা", "জার", "টি", "না", "ঘাট"]
+    terms = {}
+    while len(terms) < count:
+        picks = [rng.randrange(len(syllables)) for _ in range(rng.randint(3, 5))]
+        name = "".join(syllables[i] for i in picks)
+        terms[name] = [name, "".join(bengali[i] for i in picks)]
+    return terms
+
+
+def build_text(megabytes: float, vocab, filler, rng: random.Random) -> str:
+    """About `megabytes` MB of filler with a lexicon term every ~10 words."""
+    words, size = [], 0
+    while size < megabytes * 1_000_000:
+        word = rng.choice(vocab) if rng.random() < 0.1 else rng.choice(filler)
+        words.append(word)
+        size += len(word.encode("utf-8")) + 1
+    return " ".join(words)
+
+
+def regex_scanner(categories):
+    """The previous approach: one IGNORECASE alternation per category."""
+    patterns = [
+        re.compile(r'\b(' + '|'.join(re.escape(w) for w in words) + r')\b', re.IGNORECASE)
+        for words in categories.values()
+    ]
+    return lambda text: [len(p.findall(text)) for p in patterns]
+
+
+def throughput(scan, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode("utf-8")) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--mb", type=float, default=2, help="Text size per run in MB")
+    parser.add_argument("--terms", type=int, default=5000, help="Entries in the synthetic gazetteer")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    gazetteer = synthetic_gazetteer(args.terms, rng)
+    shipped = {"lexicon": lexicon_terms(), "location": LOCATION_ALIASES}
+    shipped_regex = {**lexicon_terms(), "location": [a for aliases in LOCATION_ALIASES.values() for a in aliases]}
+
+    cases = [
+        ("shipped, english", shipped, shipped_regex, ENGLISH_FILLER, "en"),
+        ("shipped, bengali", shipped, shipped_regex, BENGALI_FILLER, "bn"),
+        (f"{args.terms:,} terms, english", {"g": gazetteer}, {"g": [a for a, _ in gazetteer.values()]},
+         ENGLISH_FILLER, "en"),
+        (f"{args.terms:,} terms, bengali", {"g": gazetteer}, {"g": [b for _, b in gazetteer.values()]},
+         BENGALI_FILLER, "bn"),
+    ]
+
+    print(f"{'case':<24} {'regex MB/s':>11} {'matcher MB/s':>13} {'regex hits':>11} {'matcher hits':>13}")
+    for name, lexicons, regex_lexicon, filler, language in cases:
+        aliases = [a for terms in lexicons.values() for group in terms.values() for a in group]
+        vocab = [a for a in aliases if a.isascii() == (language == "en")]
+        text = build_text(args.mb, vocab, filler, rng)
+
+        matchers = [LexiconMatcher.build(terms) for terms in lexicons.values()]
+        regex = regex_scanner(regex_lexicon)
+        regex_hits = sum(regex(text))
+        matcher_hits = sum(len(m.findall(text)) for m in matchers)
+        regex_rate = throughput(regex, text, repeat=1)
+        matcher_rate = throughput(lambda t: [m.findall(t) for m in matchers], text)
+        print(f"{name:<24} {regex_rate:>11.1f} {matcher_rate:>13.1f} {regex_hits:>11,} {matcher_hits:>13,}")
+
+    cache_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    load_matcher(gazetteer, cache_dir=cache_dir)
+    built = time.perf_counter() - start
+    lexicon_matcher._matchers.clear()
+    start = time.perf_counter()
+    load_matcher(gazetteer, cache_dir=cache_dir)
+    loaded = time.perf_counter() - start
+    print(f"\n{args.terms:,}-term automaton: build + cache {built * 1e3:.0f} ms, "
+          f"load from cache {loaded * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
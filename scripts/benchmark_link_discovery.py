@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: article link discovery throughput (links/sec).
+
+Runs discover_article_links over listing pages, either saved ones
+(--pages DIR of .html files) or synthetic pages shaped like the sites'
+section listings (repeated menus, tag/category links, article slugs and
+numeric ids, Bengali and English headlines):
+
+    legacy  - the previous path: a new ArticleLinkDiscovery per call,
+              three CSS queries per anchor and one regex search per
+              pattern per link
+    engine  - BDNewsPaper.link_discovery as the spiders now call it
+
+Both must return the same article URLs for every page.
+
+Usage:
+    python scripts/benchmark_link_discovery.py
+    python scripts/benchmark_link_discovery.py --pages saved_listings/ --base-url https://www.prothomalo.com/
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy.http import HtmlResponse
+
+from BDNewsPaper.link_discovery import ArticleLinkDiscovery, discover_article_links
+
+MENU = ["politics", "business", "sports", "entertainment", "world", "opinion",
+        "technology", "lifestyle", "education", "health", "bangladesh", "economy"]
+WORDS = ["govt", "dhaka", "election", "budget", "flood", "cricket", "bank", "prices",
+         "students", "metro", "rail", "power", "export", "garment", "court", "police"]
+
+
+def synthetic_page(rng: random.Random, domain: str, index: int) -> HtmlResponse:
+    parts = ["<html><body><header><nav>"]
+    parts += [f'<a href="/{m}">{m.title()}</a>' for m in MENU]
+    parts += ['<a href="/login">Login</a><a href="/about">About us</a>',
+              '<a href="javascript:void(0)">Menu</a><a href="mailto:news@example.com">Mail</a>',
+              f'<a href="https://facebook.com/{domain}">Facebook</a></nav></header><main>']
+    for n in range(rng.randint(40, 80)):
+        slug = "-".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+        section = rng.choice(MENU)
+        kind = n % 4
+        if kind == 0:
+            href = f"/{section}/{slug}"
+        elif kind == 1:
+            href = f"/{section}/news/{rng.randint(100000, 999999)}"
+        elif kind == 2:
+            href = f"https://{domain}/{2024 + n % 2}/{n % 12 + 1:02d}/{n % 28 + 1:02d}/{slug}"
+        else:
+            href = f"/details/{section}/{rng.randint(1000, 99999)}"
+        headline = ("ঢাকায় " if n % 3 == 0 else "Dhaka ") + " ".join(rng.choice(WORDS) for _ in range(6))
+        parts.append(f'<article><a href="{href}"><img src="/media/{n}.jpg"></a>'
+                     f'<h2><a href="{href}"><span>{headline}</span></a></h2>'
+                     f'<a href="/tag/{rng.choice(WORDS)}">#tag</a></article>')
+    parts.append(f'<a href="/{MENU[index % len(MENU)]}?page={index + 2}">Next</a>')
+    parts.append("</main><footer>" + "".join(f'<a href="/{p}">{p}</a>' for p in
+                                             ("privacy", "terms", "contact", "advertise", "rss")))
+    parts.append("</footer></body></html>")
+    url = f"https://{domain}/{MENU[index % len(MENU)]}?page={index + 1}"
+    return HtmlResponse(url=url, body="".join(parts).encode("utf-8"), encoding="utf-8")
+
+
+def saved_pages(directory: str, base_url: str):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "rb") as f:
+            body = f.read()
+        canonical = re.search(rb'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', body)
+        url = canonical.group(1).decode() if canonical else urljoin(base_url, os.path.basename(path))
+        pages.append(HtmlResponse(url=url, body=body))
+    return pages
+
+
+def legacy_discover(response, limit: int = 50):
+    """The pre-engine discover_article_links, kept for comparison."""
+    cls = ArticleLinkDiscovery
+    article_regexes = [re.compile(p, re.IGNORECASE) for p in cls.ARTICLE_URL_PATTERNS]
+    exclude_regexes = [re.compile(p, re.IGNORECASE) for p in cls.EXCLUDE_PATTERNS]
+    links, seen = [], set()
+    for a_tag in response.css('a[href]'):
+        href = a_tag.css('::attr(href)').get()
+        if not href:
+            continue
+        text = a_tag.css('::text').get() or ''
+        if not text.strip():
+            text = ' '.join(a_tag.css('*::text').getall())
+        text = ' '.join(text.split())
+        full_url = urljoin(response.url, href)
+        if full_url in seen:
+            continue
+        seen.add(full_url)
+        links.append({'url': full_url, 'text': text})
+
+    page_domain = urlparse(response.url).netloc
+    for link in links:
+        parsed = urlparse(link['url'])
+        path = parsed.path.lower()
+        text = link['text']
+        if any(r.search(path) for r in exclude_regexes) or any(path.endswith(e) for e in cls.EXCLUDED_EXTENSIONS):
+            link['score'], link['is_article'] = 0, False
+            continue
+        score = 1 if parsed.netloc == page_domain or not parsed.netloc else 0
+        for regex in article_regexes:
+            if regex.search(path):
+                score += 2
+                break
+        score += len(path) > 20
+        score += 2 * bool(re.search(r'/[a-z0-9]+-[a-z0-9]+-[a-z0-9]+', path))
+        score += bool(re.search(r'/\d{4,}', path))
+        if text and 20 < len(text) < 200 and (text[0].isupper() or ord(text[0]) > 127):
+            score += 2
+        score -= len(path) < 5
+        score -= 2 * (path in ['/', '', '/index.html', '/home'])
+        link['score'], link['is_article'] = max(0, score), score >= 2
+    found = [link for link in links if link['score'] >= 2 and link['is_article']]
+    found.sort(key=lambda x: x['score'], reverse=True)
+    return [link['url'] for link in found[:limit]], len(links)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", help="Directory of saved listing pages (*.html)")
+    parser.add_argument("--base-url", default="https://www.example.com/", help="URL for pages without a canonical link")
+    parser.add_argument("--synthetic", type=int, default=300, help="Synthetic pages when --pages is not given")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the pages")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = saved_pages(args.pages, args.base_url)
+    else:
+        rng = random.Random(7)
+        domains = ["www.prothomalo.com", "www.thedailystar.net", "www.jugantor.com"]
+        pages = [synthetic_page(rng, domains[i % len(domains)], i) for i in range(args.synthetic)]
+    # Parse every page up front so both runs time link discovery only
+    for page in pages:
+        page.selector
+
+    total_links = 0
+    for page in pages:
+        legacy_urls, anchors = legacy_discover(page, limit=100)
+        total_links += anchors
+        if set(legacy_urls) != set(discover_article_links(page, limit=100)):
+            print(f"Mismatch on {page.url}")
+    print(f"{len(pages)} pages, {total_links:,} distinct links, {args.repeat} passes\n")
+
+    for label, discover in (("legacy", legacy_discover), ("engine", discover_article_links)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for page in pages:
+                discover(page, 100)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<8} {elapsed:>7.2f}s {total_links * args.repeat / elapsed:>12,.0f} links/sec")
+
+
+if __name__ == "__main__":
+    main()
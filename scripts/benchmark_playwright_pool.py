@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled Playwright rendering vs. the default mode.
+
+Serves a local static news site (listing pages with images, web fonts,
+video posters and an ad script on ``ads.localhost``) and renders it twice:
+
+    default  - new page per URL in one shared context, wait for ``load``,
+               every resource downloaded
+    pooled   - PagePool from BDNewsPaper.playwright_pool: warm per-domain
+               pages, blocked resource types/ad hosts, DOM taken as soon as
+               the listing selector is attached
+
+Reports pages/min and browser RSS (needs psutil) for each mode.
+
+Usage:
+    python scripts/benchmark_playwright_pool.py
+    python scripts/benchmark_playwright_pool.py --pages 200 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.playwright_pool import PagePool
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+LISTING_SELECTOR = ".news-list a"
+
+
+def make_handler(asset_delay: float, asset_size: int):
+    """Build a request handler for the static test site."""
+    asset = b"\0" * asset_size
+
+    class StaticSiteHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, body: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            host = self.headers.get("Host", "")
+            path = self.path
+
+            if host.startswith("ads.localhost"):
+                time.sleep(asset_delay)
+                self._send(b"/* ad tag */ var ad = 1;", "application/javascript")
+            elif path.startswith("/img/") or path.startswith("/video/"):
+                time.sleep(asset_delay)
+                self._send(asset, "image/jpeg")
+            elif path.startswith("/fonts/"):
+                time.sleep(asset_delay)
+                self._send(asset, "font/woff2")
+            elif path.startswith("/list/"):
+                port = self.server.server_address[1]
+                links = "\n".join(
+                    f'<li><a href="/article/{i}.html">Headline {i}</a>'
+                    f'<img src="/img/{path[6:]}-{i}.jpg"></li>'
+                    for i in range(30)
+                )
+                html = f"""<!doctype html><html><head>
+<style>@font-face {{ font-family: x; src: url(/fonts/x.woff2); }}
+body {{ font-family: x; }}</style>
+<script src="http://ads.localhost:{port}/tag.js"></script>
+</head><body>
+<video poster="/video/poster.jpg"></video>
+<ul class="news-list">{links}</ul>
+</body></html>"""
+                self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+            else:
+                self.send_response(404)
+                self.end_headers()
+
+    return StaticSiteHandler
+
+
+def browser_rss_mb() -> float:
+    """RSS of this process plus all child (browser) processes, in MB."""
+    if not PSUTIL_AVAILABLE:
+        return float("nan")
+    proc = psutil.Process()
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+async def run_default(browser, urls, concurrency):
+    """Current behavior: new page per request in the shared context."""
+    context = await browser.new_context()
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    peak_rss = 0.0
+
+    async def worker():
+        nonlocal peak_rss
+        while not queue.empty():
+            url = queue.get_nowait()
+            page = await context.new_page()
+            try:
+                await page.goto(url)
+                await page.wait_for_selector(LISTING_SELECTOR)
+                await page.content()
+                peak_rss = max(peak_rss, browser_rss_mb())
+            finally:
+                await page.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await context.close()
+    return peak_rss
+
+
+async def run_pooled(browser, urls, concurrency, pool_size):
+    """Pooled mode: warm pages, resource blocking, early DOM capture."""
+    pool = PagePool(max_pages_per_domain=pool_size, ad_hosts=["ads.localhost"])
+    contexts = {}
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    peak_rss = 0.0
+
+    async def worker():
+        nonlocal peak_rss
+        while not queue.empty():
+            url = queue.get_nowait()
+            page = pool.acquire(url)
+            if page is None:
+                name = pool.context_name(url)
+                if name not in contexts:
+                    contexts[name] = await browser.new_context(**pool.context_kwargs)
+                page = await contexts[name].new_page()
+                await pool.init_page(page, None)
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector(LISTING_SELECTOR, state="attached")
+            await page.content()
+            peak_rss = max(peak_rss, browser_rss_mb())
+            if not pool.release(url, page):
+                await page.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await pool.close_all()
+    for context in contexts.values():
+        await context.close()
+    return peak_rss, pool.stats
+
+
+async def main_async(args):
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("playwright is required: pip install playwright && playwright install chromium")
+        return 1
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(args.asset_delay, args.asset_size * 1024)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    urls = [f"http://localhost:{port}/list/{i}.html" for i in range(args.pages)]
+
+    results = {}
+    async with async_playwright() as p:
+        for mode in ("default", "pooled"):
+            browser = await p.chromium.launch(headless=True)
+            start = time.perf_counter()
+            if mode == "default":
+                peak_rss = await run_default(browser, urls, args.concurrency)
+                stats = None
+            else:
+                peak_rss, stats = await run_pooled(
+                    browser, urls, args.concurrency, args.pool_size
+                )
+            elapsed = time.perf_counter() - start
+            await browser.close()
+            results[mode] = (len(urls) / elapsed * 60, peak_rss, stats)
+
+    server.shutdown()
+
+    print(f"{'mode':<10} {'pages/min':>12} {'peak RSS MB':>12}")
+    for mode, (rate, rss, _) in results.items():
+        print(f"{mode:<10} {rate:>12.1f} {rss:>12.1f}")
+    base_rate = results["default"][0]
+    pooled_rate, _, stats = results["pooled"]
+    print(f"\nSpeedup: {pooled_rate / base_rate:.2f}x")
+    print(f"Pool stats: {stats}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=100, help="Listing pages to render")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent pages")
+    parser.add_argument("--pool-size", type=int, default=2, help="Idle pages per domain")
+    parser.add_argument("--asset-delay", type=float, default=0.05,
+                        help="Server latency for images/fonts/ads (seconds)")
+    parser.add_argument("--asset-size", type=int, default=100,
+                        help="Size of each image/font asset (KB)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of the component profiler on the downloader middleware chain.
+
+Builds the project's downloader middleware chain from settings.py (rate
+control off, so requests are not paced) and runs requests through it
+with a stub download that returns a synthetic article page:
+
+    off       - the chain as configured
+    sampled   - ComponentProfiler with --sample-rate (production mode)
+    full      - ComponentProfiler timing every call
+
+and prints the best µs per request of --rounds runs for each, the
+overhead against "off" and the profiler's own report for the full run.
+
+Usage:
+    python scripts/benchmark_profiler.py
+    python scripts/benchmark_profiler.py --requests 5000 --rounds 5 --sample-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy.utils.reactor import install_reactor
+
+install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+
+from scrapy import Spider
+from scrapy.core.downloader.middleware import DownloaderMiddlewareManager
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.test import get_crawler
+
+from BDNewsPaper.profiling import DOWNLOADER_METHODS, ComponentProfiler
+
+BODY = ("<html><head><title>Budget passed</title></head><body>"
+        + '<p><a href="/news/1">Dhaka</a> budget election flood cricket bank prices</p>' * 300
+        + "</body></html>").encode("utf-8")
+
+
+class BenchSpider(Spider):
+    name = "benchmark_profiler"
+
+
+def build_chain(sample_rate=None):
+    settings = get_project_settings().copy_to_dict()
+    settings.update(RATE_CONTROL_ENABLED=False, LOG_ENABLED=False)
+    crawler = get_crawler(BenchSpider, settings)
+    crawler.spider = BenchSpider.from_crawler(crawler)
+    manager = DownloaderMiddlewareManager.from_crawler(crawler)
+    profiler = None
+    if sample_rate is not None:
+        profiler = ComponentProfiler(crawler, sample_rate=sample_rate)
+        profiler.instrument(manager, 'downloader', DOWNLOADER_METHODS)
+    return manager, profiler
+
+
+async def download(request):
+    return HtmlResponse(request.url, body=BODY, encoding="utf-8", request=request)
+
+
+async def run(manager, count: int) -> float:
+    requests = [Request(f"https://www.prothomalo.com/bangladesh/{i}") for i in range(count)]
+    start = time.perf_counter()
+    for request in requests:
+        await manager.download_async(download, request)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per mode; the best counts")
+    parser.add_argument("--sample-rate", type=float, default=0.01, help="Sampled run's PROFILE_SAMPLE_RATE")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    results = {}
+    profiler = None
+    for label, rate in (("off", None), ("sampled", args.sample_rate), ("full", 1.0)):
+        manager, profiler = build_chain(rate)
+        asyncio.run(run(manager, 200))  # warm up
+        results[label] = min(asyncio.run(run(manager, args.requests)) for _ in range(args.rounds))
+        overhead = f"{results[label] / results['off'] - 1:+.1%}" if label != "off" else ""
+        print(f"{label:<8} {results[label]:>9,.1f} µs/request {overhead:>8}")
+    print(f"\n{profiler.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark: body checks of the detecting downloader middlewares (µs/response).
+
+Runs every body check a response meets on its way through the downloader
+middlewares - Cloudflare, Akamai, DataDome, PerimeterX, Incapsula, CAPTCHA,
+the hybrid JS-challenge check, geo-block, proxy ban and the honeypot's
+link count - over article pages, either saved ones (--pages DIR of .html
+files) or synthetic pages (a script-heavy head, 150-400 links and a long
+body), plus a few challenge and block pages:
+
+    legacy      - the previous path: each check slices response.text and
+                  runs its own regexes (re.I) or lowercased substring tests,
+                  and the honeypot counts links with a CSS query
+    classified  - the middlewares' detectors on classify(response), one
+                  scan of the lowercased raw head shared by all of them
+
+Each run starts from fresh responses whose text and selector are already
+built (the spider callback pays for those either way). The verdicts of
+both paths are compared page by page.
+
+Usage:
+    python scripts/benchmark_response_classifier.py
+    python scripts/benchmark_response_classifier.py --pages saved_articles/ --rounds 5
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy.http import HtmlResponse
+
+from BDNewsPaper.captcha_bypass import (
+    AkamaiBypass, DataDomeBypass, IncapsulaBypass, PerimeterXBypass, detect_captcha_type,
+)
+from BDNewsPaper.cloudflare_bypass import CloudflareDetector
+from BDNewsPaper.geo_mimicry import is_geo_blocked
+from BDNewsPaper.hybrid_request import HybridRequestMiddleware
+from BDNewsPaper.proxy import ProxyConfig, ProxyMiddleware
+from BDNewsPaper.response_classifier import classify
+
+WORDS = ["govt", "dhaka", "election", "budget", "flood", "cricket", "bank", "prices",
+         "students", "metro", "rail", "power", "export", "garment", "court", "police"]
+
+MAX_LINKS = 500
+
+CHALLENGE_PAGES = [
+    "<html><head><title>Just a moment...</title></head><body>"
+    "<script>window._cf_chl_opt={cvId:'3'}</script>Checking your browser</body></html>",
+    "<html><body><h1>Sorry, you have been blocked</h1><p>Cloudflare Ray ID: 8a1</p></body></html>",
+    "<html><body><p>This content is not available in your country.</p></body></html>",
+    '<html><body><div class="g-recaptcha" data-sitekey="6Lc_key"></div>'
+    '<script src="https://www.google.com/recaptcha/api.js"></script></body></html>',
+    "<html><body>Request unsuccessful. Incapsula incident ID: 42</body></html>",
+    '<html><body><script src="https://client.perimeterx.net/PX1/main.min.js"></script>'
+    "<p>Press & Hold to confirm you are a human</p></body></html>",
+]
+
+
+def _compile(patterns):
+    return [re.compile(p, re.I) for p in patterns]
+
+
+LEGACY_CF = [
+    ("challenge", _compile([
+        r'<title>Just a moment\.\.\.</title>', r'_cf_chl_opt', r'challenge-platform',
+        r'cf-browser-verification', r'cf-turnstile', r'Checking your browser',
+        r'Please Wait\.\.\. \| Cloudflare', r'Attention Required! \| Cloudflare', r'ray ID:', r'cf-ray',
+    ])),
+    ("blocked", _compile([r'Access denied', r'Error 1020', r'Sorry, you have been blocked',
+                          r'This website is using a security service'])),
+    ("ratelimited", _compile([r'Error 1015', r'rate limit', r'too many requests'])),
+]
+LEGACY_AKAMAI = _compile([r'/akam/[\d]+/[\w]+', r'_abck', r'bmak\.js'])
+LEGACY_DATADOME = _compile([r'js\.datadome\.co', r'datadome\.co/captcha', r'dd\.[\w]+\.js'])
+LEGACY_PX = _compile([r'client\.perimeterx\.net', r'captcha\.px-cdn\.net', r'\/api\/v\d+\/collector',
+                      r'block\.perimeterx\.net', r'Access to this page has been denied',
+                      r'press & hold', r'_pxCaptcha'])
+LEGACY_INCAPSULA = [r'/_Incapsula_Resource', r'incapsula\.com', r'Request unsuccessful.*Incapsula',
+                    r'robots\.txt.*Incapsula', r'reese84']
+LEGACY_HYBRID = _compile([
+    r'<title>Just a moment\.\.\.</title>', r'_cf_chl_opt', r'challenge-platform', r'Checking your browser',
+    r'Please enable JavaScript', r'needs JavaScript', r'turnstile', r'hcaptcha', r'Please wait while we verify',
+])
+LEGACY_GEO = [r'not available in your region', r'not available in your country', r'access denied.*location',
+              r'sorry.*region', r'geo.?restrict', r'blocked.*your country',
+              r'this content is not available in bangladesh', r'international edition', r'viewing from outside']
+LEGACY_BAN = ['blocked', 'banned', 'captcha', 'access denied', 'too many requests']
+
+
+def synthetic_page(rng: random.Random, index: int) -> str:
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    scripts = "".join(
+        f'<script src="https://cdn.example.com/js/{words(1)}.{i}.min.js" async></script>'
+        f"<script>window.dataLayer=window.dataLayer||[];dataLayer.push({{'section':'{words(1)}'}});</script>"
+        for i in range(rng.randint(6, 14))
+    )
+    meta = "".join(f'<meta name="k{i}" content="{words(4)}">' for i in range(20))
+    links = "".join(f'<li><a class="nav" href="/news/{words(1)}/{i}">{words(3)}</a></li>'
+                    for i in range(rng.randint(150, 400)))
+    paragraphs = "".join(f"<p>{words(60)}</p>" for _ in range(rng.randint(20, 50)))
+    return (f"<html><head><title>{words(6)}</title>{meta}{scripts}</head>"
+            f"<body><nav><ul>{links[:len(links) // 2]}</ul></nav><article><h1>{words(8)}</h1>"
+            f"{paragraphs}</article><footer><ul>{links[len(links) // 2:]}</ul></footer></body></html>")
+
+
+def load_pages(pages_dir: str, count: int, seed: int):
+    if pages_dir:
+        paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))[:count]
+        pages = [open(p, encoding="utf-8", errors="replace").read() for p in paths]
+    else:
+        rng = random.Random(seed)
+        pages = [synthetic_page(rng, i) for i in range(count)]
+    return pages + CHALLENGE_PAGES if pages else []
+
+
+def legacy(response):
+    """The previous path: each middleware's own decode, slice and regexes."""
+    text = response.text
+    head = text[:5000]
+    cf = next((kind for kind, patterns in LEGACY_CF if any(p.search(head) for p in patterns)), "none")
+    akamai = any(p.search(text[:10000]) for p in LEGACY_AKAMAI)
+    datadome = any(p.search(text[:10000]) for p in LEGACY_DATADOME)
+    perimeterx = any(p.search(text[:10000]) for p in LEGACY_PX)
+    incapsula = any(re.search(p, head, re.I) for p in LEGACY_INCAPSULA)
+    captcha = detect_captcha_type(text)[0] is not None
+    challenge = len(response.body) < 5000 and any(p.search(text) for p in LEGACY_HYBRID)
+    geo = any(re.search(p, head.lower(), re.I) for p in LEGACY_GEO)
+    banned = any(t in text[:1000].lower() for t in LEGACY_BAN)
+    trap = len(response.css('a::attr(href)').getall()) > MAX_LINKS
+    return cf, akamai, datadome, perimeterx, incapsula, captcha, challenge, geo, banned, trap
+
+
+class Classified:
+    def __init__(self):
+        self.cloudflare = CloudflareDetector()
+        self.akamai = AkamaiBypass()
+        self.datadome = DataDomeBypass()
+        self.perimeterx = PerimeterXBypass()
+        self.incapsula = IncapsulaBypass()
+        self.hybrid = HybridRequestMiddleware()
+        self.proxy = ProxyMiddleware(ProxyConfig({}))
+
+    def __call__(self, response):
+        verdict = classify(response)
+        captcha = verdict.has('captcha', within=10000) and detect_captcha_type(response.text)[0] is not None
+        return (self.cloudflare.detect(response).value, self.akamai.detect(response),
+                self.datadome.detect(response), self.perimeterx.detect(response),
+                self.incapsula.detect(response), captcha, self.hybrid._detect_challenge(response),
+                is_geo_blocked(response), self.proxy._is_banned_response(response),
+                verdict.link_count(limit=MAX_LINKS) > MAX_LINKS)
+
+
+def responses(pages):
+    result = []
+    for i, html in enumerate(pages):
+        response = HtmlResponse(f"https://example.com/news/{i}", body=html.encode("utf-8"), encoding="utf-8")
+        response.text, response.selector
+        result.append(response)
+    return result
+
+
+def run(fn, pages, rounds: int):
+    elapsed = 0.0
+    verdicts = []
+    for _ in range(rounds):
+        batch = responses(pages)
+        start = time.perf_counter()
+        verdicts = [fn(response) for response in batch]
+        elapsed += time.perf_counter() - start
+    return elapsed / (len(pages) * rounds) * 1e6, verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", help="Directory of saved article .html files")
+    parser.add_argument("--count", type=int, default=200, help="Pages to load or generate")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the pages")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.count, args.seed)
+    if not pages:
+        parser.error(f"no .html files in {args.pages}")
+    print(f"{len(pages)} pages ({len(CHALLENGE_PAGES)} challenge/block), {args.rounds} rounds, "
+          f"{sum(len(html) for html in pages) / len(pages) / 1024:.0f} KB average\n")
+    results = {}
+    for label, fn in (("legacy", legacy), ("classified", Classified())):
+        results[label] = run(fn, pages, args.rounds)
+        print(f"{label:<11} {results[label][0]:>10,.0f} µs/response")
+    print(f"\nspeedup     {results['legacy'][0] / results['classified'][0]:>10.2f}x")
+    differ = [i for i, (a, b) in enumerate(zip(results["legacy"][1], results["classified"][1])) if a != b]
+    print(f"verdicts    {'identical' if not differ else f'differ on pages {differ}'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: traffic a flapping site receives from immediate vs. delayed retries.
+
+Simulates --seconds of crawling two sites at --rate first attempts per
+second each. One site is down (every request fails) for --outage seconds
+in the middle of the crawl; failed requests are retried up to 3 times:
+
+    immediate  - retries go straight back into the scheduler, as before
+    delayed    - DelayedRetryQueue parks them for 2, 4 and 8 seconds
+                 (SmartRetryMiddleware's backoff) under the per-domain
+                 retry budget (RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO)
+
+Reports, for the failing site, the requests sent during the outage, the
+retries sent in total, the retries saved by the budget and the articles
+eventually fetched.
+
+Usage:
+    python scripts/benchmark_retry_queue.py
+    python scripts/benchmark_retry_queue.py --outage 120 --rate 4
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy.http import Request
+from twisted.internet.task import Clock
+
+from BDNewsPaper.retry_queue import DelayedRetryQueue, backoff_delay
+
+MAX_RETRIES = 3
+FLAPPING = "down.example.com"
+HEALTHY = "up.example.com"
+
+
+def simulate(seconds: int, rate: int, outage: int, delayed: bool, budget_ratio: float, budget_min: int):
+    clock = Clock()
+    outage_start = (seconds - outage) / 2
+    counts = {"outage_requests": 0, "retries": 0, "fetched": 0}
+    ready = []  # Requests waiting for the downloader
+
+    queue = DelayedRetryQueue(ready.append, clock=clock, budget_ratio=budget_ratio, budget_min=budget_min)
+
+    def fetch(request):
+        domain = request.meta["domain"]
+        now = clock.seconds()
+        down = domain == FLAPPING and outage_start <= now < outage_start + outage
+        if domain != FLAPPING:
+            return
+        counts["retries"] += request.meta["attempt"] > 0
+        if down:
+            counts["outage_requests"] += 1
+            attempt = request.meta["attempt"] + 1
+            if attempt > MAX_RETRIES:
+                return
+            retry = request.replace(meta={**request.meta, "attempt": attempt})
+            if delayed:
+                queue.park(retry, backoff_delay(attempt, jitter=0), domain)
+            else:
+                ready.append(retry)
+        else:
+            counts["fetched"] += 1
+
+    for tick in range(seconds * 10):
+        if tick % 10 == 0:
+            for domain in (FLAPPING, HEALTHY):
+                for i in range(rate):
+                    queue.note_request(domain)
+                    ready.append(Request(f"https://{domain}/{tick}/{i}", meta={"domain": domain, "attempt": 0}))
+        # The downloader keeps up with whatever is ready
+        while ready:
+            fetch(ready.pop(0))
+        clock.advance(0.1)
+    clock.advance(60)
+    while ready:
+        fetch(ready.pop(0))
+    counts["saved"] = queue.stats["saved_by_budget"]
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--seconds", type=int, default=300, help="Simulated crawl length")
+    parser.add_argument("--rate", type=int, default=2, help="First attempts per second per site")
+    parser.add_argument("--outage", type=int, default=60, help="Seconds the flapping site is down")
+    parser.add_argument("--budget-ratio", type=float, default=0.2, help="RETRY_BUDGET_RATIO")
+    parser.add_argument("--budget-min", type=int, default=10, help="RETRY_BUDGET_MIN")
+    args = parser.parse_args()
+
+    print(f"{args.seconds}s crawl, {args.rate} req/s per site, {FLAPPING} down for {args.outage}s\n")
+    print(f"{'run':<10} {'outage req':>11} {'retries':>8} {'saved':>6} {'fetched':>8}")
+    for label, delayed in (("immediate", False), ("delayed", True)):
+        counts = simulate(args.seconds, args.rate, args.outage, delayed, args.budget_ratio, args.budget_min)
+        print(f"{label:<10} {counts['outage_requests']:>11,} {counts['retries']:>8,} {counts['saved']:>6,} "
+              f"{counts['fetched']:>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how long newly published articles wait behind backfill requests.
+
+Simulates one domain's crawl through the real scheduler queues: an RSS
+feed of today's articles plus category listings paginated --depth pages
+deep (20 articles per page, each page older than the last). Requests are
+fetched one after another at --rate requests/second:
+
+    default     - Scrapy's scheduler, every request at priority 0 (LIFO)
+    priority    - RequestPriorityMiddleware priorities + PriorityScheduler
+    overflow    - the same with SCHEDULER_MEMORY_LIMIT=--memory-limit, so
+                  backfill requests (priority below 0) spill to disk
+
+Reports the median and 90th percentile wait, in minutes after the crawl
+started, before articles published in the last 24 hours were fetched,
+and the largest number of requests each run held in memory.
+
+Usage:
+    python scripts/benchmark_scheduling.py
+    python scripts/benchmark_scheduling.py --categories 20 --depth 200 --rate 4
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy import Spider
+from scrapy.core.scheduler import Scheduler
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from BDNewsPaper.config import DHAKA_TZ
+from BDNewsPaper.scheduling import PriorityScheduler, RequestPrioritizer
+
+PER_PAGE = 20
+FEED_ITEMS = 50
+NOW = datetime.now(DHAKA_TZ)
+
+
+class SimulatedSpider(Spider):
+    """Yields what a listing/RSS spider yields; pages are simulated."""
+
+    name = "simulated"
+    categories = 12
+    depth = 100
+
+    async def start(self):
+        yield Request("https://www.example.com/feed", callback=self.parse_rss, meta={'source': 'rss'})
+        for category in range(self.categories):
+            yield Request(f"https://www.example.com/c{category}?page=1", callback=self.parse_category,
+                          meta={'category': category, 'page': 1})
+
+    def parse_rss(self, response):
+        for i in range(FEED_ITEMS):
+            published = NOW - timedelta(minutes=15 * i)
+            yield Request(f"https://www.example.com/feed/{i}", callback=self.parse_article,
+                          meta={'rss_pub_date': published.isoformat(), 'published': published})
+
+    def parse_category(self, response):
+        category, page = response.meta['category'], response.meta['page']
+        for i in range(PER_PAGE):
+            # Each category publishes about one article an hour
+            published = NOW - timedelta(hours=(page - 1) * PER_PAGE + i)
+            yield Request(f"https://www.example.com/c{category}/{page}/{i}", callback=self.parse_article,
+                          meta={'published': published})
+        if page < self.depth:
+            yield Request(f"https://www.example.com/c{category}?page={page + 1}", callback=self.parse_category,
+                          meta={'category': category, 'page': page + 1})
+
+    def parse_article(self, response):
+        return []
+
+
+def simulate(scheduler_cls, categories: int, depth: int, rate: float, prioritize: bool, memory_limit: int):
+    overflow_dir = tempfile.mkdtemp()
+    crawler = get_crawler(SimulatedSpider, {
+        'SCHEDULER_PRIORITY_QUEUE': 'scrapy.pqueues.ScrapyPriorityQueue',
+        'SCHEDULER_MEMORY_LIMIT': memory_limit,
+        'SCHEDULER_OVERFLOW_DIR': overflow_dir,
+        'LOG_LEVEL': 'WARNING',
+    })
+    spider = SimulatedSpider.from_crawler(crawler, categories=categories, depth=depth)
+    crawler.spider = spider
+    scheduler = scheduler_cls.from_crawler(crawler)
+    scheduler.open(spider)
+    prioritizer = RequestPrioritizer(NOW - timedelta(days=3650), NOW)
+
+    def enqueue(request, response=None):
+        if prioritize:
+            request.priority += prioritizer.priority(request, response, now=NOW)
+        scheduler.enqueue_request(request)
+
+    async def start():
+        return [request async for request in spider.start()]
+
+    for request in asyncio.run(start()):
+        enqueue(request)
+
+    waits, fetched, peak_memory = [], 0, 0
+    while (request := scheduler.next_request()) is not None:
+        fetched += 1
+        peak_memory = max(peak_memory, len(scheduler.mqs))
+        published = request.meta.get('published')
+        if published and NOW - published <= timedelta(hours=24):
+            waits.append(fetched / rate / 60)
+        response = HtmlResponse(url=request.url, body=b"", request=request)
+        for child in request.callback(response) or []:
+            enqueue(child, response)
+    overflowed = crawler.stats.get_value('scheduler/enqueued/overflow', 0)
+    scheduler.close('finished')
+    shutil.rmtree(overflow_dir)
+    return fetched, waits, peak_memory, overflowed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--categories", type=int, default=12, help="Category listings")
+    parser.add_argument("--depth", type=int, default=100, help="Listing pages per category")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second")
+    parser.add_argument("--memory-limit", type=int, default=20, help="SCHEDULER_MEMORY_LIMIT for the overflow run")
+    args = parser.parse_args()
+
+    print(f"{args.categories} categories x {args.depth} pages x {PER_PAGE} articles + {FEED_ITEMS} feed items, "
+          f"{args.rate:g} req/s\n")
+    print(f"{'run':<9} {'requests':>9} {'fresh':>6} {'median min':>11} {'p90 min':>8} {'peak mem':>9} {'overflow':>9}")
+    runs = (("default", Scheduler, False, 0),
+            ("priority", PriorityScheduler, True, 50000),
+            ("overflow", PriorityScheduler, True, args.memory_limit))
+    for label, scheduler_cls, prioritize, memory_limit in runs:
+        fetched, waits, peak_memory, overflowed = simulate(
+            scheduler_cls, args.categories, args.depth, args.rate, prioritize, memory_limit)
+        p90 = statistics.quantiles(waits, n=10)[-1]
+        print(f"{label:<9} {fetched:>9,} {len(waits):>6} {statistics.median(waits):>11.1f} {p90:>8.1f} "
+              f"{peak_memory:>9,} {overflowed:>9,}")
+
+
+if __name__ == "__main__":
+    main()
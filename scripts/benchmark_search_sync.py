@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Elasticsearch sync throughput (docs/sec).
+
+Builds a synthetic archive and times BDNewsPaper.search_sync against a
+stand-in cluster that charges a fixed latency per bulk request plus a
+per-MB transfer cost (or against a real cluster with --host):
+
+    full x1      - reindex everything over one bulk stream
+    full xN      - reindex everything over N concurrent streams
+    incremental  - sync after --new articles were added, as every
+                   scheduled run now does instead of a full reindex
+
+Usage:
+    python scripts/benchmark_search_sync.py
+    python scripts/benchmark_search_sync.py --articles 200000 --streams 8
+    python scripts/benchmark_search_sync.py --host http://localhost:9200
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.search_sync import SearchSync
+
+
+class SimulatedIndices:
+    """Index/alias bookkeeping only; documents are not stored."""
+
+    def __init__(self):
+        self.aliases = {}
+        self.names = set()
+
+    def create(self, index, body):
+        self.names.add(index)
+
+    def delete(self, index):
+        self.names.discard(index)
+
+    def exists(self, index):
+        return index in self.names
+
+    def exists_alias(self, name):
+        return name in self.aliases
+
+    def get_alias(self, name):
+        return {self.aliases[name]: {}}
+
+    def put_settings(self, index, settings):
+        pass
+
+    def refresh(self, index):
+        pass
+
+    def update_aliases(self, actions):
+        for action in actions:
+            if "add" in action:
+                self.aliases[action["add"]["alias"]] = action["add"]["index"]
+
+
+class SimulatedCluster:
+    """Accepts every document after sleeping latency + size / bandwidth."""
+
+    def __init__(self, latency: float, mb_per_second: float):
+        self.latency = latency
+        self.mb_per_second = mb_per_second
+        self.indices = SimulatedIndices()
+
+    def bulk(self, operations):
+        size = sum(len(line.encode("utf-8")) + 1 for line in operations)
+        time.sleep(self.latency + size / 1e6 / self.mb_per_second)
+        return {"errors": False, "items": [{"index": {"status": 201}}] * (len(operations) // 2)}
+
+
+def build_archive(path: str, articles: int, start: int = 0) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL, headline TEXT NOT NULL, article TEXT NOT NULL,
+            category TEXT, author TEXT, publication_date TEXT, source_language TEXT,
+            word_count INTEGER, scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (url, paper_name, headline, article, category, source_language, word_count)
+        SELECT 'https://example.com/' || i, 'paper' || (i % 30), 'Headline ' || i,
+               substr(hex(randomblob(2000)), 1, 1500 + i % 2500), 'National', 'English', 300
+        FROM n
+    """, (start + 1, start + articles))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=50000, help="Articles in the archive")
+    parser.add_argument("--new", type=int, default=500, help="Articles added before the incremental run")
+    parser.add_argument("--streams", type=int, default=4, help="Concurrent bulk requests")
+    parser.add_argument("--chunk-mb", type=float, default=5, help="Bulk payload size in MB")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per bulk request")
+    parser.add_argument("--bandwidth", type=float, default=40, help="Simulated MB/s per bulk stream")
+    parser.add_argument("--host", help="Benchmark a real cluster instead (needs the elasticsearch package)")
+    args = parser.parse_args()
+
+    if args.host:
+        from elasticsearch import Elasticsearch
+        client = Elasticsearch(args.host, request_timeout=60)
+    else:
+        client = SimulatedCluster(args.latency, args.bandwidth)
+
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    build_archive(path, args.articles)
+    alias = "bench_articles"
+
+    def run(label: str, streams: int, full: bool):
+        sync = SearchSync(client, path, alias=alias, streams=streams,
+                          chunk_bytes=int(args.chunk_mb * 1024 * 1024))
+        sync.reindex() if full else sync.sync()
+        stats = sync.stats
+        print(f"{label:<14} {stats['indexed']:>9,} {stats['requests']:>9,} "
+              f"{stats['elapsed']:>9.2f} {sync.docs_per_second:>10,.0f}")
+
+    print(f"{args.articles:,} articles, {args.chunk_mb} MB chunks\n")
+    print(f"{'run':<14} {'docs':>9} {'requests':>9} {'s':>9} {'docs/sec':>10}")
+    run("full x1", 1, full=True)
+    run(f"full x{args.streams}", args.streams, full=True)
+    build_archive(path, args.new, start=args.articles)
+    run("incremental", args.streams, full=False)
+
+    if args.host:
+        client.indices.delete(index=list(client.indices.get_alias(name=alias))[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: connections and DNS lookups shared across spiders in one process.
+
+Starts a local keep-alive HTTP server that sleeps --connect-delay on every
+new connection (standing in for the TCP + TLS handshake to a remote
+site), then runs --spiders spiders in one CrawlerProcess, as
+``bdnews scrape`` does, each fetching --pages pages from it via
+``localhost``. With --sequential the spiders run one after another in
+the process (as a long-lived worker runs jobs) instead of all at once:
+
+    legacy   - Scrapy's HTTP/1.1 handler (a connection pool per crawler)
+               and CachingThreadedResolver
+    shared   - SharedHTTP11DownloadHandler and SharedDNSResolver with
+               prefetch (shared_network.py)
+
+Each mode runs in a fresh subprocess (a reactor cannot be restarted).
+Prints wall time, connections the server accepted and the shared mode's
+network_report(). Spiders started together each need their own
+connections at once, so sharing mostly pays off as crawls stagger.
+
+Usage:
+    python scripts/benchmark_shared_network.py
+    python scripts/benchmark_shared_network.py --sequential
+    python scripts/benchmark_shared_network.py --spiders 12 --pages 40 --connect-delay 0.1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+BODY = b"<html><body>" + b"<p>news</p>" * 200 + b"</body></html>"
+
+
+def serve(connect_delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        connections = 0
+
+        def setup(self):
+            super().setup()
+            Handler.connections += 1
+            time.sleep(connect_delay)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler
+
+
+def crawl(mode: str, port: int, spiders: int, pages: int, sequential: bool) -> dict:
+    from scrapy.utils.reactor import install_reactor
+
+    install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+
+    from scrapy import Spider
+    from scrapy.crawler import CrawlerProcess
+    from twisted.internet import defer, reactor
+
+    settings = {
+        "LOG_ENABLED": False,
+        "TELNETCONSOLE_ENABLED": False,
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 4,
+        "TWISTED_REACTOR": "twisted.internet.asyncioreactor.AsyncioSelectorReactor",
+    }
+    if mode == "shared":
+        handler = "BDNewsPaper.shared_network.SharedHTTP11DownloadHandler"
+        settings.update(
+            TWISTED_DNS_RESOLVER="BDNewsPaper.shared_network.SharedDNSResolver",
+            DOWNLOAD_HANDLERS={"http": handler, "https": handler},
+        )
+
+    process = CrawlerProcess(settings)
+    papers = [type(f"Paper{index}", (Spider,), {
+        "name": f"paper{index}",
+        "allowed_domains": ["localhost"],
+        "start_urls": [f"http://localhost:{port}/paper{index}/{page}" for page in range(pages)],
+        "parse": lambda self, response: None,
+    }) for index in range(spiders)]
+
+    if mode == "shared":
+        from BDNewsPaper.shared_network import prefetch
+        reactor.callWhenRunning(prefetch, ["localhost"])
+
+    @defer.inlineCallbacks
+    def one_after_another():
+        for paper in papers:
+            yield process.crawl(paper)
+        reactor.stop()
+
+    start = time.perf_counter()
+    if sequential:
+        reactor.callWhenRunning(one_after_another)
+        process.start(stop_after_crawl=False)
+    else:
+        for paper in papers:
+            process.crawl(paper)
+        process.start()
+    result = {"wall_s": round(time.perf_counter() - start, 3)}
+    if mode == "shared":
+        from BDNewsPaper.shared_network import network_report
+        result.update(network_report())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--spiders", type=int, default=12, help="Spiders in the process")
+    parser.add_argument("--pages", type=int, default=40, help="Pages per spider")
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="Seconds per new connection")
+    parser.add_argument("--sequential", action="store_true", help="Run the spiders one after another")
+    parser.add_argument("--mode", choices=("legacy", "shared"), help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(crawl(args.mode, args.port, args.spiders, args.pages, args.sequential)))
+        return
+
+    server, handler = serve(args.connect_delay)
+    port = server.server_address[1]
+    print(f"{args.spiders} spiders x {args.pages} pages {'one after another' if args.sequential else 'at once'}, "
+          f"{args.connect_delay * 1000:.0f} ms per new connection")
+    accepted = {}
+    for mode in ("legacy", "shared"):
+        before = handler.connections
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--port", str(port),
+             "--spiders", str(args.spiders), "--pages", str(args.pages)]
+            + (["--sequential"] if args.sequential else []),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        wall = result.pop("wall_s")
+        accepted[mode] = handler.connections - before
+        print(f"{mode:<7} {wall:>7.2f} s  {accepted[mode]:>4} connections accepted")
+        for key, value in result.items():
+            print(f"        {key:<22} {value}")
+    avoided = accepted["legacy"] - accepted["shared"]
+    print(f"\n{avoided} fewer connections: {avoided * args.connect_delay:.2f} s of simulated setup avoided")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stats queries against a synthetic archive.
+
+Builds an articles table of the requested size (30 papers in one language
+each, 12 of 40 categories per paper, scraped over two years) and times
+the queries behind /stats, MetricsCollector and PerformanceMonitor:
+
+    scan    - COUNT(*)/GROUP BY/AVG(LENGTH) over articles, as before
+    rollup  - BDNewsPaper.stats_rollup.StatsRollup reads
+
+It also reports the one-off backfill time and the per-insert cost of
+keeping the rollup current.
+
+Usage:
+    python scripts/benchmark_stats_rollup.py
+    python scripts/benchmark_stats_rollup.py --rows 5000000 --db /tmp/bench.db
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.stats_rollup import StatsRollup
+
+SCHEMA = """
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        paper_name TEXT NOT NULL,
+        headline TEXT NOT NULL,
+        article TEXT NOT NULL,
+        category TEXT,
+        source_language TEXT,
+        publication_date TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_paper_name ON articles(paper_name);
+    CREATE INDEX idx_category ON articles(category);
+"""
+
+
+def build_archive(conn: sqlite3.Connection, rows: int) -> None:
+    """Fill articles with `rows` synthetic rows, newest scraped now."""
+    conn.executescript(SCHEMA)
+    conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (url, paper_name, headline, article, category,
+                              source_language, publication_date, scraped_at)
+        SELECT
+            'https://example.com/' || i,
+            'paper' || (i * 7 % 30),
+            'Headline ' || i,
+            substr(hex(randomblob(1200)), 1, 800 + i % 1600),
+            CASE WHEN i % 11 = 0 THEN NULL ELSE 'category' || ((i * 7 % 30) * 3 + i * 13 % 12) % 40 END,
+            CASE WHEN (i * 7 % 30) % 3 = 0 THEN 'English' ELSE 'Bengali' END,
+            date('now', '-' || ((? - i) * 730 / ?) || ' days'),
+            datetime('now', '-' || ((? - i) * 63072000 / ?) || ' seconds')
+        FROM n
+    """, (rows, rows, rows, rows, rows))
+    conn.commit()
+
+
+def scan_queries(conn: sqlite3.Connection) -> None:
+    """The full-table queries the stats consumers used to run."""
+    conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+    conn.execute("SELECT paper_name, COUNT(*) c FROM articles GROUP BY paper_name ORDER BY c DESC").fetchall()
+    conn.execute("""SELECT category, COUNT(*) c FROM articles WHERE category IS NOT NULL
+                    GROUP BY category ORDER BY c DESC LIMIT 20""").fetchall()
+    conn.execute("""SELECT MIN(publication_date), MAX(publication_date) FROM articles
+                    WHERE publication_date IS NOT NULL""").fetchone()
+    for delta in ('-1 hour', '-24 hours', '-7 days'):
+        conn.execute("SELECT COUNT(*) FROM articles WHERE scraped_at >= datetime('now', ?)", (delta,)).fetchone()
+    conn.execute("SELECT AVG(LENGTH(article)) FROM articles WHERE scraped_at > datetime('now', '-24 hours')").fetchone()
+
+
+def rollup_queries(rollup: StatsRollup) -> None:
+    """The same answers from the rollup."""
+    rollup.ensure()
+    rollup.totals()
+    rollup.counts_by('paper_name')
+    rollup.counts_by('category', limit=20)
+    for hours in (1, 24, 7 * 24):
+        rollup.totals(hours=hours)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Articles in the synthetic archive")
+    parser.add_argument("--db", help="Database path (default: a temporary file)")
+    parser.add_argument("--inserts", type=int, default=2000, help="Inserts for the per-insert cost")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+
+    start = time.perf_counter()
+    build_archive(conn, args.rows)
+    print(f"Built {args.rows:,} articles in {time.perf_counter() - start:.1f}s ({db_path})")
+
+    rollup = StatsRollup(conn)
+    start = time.perf_counter()
+    rollup.ensure()
+    backfill = time.perf_counter() - start
+    rollup_rows = conn.execute("SELECT COUNT(*) FROM article_rollup").fetchone()[0]
+    print(f"Backfill: {backfill:.1f}s -> {rollup_rows:,} rollup rows\n")
+
+    scan = timed(lambda: scan_queries(conn))
+    read = timed(lambda: rollup_queries(rollup), repeat=10)
+    print(f"{'mode':<8} {'ms':>10}")
+    print(f"{'scan':<8} {scan * 1e3:>10.1f}")
+    print(f"{'rollup':<8} {read * 1e3:>10.1f}")
+    print(f"Speedup: {scan / read:.0f}x\n")
+
+    def insert(with_rollup: bool, offset: int):
+        for i in range(args.inserts):
+            cursor = conn.execute(
+                "INSERT INTO articles (url, paper_name, headline, article, category, source_language)"
+                " VALUES (?, 'paper1', 'h', 'body', 'category1', 'Bengali')",
+                (f"https://example.com/new/{offset + i}",)
+            )
+            if with_rollup:
+                rollup.record(cursor.lastrowid)
+            conn.commit()
+
+    plain = timed(lambda: insert(False, 0), repeat=1)
+    rollup.catch_up()
+    maintained = timed(lambda: insert(True, args.inserts), repeat=1)
+    print(f"Insert + commit: {plain / args.inserts * 1e6:.0f} us plain, "
+          f"{maintained / args.inserts * 1e6:.0f} us with rollup")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
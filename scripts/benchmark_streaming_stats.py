@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and cost of per-domain response statistics over a long crawl.
+
+Feeds the same stream of responses (lognormal latencies, 20 domains, a
+few percent 4xx/5xx) to:
+
+    legacy     - StatisticsMiddleware's previous bookkeeping: every
+                 response time appended to a list, mean at close
+    streaming  - StreamingStats: a QuantileSketch, byte and status
+                 counters per domain, p50/p95/p99 at close
+
+and prints retained memory (tracemalloc), ns per observation and, for
+streaming, the largest p50/p95/p99 error against exact percentiles.
+
+Usage:
+    python scripts/benchmark_streaming_stats.py
+    python scripts/benchmark_streaming_stats.py --responses 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.streaming_stats import StreamingStats
+
+
+def response_stream(count: int, seed: int):
+    rng = random.Random(seed)
+    domains = [f"www.paper{i}.com.bd" for i in range(20)]
+    statuses = [200] * 95 + [301, 404, 429, 503, 500]
+    return [(rng.choice(domains), rng.lognormvariate(-0.7, 0.9), rng.choice(statuses), rng.randint(20000, 250000))
+            for _ in range(count)]
+
+
+def legacy(stream):
+    stats = {'response_times': [], 'status_codes': defaultdict(int), 'domains': defaultdict(int),
+             'bytes_downloaded': 0}
+    for domain, latency, status, size in stream:
+        stats['domains'][domain] += 1
+        stats['status_codes'][status] += 1
+        stats['bytes_downloaded'] += size
+        stats['response_times'].append(latency)
+    return stats
+
+
+def streaming(stream):
+    streams = StreamingStats()
+    for domain, latency, status, size in stream:
+        streams.note_request(domain)
+        streams.observe(domain, latency, status, size)
+    return streams
+
+
+def measure(fn, stream):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(stream)
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Timing without tracemalloc's overhead
+    start = time.perf_counter()
+    fn(stream)
+    elapsed = time.perf_counter() - start
+    return result, retained, elapsed / len(stream) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--responses", type=int, default=300000, help="Responses in the stream")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    stream = response_stream(args.responses, args.seed)
+    print(f"{args.responses:,} responses over 20 domains\n")
+    for label, fn in (("legacy", legacy), ("streaming", streaming)):
+        result, retained, ns = measure(fn, stream)
+        print(f"{label:<10} {retained / 1024:>10,.0f} KB retained {ns:>8,.0f} ns/response")
+
+    by_domain = defaultdict(list)
+    for domain, latency, _, _ in stream:
+        by_domain[domain].append(latency)
+    worst = 0.0
+    for domain, values in by_domain.items():
+        values.sort()
+        sketch = result.domains[domain].latency
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            worst = max(worst, abs(sketch.quantile(q) - exact) / exact)
+    print(f"\nworst p50/p95/p99 relative error: {worst:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark: structured-data extraction per article page (pages/sec).
+
+Runs the structured-data lookups an article callback makes - the spider's
+own JSON-LD parse, BaseNewsSpider.extract_from_jsonld, extract_author
+and the date/image part of try_generic_selectors - over article pages,
+either saved ones (--pages DIR of .html files) or synthetic pages shaped
+like the sites' (a @graph with WebSite/Organization/NewsArticle nodes,
+breadcrumbs, 20-40 meta tags and a few <time> elements):
+
+    legacy  - the previous path: each helper runs its own CSS query over
+              the ld+json scripts and its own json.loads, and reads meta
+              tags and <time> with one CSS query per selector
+    shared  - structured_data(response), parsed once per response
+
+Each run starts from fresh responses, so both pay for building the tree.
+
+Usage:
+    python scripts/benchmark_structured_data.py
+    python scripts/benchmark_structured_data.py --pages saved_articles/ --rounds 5
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scrapy.http import HtmlResponse
+
+from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import ARTICLE_TYPES, structured_data
+
+WORDS = ["govt", "dhaka", "election", "budget", "flood", "cricket", "bank", "prices",
+         "students", "metro", "rail", "power", "export", "garment", "court", "police"]
+
+JSONLD_CSS = 'script[type="application/ld+json"]::text'
+AUTHOR_META = [
+    'meta[name="author"]::attr(content)',
+    'meta[property="article:author"]::attr(content)',
+    'meta[name="article:author"]::attr(content)',
+    'meta[property="og:article:author"]::attr(content)',
+    'meta[name="dcterms.creator"]::attr(content)',
+    'meta[name="dc.creator"]::attr(content)',
+]
+
+
+class BenchSpider(BaseNewsSpider):
+    name = "benchmark_structured_data"
+    paper_name = "Benchmark"
+
+
+def synthetic_page(rng: random.Random, index: int) -> str:
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    article = {
+        "@type": "NewsArticle", "headline": words(8).title(), "articleBody": words(600),
+        "author": [{"@type": "Person", "name": words(2).title()}],
+        "datePublished": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}T10:00:00+06:00",
+        "image": {"@type": "ImageObject", "url": f"https://example.com/img/{index}.jpg"},
+    }
+    graph = {"@context": "https://schema.org", "@graph": [
+        {"@type": "WebSite", "name": "Example", "url": "https://example.com/"},
+        {"@type": "Organization", "name": "Example", "logo": "https://example.com/logo.png"},
+        article,
+    ]}
+    crumbs = {"@type": "BreadcrumbList", "itemListElement": [
+        {"@type": "ListItem", "position": i, "name": words(1)} for i in range(1, 4)]}
+    meta = [f'<meta property="og:{k}" content="{words(3)}">' for k in ("title", "description", "type")]
+    meta += [f'<meta name="twitter:{k}" content="{words(3)}">' for k in ("card", "title", "site")]
+    meta += [f'<meta name="keywords-{i}" content="{words(2)}">' for i in range(rng.randint(14, 34))]
+    meta.append(f'<meta property="og:image" content="https://example.com/og/{index}.jpg">')
+    paragraphs = "".join(f"<p>{words(40)}</p>" for _ in range(rng.randint(10, 25)))
+    times = "".join(f'<time datetime="2024-01-{d:02d}">{d} Jan</time>' for d in range(1, rng.randint(2, 5)))
+    return (f"<html><head><title>{words(6)}</title>{''.join(meta)}"
+            f'<script type="application/ld+json">{json.dumps(graph)}</script>'
+            f'<script type="application/ld+json">{json.dumps(crumbs)}</script></head>'
+            f"<body><header>{words(30)}</header><article><h1>{article['headline']}</h1>{times}"
+            f"{paragraphs}</article></body></html>")
+
+
+def load_pages(pages_dir: str, count: int, seed: int):
+    if pages_dir:
+        paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))[:count]
+        return [(f"https://example.com/{os.path.basename(p)}", open(p, encoding="utf-8", errors="replace").read())
+                for p in paths]
+    rng = random.Random(seed)
+    return [(f"https://example.com/news/{i}", synthetic_page(rng, i)) for i in range(count)]
+
+
+def legacy(spider, response):
+    """The previous path: one CSS query and json.loads per helper."""
+    # Spider-level _extract_from_jsonld
+    for script in response.xpath("//script[@type='application/ld+json']/text()").getall():
+        try:
+            data = json.loads(script)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and data.get("@type") in ("Article", "NewsArticle"):
+            break
+    # extract_from_jsonld, then JSON-LD and meta authors in extract_author
+    for _ in range(2):
+        for script in response.css(JSONLD_CSS).getall():
+            try:
+                data = json.loads(script)
+            except json.JSONDecodeError:
+                continue
+            items = data.get("@graph", [data]) if isinstance(data, dict) else data
+            if any(isinstance(i, dict) and i.get("@type") in ARTICLE_TYPES for i in items):
+                break
+    author = [response.css(selector).get() for selector in AUTHOR_META]
+    # try_generic_selectors' date and image lookups
+    date = (response.css('time[datetime]::attr(datetime)').get()
+            or response.css('meta[property="article:published_time"]::attr(content)').get())
+    image = response.css('meta[property="og:image"]::attr(content)').get()
+    return author, date, image
+
+
+def shared(spider, response):
+    data = structured_data(response)
+    data.first_of_type("Article", "NewsArticle")
+    spider.extract_from_jsonld(response)
+    for item in data.jsonld:
+        spider._extract_author_from_jsonld(item)
+    author = [data.meta.get(key) for key in ("author", "article:author", "og:article:author",
+                                             "dcterms.creator", "dc.creator")]
+    date = next((t["datetime"] for t in data.times if t["datetime"]), None) or data.meta.get("article:published_time")
+    return author, date, data.meta.get("og:image")
+
+
+def run(fn, spider, pages, rounds: int) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        responses = [HtmlResponse(url, body=html.encode("utf-8"), encoding="utf-8") for url, html in pages]
+        start = time.perf_counter()
+        for response in responses:
+            fn(spider, response)
+        elapsed += time.perf_counter() - start
+    return len(pages) * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", help="Directory of saved article .html files")
+    parser.add_argument("--count", type=int, default=300, help="Pages to load or generate")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the pages")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.count, args.seed)
+    if not pages:
+        parser.error(f"no .html files in {args.pages}")
+    spider = BenchSpider()
+    print(f"{len(pages)} pages, {args.rounds} rounds, "
+          f"{sum(len(html) for _, html in pages) / len(pages) / 1024:.0f} KB average\n")
+    results = {}
+    for label, fn in (("legacy", legacy), ("shared", shared)):
+        results[label] = run(fn, spider, pages, args.rounds)
+        print(f"{label:<8} {results[label]:>10,.0f} pages/s")
+    print(f"\nspeedup  {results['shared'] / results['legacy']:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: article requests saved by URL shape learning.
+
+Simulates daily crawls of synthetic news sites whose listing pages link to
+a mix of URL shapes with different article yields (article slugs and ids,
+video and photo pages, topic hubs, print editions), and follows the links
+the way parse_listing_auto does:
+
+    baseline  - every discovered link is requested
+    learned   - links are ranked by UrlShapeLearner, which learns from the
+                outcome of each fetch and persists across the runs
+
+Reports requests made, articles stored and requests saved per run. Both
+modes must store (nearly) the same articles; the learner only saves
+requests on shapes that do not produce them.
+
+Usage:
+    python scripts/benchmark_url_shapes.py
+    python scripts/benchmark_url_shapes.py --runs 10 --links 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.url_shapes import UrlShapeLearner
+
+# (URL template, share of discovered links, chance a fetch stores an article)
+SHAPES = [
+    ("/{section}/news/{id}", 0.30, 0.97),
+    ("/{yyyy}/{mm}/{dd}/{slug}", 0.20, 0.95),
+    ("/video/{section}/{id}", 0.15, 0.00),
+    ("/photo/gallery-{slug}", 0.10, 0.02),
+    ("/topic/{slug}", 0.10, 0.00),
+    ("/epaper/{yyyy}-{mm}-{dd}/page-{id}", 0.10, 0.00),
+    ("/opinion/{slug}-{id}.html", 0.05, 0.60),
+]
+SECTIONS = ["politics", "business", "sports", "world", "national", "entertainment"]
+WORDS = ["dhaka", "budget", "flood", "cricket", "election", "metro", "rail", "export", "court", "power"]
+
+
+def make_url(rng: random.Random, domain: str, template: str) -> str:
+    path = template.format(
+        section=rng.choice(SECTIONS), id=rng.randint(100000, 999999),
+        yyyy=2024, mm=f"{rng.randint(1, 12):02d}", dd=f"{rng.randint(1, 28):02d}",
+        slug="-".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))),
+    )
+    return f"https://{domain}{path}"
+
+
+def discovered_links(rng: random.Random, domain: str, count: int):
+    """Links found on one day's listing pages, with each link's outcome."""
+    links = []
+    for _ in range(count):
+        template, _, hit_rate = rng.choices(SHAPES, weights=[s[1] for s in SHAPES])[0]
+        links.append((make_url(rng, domain, template), rng.random() < hit_rate))
+    return links
+
+
+def crawl(day_links, learner=None):
+    """Follow one day's links; returns (requests, stored)."""
+    requests = stored = 0
+    for domain, links in day_links.items():
+        outcome = dict(links)
+        if learner is None:
+            follow = [(url, None) for url in outcome]
+        else:
+            follow = [(url, shape) for url, shape, _ in learner.rank(domain, outcome)]
+        for url, shape in follow:
+            requests += 1
+            stored += outcome[url]
+            if learner is not None:
+                learner.record(domain, shape, outcome[url])
+    if learner is not None:
+        learner.flush()
+    return requests, stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5, help="Simulated daily crawls")
+    parser.add_argument("--links", type=int, default=1000, help="Links discovered per site per run")
+    parser.add_argument("--sites", type=int, default=5, help="Sites crawled")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "news.db")
+    domains = [f"www.site{i}.com" for i in range(args.sites)]
+    rng = random.Random(11)
+    print(f"{args.sites} sites, {args.links:,} links per site per run\n")
+    print(f"{'run':>3} {'baseline req':>13} {'stored':>7} {'learned req':>12} {'stored':>7} {'saved':>7}")
+
+    totals = [0, 0, 0, 0]
+    for run in range(1, args.runs + 1):
+        day_links = {domain: discovered_links(rng, domain, args.links) for domain in domains}
+        base_requests, base_stored = crawl(day_links)
+        # A fresh learner per run: counts come back from the database
+        learner = UrlShapeLearner(db_path)
+        requests, stored = crawl(day_links, learner)
+        saved = learner.stats["requests_saved"]
+        print(f"{run:>3} {base_requests:>13,} {base_stored:>7,} {requests:>12,} {stored:>7,} {saved:>7,}")
+        for i, value in enumerate((base_requests, base_stored, requests, stored)):
+            totals[i] += value
+
+    base_requests, base_stored, requests, stored = totals
+    print(f"\nrequests: {base_requests:,} -> {requests:,} ({1 - requests / base_requests:.0%} fewer), "
+          f"articles: {base_stored:,} -> {stored:,}")
+
+
+if __name__ == "__main__":
+    main()
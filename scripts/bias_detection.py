@@ -18,90 +18,49 @@ Usage:
 
 import argparse
 import sqlite3
-import re
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import Counter
 from typing import Dict, List
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
+from BDNewsPaper.article_features import (
+    FeatureExtractor, FeatureStore, lean_label, sentiment_label, update_features,
+)
+from BDNewsPaper.lexicons import BIAS_LEXICON, SENTIMENT_LEXICON as SENTIMENT
 
-# Bias indicators (simplified lexicon-based)
-BIAS_LEXICON = {
-    "left_leaning": [
-        "progressive", "reform", "equality", "rights", "justice",
-        "workers", "labor", "union", "protest", "activist",
-        "climate", "environment", "green", "social", "welfare",
-        "diversity", "inclusion", "marginalized", "oppressed"
-    ],
-    "right_leaning": [
-        "traditional", "conservative", "patriot", "national",
-        "security", "law and order", "business", "economy",
-        "growth", "investment", "development", "heritage",
-        "family values", "religious", "sovereignty"
-    ],
-    "sensational": [
-        "shocking", "explosive", "breaking", "exclusive",
-        "outrage", "scandal", "crisis", "disaster",
-        "bombshell", "unprecedented", "chaos", "fury",
-        "slam", "blast", "attack", "destroy"
-    ],
-    "neutral": [
-        "report", "according to", "stated", "announced",
-        "official", "spokesperson", "data shows", "study",
-        "research", "analysis", "survey", "statistics"
-    ]
-}
 
-# Sentiment words
-SENTIMENT = {
-    "positive": [
-        "good", "great", "excellent", "success", "achievement",
-        "progress", "growth", "improve", "benefit", "breakthrough",
-        "victory", "celebrate", "proud", "hope", "optimistic"
-    ],
-    "negative": [
-        "bad", "terrible", "failure", "crisis", "problem",
-        "decline", "loss", "damage", "concern", "threat",
-        "defeat", "condemn", "shame", "fear", "pessimistic"
-    ]
-}
+DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 
 
 class BiasDetector:
-    """Detect bias in news articles."""
+    """
+    Detect bias in news articles.
+    
+    Source and topic analyses aggregate the per-article lexicon hits stored
+    by the feature worker (BDNewsPaper.article_features), so they cover the
+    whole period instead of re-scanning article bodies.
+    """
     
     def __init__(self):
-        self.bias_patterns = {
-            category: re.compile(r'\b(' + '|'.join(words) + r')\b', re.IGNORECASE)
-            for category, words in BIAS_LEXICON.items()
-        }
-        self.sentiment_patterns = {
-            sentiment: re.compile(r'\b(' + '|'.join(words) + r')\b', re.IGNORECASE)
-            for sentiment, words in SENTIMENT.items()
-        }
+        self.extractor = FeatureExtractor()
     
     def analyze_text(self, text: str) -> Dict:
         """Analyze bias and sentiment in text."""
         if not text:
             return {}
         
-        text = text.lower()
         word_count = len(text.split())
+        counts = self.extractor.lexicon_counts(text)
         
         # Count bias indicators
-        bias_counts = {}
-        for category, pattern in self.bias_patterns.items():
-            matches = pattern.findall(text)
-            bias_counts[category] = len(matches)
+        bias_counts = {category: counts[category] for category in BIAS_LEXICON}
         
         # Count sentiment
-        sentiment_counts = {}
-        for sentiment, pattern in self.sentiment_patterns.items():
-            matches = pattern.findall(text)
-            sentiment_counts[sentiment] = len(matches)
+        sentiment_counts = {sentiment: counts[sentiment] for sentiment in SENTIMENT}
         
         # Calculate scores (normalized by word count)
         total_bias = sum(bias_counts.values())
@@ -111,70 +70,25 @@ class BiasDetector:
             for k, v in bias_counts.items()
         }
         
-        # Determine lean
-        left = bias_counts.get("left_leaning", 0)
-        right = bias_counts.get("right_leaning", 0)
-        
-        if left > right * 1.5:
-            lean = "left"
-        elif right > left * 1.5:
-            lean = "right"
-        else:
-            lean = "center"
-        
-        # Sentiment score
-        pos = sentiment_counts.get("positive", 0)
-        neg = sentiment_counts.get("negative", 0)
-        
-        if pos > neg * 1.5:
-            sentiment = "positive"
-        elif neg > pos * 1.5:
-            sentiment = "negative"
-        else:
-            sentiment = "neutral"
-        
         return {
             "bias_counts": bias_counts,
             "bias_scores": bias_scores,
             "sentiment_counts": sentiment_counts,
-            "political_lean": lean,
-            "sentiment": sentiment,
+            "political_lean": lean_label(bias_counts["left_leaning"], bias_counts["right_leaning"]),
+            "sentiment": sentiment_label(sentiment_counts["positive"], sentiment_counts["negative"]),
             "sensational_score": round(bias_counts.get("sensational", 0) / max(word_count, 1) * 100, 2)
         }
     
-    def analyze_source(self, paper_name: str, days: int = 30) -> Dict:
-        """Analyze bias for a specific news source."""
-        if not DB_PATH.exists():
-            return {}
-        
-        conn = sqlite3.connect(DB_PATH)
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        cursor = conn.execute("""
-            SELECT headline, article as article_body FROM articles
-            WHERE paper_name = ? AND scraped_at >= ?
-            ORDER BY scraped_at DESC LIMIT 500
-        """, (paper_name, cutoff))
-        
-        aggregated = defaultdict(int)
-        sentiment_agg = defaultdict(int)
-        article_count = 0
-        
-        for headline, body in cursor.fetchall():
-            text = f"{headline} {body or ''}"
-            analysis = self.analyze_text(text)
-            
-            if analysis:
-                article_count += 1
-                for cat, count in analysis.get("bias_counts", {}).items():
-                    aggregated[cat] += count
-                for sent, count in analysis.get("sentiment_counts", {}).items():
-                    sentiment_agg[sent] += count
-        
-        conn.close()
-        
-        if article_count == 0:
-            return {}
+    def _open_store(self) -> FeatureStore:
+        """Process new articles and open the feature store."""
+        update_features(str(DB_PATH))
+        return FeatureStore(sqlite3.connect(DB_PATH))
+    
+    @staticmethod
+    def _source_summary(paper_name: str, article_count: int, hits: Dict[str, int]) -> Dict:
+        """Bias profile of a source from its summed lexicon hits."""
+        aggregated = {category: hits.get(category, 0) for category in BIAS_LEXICON}
+        sentiment_agg = {sentiment: hits.get(sentiment, 0) for sentiment in SENTIMENT}
         
         # Calculate overall lean
         left = aggregated.get("left_leaning", 0)
@@ -185,32 +99,42 @@ class BiasDetector:
         return {
             "paper_name": paper_name,
             "articles_analyzed": article_count,
-            "bias_totals": dict(aggregated),
-            "sentiment_totals": dict(sentiment_agg),
+            "bias_totals": aggregated,
+            "sentiment_totals": sentiment_agg,
             "lean_score": round(lean_score, 2),
             "lean_label": "left" if lean_score < -0.2 else "right" if lean_score > 0.2 else "center",
             "sensationalism": round(aggregated.get("sensational", 0) / article_count, 1)
         }
     
+    def analyze_source(self, paper_name: str, days: int = 30) -> Dict:
+        """Analyze bias for a specific news source."""
+        if not DB_PATH.exists():
+            return {}
+        
+        store = self._open_store()
+        article_count = store.article_count(days=days, paper=paper_name)
+        hits = dict(store.term_counts("lexicon", days=days, paper=paper_name))
+        store.conn.close()
+        
+        if article_count == 0:
+            return {}
+        
+        return self._source_summary(paper_name, article_count, hits)
+    
     def compare_sources(self, days: int = 30) -> List[Dict]:
         """Compare bias across all sources."""
         if not DB_PATH.exists():
             return []
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.execute("""
-            SELECT DISTINCT paper_name FROM articles
-            WHERE scraped_at >= ?
-        """, ((datetime.now() - timedelta(days=days)).isoformat(),))
-        
-        papers = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        store = self._open_store()
+        article_counts = store.article_counts_by_paper(days=days)
+        hits_by_paper = store.term_counts_by("paper", "lexicon", days=days)
+        store.conn.close()
         
-        results = []
-        for paper in papers:
-            analysis = self.analyze_source(paper, days)
-            if analysis:
-                results.append(analysis)
+        results = [
+            self._source_summary(paper, count, hits_by_paper.get(paper, {}))
+            for paper, count in article_counts.items() if count
+        ]
         
         # Sort by lean score
         results.sort(key=lambda x: x.get("lean_score", 0))
@@ -222,27 +146,22 @@ class BiasDetector:
         if not DB_PATH.exists():
             return {}
         
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        store = self._open_store()
         
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        cursor = conn.execute("""
-            SELECT paper_name, headline, article as article_body
-            FROM articles
-            WHERE scraped_at >= ? AND (
-                LOWER(headline) LIKE ? OR LOWER(article) LIKE ?
+        # Only the topic match reads article text; lean/sentiment are stored
+        cursor = store.conn.execute("""
+            SELECT f.paper_name, f.sentiment, f.political_lean
+            FROM articles a JOIN article_features f ON f.article_id = a.id
+            WHERE f.scraped_at >= datetime('now', ?) AND (
+                LOWER(a.headline) LIKE ? OR LOWER(a.article) LIKE ?
             )
-        """, (cutoff, f"%{topic.lower()}%", f"%{topic.lower()}%"))
-        
-        by_source = defaultdict(list)
+        """, (f"-{days} days", f"%{topic.lower()}%", f"%{topic.lower()}%"))
         
-        for row in cursor.fetchall():
-            text = f"{row['headline']} {row['article_body'] or ''}"
-            analysis = self.analyze_text(text)
-            by_source[row['paper_name']].append(analysis)
+        by_source = {}
+        for paper, sentiment, lean in cursor.fetchall():
+            by_source.setdefault(paper, []).append({"sentiment": sentiment, "political_lean": lean})
         
-        conn.close()
+        store.conn.close()
         
         # Aggregate per source
         source_summary = {}
@@ -9,14 +9,17 @@ Run:
 """
 
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import Counter
-import re
 
 import streamlit as st
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.article_features import FeatureStore, update_features
+
 # Optional imports for advanced features
 try:
     import plotly.express as px
@@ -76,6 +79,22 @@ def load_data(days: int = 30) -> pd.DataFrame:
     return df
 
 
+@st.cache_data(ttl=300)
+def load_headline_terms(days: int = 30, limit: int = 200, min_length: int = 0,
+                        exclude: tuple = ()) -> dict:
+    """Headline keyword frequencies from the article feature store."""
+    if not DB_PATH.exists():
+        return {}
+    
+    update_features(str(DB_PATH))
+    conn = sqlite3.connect(DB_PATH)
+    terms = dict(FeatureStore(conn).term_counts(
+        "token", days=days, limit=limit, min_length=min_length, exclude=exclude
+    ))
+    conn.close()
+    return terms
+
+
 @st.cache_data(ttl=300)
 def get_total_stats() -> dict:
     """Get overall database statistics."""
@@ -170,7 +189,7 @@ def render_charts(df: pd.DataFrame):
             st.plotly_chart(fig, use_container_width=True)
 
 
-def render_word_cloud(df: pd.DataFrame):
+def render_word_cloud(days: int):
     """Generate and render word cloud from headlines."""
     st.subheader("☁️ Word Cloud from Headlines")
     
@@ -178,28 +197,19 @@ def render_word_cloud(df: pd.DataFrame):
         st.info("Install wordcloud: `pip install wordcloud matplotlib`")
         return
     
-    if df.empty:
+    # Stop words are dropped when the features are extracted
+    frequencies = load_headline_terms(days, limit=100)
+    if not frequencies:
         st.warning("No data available")
         return
     
-    # Combine headlines
-    text = " ".join(df['headline'].dropna().tolist())
-    
-    # Remove common words
-    stop_words = set(['the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'is', 'are', 
-                      'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
-                      'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                      'with', 'by', 'from', 'as', 'that', 'this', 'it', 'its', 'or', 'but',
-                      'not', 'no', 'if', 'so', 'than', 'too', 'very', 'just', 'over', 'also'])
-    
     wordcloud = WordCloud(
         width=800,
         height=400,
         background_color='white',
         colormap='viridis',
-        max_words=100,
-        stopwords=stop_words
-    ).generate(text)
+        max_words=100
+    ).generate_from_frequencies(frequencies)
     
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.imshow(wordcloud, interpolation='bilinear')
@@ -207,30 +217,20 @@ def render_word_cloud(df: pd.DataFrame):
     st.pyplot(fig)
 
 
-def render_trending(df: pd.DataFrame):
+def render_trending():
     """Show trending topics/keywords."""
     st.subheader("🔥 Trending Keywords (Last 7 Days)")
     
-    recent = df[df['scraped_at'] >= datetime.now() - timedelta(days=7)]
+    word_counts = list(load_headline_terms(
+        7, limit=20, min_length=4, exclude=('their', 'about', 'says', 'said')
+    ).items())
     
-    if recent.empty:
+    if not word_counts:
         st.info("No recent articles to analyze")
         return
     
-    # Extract words from headlines
-    words = []
-    for headline in recent['headline'].dropna():
-        # Split and clean
-        for word in re.findall(r'\b[A-Za-z]{4,}\b', headline):
-            word = word.lower()
-            if word not in ['this', 'that', 'with', 'from', 'have', 'been', 'will', 'would', 'could', 'their', 'about', 'says', 'said']:
-                words.append(word)
-    
-    word_counts = Counter(words).most_common(20)
-    
-    if word_counts:
-        keywords_df = pd.DataFrame(word_counts, columns=['Keyword', 'Count'])
-        st.dataframe(keywords_df, use_container_width=True, hide_index=True)
+    keywords_df = pd.DataFrame(word_counts, columns=['Keyword', 'Count'])
+    st.dataframe(keywords_df, use_container_width=True, hide_index=True)
 
 
 def render_latest_headlines(df: pd.DataFrame):
@@ -297,10 +297,10 @@ def main():
         render_charts(df)
     
     with tab2:
-        render_word_cloud(df)
+        render_word_cloud(days)
     
     with tab3:
-        render_trending(df)
+        render_trending()
     
     with tab4:
         render_latest_headlines(df)
@@ -8,6 +8,7 @@ Run: streamlit run dashboard_enhanced.py
 """
 
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import Counter
@@ -17,6 +18,10 @@ import json
 import streamlit as st
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.stats_rollup import StatsRollup
+
 try:
     import plotly.express as px
     import plotly.graph_objects as go
@@ -568,13 +573,18 @@ def get_total_stats() -> dict:
         return {"total": 0, "papers": 0, "categories": 0, "today": 0}
     
     conn = sqlite3.connect(DB_PATH)
-    today = datetime.now().date().isoformat()
+    rollup = StatsRollup(conn)
+    if not rollup.ensure():
+        conn.close()
+        return {"total": 0, "papers": 0, "categories": 0, "today": 0}
     
+    totals = rollup.totals()
     stats = {
-        "total": conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
-        "papers": conn.execute("SELECT COUNT(DISTINCT paper_name) FROM articles").fetchone()[0],
-        "categories": conn.execute("SELECT COUNT(DISTINCT category) FROM articles WHERE category IS NOT NULL").fetchone()[0],
-        "today": conn.execute(f"SELECT COUNT(*) FROM articles WHERE date(scraped_at) = '{today}'").fetchone()[0],
+        "total": totals["articles"],
+        "papers": totals["papers"],
+        "categories": totals["categories"],
+        # scraped_at is UTC, so "today" is the UTC day
+        "today": rollup.totals(day="today")["articles"],
     }
     conn.close()
     return stats
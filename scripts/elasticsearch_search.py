@@ -14,30 +14,38 @@ Setup:
     docker run -d -p 9200:9200 -e "discovery.type=single-node" elasticsearch:8.11.0
     pip install elasticsearch
 
+Indexing is incremental (BDNewsPaper.search_sync): --index sends only
+articles added since the last run plus earlier failures; --reindex builds
+a new index and swaps the search alias onto it without downtime.
+
 Usage:
-    python elasticsearch_search.py --index            # Index articles
+    python elasticsearch_search.py --index            # Index new articles
+    python elasticsearch_search.py --reindex          # Zero-downtime rebuild
     python elasticsearch_search.py --search "query"   # Search
     python elasticsearch_search.py --suggest "qu"     # Autocomplete
 """
 
 import argparse
-import sqlite3
-from datetime import datetime
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.search_sync import DEFAULT_ALIAS, SearchSync
+
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 
 # Try to import Elasticsearch
 try:
-    from elasticsearch import Elasticsearch, helpers
+    from elasticsearch import Elasticsearch
     ES_AVAILABLE = True
 except ImportError:
     ES_AVAILABLE = False
 
 ES_HOST = "http://localhost:9200"
-ES_INDEX = "bdnews_articles"
+ES_INDEX = DEFAULT_ALIAS
 
 
 class ElasticsearchManager:
@@ -73,113 +81,32 @@ class ElasticsearchManager:
     def is_available(self) -> bool:
         return self.client is not None
     
-    def create_index(self):
-        """Create index with mapping."""
-        if not self.is_available:
-            return False
-        
-        # Check if exists
-        if self.client.indices.exists(index=self.index):
-            print(f"ℹ️ Index {self.index} already exists")
-            return True
-        
-        mapping = {
-            "settings": {
-                "number_of_shards": 1,
-                "number_of_replicas": 0,
-                "analysis": {
-                    "analyzer": {
-                        "bangla_analyzer": {
-                            "type": "custom",
-                            "tokenizer": "standard",
-                            "filter": ["lowercase"]
-                        }
-                    }
-                }
-            },
-            "mappings": {
-                "properties": {
-                    "headline": {
-                        "type": "text",
-                        "analyzer": "standard",
-                        "fields": {
-                            "keyword": {"type": "keyword"},
-                            "suggest": {"type": "completion"}
-                        }
-                    },
-                    "article_body": {
-                        "type": "text",
-                        "analyzer": "standard"
-                    },
-                    "paper_name": {"type": "keyword"},
-                    "category": {"type": "keyword"},
-                    "author": {"type": "keyword"},
-                    "source_language": {"type": "keyword"},
-                    "url": {"type": "keyword"},
-                    "publication_date": {"type": "date", "ignore_malformed": True},
-                    "scraped_at": {"type": "date"},
-                    "word_count": {"type": "integer"}
-                }
-            }
-        }
-        
-        self.client.indices.create(index=self.index, body=mapping)
-        print(f"✅ Created index: {self.index}")
-        return True
-    
-    def index_articles(self, batch_size: int = 500) -> int:
-        """Index all articles from database."""
+    def index_articles(self, full: bool = False, streams: int = 4, chunk_mb: float = 5) -> Dict:
+        """Index new articles, or rebuild the whole index when full is set."""
         if not self.is_available:
             print("❌ Elasticsearch not available")
-            return 0
+            return {}
         
         if not DB_PATH.exists():
             print("❌ Database not found")
-            return 0
-        
-        self.create_index()
-        
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        
-        cursor = conn.execute("""
-            SELECT id, url, headline, article_body, paper_name, category,
-                   author, publication_date, source_language, word_count, scraped_at
-            FROM articles
-        """)
-        
-        def generate_actions():
-            for row in cursor:
-                doc = {
-                    "_index": self.index,
-                    "_id": row["id"],
-                    "_source": {
-                        "headline": row["headline"],
-                        "article_body": row["article_body"] or "",
-                        "paper_name": row["paper_name"],
-                        "category": row["category"],
-                        "author": row["author"],
-                        "url": row["url"],
-                        "source_language": row["source_language"],
-                        "word_count": row["word_count"],
-                        "publication_date": row["publication_date"],
-                        "scraped_at": row["scraped_at"]
-                    }
-                }
-                yield doc
+            return {}
         
-        print("📤 Indexing articles...")
-        success, failed = helpers.bulk(
-            self.client,
-            generate_actions(),
-            chunk_size=batch_size,
-            raise_on_error=False
+        sync = SearchSync(
+            self.client, str(DB_PATH), alias=self.index,
+            streams=streams, chunk_bytes=int(chunk_mb * 1024 * 1024)
         )
         
-        conn.close()
+        print("📤 Reindexing all articles..." if full else "📤 Indexing new articles...")
+        if full:
+            sync.reindex()
+        else:
+            sync.sync()
         
-        print(f"✅ Indexed {success} articles ({failed} failed)")
-        return success
+        stats = sync.stats
+        print(f"✅ Indexed {stats['indexed']:,} articles ({stats['failed']} failed, "
+              f"{stats['retried']} retried) in {stats['elapsed']:.1f}s "
+              f"- {sync.docs_per_second:,.0f} docs/sec over {stats['requests']} requests")
+        return stats
     
     def search(
         self,
@@ -310,12 +237,13 @@ class ElasticsearchManager:
             return {"available": False}
         
         try:
-            stats = self.client.indices.stats(index=self.index)
+            # Totals over whichever index the alias points at
+            stats = self.client.indices.stats(index=self.index)["_all"]["primaries"]
             
             return {
                 "available": True,
-                "documents": stats["indices"][self.index]["primaries"]["docs"]["count"],
-                "size_bytes": stats["indices"][self.index]["primaries"]["store"]["size_in_bytes"]
+                "documents": stats["docs"]["count"],
+                "size_bytes": stats["store"]["size_in_bytes"]
             }
         except Exception as e:
             return {"available": False, "error": str(e)}
@@ -323,7 +251,10 @@ class ElasticsearchManager:
 
 def main():
     parser = argparse.ArgumentParser(description="Elasticsearch integration")
-    parser.add_argument("--index", action="store_true", help="Index articles")
+    parser.add_argument("--index", action="store_true", help="Index new articles")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild the index and swap the alias")
+    parser.add_argument("--streams", type=int, default=4, help="Concurrent bulk requests")
+    parser.add_argument("--chunk-mb", type=float, default=5, help="Bulk request payload size in MB")
     parser.add_argument("--search", help="Search query")
     parser.add_argument("--suggest", help="Autocomplete prefix")
     parser.add_argument("--facets", action="store_true", help="Get facets")
@@ -340,8 +271,8 @@ def main():
     
     es = ElasticsearchManager()
     
-    if args.index:
-        es.index_articles()
+    if args.index or args.reindex:
+        es.index_articles(full=args.reindex, streams=args.streams, chunk_mb=args.chunk_mb)
     
     elif args.search:
         results = es.search(args.search, page=args.page, paper=args.paper, category=args.category)
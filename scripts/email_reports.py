@@ -38,6 +38,11 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from collections import Counter
 import io
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.stats_rollup import StatsRollup
 
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 REPORTS_DIR = Path(__file__).parent / "reports"
@@ -68,31 +73,17 @@ class EmailReporter:
         conn.row_factory = sqlite3.Row
         
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        rollup = StatsRollup(conn)
+        rollup.ensure()
         
         # Total articles
-        total = conn.execute(
-            "SELECT COUNT(*) FROM articles WHERE scraped_at >= ?", (cutoff,)
-        ).fetchone()[0]
+        total = rollup.totals(hours=days * 24)["articles"]
         
         # By paper
-        by_paper = {
-            row["paper_name"]: row["count"]
-            for row in conn.execute("""
-                SELECT paper_name, COUNT(*) as count 
-                FROM articles WHERE scraped_at >= ?
-                GROUP BY paper_name ORDER BY count DESC
-            """, (cutoff,)).fetchall()
-        }
+        by_paper = rollup.counts_by("paper_name", hours=days * 24)
         
         # By category
-        by_category = {
-            row["category"]: row["count"]
-            for row in conn.execute("""
-                SELECT category, COUNT(*) as count 
-                FROM articles WHERE scraped_at >= ? AND category IS NOT NULL
-                GROUP BY category ORDER BY count DESC LIMIT 10
-            """, (cutoff,)).fetchall()
-        }
+        by_category = rollup.counts_by("category", hours=days * 24, limit=10)
         
         # Top headlines
         headlines = [
@@ -5,7 +5,7 @@ Geographical News Mapping
 Plot news articles on Bangladesh map by location mentions.
 
 Features:
-    - Extract location mentions from articles
+    - Extract location mentions (English and Bengali spellings)
     - Geocode locations to coordinates
     - Generate interactive maps
     - Heatmap of news concentration
@@ -19,140 +19,69 @@ Usage:
 import argparse
 import sqlite3
 import json
-import re
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.article_features import FeatureExtractor, update_features
+from BDNewsPaper.lexicons import BANGLADESH_LOCATIONS
+
 
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 OUTPUT_DIR = Path(__file__).parent / "maps"
 
-# Bangladesh locations with coordinates
-BANGLADESH_LOCATIONS = {
-    # Divisions
-    "dhaka": (23.8103, 90.4125),
-    "chittagong": (22.3569, 91.7832),
-    "chattogram": (22.3569, 91.7832),
-    "rajshahi": (24.3745, 88.6042),
-    "khulna": (22.8456, 89.5403),
-    "sylhet": (24.8949, 91.8687),
-    "barisal": (22.7010, 90.3535),
-    "barishal": (22.7010, 90.3535),
-    "rangpur": (25.7439, 89.2752),
-    "mymensingh": (24.7471, 90.4203),
-    
-    # Major cities
-    "comilla": (23.4607, 91.1809),
-    "cumilla": (23.4607, 91.1809),
-    "gazipur": (23.9999, 90.4203),
-    "narayanganj": (23.6238, 90.5000),
-    "bogra": (24.8510, 89.3697),
-    "bogura": (24.8510, 89.3697),
-    "jessore": (23.1634, 89.2182),
-    "jashore": (23.1634, 89.2182),
-    "dinajpur": (25.6217, 88.6354),
-    "tangail": (24.2513, 89.9167),
-    "brahmanbaria": (23.9608, 91.1115),
-    "cox's bazar": (21.4272, 92.0058),
-    "coxs bazar": (21.4272, 92.0058),
-    "coxsbazar": (21.4272, 92.0058),
-    "narsingdi": (23.9322, 90.7151),
-    "faridpur": (23.6070, 89.8429),
-    "savar": (23.8583, 90.2667),
-    "tongi": (23.8783, 90.4058),
-    "manikganj": (23.8644, 90.0047),
-    "munshiganj": (23.5422, 90.5305),
-    "chandpur": (23.2333, 90.6500),
-    "habiganj": (24.3750, 91.4167),
-    "moulvibazar": (24.4833, 91.7667),
-    "sunamganj": (25.0667, 91.4000),
-    "netrokona": (24.8833, 90.7333),
-    "jamalpur": (24.9300, 89.9500),
-    "sherpur": (25.0167, 90.0167),
-    "feni": (23.0167, 91.4000),
-    "noakhali": (22.8333, 91.1000),
-    "lakshmipur": (22.9500, 90.8167),
-    "patuakhali": (22.3500, 90.3500),
-    "bhola": (22.6833, 90.6500),
-    "jhalokati": (22.6500, 90.2000),
-    "barguna": (22.1500, 90.1167),
-    "pirojpur": (22.5833, 89.9667),
-    "satkhira": (22.7167, 89.0667),
-    "narail": (23.1667, 89.5000),
-    "magura": (23.4833, 89.4333),
-    "meherpur": (23.7667, 88.6333),
-    "chuadanga": (23.6500, 88.8500),
-    "kushtia": (23.9000, 89.1200),
-    "jhenaidah": (23.5500, 89.1667),
-    "natore": (24.4167, 89.0000),
-    "chapainawabganj": (24.6000, 88.2667),
-    "naogaon": (24.8000, 88.9500),
-    "joypurhat": (25.0833, 89.0167),
-    "gaibandha": (25.3333, 89.5333),
-    "kurigram": (25.8000, 89.6333),
-    "nilphamari": (25.9333, 88.8500),
-    "lalmonirhat": (25.9167, 89.4333),
-    "thakurgaon": (26.0333, 88.4667),
-    "panchagarh": (26.3333, 88.5500),
-    "bandarban": (22.1953, 92.2184),
-    "rangamati": (22.6333, 92.2000),
-    "khagrachhari": (23.1167, 91.9500),
-    
-    # General terms
-    "bangladesh": (23.6850, 90.3563),
-    "capital": (23.8103, 90.4125),
-}
-
 
 class GeoMapper:
     """Map news articles geographically."""
     
     def __init__(self):
         OUTPUT_DIR.mkdir(exist_ok=True)
-        self.location_pattern = re.compile(
-            r'\b(' + '|'.join(re.escape(loc) for loc in BANGLADESH_LOCATIONS.keys()) + r')\b',
-            re.IGNORECASE
-        )
+        self.extractor = FeatureExtractor()
     
     def extract_locations(self, text: str) -> List[str]:
         """Extract location mentions from text."""
-        if not text:
-            return []
-        
-        matches = self.location_pattern.findall(text.lower())
-        return list(set(matches))
+        return self.extractor.locations(text)
     
-    def get_articles_with_locations(self, days: int = 30, limit: int = 1000) -> List[Dict]:
-        """Get articles and extract locations."""
+    def get_articles_with_locations(self, days: int = 30, limit: Optional[int] = None) -> List[Dict]:
+        """Get articles with headline location mentions (from the feature store)."""
         if not DB_PATH.exists():
             return []
         
+        update_features(str(DB_PATH))
+        
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
         
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        cursor = conn.execute("""
-            SELECT id, headline, paper_name, category, url, scraped_at
-            FROM articles WHERE scraped_at >= ?
-            ORDER BY scraped_at DESC LIMIT ?
-        """, (cutoff, limit))
+        query = """
+            SELECT a.id, a.headline, f.paper_name, f.category, a.url, f.scraped_at,
+                   GROUP_CONCAT(t.term, '|') AS locations
+            FROM article_features f
+            JOIN article_feature_terms t ON t.article_id = f.article_id AND t.kind = 'location'
+            JOIN articles a ON a.id = f.article_id
+            WHERE f.scraped_at >= datetime('now', ?)
+            GROUP BY f.article_id
+            ORDER BY f.scraped_at DESC
+        """
+        params = [f"-{days} days"]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
         
         articles = []
-        for row in cursor.fetchall():
-            locations = self.extract_locations(row["headline"])
-            if locations:
-                articles.append({
-                    "id": row["id"],
-                    "headline": row["headline"],
-                    "paper_name": row["paper_name"],
-                    "category": row["category"],
-                    "url": row["url"],
-                    "locations": locations,
-                    "date": row["scraped_at"][:10]
-                })
+        for row in conn.execute(query, params).fetchall():
+            articles.append({
+                "id": row["id"],
+                "headline": row["headline"],
+                "paper_name": row["paper_name"],
+                "category": row["category"],
+                "url": row["url"],
+                "locations": row["locations"].split("|"),
+                "date": row["scraped_at"][:10]
+            })
         
         conn.close()
         return articles
@@ -5,36 +5,40 @@ Hugging Face Dataset Uploader
 Upload scraped news data to Hugging Face Hub for public sharing.
 
 Features:
-    - Export to Hugging Face dataset format
+    - Streaming, sharded export (Parquet or JSONL.zst) via
+      BDNewsPaper.dataset_export; later runs only add delta shards
     - Automatic dataset card generation
-    - Version control with commits
+    - Version control with commits (only new shards are uploaded)
     - Privacy options
 
 Setup:
-    pip install datasets huggingface_hub
+    pip install huggingface_hub pyarrow
     huggingface-cli login
 
 Usage:
-    python huggingface_upload.py --upload           # Upload dataset
+    python huggingface_upload.py --upload           # Upload new articles
+    python huggingface_upload.py --upload --full    # Re-export and replace all shards
     python huggingface_upload.py --export           # Export only (no upload)
     python huggingface_upload.py --preview          # Preview data
 """
 
 import argparse
 import sqlite3
-import json
-from datetime import datetime
+import sys
 from pathlib import Path
 from typing import Dict, List
 import os
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.dataset_export import DatasetExporter
+
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 EXPORT_DIR = Path(__file__).parent / "dataset_export"
 
 # Try to import HF libraries
 try:
-    from datasets import Dataset, DatasetDict
-    from huggingface_hub import HfApi, create_repo
+    from huggingface_hub import HfApi
     HF_AVAILABLE = True
 except ImportError:
     HF_AVAILABLE = False
@@ -43,71 +47,71 @@ except ImportError:
 class HuggingFaceUploader:
     """Upload news dataset to Hugging Face Hub."""
     
-    def __init__(self, repo_name: str = None):
+    def __init__(self, repo_name: str = None, fmt: str = None):
         self.repo_name = repo_name or os.getenv("HF_REPO_NAME", "bd-news-dataset")
         self.username = os.getenv("HF_USERNAME", "")
         EXPORT_DIR.mkdir(exist_ok=True)
+        self.exporter = DatasetExporter(DB_PATH, EXPORT_DIR, fmt)
     
-    def load_articles(self, limit: int = None) -> List[Dict]:
-        """Load all articles from database."""
+    def load_articles(self, limit: int = 5) -> List[Dict]:
+        """Load the newest articles (for previews)."""
         if not DB_PATH.exists():
             print("❌ Database not found")
             return []
         
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
-        
-        query = """
+        articles = [dict(row) for row in conn.execute("""
             SELECT 
-                id, url, paper_name, headline, article_body,
+                id, url, paper_name, headline, article,
                 category, author, publication_date, 
                 source_language, word_count, scraped_at
             FROM articles
-            ORDER BY scraped_at DESC
-        """
-        
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        articles = [dict(row) for row in conn.execute(query).fetchall()]
+            ORDER BY id DESC
+            LIMIT ?
+        """, (limit,)).fetchall()]
         conn.close()
         
         return articles
     
-    def export_to_jsonl(self, articles: List[Dict]) -> str:
-        """Export articles to JSONL format."""
-        output_path = EXPORT_DIR / "data.jsonl"
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            for article in articles:
-                # Clean up for export
-                clean_article = {
-                    "id": article["id"],
-                    "url": article["url"],
-                    "newspaper": article["paper_name"],
-                    "headline": article["headline"],
-                    "content": article.get("article_body") or "",
-                    "category": article.get("category") or "",
-                    "author": article.get("author") or "",
-                    "date": article.get("publication_date") or "",
-                    "language": article.get("source_language") or "en",
-                    "word_count": article.get("word_count") or 0,
-                }
-                f.write(json.dumps(clean_article, ensure_ascii=False) + "\n")
+    def dataset_stats(self) -> Dict:
+        """Counts and ranges for the dataset card, computed in SQL."""
+        conn = sqlite3.connect(DB_PATH)
+        count, earliest, latest = conn.execute(
+            "SELECT COUNT(*), MIN(substr(publication_date, 1, 10)), MAX(substr(publication_date, 1, 10))"
+            " FROM articles WHERE publication_date IS NOT NULL AND publication_date != ''"
+        ).fetchone()
+        stats = {
+            "articles": conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+            "papers": [r[0] for r in conn.execute("SELECT DISTINCT paper_name FROM articles ORDER BY 1")],
+            "categories": [r[0] for r in conn.execute(
+                "SELECT DISTINCT category FROM articles WHERE category IS NOT NULL AND category != '' ORDER BY 1"
+            )],
+            "date_range": {"earliest": earliest or "", "latest": latest or ""},
+        }
+        conn.close()
+        return stats
+    
+    def export(self, full: bool = False, limit: int = None) -> List[Dict]:
+        """Export new articles (or everything) as shards, plus the dataset card."""
+        if not DB_PATH.exists():
+            print("❌ Database not found")
+            return []
         
-        print(f"✅ Exported {len(articles)} articles to {output_path}")
-        return str(output_path)
+        shards = self.exporter.export(full=full, limit=limit)
+        manifest = self.exporter.manifest()
+        print(f"✅ Exported {sum(s['rows'] for s in shards):,} articles in {len(shards)} new shards "
+              f"({manifest['rows']:,} articles in {len(manifest['shards'])} shards total) to {EXPORT_DIR}")
+        self.generate_dataset_card(self.dataset_stats())
+        return shards
     
-    def generate_dataset_card(self, articles: List[Dict]) -> str:
+    def generate_dataset_card(self, stats: Dict) -> str:
         """Generate README for the dataset."""
-        # Get stats
-        papers = list(set(a["paper_name"] for a in articles))
-        categories = list(set(a.get("category") for a in articles if a.get("category")))
-        
-        date_range = {
-            "earliest": min((a.get("publication_date") or "")[:10] for a in articles if a.get("publication_date")),
-            "latest": max((a.get("publication_date") or "")[:10] for a in articles if a.get("publication_date"))
-        }
+        papers = stats["papers"]
+        categories = stats["categories"]
+        date_range = stats["date_range"]
+        count = stats["articles"]
+        data_format = "parquet" if self.exporter.fmt == "parquet" else "json"
         
         card = f"""---
 license: mit
@@ -124,7 +128,12 @@ tags:
   - newspapers
   - nlp
 size_categories:
-  - {"10K<n<100K" if len(articles) > 10000 else "1K<n<10K" if len(articles) > 1000 else "n<1K"}
+  - {"100K<n<1M" if count > 100000 else "10K<n<100K" if count > 10000 else "1K<n<10K" if count > 1000 else "n<1K"}
+configs:
+  - config_name: default
+    data_files:
+      - split: train
+        path: "data/*.{self.exporter.fmt}"
 ---
 
 # 🗞️ BD News Dataset
@@ -133,7 +142,7 @@ A comprehensive collection of news articles from major Bangladeshi newspapers.
 
 ## Dataset Description
 
-This dataset contains **{len(articles):,}** news articles scraped from **{len(papers)}** Bangladeshi newspapers, covering various categories including politics, business, sports, entertainment, and more.
+This dataset contains **{count:,}** news articles scraped from **{len(papers)}** Bangladeshi newspapers, covering various categories including politics, business, sports, entertainment, and more.
 
 ### Supported Newspapers
 
@@ -162,10 +171,15 @@ This dataset contains **{len(articles):,}** news articles scraped from **{len(pa
     "author": str,
     "date": str,
     "language": str,  # "en" or "bn"
-    "word_count": int
+    "word_count": int,
+    "scraped_at": str
 }}
 ```
 
+Data is published as {data_format} shards under `data/`. `manifest.json`
+lists every shard with its row count, id range and sha256; new articles
+arrive as additional `delta-*` shards.
+
 ## Usage
 
 ```python
@@ -176,6 +190,9 @@ dataset = load_dataset("{self.username}/{self.repo_name}")
 # Access articles
 for article in dataset["train"]:
     print(article["headline"])
+
+# Hold out a test split
+splits = dataset["train"].train_test_split(test_size=0.1)
 ```
 
 ## License
@@ -206,10 +223,10 @@ This dataset is provided under the MIT License. The original content is owned by
         
         return card
     
-    def upload_to_hub(self, articles: List[Dict], private: bool = False) -> bool:
-        """Upload dataset to Hugging Face Hub."""
+    def upload_to_hub(self, full: bool = False, private: bool = False, limit: int = None) -> bool:
+        """Export new articles and upload the new shards to Hugging Face Hub."""
         if not HF_AVAILABLE:
-            print("❌ Install: pip install datasets huggingface_hub")
+            print("❌ Install: pip install huggingface_hub")
             return False
         
         if not self.username:
@@ -218,24 +235,24 @@ This dataset is provided under the MIT License. The original content is owned by
             return False
         
         try:
-            # Export data
-            jsonl_path = self.export_to_jsonl(articles)
-            self.generate_dataset_card(articles)
-            
-            # Create dataset
-            dataset = Dataset.from_json(jsonl_path)
-            
-            # Split into train/test
-            split_dataset = dataset.train_test_split(test_size=0.1)
+            shards = self.export(full=full, limit=limit)
+            if not shards and not full:
+                print("ℹ️ No new articles since the last export")
+                return True
             
-            # Upload
             repo_id = f"{self.username}/{self.repo_name}"
             print(f"📤 Uploading to {repo_id}...")
             
-            split_dataset.push_to_hub(
-                repo_id,
-                private=private,
-                commit_message=f"Update dataset: {len(articles)} articles"
+            api = HfApi()
+            api.create_repo(repo_id, repo_type="dataset", private=private, exist_ok=True)
+            api.upload_folder(
+                folder_path=str(EXPORT_DIR),
+                repo_id=repo_id,
+                repo_type="dataset",
+                # A delta only ships its new shards; a full export replaces them all
+                allow_patterns=None if full else ["README.md", "manifest.json"] + [s["path"] for s in shards],
+                delete_patterns=["data/*"] if full else None,
+                commit_message=f"Update dataset: {sum(s['rows'] for s in shards)} articles",
             )
             
             print(f"✅ Dataset uploaded: https://huggingface.co/datasets/{repo_id}")
@@ -254,7 +271,7 @@ This dataset is provided under the MIT License. The original content is owned by
         for a in articles:
             print(f"📰 {a['paper_name']}")
             print(f"   {a['headline'][:80]}...")
-            print(f"   Category: {a.get('category', 'N/A')} | Date: {a.get('publication_date', 'N/A')[:10]}")
+            print(f"   Category: {a.get('category') or 'N/A'} | Date: {(a.get('publication_date') or 'N/A')[:10]}")
             print()
 
 
@@ -264,22 +281,21 @@ def main():
     parser.add_argument("--export", action="store_true", help="Export only")
     parser.add_argument("--preview", action="store_true", help="Preview data")
     parser.add_argument("--limit", type=int, help="Limit articles")
+    parser.add_argument("--full", action="store_true", help="Re-export everything instead of new articles")
+    parser.add_argument("--format", choices=["parquet", "jsonl.zst", "jsonl.gz"], help="Shard format")
     parser.add_argument("--private", action="store_true", help="Make private")
     parser.add_argument("--repo", default="bd-news-dataset", help="Repository name")
     
     args = parser.parse_args()
     
-    uploader = HuggingFaceUploader(repo_name=args.repo)
+    uploader = HuggingFaceUploader(repo_name=args.repo, fmt=args.format)
     
     if args.preview:
         uploader.preview(args.limit or 5)
     elif args.export:
-        articles = uploader.load_articles(limit=args.limit)
-        uploader.export_to_jsonl(articles)
-        uploader.generate_dataset_card(articles)
+        uploader.export(full=args.full, limit=args.limit)
     elif args.upload:
-        articles = uploader.load_articles(limit=args.limit)
-        uploader.upload_to_hub(articles, private=args.private)
+        uploader.upload_to_hub(full=args.full, private=args.private, limit=args.limit)
     else:
         parser.print_help()
 
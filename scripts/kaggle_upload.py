@@ -9,6 +9,11 @@ Setup:
     2. Go to Account → Create API Token
     3. Place kaggle.json in ~/.kaggle/ or set KAGGLE_USERNAME and KAGGLE_KEY
 
+Data is exported by BDNewsPaper.dataset_export as size-bounded shards
+(Parquet with pyarrow installed, otherwise compressed JSONL) under
+kaggle_export/data/. Each export only writes shards for articles added
+since the last one; --full rewrites them all.
+
 Usage:
     python kaggle_upload.py --export        # Export dataset
     python kaggle_upload.py --upload        # Upload to Kaggle
@@ -17,15 +22,18 @@ Usage:
 
 import argparse
 import os
-import sqlite3
+import sys
 import json
-import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 import subprocess
 import zipfile
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.dataset_export import MANIFEST_NAME, DatasetExporter
+
 
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
 EXPORT_DIR = Path(__file__).parent / "kaggle_export"
@@ -38,52 +46,30 @@ DATASET_SLUG = os.getenv("KAGGLE_DATASET_SLUG", "bd-news-articles")
 class KagglePublisher:
     """Publish dataset to Kaggle."""
     
-    def __init__(self):
+    def __init__(self, fmt: str = None):
         self.export_dir = EXPORT_DIR
         self.export_dir.mkdir(exist_ok=True)
+        self.exporter = DatasetExporter(DB_PATH, self.export_dir, fmt)
     
-    def export_data(self, limit: int = None) -> Dict:
-        """Export articles to CSV."""
+    def export_data(self, limit: int = None, full: bool = False) -> Dict:
+        """Export new articles (or everything) as dataset shards."""
         if not DB_PATH.exists():
             return {"error": "Database not found"}
         
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        
-        query = """
-            SELECT 
-                id, url, paper_name, headline, article_body,
-                category, author, publication_date, 
-                source_language, word_count, scraped_at
-            FROM articles
-            ORDER BY scraped_at DESC
-        """
-        
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor = conn.execute(query)
-        articles = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        # Export to CSV
-        csv_path = self.export_dir / "articles.csv"
-        
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            if articles:
-                writer = csv.DictWriter(f, fieldnames=articles[0].keys())
-                writer.writeheader()
-                writer.writerows(articles)
-        
-        print(f"✅ Exported {len(articles)} articles to {csv_path}")
+        shards = self.exporter.export(full=full, limit=limit)
+        manifest = self.exporter.manifest()
+        new_rows = sum(s["rows"] for s in shards)
+        print(f"✅ Exported {new_rows:,} articles in {len(shards)} new shards "
+              f"({manifest['rows']:,} articles total) to {self.export_dir}")
         
         # Create dataset metadata
-        self._create_metadata(len(articles))
+        self._create_metadata(manifest)
         
-        return {"articles": len(articles), "path": str(csv_path)}
+        return {"articles": manifest["rows"], "new_articles": new_rows, "path": str(self.export_dir)}
     
-    def _create_metadata(self, article_count: int):
+    def _create_metadata(self, manifest: Dict):
         """Create dataset-metadata.json for Kaggle."""
+        article_count = manifest["rows"]
         metadata = {
             "title": "Bangladeshi News Articles Dataset",
             "id": f"{KAGGLE_USERNAME}/{DATASET_SLUG}",
@@ -97,9 +83,10 @@ class KagglePublisher:
             ],
             "resources": [
                 {
-                    "path": "articles.csv",
-                    "description": f"News articles from Bangladeshi newspapers ({article_count:,} rows)"
+                    "path": shard["path"],
+                    "description": f"News articles {shard['min_id']}-{shard['max_id']} ({shard['rows']:,} rows)"
                 }
+                for shard in manifest["shards"]
             ]
         }
         
@@ -117,7 +104,8 @@ This dataset contains **{article_count:,}** news articles scraped from 75+ Bangl
 
 ## Content
 
-- `articles.csv` - Main data file with all articles
+- `data/` - Article shards ({manifest['format']}); `delta-*` shards hold articles added since the last full export
+- `manifest.json` - Every shard with its row count, id range and sha256
 
 ### Columns
 
@@ -125,13 +113,13 @@ This dataset contains **{article_count:,}** news articles scraped from 75+ Bangl
 |--------|-------------|
 | id | Unique article ID |
 | url | Original article URL |
-| paper_name | Newspaper name |
+| newspaper | Newspaper name |
 | headline | Article title |
-| article_body | Full article text |
+| content | Full article text |
 | category | News category |
 | author | Article author |
-| publication_date | Publication date |
-| source_language | Language (en/bn) |
+| date | Publication date |
+| language | Language (en/bn) |
 | word_count | Word count |
 | scraped_at | Scrape timestamp |
 
@@ -172,7 +160,7 @@ Weekly updates
             return False
         
         # Export first
-        result = self.export_data()
+        result = self.export_data(full=new)
         if "error" in result:
             print(f"❌ {result['error']}")
             return False
@@ -180,10 +168,11 @@ Weekly updates
         try:
             if new:
                 # Create new dataset
-                cmd = ["kaggle", "datasets", "create", "-p", str(self.export_dir)]
+                cmd = ["kaggle", "datasets", "create", "-p", str(self.export_dir), "--dir-mode", "zip"]
             else:
                 # Update existing
-                cmd = ["kaggle", "datasets", "version", "-p", str(self.export_dir), "-m", f"Update {datetime.now().strftime('%Y-%m-%d')}"]
+                cmd = ["kaggle", "datasets", "version", "-p", str(self.export_dir), "--dir-mode", "zip",
+                       "-m", f"Update {datetime.now().strftime('%Y-%m-%d')}"]
             
             result = subprocess.run(cmd, capture_output=True, text=True)
             
@@ -206,10 +195,12 @@ Weekly updates
         
         zip_path = self.export_dir / "dataset.zip"
         
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for file in self.export_dir.glob("*"):
-                if file.suffix in [".csv", ".md", ".json"] and file.name != "dataset.zip":
-                    zf.write(file, file.name)
+        # Shards are already compressed; store them as-is
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+            for name in ["README.md", "dataset-metadata.json", MANIFEST_NAME]:
+                zf.write(self.export_dir / name, name)
+            for shard in self.exporter.manifest()["shards"]:
+                zf.write(self.export_dir / shard["path"], shard["path"])
         
         print(f"✅ Created zip archive: {zip_path}")
         return str(zip_path)
@@ -222,13 +213,15 @@ def main():
     parser.add_argument("--update", action="store_true", help="Update existing")
     parser.add_argument("--zip", action="store_true", help="Create zip archive")
     parser.add_argument("--limit", type=int, help="Limit articles")
+    parser.add_argument("--full", action="store_true", help="Re-export everything instead of new articles")
+    parser.add_argument("--format", choices=["parquet", "jsonl.zst", "jsonl.gz"], help="Shard format")
     
     args = parser.parse_args()
     
-    publisher = KagglePublisher()
+    publisher = KagglePublisher(fmt=args.format)
     
     if args.export:
-        publisher.export_data(args.limit)
+        publisher.export_data(args.limit, full=args.full)
     elif args.upload:
         publisher.upload(new=True)
     elif args.update:
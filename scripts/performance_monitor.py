@@ -5,11 +5,16 @@ Provides real-time stats and performance metrics.
 """
 
 import sqlite3
+import sys
 import time
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from BDNewsPaper.stats_rollup import StatsRollup
+
 
 class PerformanceMonitor:
     """Monitor scraping performance and generate reports."""
@@ -31,11 +36,10 @@ class PerformanceMonitor:
         
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            rollup = StatsRollup(conn)
             
-            # Check if articles table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='articles'")
-            if not cursor.fetchone():
+            # Check if articles table exists (and bring the rollup up to date)
+            if not rollup.ensure():
                 return {
                     "error": "Articles table not found",
                     "total_articles": 0,
@@ -44,40 +48,16 @@ class PerformanceMonitor:
                     "papers": {}
                 }
             
-            # Get articles added in the last N hours
-            cutoff_time = datetime.now() - timedelta(hours=hours_back)
-            cutoff_str = cutoff_time.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Total articles in period
-            cursor.execute(
-                "SELECT COUNT(*) FROM articles WHERE scraped_at > ?", 
-                (cutoff_str,)
-            )
-            recent_articles = cursor.fetchone()[0] or 0
+            # Articles added in the last N hours
+            recent = rollup.totals(hours=hours_back)
+            recent_articles = recent["articles"]
+            avg_length = recent["avg_length"]
             
             # Articles by paper
-            cursor.execute(
-                """
-                SELECT paper_name, COUNT(*) as count 
-                FROM articles 
-                WHERE scraped_at > ? 
-                GROUP BY paper_name 
-                ORDER BY count DESC
-                """, 
-                (cutoff_str,)
-            )
-            by_paper = dict(cursor.fetchall())
+            by_paper = rollup.counts_by("paper_name", hours=hours_back)
             
             # Total articles in database
-            cursor.execute("SELECT COUNT(*) FROM articles")
-            total_articles = cursor.fetchone()[0]
-            
-            # Average article length
-            cursor.execute(
-                "SELECT AVG(LENGTH(article)) FROM articles WHERE scraped_at > ?", 
-                (cutoff_str,)
-            )
-            avg_length = cursor.fetchone()[0] or 0
+            total_articles = rollup.totals()["articles"]
             
             conn.close()
             
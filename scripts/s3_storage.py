@@ -16,21 +16,30 @@ Setup:
     export AWS_SECRET_ACCESS_KEY=your-secret
     export S3_BUCKET=your-bucket
 
+Database backups are online and incremental (BDNewsPaper.db_backup): a
+consistent snapshot is taken while the crawler keeps writing, split into
+content-defined chunks, and only chunks the previous backup lacks are
+compressed (in parallel) and uploaded. Without S3 credentials, or with
+--target-dir, backups go to a local directory instead.
+
 Usage:
     python s3_storage.py --backup           # Backup database
     python s3_storage.py --sync             # Sync all data
-    python s3_storage.py --restore          # Restore from S3
+    python s3_storage.py --restore          # Restore latest from S3
+    python s3_storage.py --restore --name news_articles_20250101_000000_000000
     python s3_storage.py --list             # List backups
+    python s3_storage.py --backup --target-dir /mnt/backups
 """
 
 import argparse
 import os
-import gzip
-import shutil
-from datetime import datetime
+import sys
 from pathlib import Path
-from typing import List, Optional
-import json
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.db_backup import BackupEngine, LocalTarget, S3Target
 
 
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
@@ -53,18 +62,24 @@ try:
     S3_AVAILABLE = True
 except ImportError:
     S3_AVAILABLE = False
+    ClientError = OSError
 
 
 class S3Storage:
     """S3 cloud storage management."""
     
-    def __init__(self):
+    def __init__(self, target_dir: Optional[str] = None, workers: int = 4):
         self.config = S3_CONFIG
         self.client = None
-        BACKUP_DIR.mkdir(exist_ok=True)
         
-        if S3_AVAILABLE and self.config["access_key"]:
+        if S3_AVAILABLE and self.config["access_key"] and not target_dir:
             self._connect()
+        
+        if self.is_available:
+            target = S3Target(self.client, self.config["bucket"])
+        else:
+            target = LocalTarget(target_dir or str(BACKUP_DIR))
+        self.backups = BackupEngine(target, workers=workers)
     
     def _connect(self):
         """Connect to S3."""
@@ -88,51 +103,23 @@ class S3Storage:
     def is_available(self) -> bool:
         return self.client is not None
     
-    def compress_file(self, filepath: Path) -> Path:
-        """Compress file with gzip."""
-        gz_path = BACKUP_DIR / f"{filepath.name}.gz"
-        
-        with open(filepath, "rb") as f_in:
-            with gzip.open(gz_path, "wb") as f_out:
-                shutil.copyfileobj(f_in, f_out)
-        
-        return gz_path
-    
     def backup_database(self) -> Optional[str]:
-        """Backup database to S3."""
+        """Take an incremental backup of the database. Returns its name."""
         if not DB_PATH.exists():
             print("❌ Database not found")
             return None
         
-        # Create timestamped backup
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"news_articles_{timestamp}.db.gz"
-        
-        # Compress
-        print(f"📦 Compressing database...")
-        gz_path = self.compress_file(DB_PATH)
-        
-        # Upload
-        s3_key = f"backups/database/{backup_name}"
+        print(f"📦 Backing up database to {self.backups.target}...")
+        try:
+            name = self.backups.backup(str(DB_PATH))
+        except (ClientError, OSError) as e:
+            print(f"❌ Backup failed: {e}")
+            return None
         
-        if self.is_available:
-            try:
-                self.client.upload_file(str(gz_path), self.config["bucket"], s3_key)
-                print(f"✅ Uploaded: s3://{self.config['bucket']}/{s3_key}")
-                
-                # Clean local backup
-                gz_path.unlink()
-                
-                return s3_key
-            except ClientError as e:
-                print(f"❌ Upload failed: {e}")
-                return None
-        else:
-            # Save locally if S3 not configured
-            local_backup = BACKUP_DIR / backup_name
-            gz_path.rename(local_backup)
-            print(f"✅ Local backup: {local_backup}")
-            return str(local_backup)
+        stats = self.backups.stats
+        print(f"✅ Backup {name}: {stats['new_chunks']}/{stats['chunks']} chunks new, "
+              f"{stats['stored_bytes'] / 1024 / 1024:.1f} MB uploaded in {stats['elapsed']:.1f}s")
+        return name
     
     def sync_data(self) -> int:
         """Sync data directory to S3."""
@@ -160,106 +147,40 @@ class S3Storage:
         print(f"✅ Synced {uploaded} files to S3")
         return uploaded
     
-    def restore_database(self, backup_key: str = None) -> bool:
-        """Restore database from S3."""
-        if not self.is_available:
-            print("❌ S3 not configured")
-            return False
-        
+    def restore_database(self, backup_name: str = None) -> bool:
+        """Restore a backup (default: latest) over the database."""
         try:
-            if not backup_key:
-                # Get latest backup
-                response = self.client.list_objects_v2(
-                    Bucket=self.config["bucket"],
-                    Prefix="backups/database/"
-                )
-                
-                backups = sorted(
-                    [obj["Key"] for obj in response.get("Contents", [])],
-                    reverse=True
-                )
-                
-                if not backups:
-                    print("❌ No backups found")
-                    return False
-                
-                backup_key = backups[0]
-            
-            print(f"📥 Downloading: {backup_key}")
-            
-            # Download
-            local_gz = BACKUP_DIR / Path(backup_key).name
-            self.client.download_file(self.config["bucket"], backup_key, str(local_gz))
-            
-            # Decompress
-            with gzip.open(local_gz, "rb") as f_in:
-                with open(DB_PATH, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            
-            local_gz.unlink()
-            print(f"✅ Restored database from {backup_key}")
-            return True
-            
-        except ClientError as e:
+            manifest = self.backups.restore(str(DB_PATH), backup_name, source=str(DB_PATH))
+        except FileNotFoundError as e:
+            print(f"❌ No backup found: {e}")
+            return False
+        except (ClientError, OSError, ValueError) as e:
             print(f"❌ Restore failed: {e}")
             return False
+        
+        print(f"✅ Restored database from {manifest['name']}")
+        return True
     
     def list_backups(self) -> List[Dict]:
-        """List available backups."""
-        if not self.is_available:
-            # List local backups
-            backups = []
-            for f in BACKUP_DIR.glob("*.db.gz"):
-                backups.append({
-                    "key": str(f),
-                    "size": f.stat().st_size,
-                    "date": datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
-                    "location": "local"
-                })
-            return backups
-        
+        """List available backups, newest first."""
+        location = "s3" if self.is_available else "local"
         try:
-            response = self.client.list_objects_v2(
-                Bucket=self.config["bucket"],
-                Prefix="backups/database/"
-            )
-            
-            backups = []
-            for obj in response.get("Contents", []):
-                backups.append({
-                    "key": obj["Key"],
-                    "size": obj["Size"],
-                    "date": obj["LastModified"].isoformat(),
-                    "location": "s3"
-                })
-            
-            return sorted(backups, key=lambda x: x["date"], reverse=True)
-            
-        except ClientError as e:
+            return [
+                {"key": b["name"], "size": b["size"], "date": b["created_at"], "location": location}
+                for b in self.backups.backups()
+            ]
+        except (ClientError, OSError) as e:
             print(f"❌ Error: {e}")
             return []
     
     def cleanup_old_backups(self, keep: int = 7):
-        """Delete old backups, keeping latest N."""
-        backups = self.list_backups()
-        
-        if len(backups) <= keep:
-            print(f"ℹ️ Only {len(backups)} backups, nothing to clean")
+        """Delete old backups, keeping latest N, and chunks only they used."""
+        deleted = self.backups.prune(keep, source=str(DB_PATH))
+        if not deleted:
+            print(f"ℹ️ Nothing to clean, keeping latest {keep} backups")
             return
         
-        to_delete = backups[keep:]
-        
-        for backup in to_delete:
-            if backup["location"] == "s3":
-                try:
-                    self.client.delete_object(Bucket=self.config["bucket"], Key=backup["key"])
-                    print(f"🗑️ Deleted: {backup['key']}")
-                except ClientError:
-                    pass
-            else:
-                Path(backup["key"]).unlink(missing_ok=True)
-        
-        print(f"✅ Cleaned {len(to_delete)} old backups")
+        print(f"✅ Cleaned {deleted} old backups")
 
 
 def main():
@@ -270,23 +191,26 @@ def main():
     parser.add_argument("--list", action="store_true", help="List backups")
     parser.add_argument("--cleanup", action="store_true", help="Clean old backups")
     parser.add_argument("--keep", type=int, default=7, help="Backups to keep")
+    parser.add_argument("--name", help="Backup to restore (default: latest)")
+    parser.add_argument("--target-dir", help="Back up to this directory instead of S3")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel compress/upload threads")
     
     args = parser.parse_args()
     
-    storage = S3Storage()
+    storage = S3Storage(target_dir=args.target_dir, workers=args.workers)
     
     if args.backup:
         storage.backup_database()
     elif args.sync:
         storage.sync_data()
     elif args.restore:
-        storage.restore_database()
+        storage.restore_database(args.name)
     elif args.list:
         backups = storage.list_backups()
         print(f"\n📁 Available Backups ({len(backups)}):\n")
         for b in backups[:10]:
             size_mb = b["size"] / 1024 / 1024
-            print(f"  {b['date'][:19]} - {size_mb:.1f} MB - {b['location']}")
+            print(f"  {b['date'][:19]} - {size_mb:.1f} MB - {b['location']} - {b['key']}")
     elif args.cleanup:
         storage.cleanup_old_backups(args.keep)
     else:
@@ -26,6 +26,11 @@ from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 from typing import Dict, List
 import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BDNewsPaper.stats_rollup import StatsRollup
 
 
 DB_PATH = Path(__file__).resolve().parent.parent / "news_articles.db"
@@ -98,24 +103,16 @@ def get_spider_stats() -> Dict[str, Dict]:
         return {}
     
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    rollup = StatsRollup(conn)
     
     # Get counts and last scraped
-    query = """
-        SELECT 
-            paper_name,
-            COUNT(*) as article_count,
-            MAX(scraped_at) as last_scraped
-        FROM articles 
-        GROUP BY paper_name
-    """
-    
     stats = {}
-    for row in conn.execute(query).fetchall():
-        stats[row["paper_name"]] = {
-            "count": row["article_count"],
-            "last_scraped": row["last_scraped"]
-        }
+    if rollup.ensure():
+        for paper in rollup.papers():
+            stats[paper["paper_name"]] = {
+                "count": paper["count"],
+                "last_scraped": paper["last_scraped"]
+            }
     
     conn.close()
     return stats
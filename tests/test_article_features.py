@@ -0,0 +1,125 @@
+"""
+Article Feature Store Tests
+===========================
+Tests for per-article feature extraction, the incremental worker and the
+aggregate queries.
+"""
+
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.article_features import FeatureExtractor, FeatureStore, FeatureWorker
+
+
+HEADLINES = [
+    "Flood crisis in Sylhet as Minister Rahman Khan visits",
+    "Dhaka University students protest for workers rights",
+    "Investment growth boosts economy in Chattogram",
+    "Shocking scandal at Sonali Bank branch in Khulna",
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "features.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL,
+            headline TEXT NOT NULL,
+            article TEXT NOT NULL,
+            category TEXT,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_articles(db_path, count, start=0):
+    conn = sqlite3.connect(db_path)
+    for i in range(start, start + count):
+        headline = HEADLINES[i % len(HEADLINES)]
+        conn.execute(
+            "INSERT INTO articles (url, paper_name, headline, article, category) VALUES (?, ?, ?, ?, ?)",
+            (f"https://example.com/{i}", f"paper{i % 2}", headline,
+             f"{headline}. The report stated good progress despite the crisis.", "National"),
+        )
+    conn.commit()
+    conn.close()
+
+
+class TestFeatureExtractor:
+    """Tests for FeatureExtractor."""
+
+    def test_extract(self):
+        features = FeatureExtractor().extract(HEADLINES[0], "A terrible crisis.")
+        terms = {(kind, term): count for kind, term, count in features["terms"]}
+
+        assert terms[("location", "sylhet")] == 1
+        assert terms[("lexicon", "sensational")] == 2
+        assert terms[("person", "Minister Rahman Khan")] == 1
+        assert ("token", "flood") in terms
+        assert ("token", "in") not in terms
+        assert features["sentiment"] == "negative"
+        assert features["political_lean"] == "center"
+
+    def test_organizations(self):
+        people, organizations = FeatureExtractor.entities("Funds at Sonali Bank and Dhaka University")
+        assert organizations == {"Sonali Bank": 1, "Dhaka University": 1}
+        assert not people
+
+
+class TestFeatureWorker:
+    """Tests for FeatureWorker and FeatureStore."""
+
+    def test_processes_only_new_articles(self, db_path):
+        add_articles(db_path, 5)
+        worker = FeatureWorker(db_path, workers=1, batch_size=2)
+        assert worker.run() == 5
+        assert worker.stats["batches"] == 3
+
+        add_articles(db_path, 3, start=5)
+        worker = FeatureWorker(db_path, workers=1, batch_size=2)
+        assert worker.run() == 3
+        assert FeatureWorker(db_path, workers=1).run() == 0
+
+    def test_parallel_matches_inline(self, db_path, tmp_path):
+        add_articles(db_path, 40)
+        FeatureWorker(db_path, workers=1, batch_size=7).run()
+        conn = sqlite3.connect(db_path)
+        inline = sorted(conn.execute("SELECT * FROM article_feature_terms").fetchall())
+        conn.close()
+
+        FeatureWorker(db_path, workers=2, batch_size=7).rebuild()
+        conn = sqlite3.connect(db_path)
+        parallel = sorted(conn.execute("SELECT * FROM article_feature_terms").fetchall())
+        ids = [row[0] for row in conn.execute("SELECT article_id FROM article_features ORDER BY article_id")]
+        conn.close()
+
+        assert parallel == inline
+        assert ids == list(range(1, 41))
+
+    def test_store_aggregates(self, db_path):
+        add_articles(db_path, 8)
+        FeatureWorker(db_path, workers=1).run()
+        store = FeatureStore(sqlite3.connect(db_path))
+
+        assert store.article_count(days=1) == 8
+        assert store.article_count(paper="paper0") == 4
+        locations = dict(store.term_counts("location", articles=True))
+        assert locations["sylhet"] == 2
+        assert locations["dhaka"] == 2
+        by_paper = store.term_counts_by("paper", "lexicon")
+        assert set(by_paper) == {"paper0", "paper1"}
+        assert store.term_counts("token", limit=1, min_length=8, exclude=["chattogram"])[0][0] != "chattogram"
+        with pytest.raises(ValueError):
+            store.term_counts("headline")
+        store.conn.close()
+
+    def test_missing_articles_table(self, tmp_path):
+        assert FeatureWorker(str(tmp_path / "empty.db"), workers=1).run() == 0
@@ -0,0 +1,151 @@
+"""
+Article Partition Tests
+=======================
+Tests for monthly article partitions behind the articles view.
+"""
+
+import gzip
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.article_partitions import ArticlePartitions, current_month, partition_name
+from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.stats_rollup import StatsRollup
+
+
+class PartitionedSpider(BaseNewsSpider):
+    name = "partitioned_test"
+    paper_name = "p"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "news.db"))
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL,
+            headline TEXT NOT NULL,
+            article TEXT NOT NULL,
+            sub_title TEXT,
+            category TEXT,
+            author TEXT,
+            publication_date TEXT,
+            modification_date TEXT,
+            image_url TEXT,
+            keywords TEXT,
+            source_language TEXT,
+            word_count INTEGER,
+            content_hash TEXT,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    yield conn
+    conn.close()
+
+
+def insert(conn, url, scraped_at):
+    conn.execute(
+        "INSERT INTO articles (url, paper_name, headline, article, scraped_at) VALUES (?, 'p', 'h', 'body', ?)",
+        (url, scraped_at),
+    )
+    conn.commit()
+
+
+def article(url):
+    return {"url": url, "paper_name": "p", "headline": "h", "article": "body"}
+
+
+class TestArticlePartitions:
+    """Tests for ArticlePartitions."""
+
+    def test_migrate_moves_rows_by_month(self, conn):
+        insert(conn, "https://example.com/1", "2024-01-05 10:00:00")
+        insert(conn, "https://example.com/2", "2024-01-20 10:00:00")
+        insert(conn, "https://example.com/3", "2024-02-01 00:00:00")
+        conn.execute("DELETE FROM articles WHERE id = 3")
+        insert(conn, "https://example.com/4", "2024-02-02 00:00:00")
+
+        partitions = ArticlePartitions(conn)
+        assert partitions.migrate() == 3
+        assert partitions.is_partitioned()
+
+        assert conn.execute("SELECT id, url FROM articles ORDER BY id").fetchall() == [
+            (1, "https://example.com/1"), (2, "https://example.com/2"), (4, "https://example.com/4"),
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM articles_2024_01").fetchone()[0] == 2
+        months = [p["month"] for p in partitions.partitions()]
+        assert months[:2] == ["2024-01", "2024-02"]
+        assert current_month() in months
+        # Ids continue past the highest one ever allocated
+        assert partitions.insert(article("https://example.com/5")) == 5
+        assert partitions.migrate() == 0
+
+    def test_insert_routes_to_current_month(self, conn):
+        partitions = ArticlePartitions(conn)
+        partitions.ensure()
+
+        article_id = partitions.insert(article("https://example.com/new"))
+        conn.commit()
+        name = partition_name(current_month())
+        assert conn.execute(f"SELECT id FROM {name}").fetchall() == [(article_id,)]
+        assert partitions.url_exists("https://example.com/new")
+        with pytest.raises(sqlite3.IntegrityError):
+            partitions.insert(article("https://example.com/new"))
+
+    def test_recent_window_uses_partition_indexes(self, conn):
+        insert(conn, "https://example.com/old", "2023-06-01 00:00:00")
+        ArticlePartitions(conn).migrate()
+
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM articles WHERE scraped_at >= datetime('now', '-1 day')"
+        ))
+        assert "idx_articles_2023_06_scraped_at" in plan
+        assert f"idx_{partition_name(current_month())}_scraped_at" in plan
+        assert "SCAN articles_" not in plan
+
+    def test_archive_moves_month_out(self, conn, tmp_path):
+        insert(conn, "https://example.com/old", "2023-06-01 00:00:00")
+        insert(conn, "https://example.com/recent", "2099-01-01 00:00:00")
+        partitions = ArticlePartitions(conn)
+        partitions.migrate()
+
+        path = partitions.archive("2023-06", str(tmp_path / "archive"))
+        assert path.endswith("articles_2023_06.db.gz")
+        assert conn.execute("SELECT url FROM articles").fetchall() == [("https://example.com/recent",)]
+        assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_2023_06'").fetchone()
+        # Archived URLs still count as seen
+        assert partitions.url_exists("https://example.com/old")
+
+        restored = tmp_path / "restored.db"
+        with gzip.open(path, "rb") as src:
+            restored.write_bytes(src.read())
+        archived = sqlite3.connect(str(restored))
+        assert archived.execute("SELECT url FROM articles_2023_06").fetchall() == [("https://example.com/old",)]
+        archived.close()
+
+        with pytest.raises(ValueError):
+            partitions.archive("2023-06", str(tmp_path / "archive"))
+        with pytest.raises(ValueError):
+            partitions.archive(current_month(), str(tmp_path / "archive"))
+
+    def test_archived_urls_stay_known_and_rollup_follows(self, conn, tmp_path):
+        insert(conn, "https://example.com/old", "2023-06-01 00:00:00")
+        insert(conn, "https://example.com/recent", "2099-01-01 00:00:00")
+        partitions = ArticlePartitions(conn)
+        partitions.migrate()
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+        assert rollup.totals()["articles"] == 2
+
+        partitions.archive("2023-06", str(tmp_path / "archive"))
+        assert rollup.totals()["articles"] == 1
+
+        db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+        spider = PartitionedSpider(db_path=db_path)
+        assert spider.is_url_in_db("https://example.com/old")
+        assert spider.filter_new_urls(["https://example.com/old", "https://example.com/new"]) == [
+            "https://example.com/new"
+        ]
@@ -220,6 +220,12 @@ class TestConvertBengaliDate:
         tomorrow = datetime.now(DHAKA_TZ) + timedelta(days=1)
         assert result.date() == tomorrow.date()
 
+    def test_time_numbers_not_taken_as_day_or_year(self):
+        result = convert_bengali_date_to_english("জুলাই ১০, ২০২৪ সন্ধ্যা ৭টা ১৫ মিনিট")
+        assert result is not None
+        assert (result.year, result.month, result.day) == (2024, 7, 10)
+        assert (result.hour, result.minute) == (19, 15)
+
     def test_invalid_returns_none(self):
         assert convert_bengali_date_to_english("not a date") is None
         assert convert_bengali_date_to_english("random text ১২৩") is None
@@ -342,6 +348,20 @@ class TestBengaliDateParser:
         assert result.hour == 0
         assert result.minute == 0
 
+    def test_parse_many_preserves_order(self):
+        parser = BengaliDateParser()
+        results = parser.parse_many([
+            "জুলাই ১০, ২০২৪", "invalid text", "জুলাই ১০, ২০২৪", "১৫ ডিসেম্বর ২০২৪",
+        ])
+        assert [r.date() if r else None for r in results] == [
+            date(2024, 7, 10), None, date(2024, 7, 10), date(2024, 12, 15),
+        ]
+
+    def test_parse_many_strict_raises(self):
+        parser = BengaliDateParser(strict=True)
+        with pytest.raises(ValueError, match="Failed to parse"):
+            parser.parse_many(["জুলাই ১০, ২০২৪", "not a bengali date"])
+
 
 # ==============================================================================
 # validate_bengali_date_format
@@ -0,0 +1,95 @@
+"""
+Crawl Frontier Tests
+====================
+Tests for batched URL checks and stop-on-known pagination in BaseNewsSpider.
+"""
+
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+
+
+class ListingSpider(BaseNewsSpider):
+    name = "listing_test"
+    paper_name = "Listing Test"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "news.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, url TEXT UNIQUE)")
+    conn.executemany("INSERT INTO articles (url) VALUES (?)",
+                     [(f"https://x.com/news/{i}",) for i in range(100)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def page_urls(page, per_page=10):
+    """Page 1 holds the newest articles (ids 100+), older pages stored ones."""
+    first = 130 - page * per_page
+    return [f"https://x.com/news/{i}" for i in range(first, first + per_page)]
+
+
+class TestFilterNewUrls:
+    """Tests for BaseNewsSpider.filter_new_urls."""
+
+    def test_one_query_per_page(self, db_path):
+        spider = ListingSpider(db_path=db_path)
+        queries = []
+        spider._get_db_connection().set_trace_callback(queries.append)
+
+        urls = ["https://x.com/news/5", "https://x.com/news/500", "https://x.com/news/5", "",
+                "https://x.com/news/501"]
+        assert spider.filter_new_urls(urls) == ["https://x.com/news/500", "https://x.com/news/501"]
+        assert len(queries) == 1
+        assert spider.stats.duplicates_skipped == 1
+
+        # URLs already requested in this run are not new and need no query
+        assert spider.filter_new_urls(["https://x.com/news/500"]) == []
+        assert len(queries) == 1
+        assert spider.is_url_in_db("https://x.com/news/501")
+
+
+class TestStopOnKnownPages:
+    """Tests for BaseNewsSpider.should_paginate."""
+
+    def walk(self, spider, listing="politics"):
+        page = 1
+        while True:
+            spider.filter_new_urls(page_urls(page), listing=listing)
+            if not spider.should_paginate(listing, page):
+                return page
+            page += 1
+
+    def test_stops_after_consecutive_known_pages(self, db_path):
+        spider = ListingSpider(db_path=db_path, max_pages=12, stop_on_known_pages=2)
+        # Pages 1-3 have new articles, 4 and 5 are stored already
+        assert self.walk(spider) == 5
+        assert spider.stats.known_pages == 2
+        assert spider.stats.pages_saved == 7
+
+    def test_new_page_resets_streak(self, db_path):
+        spider = ListingSpider(db_path=db_path, stop_on_known_pages=2)
+        spider.filter_new_urls(page_urls(5), listing="sports")
+        spider.filter_new_urls(["https://x.com/news/999"], listing="sports")
+        spider.filter_new_urls(page_urls(6), listing="sports")
+        assert spider.should_paginate("sports", 3)
+        # Listings are tracked separately
+        spider.filter_new_urls(page_urls(7), listing="sports")
+        assert not spider.should_paginate("sports", 4)
+        assert spider.should_paginate("world", 4)
+
+    def test_full_walk_when_disabled(self, db_path):
+        spider = ListingSpider(db_path=db_path, max_pages=12, stop_on_known_pages="0")
+        assert self.walk(spider) == 12
+        assert spider.stats.pages_saved == 0
+
+    def test_last_page_bounds_savings(self, db_path):
+        spider = ListingSpider(db_path=db_path, stop_on_known_pages=1)
+        spider.filter_new_urls(page_urls(5), listing="world")
+        assert not spider.should_paginate("world", 1, last_page=4)
+        assert spider.stats.pages_saved == 3
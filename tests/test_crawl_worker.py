@@ -0,0 +1,154 @@
+"""
+Crawl Worker Tests
+==================
+Tests for long-lived crawl workers running (spider, date range) jobs.
+"""
+
+import os
+import queue
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import scrapy
+
+from BDNewsPaper.crawl_worker import CrawlJob, CrawlWorkerPool, JobResult
+
+# The workers load the spiders below from this module
+WORKER_SETTINGS = {
+    'SPIDER_MODULES': [__name__],
+    'SPIDER_MIDDLEWARES': {},
+    'ITEM_PIPELINES': {},
+    'LOG_ENABLED': False,
+}
+
+
+class DaySpider(scrapy.Spider):
+    """Fetches one page per day of its date range."""
+    name = 'days'
+
+    async def start(self):
+        first, last = date.fromisoformat(self.start_date), date.fromisoformat(self.end_date)
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            yield scrapy.Request(f'http://127.0.0.1:{self.port}/{date.fromordinal(ordinal)}')
+
+    def parse(self, response):
+        yield {'url': response.url}
+
+
+class CrashingSpider(DaySpider):
+    """Takes its worker process down with it."""
+    name = 'crash'
+
+    def parse(self, response):
+        os._exit(3)
+
+
+@pytest.fixture(scope='module')
+def port():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+
+
+class TestJobResult:
+    """Tests for JobResult."""
+
+    def test_ok_and_overhead(self):
+        job = CrawlJob('days', '2024-01-01', '2024-01-30')
+        result = JobResult(job, worker=0, finish_reason='finished', wall_s=2.5, crawl_s=2.2)
+        assert result.ok and result.overhead_s == pytest.approx(0.3)
+        assert not JobResult(job, worker=0, finish_reason='shutdown').ok
+        assert JobResult(job, worker=0, finish_reason='closespider_itemcount').ok
+
+
+class TestDispatch:
+    """Job dispatch across spiders, without worker processes."""
+
+    def make_pool(self, workers, **kwargs):
+        pool = CrawlWorkerPool(workers=workers, **kwargs)
+        pool.inboxes = {worker_id: queue.Queue() for worker_id in range(workers)}
+        pool.jobs_run = dict.fromkeys(range(workers), 0)
+        return pool
+
+    def finish(self, pool, worker_id):
+        pool.running.pop(worker_id)
+        pool._finished(worker_id)
+        pool._dispatch()
+
+    def test_round_robin_across_spiders(self):
+        pool = self.make_pool(1)
+        for spider in ('a', 'a', 'a', 'b', 'b'):
+            pool.submit(CrawlJob(spider))
+        pool.idle.append(0)
+        pool._dispatch()
+        order = []
+        while pool.running:
+            order.append(pool.running[0].spider)
+            self.finish(pool, 0)
+        assert order == ['a', 'b', 'a', 'b', 'a']
+
+    def test_one_worker_per_spider(self):
+        pool = self.make_pool(3)
+        pool.idle.extend([0, 1, 2])
+        for spider in ('a', 'a', 'b'):
+            pool.submit(CrawlJob(spider))
+        assert sorted(job.spider for job in pool.running.values()) == ['a', 'b']
+        assert list(pool.idle) == [2]
+        worker_a = next(worker_id for worker_id, job in pool.running.items() if job.spider == 'a')
+        self.finish(pool, worker_a)
+        assert sorted(job.spider for job in pool.running.values()) == ['a', 'b']
+
+        pool = self.make_pool(2, max_per_spider=2)
+        pool.idle.extend([0, 1])
+        pool.submit(CrawlJob('a'))
+        pool.submit(CrawlJob('a'))
+        assert len(pool.running) == 2
+
+
+class TestCrawlWorkerPool:
+    """Tests for CrawlWorkerPool."""
+
+    def test_runs_jobs_back_to_back_in_one_worker(self, port):
+        with CrawlWorkerPool(workers=1, settings=WORKER_SETTINGS) as pool:
+            pool.submit(CrawlJob('days', '2024-01-01', '2024-01-03', {'port': port}))
+            pool.submit(CrawlJob('missing'))
+            pool.submit(CrawlJob('days', '2024-02-01', '2024-02-05', {'port': port}))
+            results = {result.job.start_date: result for result in pool.results()}
+
+        assert [results[day].items for day in ('2024-01-01', '2024-02-01')] == [3, 5]
+        assert all(results[day].ok and results[day].crawl_s > 0 for day in ('2024-01-01', '2024-02-01'))
+        missing = results[None]
+        assert not missing.ok and 'Spider not found' in missing.error
+
+    def test_dead_worker_reported_and_others_carry_on(self, port):
+        with CrawlWorkerPool(workers=2, settings=WORKER_SETTINGS) as pool:
+            pool.submit(CrawlJob('crash', '2024-01-01', '2024-01-01', {'port': port}))
+            pool.submit(CrawlJob('days', '2024-01-01', '2024-01-02', {'port': port}))
+            results = {result.job.spider: result for result in pool.results()}
+
+        assert results['crash'].error == 'worker exited with code 3'
+        assert results['days'].ok and results['days'].items == 2
+
+    def test_workers_recycled_after_max_jobs(self, port):
+        with CrawlWorkerPool(workers=1, settings=WORKER_SETTINGS, max_jobs=1) as pool:
+            for day in ('2024-01-01', '2024-01-02'):
+                pool.submit(CrawlJob('days', day, day, {'port': port}))
+            results = list(pool.results())
+
+        assert all(result.ok and result.items == 1 for result in results)
+        assert sorted(result.worker for result in results) == [0, 1]
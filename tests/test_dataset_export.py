@@ -0,0 +1,140 @@
+"""
+Dataset Export Tests
+====================
+Tests for streaming, sharded dataset exports with delta shards.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.dataset_export import DatasetExporter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "news.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL,
+            headline TEXT NOT NULL,
+            article TEXT NOT NULL,
+            category TEXT,
+            author TEXT,
+            publication_date TEXT,
+            source_language TEXT,
+            word_count INTEGER,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    conn.close()
+    add_articles(path, 50)
+    return path
+
+
+def add_articles(db_path, count):
+    conn = sqlite3.connect(db_path)
+    start = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO articles (url, paper_name, headline, article, source_language) VALUES (?, 'prothomalo', ?, ?, ?)",
+        [(f"https://example.com/{i}", f"Headline {i}", os.urandom(400).hex(), "bn" if i % 2 else None)
+         for i in range(start, start + count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def read_records(out_dir, shards):
+    records = []
+    for shard in shards:
+        with gzip.open(os.path.join(out_dir, shard["path"]), "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def make_exporter(db_path, tmp_path, **kwargs):
+    kwargs.setdefault("fmt", "jsonl.gz")
+    kwargs.setdefault("batch_rows", 7)
+    return DatasetExporter(db_path, str(tmp_path / "export"), **kwargs)
+
+
+class TestDatasetExporter:
+    """Tests for DatasetExporter."""
+
+    def test_first_export_is_full_and_sharded(self, db_path, tmp_path):
+        exporter = make_exporter(db_path, tmp_path, shard_bytes=8 * 1024)
+        shards = exporter.export()
+
+        assert len(shards) > 1
+        assert {s["kind"] for s in shards} == {"full"}
+        records = read_records(exporter.out_dir, shards)
+        assert [r["id"] for r in records] == list(range(1, 51))
+        assert records[0]["newspaper"] == "prothomalo"
+        assert records[0]["language"] == "en" and records[1]["language"] == "bn"
+        assert len(records[0]["content"]) == 800
+
+        manifest = exporter.manifest()
+        assert manifest["rows"] == 50
+        assert manifest["last_id"] == 50
+        assert [s["rows"] for s in manifest["shards"]] == [s["max_id"] - s["min_id"] + 1 for s in shards]
+        assert exporter.verify() == []
+
+    def test_delta_export_has_only_new_articles(self, db_path, tmp_path):
+        exporter = make_exporter(db_path, tmp_path)
+        exporter.export()
+        add_articles(db_path, 5)
+
+        delta = make_exporter(db_path, tmp_path).export()
+        assert [s["kind"] for s in delta] == ["delta"]
+        assert [r["id"] for r in read_records(str(tmp_path / "export"), delta)] == [51, 52, 53, 54, 55]
+        assert make_exporter(db_path, tmp_path).export() == []
+
+        manifest = exporter.manifest()
+        assert manifest["rows"] == 55
+        assert [s["kind"] for s in manifest["shards"]] == ["full", "delta"]
+
+    def test_limit_caps_run_and_next_run_continues(self, db_path, tmp_path):
+        exporter = make_exporter(db_path, tmp_path)
+        assert sum(s["rows"] for s in exporter.export(limit=20)) == 20
+        assert sum(s["rows"] for s in exporter.export()) == 30
+        assert exporter.manifest()["last_id"] == 50
+
+    def test_full_export_replaces_old_shards(self, db_path, tmp_path):
+        exporter = make_exporter(db_path, tmp_path)
+        first = exporter.export()
+        add_articles(db_path, 3)
+        exporter.export()
+
+        shards = exporter.export(full=True)
+        assert [s["kind"] for s in exporter.manifest()["shards"]] == ["full"]
+        assert sorted(os.listdir(exporter.data_dir)) == [os.path.basename(s["path"]) for s in shards]
+        assert not os.path.exists(os.path.join(exporter.out_dir, first[0]["path"]))
+
+    def test_verify_and_stray_cleanup(self, db_path, tmp_path):
+        exporter = make_exporter(db_path, tmp_path)
+        shards = exporter.export()
+        stray = os.path.join(exporter.data_dir, "delta-interrupted-00000.jsonl.gz.tmp")
+        open(stray, "wb").close()
+
+        with open(os.path.join(exporter.out_dir, shards[0]["path"]), "ab") as f:
+            f.write(b"x")
+        assert exporter.verify() == [shards[0]["path"]]
+
+        add_articles(db_path, 1)
+        exporter.export()
+        assert not os.path.exists(stray)
+
+    def test_parquet_shards(self, db_path, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        exporter = make_exporter(db_path, tmp_path, fmt="parquet")
+        shards = exporter.export()
+        table = pq.read_table(os.path.join(exporter.out_dir, shards[0]["path"]))
+        assert table.num_rows == 50
+        assert table.column("id").to_pylist() == list(range(1, 51))
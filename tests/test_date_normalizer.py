@@ -0,0 +1,95 @@
+"""
+Date Normalizer Tests
+=====================
+Tests for the shared shape-dispatching date parser.
+"""
+
+from datetime import datetime, timedelta
+
+from BDNewsPaper.config import DHAKA_TZ
+from types import SimpleNamespace
+
+from BDNewsPaper.date_normalizer import DateNormalizer, date_shape, get_normalizer
+from BDNewsPaper.items import normalize_date
+from BDNewsPaper.pipelines import DateFilterPipeline
+
+
+class TestDateShape:
+    """Tests for date string fingerprints."""
+
+    def test_month_names_share_shape(self):
+        assert date_shape("December 26, 2024") == date_shape("May 01, 2025") == "a 00, 0000"
+
+    def test_separators_kept(self):
+        assert date_shape("26/12/2024") == "00/00/0000"
+        assert date_shape("26-12-2024") == "00-00-0000"
+
+
+class TestDateNormalizer:
+    """Tests for DateNormalizer."""
+
+    def test_iso_fast_path(self):
+        normalizer = DateNormalizer()
+        dt = normalizer.parse("2026-03-17T10:30:00+06:00")
+        assert dt.utcoffset() == timedelta(hours=6)
+        assert normalizer.parse("2024-12-26") == datetime(2024, 12, 26)
+        assert normalizer.stats['iso'] == 2
+
+    def test_learned_shape_dispatches_directly(self):
+        normalizer = DateNormalizer()
+        assert normalizer.parse("Thursday, 25 December, 2025 at 10:12 PM") == datetime(2025, 12, 25, 22, 12)
+        assert normalizer.parse("Friday, 26 December, 2025 at 09:05 AM") == datetime(2025, 12, 26, 9, 5)
+        assert normalizer.stats['learned'] == 1
+        assert normalizer.stats['shape_hits'] == 1
+
+    def test_remembers_month_first_site(self):
+        normalizer = DateNormalizer()
+        assert normalizer.parse("12/26/2024") == datetime(2024, 12, 26)
+        # Ambiguous afterwards: the site's month-first convention wins
+        assert normalizer.parse("05/06/2024") == datetime(2024, 5, 6)
+        assert DateNormalizer().parse("05/06/2024") == datetime(2024, 6, 5)
+
+    def test_one_miss_does_not_flip_learned_format(self):
+        normalizer = DateNormalizer()
+        for value in ("12/26/2024", "11/20/2024", "10/15/2024"):
+            normalizer.parse(value)
+        assert normalizer.parse("13/06/2024") == datetime(2024, 6, 13)  # Stray day-first date
+        assert normalizer.parse("05/06/2024") == datetime(2024, 5, 6)
+        assert normalizer.stats['relearned'] == 0
+
+    def test_relearns_once_another_format_wins_more(self):
+        normalizer = DateNormalizer()
+        normalizer.parse("05/06/2024")  # Read day-first: June 5
+        normalizer.parse("12/26/2024")
+        normalizer.parse("11/20/2024")
+        assert normalizer.parse("05/06/2024") == datetime(2024, 5, 6)
+        assert normalizer.stats['relearned'] == 1
+
+    def test_relative_time(self):
+        normalizer = DateNormalizer()
+        dt = normalizer.parse("3 hours ago")
+        assert abs(datetime.now(DHAKA_TZ) - timedelta(hours=3) - dt) < timedelta(seconds=5)
+
+    def test_rfc822(self):
+        dt = DateNormalizer().parse("Mon, 17 Mar 2026 10:30:00 +0600")
+        assert dt.utcoffset() == timedelta(hours=6)
+
+    def test_parse_localized_and_failure(self):
+        normalizer = DateNormalizer()
+        assert normalizer.parse_localized("26 Dec 2024").utcoffset() == timedelta(hours=6)
+        assert normalizer.parse("not a date") is None
+        assert normalizer.stats['failed'] == 1
+
+
+class TestPerSpiderNormalizers:
+    """Dates learned on one site are not applied to another."""
+
+    def test_items_and_pipelines_use_the_spiders_normalizer(self):
+        month_first = SimpleNamespace(name="test_month_first_site")
+        day_first = SimpleNamespace(name="test_day_first_site")
+        get_normalizer(month_first.name).parse("12/26/2024")
+
+        assert normalize_date("05/06/2024", {"spider": month_first}).startswith("2024-05-06")
+        assert normalize_date("05/06/2024", {"spider": day_first}).startswith("2024-06-05")
+        pipeline = DateFilterPipeline(enabled=True)
+        assert pipeline._parse_date("05/06/2024", day_first).date() == datetime(2024, 6, 5).date()
@@ -0,0 +1,194 @@
+"""
+Database Backup Tests
+=====================
+Tests for online, chunked, incremental SQLite backups to a local target.
+"""
+
+import io
+import os
+import sqlite3
+import threading
+import zlib
+
+import pytest
+
+from BDNewsPaper.db_backup import BackupEngine, LocalTarget, chunk_key, chunk_pages, snapshot
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "news_articles.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, url TEXT UNIQUE, article TEXT)")
+    add_articles(conn, 0, 2000)
+    conn.close()
+    return path
+
+
+def add_articles(conn, start, count):
+    conn.executemany(
+        "INSERT INTO articles (id, url, article) VALUES (?, ?, ?)",
+        [(i, f"https://example.com/{i}", os.urandom(300).hex()) for i in range(start, start + count)],
+    )
+    conn.commit()
+
+
+def make_engine(tmp_path, **kwargs):
+    kwargs.setdefault("avg_chunk_bytes", 64 * 1024)
+    return BackupEngine(LocalTarget(str(tmp_path / "backups")), **kwargs)
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    result = conn.execute("SELECT id, url, article FROM articles ORDER BY id").fetchall()
+    conn.close()
+    return result
+
+
+class TestChunking:
+    """Tests for page-aligned content-defined chunking."""
+
+    def test_chunks_are_page_aligned_and_cover_file(self):
+        data = os.urandom(4096 * 300)
+        chunks = list(chunk_pages(io.BytesIO(data), 4096, avg_bytes=32 * 4096))
+        assert b"".join(chunks) == data
+        assert all(len(chunk) % 4096 == 0 for chunk in chunks)
+        assert max(len(chunk) for chunk in chunks) <= 4 * 32 * 4096
+        assert len(chunks) > 1
+
+    def test_local_change_keeps_other_chunks(self):
+        pages = [os.urandom(4096) for _ in range(400)]
+        before = list(chunk_pages(io.BytesIO(b"".join(pages)), 4096, avg_bytes=16 * 4096))
+        pages[200] = os.urandom(4096)
+        after = list(chunk_pages(io.BytesIO(b"".join(pages)), 4096, avg_bytes=16 * 4096))
+        assert len(set(after) - set(before)) <= 3
+
+
+class TestBackupEngine:
+    """Tests for BackupEngine."""
+
+    def test_backup_and_restore_roundtrip(self, db_path, tmp_path):
+        engine = make_engine(tmp_path)
+        name = engine.backup(db_path)
+        assert name.startswith("news_articles_")
+
+        restored = str(tmp_path / "restored.db")
+        manifest = engine.restore(restored)
+        assert manifest["name"] == name
+        assert rows(restored) == rows(db_path)
+        conn = sqlite3.connect(restored)
+        assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        conn.close()
+
+    def test_second_backup_uploads_only_changed_chunks(self, db_path, tmp_path):
+        engine = make_engine(tmp_path)
+        engine.backup(db_path)
+        first_chunks = engine.stats["chunks"]
+
+        conn = sqlite3.connect(db_path)
+        add_articles(conn, 2000, 20)
+        conn.close()
+
+        engine = make_engine(tmp_path)
+        name = engine.backup(db_path)
+        assert 0 < engine.stats["new_chunks"] < first_chunks / 2
+        restored = str(tmp_path / "restored.db")
+        engine.restore(restored, name)
+        assert len(rows(restored)) == 2020
+
+    def test_snapshot_is_consistent_under_concurrent_writes(self, db_path, tmp_path):
+        writer = sqlite3.connect(db_path, check_same_thread=False)
+        stop = threading.Event()
+
+        def write():
+            i = 10000
+            while not stop.is_set():
+                writer.execute("INSERT INTO articles (id, url, article) VALUES (?, ?, 'x')",
+                               (i, f"https://example.com/{i}"))
+                writer.commit()
+                i += 1
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        try:
+            dest = str(tmp_path / "snap.db")
+            snapshot(db_path, dest, step_pages=8)
+        finally:
+            stop.set()
+            thread.join()
+            writer.close()
+
+        conn = sqlite3.connect(dest)
+        assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert conn.execute("SELECT COUNT(*) FROM articles WHERE id < 2000").fetchone() == (2000,)
+        conn.close()
+
+    def test_corrupt_chunk_fails_restore_and_keeps_destination(self, db_path, tmp_path):
+        engine = make_engine(tmp_path)
+        name = engine.backup(db_path)
+        digest = engine.manifest(name)["chunks"][0][0]
+        engine.target.put(chunk_key(digest), zlib.compress(b"garbage"))
+
+        restored = tmp_path / "restored.db"
+        restored.write_bytes(b"previous")
+        with pytest.raises(ValueError):
+            engine.restore(str(restored))
+        assert restored.read_bytes() == b"previous"
+        assert not os.path.exists(f"{restored}.restore-tmp")
+
+    def test_prune_drops_unreferenced_chunks(self, db_path, tmp_path):
+        engine = make_engine(tmp_path)
+        first = engine.backup(db_path, name="b1")
+        conn = sqlite3.connect(db_path)
+        add_articles(conn, 2000, 500)
+        conn.close()
+        engine.backup(db_path, name="b2")
+
+        assert engine.prune(keep=1) == 1
+        assert engine.names() == ["b2"]
+        live = {chunk_key(digest) for digest, _ in engine.manifest("b2")["chunks"]}
+        assert set(engine.target.list("chunks/")) == live
+        with pytest.raises(FileNotFoundError):
+            engine.manifest(first)
+        engine.restore(str(tmp_path / "restored.db"))
+        assert len(rows(str(tmp_path / "restored.db"))) == 2500
+
+    def test_latest_is_newest_not_last_by_name(self, db_path, tmp_path):
+        engine = make_engine(tmp_path)
+        engine.backup(db_path, name="zeta")
+        conn = sqlite3.connect(db_path)
+        add_articles(conn, 2000, 100)
+        conn.close()
+        engine.backup(db_path, name="alpha")
+
+        assert engine.names() == ["zeta", "alpha"]
+        assert engine.restore(str(tmp_path / "restored.db"))["name"] == "alpha"
+        assert len(rows(str(tmp_path / "restored.db"))) == 2100
+        assert engine.prune(keep=1) == 1
+        assert engine.names() == ["alpha"]
+
+    def test_databases_sharing_a_target(self, db_path, tmp_path):
+        other = str(tmp_path / "archive.db")
+        conn = sqlite3.connect(other)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, url TEXT UNIQUE, article TEXT)")
+        add_articles(conn, 0, 10)
+        conn.close()
+        engine = make_engine(tmp_path)
+        engine.backup(db_path, name="news-1")
+        engine.backup(other, name="archive-1")
+        engine.backup(db_path, name="news-2")
+        engine.backup(other, name="archive-2")
+
+        assert engine.names(source=other) == ["archive-1", "archive-2"]
+        with pytest.raises(ValueError):
+            engine.restore(str(tmp_path / "restored.db"))
+        engine.restore(str(tmp_path / "restored.db"), source=other)
+        assert len(rows(str(tmp_path / "restored.db"))) == 10
+
+        # Each database keeps its own newest backups
+        assert engine.prune(keep=1) == 2
+        assert sorted(engine.names()) == ["archive-2", "news-2"]
+        engine.restore(str(tmp_path / "restored.db"), source=db_path)
+        assert len(rows(str(tmp_path / "restored.db"))) == 2000
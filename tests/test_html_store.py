@@ -0,0 +1,58 @@
+"""
+HTML Store Tests
+================
+Tests for the bounded, spill-to-disk side-channel HTML store.
+"""
+
+import os
+
+import pytest
+
+from BDNewsPaper.html_store import HtmlStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HtmlStore(max_memory_bytes=4096, max_disk_bytes=1024 * 1024, spill_dir=str(tmp_path))
+    yield store
+    store.close()
+
+
+def page(n: int) -> str:
+    # Incompressible-ish content so the memory budget is exercised
+    return "<html>" + "".join(f"<p>{i * 7919 % 104729}</p>" for i in range(n, n + 400)) + "</html>"
+
+
+class TestHtmlStore:
+    """Tests for HtmlStore."""
+
+    def test_put_get_roundtrip(self, store):
+        html = "<html><body>বাংলা সংবাদ</body></html>"
+        handle = store.put("https://example.com/a", html)
+        assert handle == "https://example.com/a"
+        assert store.get(handle) == html
+
+    def test_memory_overflow_spills_to_disk(self, store, tmp_path):
+        handles = [store.put(f"https://example.com/{i}", page(i)) for i in range(10)]
+        assert store.memory_bytes <= store.max_memory_bytes
+        assert store.stats['spilled'] > 0
+        assert os.listdir(tmp_path)
+        # Spilled entries are still readable
+        assert store.get(handles[0]) == page(0)
+
+    def test_release_removes_memory_and_disk_entries(self, store, tmp_path):
+        handles = [store.put(f"https://example.com/{i}", page(i)) for i in range(10)]
+        for handle in handles:
+            store.release(handle)
+        assert len(store) == 0
+        assert store.memory_bytes == 0
+        assert store.disk_bytes == 0
+        assert not os.listdir(tmp_path)
+
+    def test_disk_tier_is_bounded(self, tmp_path):
+        store = HtmlStore(max_memory_bytes=0, max_disk_bytes=3000, spill_dir=str(tmp_path))
+        for i in range(20):
+            store.put(f"https://example.com/{i}", page(i))
+        assert store.disk_bytes <= 3000
+        assert store.stats['evicted'] > 0
+        assert store.get("https://example.com/0") is None
@@ -187,6 +187,11 @@ class TestNewsArticleItemMetadata:
         item['article_body'] = "এটি একটি বাংলা নিবন্ধ"
         assert item['source_language'] == "Bengali"
 
+    def test_source_language_uses_majority_script(self):
+        item = NewsArticleItem()
+        item['article_body'] = "The Prime Minister spoke at the ceremony, saying \"জয় বাংলা\" to the crowd"
+        assert item['source_language'] == "English"
+
     def test_scraped_at_auto_generated(self):
         item = NewsArticleItem()
         item['article_body'] = "some content here"
@@ -338,3 +343,27 @@ class TestFallbackExtractionPipeline:
         assert result is item
         assert pipeline.stats['fallback_failed'] == 1
         mock_spider.logger.warning.assert_called_once()
+
+    def test_fallback_reads_html_from_store_handle(self, mock_spider):
+        from BDNewsPaper.html_store import get_html_store
+
+        pipeline = FallbackExtractionPipeline(enabled=True, min_body_length=50)
+        url = "https://example.com/handle"
+        handle = get_html_store().put(url, "<html><body>Stored page</body></html>")
+
+        mock_extractor = MagicMock()
+        mock_extractor.extract.return_value.is_valid.return_value = False
+
+        item = self._make_item(
+            headline="H", article_body="short", url=url, paper_name="P",
+            _html_handle=handle,
+        )
+        with patch.object(pipeline, '_get_extractor', return_value=mock_extractor):
+            pipeline.process_item(item, mock_spider)
+
+        mock_extractor.extract.assert_called_once_with(
+            "<html><body>Stored page</body></html>", url
+        )
+
+        pipeline.release_html(item, spider=mock_spider)
+        assert handle not in get_html_store()
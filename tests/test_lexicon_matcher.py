@@ -0,0 +1,82 @@
+"""
+Lexicon Matcher Tests
+=====================
+Tests for the word-level Aho-Corasick matcher and its disk cache.
+"""
+
+import json
+
+import pytest
+
+from BDNewsPaper import lexicon_matcher
+from BDNewsPaper.lexicon_matcher import LexiconMatcher, lexicon_key, load_matcher
+from BDNewsPaper.lexicons import LOCATION_ALIASES
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo(monkeypatch):
+    monkeypatch.setattr(lexicon_matcher, "_matchers", {})
+
+
+class TestLexiconMatcher:
+    """Tests for LexiconMatcher."""
+
+    def test_aliases_map_to_canonical_ids(self):
+        matcher = LexiconMatcher.build(LOCATION_ALIASES)
+        text = "Chittagong port reopens; Chattogram traders and চট্টগ্রাম buyers react"
+        assert matcher.counts(text) == {"chattogram": 3}
+
+    def test_bengali_case_endings_and_possessives(self):
+        matcher = LexiconMatcher.build(LOCATION_ALIASES)
+        text = "ঢাকায় বৃষ্টি, ঢাকার রাস্তা আর সিলেটে বন্যা. Dhaka's roads, Dhaka’s traffic"
+        assert matcher.counts(text) == {"dhaka": 4, "sylhet": 1}
+
+    def test_word_boundaries(self):
+        matcher = LexiconMatcher.build({"dhaka": ["dhaka"], "feni": ["feni"]})
+        assert matcher.findall("Dhakaiya food in Fenidom") == []
+
+    def test_multi_word_and_overlapping_aliases(self):
+        matcher = LexiconMatcher.build({
+            "phrase": ["law and order", "and order now"],
+            "order": ["order"],
+            "growth": ["growth"],
+            "positive": ["growth"],
+        })
+        assert matcher.findall("Law and order now, growth") == [
+            "phrase", "order", "phrase", "growth", "positive",
+        ]
+        # A partial phrase falls back to its suffixes
+        assert matcher.findall("law and and order") == ["order"]
+
+    def test_distinct_keeps_first_mention_order(self):
+        matcher = LexiconMatcher.build(LOCATION_ALIASES)
+        assert matcher.distinct("Sylhet, then Khulna, then Sylhet") == ["sylhet", "khulna"]
+        assert matcher.distinct("") == []
+
+
+class TestLoadMatcher:
+    """Tests for load_matcher caching."""
+
+    def test_round_trips_through_disk_cache(self, tmp_path, monkeypatch):
+        terms = {"dhaka": ["dhaka", "ঢাকা"], "cox's bazar": ["cox's bazar"]}
+        built = load_matcher(terms, cache_dir=tmp_path)
+        (path,) = tmp_path.glob("lexicon-*.json")
+        assert lexicon_key(terms) in path.name
+
+        monkeypatch.setattr(lexicon_matcher, "_matchers", {})
+        monkeypatch.setattr(LexiconMatcher, "build", classmethod(lambda cls, terms: pytest.fail("rebuilt")))
+        loaded = load_matcher(terms, cache_dir=tmp_path)
+
+        text = "Cox's Bazar and ঢাকায়"
+        assert loaded is not built
+        assert loaded.findall(text) == built.findall(text) == ["cox's bazar", "dhaka"]
+
+    def test_corrupt_cache_is_rebuilt(self, tmp_path):
+        terms = {"dhaka": ["dhaka"]}
+        (tmp_path / f"lexicon-{lexicon_key(terms)}.json").write_text("{not json")
+        assert load_matcher(terms, cache_dir=tmp_path).findall("Dhaka") == ["dhaka"]
+        assert json.loads((tmp_path / f"lexicon-{lexicon_key(terms)}.json").read_text())["ids"] == ["dhaka"]
+
+    def test_key_changes_with_lexicon(self):
+        assert lexicon_key({"a": ["x", "y"]}) == lexicon_key({"a": ["y", "x"]})
+        assert lexicon_key({"a": ["x"]}) != lexicon_key({"a": ["x", "y"]})
@@ -0,0 +1,82 @@
+"""
+Link Discovery Tests
+====================
+Tests for compiled, per-domain article link scoring.
+"""
+
+from scrapy.http import HtmlResponse
+
+from BDNewsPaper.link_discovery import (
+    ArticleLinkDiscovery,
+    discover_article_links,
+    get_link_discovery,
+    score_url_as_article,
+)
+
+LISTING = """
+<html><body>
+  <nav><a href="/">Home</a><a href="/category/politics">Politics</a><a href="/tag/dhaka">Dhaka</a></nav>
+  <a href="/politics/news/123456"><span>Election Commission announces</span> <b>polling schedule</b></a>
+  <a href="https://www.example.com/2024/12/27/metro-rail-extends-service-hours">Metro rail extends service hours tonight</a>
+  <a href="/politics/news/123456">duplicate</a>
+  <a href="../sports/cricket-team-wins-series-again">বাংলাদেশ দল সিরিজ জিতেছে আবারও দারুণভাবে</a>
+  <a href="/media/photo.jpg">Photo</a>
+  <a href="javascript:void(0)">Open menu for more sections</a>
+  <a href="mailto:news@example.com">Email the newsroom with a tip today</a>
+</body></html>
+"""
+
+
+def listing(url="https://www.example.com/politics/"):
+    return HtmlResponse(url=url, body=LISTING.encode("utf-8"), encoding="utf-8")
+
+
+class TestArticleLinkDiscovery:
+    """Tests for ArticleLinkDiscovery and the module helpers."""
+
+    def test_discovers_articles_and_skips_navigation(self):
+        links = ArticleLinkDiscovery().discover_links(listing())
+        urls = [link["url"] for link in links]
+        assert sorted(urls) == [
+            "https://www.example.com/2024/12/27/metro-rail-extends-service-hours",
+            "https://www.example.com/politics/news/123456",
+            "https://www.example.com/sports/cricket-team-wins-series-again",
+        ]
+        by_url = {link["url"]: link for link in links}
+        article = by_url["https://www.example.com/politics/news/123456"]
+        assert article["text"] == "Election Commission announces polling schedule"
+        assert article["reasons"] == ["same_domain", "article_pattern", "long_path", "numeric_id", "headline_text"]
+        assert article["score"] == 7
+
+    def test_exclusions(self):
+        discovery = ArticleLinkDiscovery()
+        links = discovery._score_links([
+            {"url": "https://www.example.com/tag/dhaka-city-news", "text": ""},
+            {"url": "https://www.example.com/2024/report-on-floods.docx", "text": ""},
+            {"url": "javascript:void(0)", "text": "Open menu for more sections"},
+        ], "https://www.example.com/")
+        assert [link["reasons"] for link in links] == [
+            ["excluded_pattern"], ["excluded_extension"], ["excluded_pattern"],
+        ]
+        assert not any(link["is_article"] for link in links)
+
+    def test_score_url_as_article(self):
+        assert score_url_as_article("https://www.example.com/news/2024/12/27/budget-passed-in-parliament") >= 6
+        assert score_url_as_article("https://www.example.com/") == 0
+        assert score_url_as_article("https://www.example.com/about-us-and-team") == 0
+
+    def test_discoverers_are_shared_per_domain(self):
+        assert get_link_discovery("www.example.com") is get_link_discovery("www.example.com")
+        assert get_link_discovery("www.example.com") is not get_link_discovery("www.example.org")
+
+        discover_article_links(listing())
+        cache = get_link_discovery("www.example.com")._path_cache
+        assert "/politics/news/123456" in cache
+
+    def test_subclass_patterns_compile_separately(self):
+        class StrictDiscovery(ArticleLinkDiscovery):
+            EXCLUDE_PATTERNS = ArticleLinkDiscovery.EXCLUDE_PATTERNS + [r'^/sports/']
+
+        links = StrictDiscovery().discover_links(listing())
+        assert "https://www.example.com/sports/cricket-team-wins-series-again" not in [l["url"] for l in links]
+        assert len(ArticleLinkDiscovery().discover_links(listing())) == 3
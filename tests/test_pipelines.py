@@ -172,6 +172,38 @@ class TestLanguageDetectionPipeline:
         
         result = pipeline.process_item(valid_article_item, mock_spider)
         assert result is not None
+    
+    def test_script_guess_skips_model(self, pipeline, mock_spider, valid_article_item):
+        """Test that single-script articles never reach langdetect."""
+        with patch.object(pipeline._identifier, 'identify_many') as identify_many:
+            result = pipeline.process_item(valid_article_item, mock_spider)
+        
+        identify_many.assert_not_called()
+        assert result['detected_language'] == 'en'
+        assert pipeline.stats['script'] == 1
+    
+    def test_mixed_script_items_batched(self, mock_spider):
+        """Test that mixed-script articles are identified together in one batch."""
+        pipeline = LanguageDetectionPipeline(batch_size=2)
+        if not pipeline._langdetect_available:
+            pytest.skip("langdetect not installed")
+        
+        results = []
+        for i in range(2):
+            item = NewsArticleItem(
+                headline="Budget 2025 বাজেট",
+                article_body="The finance minister বাজেট ঘোষণা করেছেন today in Dhaka সংসদে " * 5,
+                url=f"https://example.com/mixed-{i}",
+                paper_name="Test",
+            )
+            d = pipeline.process_item(item, mock_spider)
+            d.addCallback(results.append)
+            if i == 0:
+                assert results == []
+        
+        assert len(results) == 2
+        assert all(r['detected_language'] in ('bn', 'en') for r in results)
+        assert pipeline.stats['model'] == 2
 
 
 class TestContentQualityPipeline:
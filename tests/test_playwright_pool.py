@@ -0,0 +1,129 @@
+"""
+Playwright Page Pool Tests
+==========================
+Tests for resource blocking and the per-domain warm page pool.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from scrapy.http import Request
+
+from BDNewsPaper.playwright_pool import PagePool, PagePoolMiddleware, should_abort_request
+
+
+class FakeContext:
+    """Minimal stand-in for a Playwright BrowserContext."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    """Minimal stand-in for a Playwright Page."""
+
+    def __init__(self, context=None):
+        self.closed = False
+        self.context = context
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def route(self, pattern, handler):
+        pass
+
+
+def make_request(url, resource_type="document"):
+    return SimpleNamespace(url=url, resource_type=resource_type)
+
+
+class TestShouldAbortRequest:
+    """Tests for should_abort_request."""
+
+    @pytest.mark.parametrize("resource_type", ["image", "media", "font"])
+    def test_blocks_heavy_resource_types(self, resource_type):
+        request = make_request("https://www.kalerkantho.com/x.jpg", resource_type)
+        assert should_abort_request(request)
+
+    def test_allows_document_and_scripts(self):
+        assert not should_abort_request(make_request("https://www.kalerkantho.com/online"))
+        assert not should_abort_request(
+            make_request("https://www.kalerkantho.com/app.js", "script")
+        )
+
+    def test_blocks_ad_host_subdomains(self):
+        request = make_request(
+            "https://securepubads.g.doubleclick.net/tag/js/gpt.js", "script"
+        )
+        assert should_abort_request(request)
+
+    def test_suffix_match_respects_label_boundary(self):
+        request = make_request("https://notdoubleclick.net/app.js", "script")
+        assert not should_abort_request(request)
+
+
+class TestPagePool:
+    """Tests for PagePool."""
+
+    def test_context_is_per_domain(self):
+        pool = PagePool()
+        assert pool.context_name("https://www.daily-sun.com/a") == "pool:daily-sun.com"
+        assert pool.context_name("https://daily-sun.com/b") == "pool:daily-sun.com"
+
+    def test_release_then_acquire_reuses_page(self):
+        pool = PagePool(max_pages_per_domain=2)
+        page = FakePage()
+        assert pool.acquire("https://example.com/1") is None
+        assert pool.release("https://example.com/1", page)
+        assert pool.acquire("https://example.com/2") is page
+        assert pool.stats["pages_reused"] == 1
+
+    def test_pool_is_bounded(self):
+        pool = PagePool(max_pages_per_domain=1)
+        assert pool.release("https://example.com/1", FakePage())
+        assert not pool.release("https://example.com/2", FakePage())
+        assert pool.idle_count("https://example.com/") == 1
+
+    def test_closed_pages_are_skipped(self):
+        pool = PagePool(max_pages_per_domain=2)
+        page = FakePage()
+        pool.release("https://example.com/1", page)
+        page.closed = True
+        assert pool.acquire("https://example.com/2") is None
+
+    def test_close_all_closes_pages_and_contexts(self):
+        pool = PagePool()
+        context = FakeContext()
+        page = FakePage(context)
+        asyncio.run(pool.init_page(page, None))
+        pool.release("https://example.com/1", page)
+        asyncio.run(pool.close_all())
+        assert page.closed and context.closed
+        assert pool.idle_count() == 0
+
+
+class TestPagePoolMiddleware:
+    """Tests for PagePoolMiddleware."""
+
+    def test_page_taken_at_download_time(self):
+        pool = PagePool()
+        spider = SimpleNamespace(_get_page_pool=lambda: pool)
+        url = "https://example.com/1"
+        request = Request(url, meta={"playwright": True, "playwright_pool_url": url})
+        middleware = PagePoolMiddleware()
+
+        middleware.process_request(request, spider)
+        assert "playwright_page" not in request.meta  # No idle page yet
+
+        page = FakePage()
+        pool.release(url, page)
+        middleware.process_request(request, spider)
+        assert request.meta["playwright_page"] is page
+        assert pool.idle_count() == 0
@@ -0,0 +1,105 @@
+"""
+Component Profiler Tests
+========================
+Tests for the sampled per-middleware and per-pipeline timing extension.
+"""
+
+import asyncio
+
+import pytest
+from scrapy import Spider
+from scrapy.core.downloader.middleware import DownloaderMiddlewareManager
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from BDNewsPaper.profiling import DOWNLOADER_METHODS, ComponentProfiler
+
+
+class ProfiledSpider(Spider):
+    name = "profiled"
+
+
+class TaggingMiddleware:
+    def process_request(self, request, spider):
+        request.meta["spider"] = spider.name
+
+    def process_response(self, request, response, spider):
+        request.meta.setdefault("seen", []).append(len(response.body))
+        return response
+
+
+class PacedMiddleware:
+    async def process_request(self, request):
+        await asyncio.sleep(0)
+
+
+async def download(request):
+    return HtmlResponse(request.url, body=b"<html></html>", request=request)
+
+
+@pytest.fixture
+def crawler():
+    crawler = get_crawler(ProfiledSpider, {"PROFILE_COMPONENTS": True})
+    crawler.spider = ProfiledSpider.from_crawler(crawler)
+    return crawler
+
+
+def profiled_chain(crawler, sample_rate=1.0):
+    manager = DownloaderMiddlewareManager(TaggingMiddleware(), PacedMiddleware(), crawler=crawler)
+    profiler = ComponentProfiler(crawler, sample_rate=sample_rate)
+    profiler.instrument(manager, "downloader", DOWNLOADER_METHODS)
+    return manager, profiler
+
+
+def run(manager, count):
+    async def crawl():
+        requests = [Request(f"https://example.com/{i}") for i in range(count)]
+        for request in requests:
+            await manager.download_async(download, request)
+        return requests
+    return asyncio.run(crawl())
+
+
+class TestComponentProfiler:
+    """Tests for ComponentProfiler."""
+
+    def test_disabled_by_default(self):
+        with pytest.raises(NotConfigured):
+            ComponentProfiler.from_crawler(get_crawler(ProfiledSpider))
+
+    def test_wraps_chain_and_keeps_spider_argument(self, crawler):
+        manager, profiler = profiled_chain(crawler)
+        requests = run(manager, 5)
+        assert all(r.meta["spider"] == "profiled" and r.meta["seen"] == [13] for r in requests)
+
+        records = {(r.component, r.method): r for r in profiler.records}
+        assert set(records) == {
+            ("TaggingMiddleware", "process_request"), ("TaggingMiddleware", "process_response"),
+            ("PacedMiddleware", "process_request"),
+        }
+        tagging = records[("TaggingMiddleware", "process_request")]
+        assert tagging.calls == tagging.wall.count == tagging.cpu_samples == 5
+        paced = records[("PacedMiddleware", "process_request")]
+        assert paced.wall.count == 5 and paced.cpu_samples == 0
+
+    def test_samples_one_call_in_every(self, crawler):
+        manager, profiler = profiled_chain(crawler, sample_rate=0.1)
+        run(manager, 40)
+        assert profiler.every == 10
+        assert all(r.calls == 40 and r.wall.count == 4 for r in profiler.records)
+
+    def test_report_stats_and_flamegraph_output(self, crawler, tmp_path):
+        manager, profiler = profiled_chain(crawler)
+        profiler.output_dir = str(tmp_path)
+        run(manager, 3)
+        profiler.spider_closed(crawler.spider, "finished")
+
+        stats = crawler.stats
+        assert stats.get_value("profile/downloader/TaggingMiddleware.process_request/calls") == 3
+        assert stats.get_value("profile/downloader/PacedMiddleware.process_request/wall_p95_us") >= 0
+        report = (tmp_path / "profiled-components.txt").read_text()
+        assert "TaggingMiddleware.process_response" in report
+        for line in (tmp_path / "profiled-components.folded").read_text().splitlines():
+            stack, micros = line.rsplit(" ", 1)
+            assert stack.startswith("profiled;downloader;process_") and int(micros) > 0
@@ -0,0 +1,190 @@
+"""
+Proxy Pool Tests
+================
+Tests for latency-weighted proxy selection, cool-downs and health probes.
+"""
+
+import asyncio
+import random
+
+from scrapy import Spider
+from scrapy.http import Request, Response
+from scrapy.utils.test import get_crawler
+from twisted.internet.task import Clock
+
+from BDNewsPaper.proxy import POOLED_META_KEY, ProxyMiddleware
+from BDNewsPaper.proxy_pool import ProxyPool, probe_proxy, proxy_label
+
+PROXIES = [f"http://10.0.0.{i}:3128" for i in range(1, 9)]
+SOCKS = "socks5://10.0.0.100:1080"
+
+
+class ProxySpider(Spider):
+    name = "proxied"
+
+
+async def fake_proxy(delay, status=200):
+    """A local proxy that answers every request with `status` after `delay` seconds."""
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(delay)
+        writer.write(f"HTTP/1.1 {status} OK\r\nContent-Length: 2\r\n\r\n{{}}".encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def make_pool(**kwargs):
+    clock = Clock()
+    return ProxyPool(PROXIES, clock=clock, rng=random.Random(7), **kwargs), clock
+
+
+class TestProxyPool:
+    """Tests for ProxyPool."""
+
+    def test_prefers_fast_proxies_without_herding(self):
+        pool, _ = make_pool()
+        latency = {proxy: 0.1 * (i + 1) for i, proxy in enumerate(PROXIES)}
+        picks = {proxy: 0 for proxy in PROXIES}
+        for _ in range(4000):
+            proxy = pool.select()
+            pool.acquire(proxy)
+            pool.release(proxy, latency=latency[proxy])
+            picks[proxy] += 1
+        fastest, slowest = PROXIES[0], PROXIES[-1]
+        assert picks[fastest] > 3 * picks[slowest]
+        assert picks[fastest] < 4000 / 2  # still spread over several proxies
+        assert all(picks[proxy] for proxy in PROXIES)  # each tried at least once
+
+    def test_in_flight_requests_count_against_a_proxy(self):
+        pool = ProxyPool(PROXIES[:2], rng=random.Random(1))
+        fast, slow = PROXIES[:2]
+        pool.release(fast, latency=0.1, in_flight=False)
+        pool.release(slow, latency=0.3, in_flight=False)
+        assert pool.select() == fast
+        for _ in range(3):
+            pool.acquire(fast)
+        assert pool.select() == slow
+
+    def test_cool_down_and_probation(self):
+        pool, clock = make_pool(failure_threshold=2, cooldown=10, max_cooldown=15)
+        bad = PROXIES[0]
+        for _ in range(2):
+            pool.release(bad, ok=False, in_flight=False)
+        assert bad not in {state.url for state in pool.usable} and len(pool.usable) == 7
+        assert bad not in {pool.round_robin() for _ in range(50)}
+
+        clock.advance(10)
+        pool.select()
+        assert bad in {state.url for state in pool.usable}
+        # On probation: one failure sends it back, for twice as long (capped)
+        pool.release(bad, ok=False, in_flight=False)
+        assert pool.cooling[0] == (25.0, bad)
+        pool.release(bad, latency=0.2, ok=True, in_flight=False)
+        assert pool.states[bad].cooldowns == 0
+
+    def test_every_proxy_cooling_uses_first_due_back(self):
+        pool, clock = make_pool(failure_threshold=1)
+        for proxy in PROXIES:
+            clock.advance(1)
+            pool.release(proxy, ok=False, in_flight=False)
+        assert not pool.usable
+        assert pool.select() == pool.round_robin() == pool.random() == PROXIES[0]
+
+    def test_probes_fake_proxies_concurrently(self):
+        async def run():
+            fast, fast_url = await fake_proxy(0.01)
+            slow, slow_url = await fake_proxy(0.3)
+            refusing, refusing_url = await fake_proxy(0.0, status=407)
+            dead_url = "http://127.0.0.1:1"
+            pool = ProxyPool([fast_url, slow_url, refusing_url, dead_url, SOCKS], failure_threshold=1)
+            start = asyncio.get_running_loop().time()
+            results = await pool.probe("http://example.com/", timeout=2)
+            elapsed = asyncio.get_running_loop().time() - start
+            timed_out = await probe_proxy(slow_url, "http://example.com/", timeout=0.05)
+            for server in (fast, slow, refusing):
+                server.close()
+            return pool, results, elapsed, timed_out, (fast_url, slow_url, refusing_url, dead_url)
+
+        pool, results, elapsed, timed_out, (fast, slow, refusing, dead) = asyncio.run(run())
+        assert results[fast] < 0.2 <= results[slow]
+        assert results[refusing] is None and results[dead] is None and timed_out is None
+        assert elapsed < 0.6  # concurrent, not one after another
+        assert pool.states[fast].latency == results[fast]
+        # SOCKS proxies cannot be probed and are left alone, not failed
+        assert SOCKS not in results and pool.states[SOCKS].cooldowns == 0
+        assert {state.url for state in pool.usable} == {fast, slow, SOCKS}
+
+    def test_probe_rounds_leave_socks_proxies_usable(self):
+        pool = ProxyPool([SOCKS], failure_threshold=1)
+        for _ in range(5):
+            assert asyncio.run(pool.probe("http://example.com/", timeout=0.1)) == {}
+        assert [state.url for state in pool.usable] == [SOCKS] and not pool.cooling
+
+
+class TestProxyMiddleware:
+    """Tests for ProxyMiddleware on a rotating proxy list."""
+
+    def make_middleware(self, tmp_path, **settings):
+        proxy_list = tmp_path / "proxies.txt"
+        proxy_list.write_text("# pool\n" + "\n".join(p[len("http://"):] for p in PROXIES[:3]) + "\n")
+        crawler = get_crawler(ProxySpider, {
+            "PROXY_ENABLED": True, "PROXY_TYPE": "list", "PROXY_LIST": str(proxy_list),
+            "PROXY_ROTATION": "smart", "PROXY_BAN_THRESHOLD": 2, **settings,
+        })
+        middleware = ProxyMiddleware.from_crawler(crawler)
+        middleware.pool._clock = Clock()
+        return crawler, middleware
+
+    def test_latency_and_bans_feed_the_pool(self, tmp_path, mock_spider):
+        crawler, middleware = self.make_middleware(tmp_path, PROXY_PROBE_INTERVAL=0)
+        middleware.spider_opened(mock_spider)
+        assert middleware.probe_call is None
+
+        request = Request("https://www.example.com/a")
+        middleware.process_request(request, mock_spider)
+        proxy = request.meta["proxy"]
+        assert request.meta[POOLED_META_KEY] and middleware.pool.states[proxy].in_flight == 1
+        request.meta["download_latency"] = 0.4
+        middleware.process_response(request, Response(request.url), mock_spider)
+        assert middleware.pool.states[proxy].latency == 0.4
+        assert middleware.pool.states[proxy].in_flight == 0
+
+        for status in (403, 429):
+            banned = Request("https://www.example.com/b", meta={"proxy": proxy, POOLED_META_KEY: True})
+            middleware.process_response(banned, Response(banned.url, status=status), mock_spider)
+        assert proxy in {cooling for _, cooling in middleware.pool.cooling}
+
+        other = next(p for p in PROXIES if p != proxy)
+        retry = middleware.process_exception(
+            Request("https://www.example.com/c", meta={"proxy": other, POOLED_META_KEY: True}),
+            ConnectionRefusedError(), mock_spider)
+        assert "proxy" not in retry.meta and middleware.pool.states[other].failures == 1
+
+        middleware.spider_closed(mock_spider, "finished")
+        assert crawler.stats.get_value(f"proxy/{proxy_label(proxy)}/latency_s") == 0.4
+        assert crawler.stats.get_value(f"proxy/{proxy_label(proxy)}/cooldowns") == 1
+
+    def test_probe_rounds_rescheduled_until_close(self, tmp_path, mock_spider):
+        _, middleware = self.make_middleware(tmp_path, PROXY_PROBE_INTERVAL=30)
+        rounds = []
+
+        async def probe(url, timeout):
+            rounds.append(url)
+
+        middleware.pool.probe = probe
+        middleware.spider_opened(mock_spider)
+        clock = middleware.pool.clock
+        clock.advance(30)
+        assert len(rounds) == 1
+        # The next round is scheduled when this one ends, not on a fixed beat
+        assert middleware.probe_call.getTime() == 60
+        clock.advance(30)
+        assert len(rounds) == 2
+
+        middleware.spider_closed(mock_spider, "finished")
+        assert not middleware.probe_call.active()
+        clock.advance(60)
+        assert len(rounds) == 2
@@ -0,0 +1,221 @@
+"""
+Rate Control Tests
+==================
+Tests for per-domain token buckets, AIMD concurrency and circuit pauses.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from twisted.internet.task import Clock
+
+from BDNewsPaper.enums import CircuitState
+from BDNewsPaper.rate_control import RateController, parse_retry_after
+
+DOMAIN = "www.example.com"
+
+
+def make_controller(**kwargs):
+    clock = Clock()
+    return RateController(clock=clock, **kwargs), clock
+
+
+def send(controller, count):
+    """Acquire `count` requests; returns the list that got through so far."""
+    sent = []
+    for i in range(count):
+        waiting = controller.acquire(DOMAIN)
+        if waiting is None:
+            sent.append(i)
+        else:
+            waiting.addCallback(lambda _, i=i: sent.append(i))
+    return sent
+
+
+class TestRateController:
+    """Tests for RateController and DomainGate."""
+
+    def test_token_bucket_spaces_requests(self):
+        controller, clock = make_controller(burst=2, start_concurrency=10)
+        controller.gate(DOMAIN, rate=2.0)
+        sent = send(controller, 6)
+        assert sent == [0, 1]  # burst
+        clock.advance(0.5)
+        assert sent == [0, 1, 2]
+        clock.pump([0.5] * 3)
+        assert sent == [0, 1, 2, 3, 4, 5]
+        assert controller.stats(DOMAIN)["observed_rate"] == 2.5  # 6 requests in 2s
+
+    def test_stats_since_snapshot(self):
+        controller, clock = make_controller(burst=1, start_concurrency=10)
+        controller.gate(DOMAIN, rate=1.0)
+        send(controller, 4)
+        clock.pump([1.0] * 4)
+        controller.release(DOMAIN, status=503)
+        for _ in range(3):
+            controller.release(DOMAIN, latency=0.1, status=200)
+        clock.advance(60)
+        baseline = controller.snapshot()[DOMAIN]
+        first_sent = clock.seconds()
+        sent = send(controller, 3)
+        clock.pump([1.0] * 10)
+
+        stats = controller.stats(DOMAIN, baseline, first_sent)
+        assert len(sent) == 3
+        assert stats["requests"] == 3 and stats["backoffs"] == 0
+        assert 0 < stats["observed_rate"] <= stats["rate"]
+        assert controller.stats(DOMAIN)["requests"] == 7 and controller.stats(DOMAIN)["backoffs"] == 1
+
+    def test_min_interval_caps_rate(self):
+        controller, clock = make_controller(burst=1, start_concurrency=10)
+        controller.gate(DOMAIN, rate=10.0)
+        controller.set_min_interval(DOMAIN, 1.0)
+        sent = send(controller, 3)
+        clock.advance(0.9)
+        assert sent == [0]
+        clock.advance(0.1)
+        assert sent == [0, 1]
+
+    def test_aimd_concurrency(self):
+        controller, clock = make_controller(start_concurrency=4, target_latency=1.0, decrease_factor=0.5)
+        gate = controller.gate(DOMAIN, max_concurrency=8)
+        sent = send(controller, 6)
+        assert sent == [0, 1, 2, 3]
+        # Good responses grow the limit by about one per round trip
+        for _ in range(4):
+            controller.release(DOMAIN, latency=0.2, status=200)
+        assert gate.concurrency == pytest.approx(4.9, abs=0.05)
+        assert sent == [0, 1, 2, 3, 4, 5]
+        # A slow response halves it once; the next one within the round trip is ignored
+        controller.release(DOMAIN, latency=2.0, status=200)
+        controller.release(DOMAIN, latency=2.0, status=200)
+        assert gate.concurrency == pytest.approx(2.45, abs=0.05)
+        clock.advance(2.0)
+        controller.release(DOMAIN, status=None)
+        assert gate.concurrency == pytest.approx(1.2, abs=0.05)
+        assert gate.backoffs == 2
+
+    def test_throttling_lowers_rate_and_retry_after_pauses(self):
+        controller, clock = make_controller(burst=1, start_concurrency=10)
+        gate = controller.gate(DOMAIN, rate=4.0)
+        assert send(controller, 1) == [0]
+        controller.release(DOMAIN, latency=0.1, status=429, retry_after=30)
+        assert gate.rate == 2.0
+        sent = send(controller, 1)
+        clock.advance(29)
+        assert sent == []
+        clock.advance(1)
+        assert sent == [0]
+
+    def test_circuit_pauses_then_probes(self):
+        controller, clock = make_controller(start_concurrency=4)
+        controller.gate(DOMAIN)
+        controller.set_circuit(DOMAIN, CircuitState.OPEN, recovery_timeout=60)
+        sent = send(controller, 3)
+        clock.advance(59)
+        assert sent == []
+        clock.advance(1)
+        assert sent == [0]  # half-open: one probe at a time
+        controller.release(DOMAIN, latency=0.1, status=200)
+        assert sent == [0, 1]
+        controller.set_circuit(DOMAIN, CircuitState.CLOSED)
+        assert sent == [0, 1, 2]
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after(b"120") == 120.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+CRAWL_SCRIPT = """
+import json, sys
+import scrapy
+from scrapy.crawler import CrawlerProcess
+
+base = sys.argv[1]
+
+class PacedSpider(scrapy.Spider):
+    name = "paced"
+
+    async def start(self):
+        yield scrapy.Request(base + "/flaky", callback=self.parse)
+        for i in range(10):
+            yield scrapy.Request(f"{base}/ok/{i}", callback=self.parse)
+
+    def parse(self, response):
+        return []
+
+process = CrawlerProcess({
+    "DOWNLOAD_DELAY": 0.25,
+    "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
+    "AUTOTHROTTLE_ENABLED": True,
+    "RATE_CONTROL_BURST": 1,
+    "RETRY_BACKOFF_FACTOR": 2.0,
+    "RETRY_JITTER_FACTOR": 0.0,
+    "DOWNLOADER_MIDDLEWARES": {
+        "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
+        "BDNewsPaper.middlewares.SmartRetryMiddleware": 550,
+        "BDNewsPaper.rate_control.RateControlMiddleware": 950,
+    },
+    "EXTENSIONS": {"BDNewsPaper.retry_queue.DelayedRetryExtension": 500},
+    "LOG_LEVEL": "WARNING",
+})
+crawler = process.create_crawler(PacedSpider)
+process.crawl(crawler)
+process.start()
+print(json.dumps({k: v for k, v in crawler.stats.get_stats().items() if k.startswith(("rate_control/", "retry_queue/"))}))
+"""
+
+
+class PacedHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append((self.path, time.monotonic()))
+        first_flaky = self.path == "/flaky" and sum(path == "/flaky" for path, _ in self.hits) == 1
+        self.send_response(503 if first_flaky else 200)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        self.wfile.write(b"<html></html>")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRateControlCrawl:
+    """End-to-end: a real crawl against a local HTTP server."""
+
+    def test_rate_and_retry_backoff_are_enforced(self):
+        PacedHandler.hits = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), PacedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            env = dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent))
+            result = subprocess.run(
+                [sys.executable, "-c", CRAWL_SCRIPT, f"http://127.0.0.1:{server.server_port}"],
+                capture_output=True, text=True, timeout=60, env=env,
+            )
+        finally:
+            server.shutdown()
+        assert result.returncode == 0, result.stderr
+
+        times = [t for _, t in PacedHandler.hits]
+        assert len(times) == 12
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert min(gaps) >= 0.2  # 4 req/s from DOWNLOAD_DELAY=0.25
+        flaky = [t for path, t in PacedHandler.hits if path == "/flaky"]
+        assert flaky[1] - flaky[0] >= 1.9  # 2 ** 1 second backoff
+
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        assert stats["rate_control/127.0.0.1/requests"] == 12
+        assert stats["retry_queue/parked/smart_retry"] == 1
+        assert stats["rate_control/127.0.0.1/rate"] <= 4.0
+        assert 0 < stats["rate_control/127.0.0.1/observed_rate"] <= 4.2
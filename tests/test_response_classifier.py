@@ -0,0 +1,106 @@
+"""
+Response Classifier Tests
+=========================
+Tests for the single-pass response verdict and the detectors that read it.
+"""
+
+from scrapy.http import HtmlResponse, Request, Response
+
+from BDNewsPaper.captcha_bypass import DataDomeBypass, IncapsulaBypass, PerimeterXBypass
+from BDNewsPaper.geo_mimicry import is_geo_blocked
+from BDNewsPaper.honeypot import HoneypotDetectionMiddleware
+from BDNewsPaper.hybrid_request import HybridRequestMiddleware
+from BDNewsPaper.proxy import ProxyConfig, ProxyMiddleware
+from BDNewsPaper.response_classifier import SCAN_BYTES, classify
+
+
+def make_response(body, status=200):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return HtmlResponse("https://example.com/news/1", body=body, status=status, encoding="utf-8")
+
+
+ARTICLE = "<html><body>" + "<p>ঢাকায় বৃষ্টি, window.location and the region's budget.</p>" * 40 + "</body></html>"
+
+
+class TestVerdict:
+    """Tests for classify() and Verdict."""
+
+    def test_clean_article(self):
+        verdict = classify(make_response(ARTICLE))
+        assert verdict.flags == []
+        assert classify(Response("https://example.com/logo.png", body=b"\x89PNG")).flags == []
+
+    def test_overlapping_signatures_and_patterns(self):
+        verdict = classify(make_response(
+            '<TITLE>Just a moment...</TITLE><div class="CF-Turnstile" data-sitekey="0xAB"></div>'
+            '<script src="https://geo.captcha-delivery.com/c.js"></script>'
+        ))
+        # "turnstile" and "captcha" sit inside longer signatures
+        assert verdict.flags == ["ban", "captcha", "cf_challenge", "datadome_redirect", "js_challenge"]
+        assert verdict.offset("cf_challenge") == 0
+
+    def test_windows_and_sequences(self):
+        padding = " " * 2000
+        verdict = classify(make_response(f"<p>{padding}Access denied based on your location</p>"))
+        assert verdict.has("geo_block") and verdict.has("cf_block", within=5000)
+        assert not verdict.has("ban", within=1000)  # proxy checks the first 1KB only
+        # Both parts are needed, in order
+        assert not classify(make_response("<p>location ... access denied</p>")).has("geo_block")
+        # Nothing past the scan window is seen
+        assert not classify(make_response("x" * SCAN_BYTES + "access denied")).has("cf_block")
+
+    def test_memoized_per_response(self):
+        response = make_response(ARTICLE)
+        assert classify(response) is classify(response)
+        assert classify(make_response(ARTICLE)) is not classify(response)
+
+    def test_link_count(self):
+        links = "".join(f'<a class="x" href="/n/{i}">n</a>' for i in range(30))
+        assert classify(make_response(links)).link_count() == 30
+        assert classify(make_response(links)).link_count(limit=50) == 30
+        assert classify(make_response(links + "<link href='/s.css'>")).link_count(limit=10) == 30
+
+
+class TestDetectors:
+    """The middlewares' detectors on top of the verdict."""
+
+    def test_challenge_and_block_detectors(self):
+        hybrid = HybridRequestMiddleware()
+        assert hybrid._detect_challenge(make_response("<p>Please enable JavaScript to continue</p>"))
+        assert not hybrid._detect_challenge(make_response(ARTICLE))
+        custom = HybridRequestMiddleware(challenge_patterns=[r"verify you are human"])
+        assert custom._detect_challenge(make_response("<p>Verify you are human</p>"))
+        assert not custom._detect_challenge(make_response("<p>Please enable JavaScript</p>"))
+
+        assert is_geo_blocked(make_response("<h1>Not available in your country</h1>"))
+        assert not is_geo_blocked(make_response(ARTICLE))
+
+        proxy = ProxyMiddleware(ProxyConfig({}))
+        assert proxy._is_banned_response(make_response("<h1>You have been BLOCKED</h1>"))
+        assert not proxy._is_banned_response(make_response(ARTICLE))
+
+    def test_keywords_inside_pattern_matches(self):
+        proxy = ProxyMiddleware(ProxyConfig({}))
+        for body in ('<div class="g-recaptcha"></div>', "<div class='h-captcha'></div>",
+                     '<script src="https://ct.example.com/dd.blocked.js"></script>'):
+            assert "ban" in classify(make_response(body)).flags
+            assert proxy._is_banned_response(make_response(body))
+        assert classify(make_response('<div class="g-recaptcha"></div>')).has("captcha")
+        assert classify(make_response('<script src="/dd.blocked.js"></script>')).has("datadome")
+
+    def test_antibot_detectors(self):
+        assert DataDomeBypass().detect(make_response('<script src="https://js.datadome.co/tags.js">'))
+        assert DataDomeBypass().detect(make_response("geo.captcha-delivery.com", status=403))
+        assert not DataDomeBypass().detect(make_response("geo.captcha-delivery.com"))
+        assert PerimeterXBypass().detect(make_response("<p>Press & Hold to confirm</p>"))
+        assert IncapsulaBypass().detect(make_response("Request unsuccessful. Incapsula incident ID"))
+        assert not IncapsulaBypass().detect(make_response(ARTICLE))
+
+    def test_honeypot_trap_page(self, mock_spider):
+        middleware = HoneypotDetectionMiddleware(max_links_per_page=20)
+        request = Request("https://example.com/news/1")
+        links = "".join(f'<a href="/n/{i}">n</a>' for i in range(25))
+        middleware.process_response(request, make_response(links), mock_spider)
+        assert request.meta.get("is_trap_page")
+        assert middleware.stats["trap_pages_detected"] == 1
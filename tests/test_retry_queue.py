@@ -0,0 +1,117 @@
+"""
+Delayed Retry Queue Tests
+=========================
+Tests for parked retries, per-domain retry budgets and the disk spill.
+"""
+
+import pytest
+from scrapy import Spider
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest
+from scrapy.http import Request
+from scrapy.squeues import PickleFifoDiskQueue
+from scrapy.utils.test import get_crawler
+from twisted.internet.task import Clock
+
+from BDNewsPaper.retry_queue import DelayedRetryExtension, DelayedRetryQueue, backoff_delay
+
+DOMAIN = "www.example.com"
+
+
+class RetrySpider(Spider):
+    name = "retries"
+
+    def parse_article(self, response):
+        pass
+
+
+def make_queue(**kwargs):
+    clock, released = Clock(), []
+    return DelayedRetryQueue(released.append, clock=clock, **kwargs), clock, released
+
+
+class TestDelayedRetryQueue:
+    """Tests for DelayedRetryQueue."""
+
+    def test_released_in_due_order(self):
+        queue, clock, released = make_queue()
+        late, early = Request(f"https://{DOMAIN}/late"), Request(f"https://{DOMAIN}/early")
+        assert queue.park(late, 8.0, DOMAIN)
+        assert queue.park(early, 2.0, DOMAIN, source="proxy")
+        clock.advance(1.9)
+        assert released == []
+        clock.advance(0.1)
+        assert released == [early]
+        clock.advance(6)
+        assert released == [early, late] and len(queue) == 0
+        assert queue.stats["parked/proxy"] == 1
+        assert queue.stats["delay_hist/le_5s"] == 1 and queue.stats["delay_hist/le_15s"] == 1
+        assert queue.delay_stats()["delay_max_s"] == 8.0
+
+    def test_budget_grows_with_first_attempts(self):
+        queue, clock, released = make_queue(budget_ratio=0.5, budget_min=1)
+        assert queue.park(Request(f"https://{DOMAIN}/1"), 1.0, DOMAIN)
+        assert not queue.park(Request(f"https://{DOMAIN}/2"), 1.0, DOMAIN)
+        for _ in range(4):
+            queue.note_request(DOMAIN)
+        assert queue.park(Request(f"https://{DOMAIN}/3"), 1.0, DOMAIN)
+        assert queue.park(Request(f"https://{DOMAIN}/4"), 1.0, DOMAIN)
+        assert not queue.park(Request(f"https://{DOMAIN}/5"), 1.0, DOMAIN)
+        # Budgets are per domain
+        assert queue.park(Request("https://other.example.org/1"), 1.0, "other.example.org")
+        assert queue.stats["saved_by_budget"] == 2
+        assert queue.stats[f"saved_by_budget/{DOMAIN}"] == 2
+
+    def test_spills_to_disk_beyond_cap(self, tmp_path):
+        crawler = get_crawler(RetrySpider)
+        crawler.spider = spider = RetrySpider.from_crawler(crawler)
+        spill = PickleFifoDiskQueue.from_crawler(crawler, key=str(tmp_path / "spill"))
+        queue, clock, released = make_queue(max_parked=2, budget_min=100, spill=spill)
+        for i in range(5):
+            queue.park(Request(f"https://{DOMAIN}/{i}", callback=spider.parse_article), 1.0 + i, DOMAIN)
+        assert len(queue.heap) == 2 and len(queue) == 5
+        assert queue.stats["spilled"] == 3
+        clock.pump([1] * 6)
+        assert [request.url[-1] for request in released] == ["0", "1", "2", "3", "4"]
+        assert released[-1].callback == spider.parse_article
+        assert queue.close() == 0
+
+    def test_backoff_delay(self):
+        assert [backoff_delay(n, jitter=0) for n in range(4)] == [1.0, 2.0, 4.0, 8.0]
+        assert backoff_delay(10, jitter=0) == 60.0
+        assert 0.35 <= backoff_delay(0, base=0.5) <= 0.65
+
+
+class TestDelayedRetryExtension:
+    """Tests for DelayedRetryExtension's signal handling."""
+
+    @pytest.fixture
+    def extension(self):
+        crawler = get_crawler(RetrySpider, {"RETRY_BUDGET_MIN": 1, "RETRY_BUDGET_RATIO": 0})
+        extension = DelayedRetryExtension.from_crawler(crawler)
+        extension.queue._clock = Clock()
+        extension.crawled = []
+        extension._reinject = extension.queue.release = extension.crawled.append
+        return extension
+
+    def test_parks_until_due_and_keeps_spider_open(self, extension, mock_spider):
+        extension.request_scheduled(Request(f"https://{DOMAIN}/a"), mock_spider)
+        retry = Request(f"https://{DOMAIN}/b", meta={"retry_delay": 4.0, "retry_source": "hybrid"})
+        with pytest.raises(IgnoreRequest):
+            extension.request_scheduled(retry, mock_spider)
+        with pytest.raises(DontCloseSpider):
+            extension.spider_idle(mock_spider)
+
+        extension.queue.clock.advance(4.0)
+        assert extension.crawled == [retry] and "retry_delay" not in retry.meta
+        extension.request_scheduled(retry, mock_spider)  # re-injected: not a first attempt
+        extension.spider_idle(mock_spider)
+        assert extension.queue.first_attempts[DOMAIN] == 1
+
+        # Over budget: dropped, counted as saved
+        with pytest.raises(IgnoreRequest):
+            extension.request_scheduled(Request(f"https://{DOMAIN}/c", meta={"retry_delay": 1.0}), mock_spider)
+        extension.spider_closed(mock_spider, "finished")
+        stats = extension.stats
+        assert stats.get_value("retry_queue/parked/hybrid") == 1
+        assert stats.get_value("retry_queue/saved_by_budget") == 1
+        assert stats.get_value("retry_queue/delay_p50_s") == 4.0
@@ -0,0 +1,146 @@
+"""
+Request Scheduling Tests
+========================
+Tests for request priorities, the overflow scheduler and time to ingest.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from scrapy import Spider
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from BDNewsPaper.config import DHAKA_TZ
+from BDNewsPaper.scheduling import PriorityScheduler, RequestPrioritizer, RequestPriorityMiddleware
+
+NOW = DHAKA_TZ.localize(datetime(2024, 12, 27, 12, 0))
+
+
+class NewsSpider(Spider):
+    name = "news"
+
+    def parse_rss(self, response):
+        pass
+
+    def parse_sitemap(self, response):
+        pass
+
+    def parse_category(self, response):
+        pass
+
+    def parse_api_response(self, response):
+        pass
+
+    def parse_article(self, response):
+        pass
+
+
+spider = NewsSpider()
+
+
+def request(callback, **meta):
+    return Request("https://www.example.com/x", callback=callback, meta=meta)
+
+
+class TestRequestPrioritizer:
+    """Tests for RequestPrioritizer."""
+
+    def test_kinds_and_listing_depth(self):
+        prioritizer = RequestPrioritizer()
+        assert prioritizer.priority(request(spider.parse_rss, source="rss")) == 100
+        assert prioritizer.priority(request(spider.parse_category, source="sitemap")) == 80
+        assert prioritizer.priority(request(spider.parse_category, category="politics")) == 50
+        assert prioritizer.priority(request(spider.parse_category, page=3)) == 40
+        assert prioritizer.priority(request(spider.parse_api_response, offset=100)) == 25
+        assert prioritizer.priority(request(spider.parse_api_response, offset=100, limit=50)) == 40
+        assert prioritizer.priority(request(spider.parse_category, page=500)) == -50
+        assert prioritizer.priority(request(spider.parse_category, discovery="feed")) == 100
+
+    def test_article_freshness_and_date_range(self):
+        prioritizer = RequestPrioritizer(NOW - timedelta(days=7), NOW + timedelta(hours=12))
+        fresh = request(spider.parse_article, rss_pub_date=(NOW - timedelta(minutes=30)).isoformat())
+        day_old = request(spider.parse_article, sitemap_pub_date=(NOW - timedelta(days=1)).isoformat())
+        too_old = request(spider.parse_article, rss_pub_date=(NOW - timedelta(days=30)).isoformat())
+        assert prioritizer.priority(fresh, now=NOW) == 95
+        assert prioritizer.priority(day_old, now=NOW) == 65
+        assert prioritizer.priority(too_old, now=NOW) == -40
+
+    def test_backfill_ranks_by_end_date_proximity(self):
+        end = NOW - timedelta(days=365)
+        prioritizer = RequestPrioritizer(end - timedelta(days=30), end)
+        near_end = request(spider.parse_article, rss_pub_date=(end - timedelta(hours=1)).isoformat())
+        near_start = request(spider.parse_article, rss_pub_date=(end - timedelta(days=29)).isoformat())
+        assert prioritizer.priority(near_end, now=NOW) > prioritizer.priority(near_start, now=NOW)
+
+    def test_undated_articles_inherit_listing_depth(self):
+        listing = HtmlResponse(url="https://www.example.com/politics?page=9", body=b"",
+                               request=request(spider.parse_category, page=9))
+        assert RequestPrioritizer().priority(request(spider.parse_article), listing) == 20
+        assert RequestPrioritizer().priority(request(spider.parse_article)) == 60
+
+
+class TestRequestPriorityMiddleware:
+    """Tests for RequestPriorityMiddleware."""
+
+    def test_adds_priority_to_yielded_requests(self):
+        crawler = get_crawler(NewsSpider)
+        middleware = RequestPriorityMiddleware.from_crawler(crawler)
+        shaped = request(spider.parse_article)
+        shaped.priority = 7
+        listing = HtmlResponse(url="https://www.example.com/", body=b"", request=request(spider.parse_category))
+        output = list(middleware.process_spider_output(listing, [shaped, {"headline": "h"}], spider))
+        assert output[0].priority == 67
+        assert crawler.stats.get_value("scheduler/priority/article") == 1
+
+    def test_median_time_to_ingest(self):
+        crawler = get_crawler(NewsSpider)
+        middleware = RequestPriorityMiddleware.from_crawler(crawler)
+        now = datetime.now(DHAKA_TZ)
+        for minutes in (10, 20, 40, 60 * 48):
+            published = (now - timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S")
+            middleware.item_scraped({"publication_date": published}, None, spider)
+        middleware.item_scraped({"publication_date": "Unknown"}, None, spider)
+        middleware.spider_closed(spider, "finished")
+        assert crawler.stats.get_value("ingest/fresh_articles") == 3
+        assert abs(crawler.stats.get_value("ingest/time_to_ingest_median_s") - 1200) < 5
+
+
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler's disk overflow."""
+
+    def make_scheduler(self, tmp_path, **settings):
+        settings.setdefault("SCHEDULER_PRIORITY_QUEUE", "scrapy.pqueues.ScrapyPriorityQueue")
+        settings.setdefault("SCHEDULER_OVERFLOW_DIR", str(tmp_path))
+        crawler = get_crawler(NewsSpider, settings)
+        crawler.spider = NewsSpider.from_crawler(crawler)
+        scheduler = PriorityScheduler.from_crawler(crawler)
+        scheduler.open(crawler.spider)
+        return scheduler
+
+    def test_backfill_overflows_to_disk(self, tmp_path):
+        scheduler = self.make_scheduler(tmp_path, SCHEDULER_MEMORY_LIMIT=2)
+        crawl_spider = scheduler.spider
+        for i in range(6):
+            scheduler.enqueue_request(Request(f"https://www.example.com/{i}", callback=crawl_spider.parse_article,
+                                              priority=10 if i % 2 else -10))
+        assert len(scheduler) == 6
+        assert scheduler.stats.get_value("scheduler/enqueued/overflow") == 2
+        assert os.listdir(tmp_path)
+
+        order = []
+        while (next_request := scheduler.next_request()) is not None:
+            order.append(next_request.priority)
+            assert next_request.callback == crawl_spider.parse_article
+        assert order == [10, 10, 10, -10, -10, -10]
+        assert scheduler.stats.get_value("scheduler/dequeued/overflow") == 2
+
+        scheduler.close("finished")
+        assert os.listdir(tmp_path) == []
+
+    def test_duplicates_are_filtered_before_overflow(self, tmp_path):
+        scheduler = self.make_scheduler(tmp_path, SCHEDULER_MEMORY_LIMIT=0)
+        assert scheduler.enqueue_request(Request("https://www.example.com/a", priority=-10))
+        assert not scheduler.enqueue_request(Request("https://www.example.com/a", priority=-10))
+        assert len(scheduler) == 1
+        scheduler.close("finished")
@@ -0,0 +1,270 @@
+"""
+Search Index Sync Tests
+=======================
+Tests for incremental Elasticsearch sync against an in-memory stand-in.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.search_sync import SearchSync
+
+
+class FakeIndices:
+    """The parts of the indices API SearchSync uses, over dicts."""
+
+    def __init__(self, es):
+        self.es = es
+
+    def create(self, index, body):
+        self.es.docs[index] = {}
+        self.es.settings[index] = body["settings"]
+
+    def delete(self, index):
+        self.es.docs.pop(index)
+        self.es.aliases = {a: i for a, i in self.es.aliases.items() if i != index}
+
+    def exists(self, index):
+        return index in self.es.docs or index in self.es.aliases
+
+    def exists_alias(self, name):
+        return name in self.es.aliases
+
+    def get_alias(self, name):
+        return {self.es.aliases[name]: {"aliases": {name: {}}}}
+
+    def put_settings(self, index, settings):
+        self.es.settings[index].update(settings["index"])
+
+    def refresh(self, index):
+        pass
+
+    def update_aliases(self, actions):
+        self.es.alias_updates.append(actions)
+        for action in actions:
+            (kind, spec), = action.items()
+            if kind == "add":
+                self.es.aliases[spec["alias"]] = spec["index"]
+            elif kind == "remove_index":
+                self.es.docs.pop(spec["index"])
+
+
+class FakeElasticsearch:
+    """
+    In-memory Elasticsearch stand-in.
+
+    ``item_errors`` maps a document id to a list of statuses returned on
+    successive attempts; ``fail_requests`` makes that many bulk calls raise.
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.settings = {}
+        self.aliases = {}
+        self.alias_updates = []
+        self.bulk_calls = []
+        self.item_errors = {}
+        self.fail_requests = 0
+        self.indices = FakeIndices(self)
+
+    def bulk(self, operations):
+        if self.fail_requests:
+            self.fail_requests -= 1
+            raise ConnectionError("connection reset")
+        lines = [json.loads(line) for line in operations]
+        self.bulk_calls.append([action["index"]["_id"] for action in lines[::2]])
+        items = []
+        for action, source in zip(lines[::2], lines[1::2]):
+            meta = action["index"]
+            index = self.aliases.get(meta["_index"], meta["_index"])
+            statuses = self.item_errors.get(meta["_id"])
+            status = statuses.pop(0) if statuses else 201
+            if status < 300:
+                self.docs[index][meta["_id"]] = source
+            items.append({"index": {"_id": meta["_id"], "status": status,
+                                    "error": None if status < 300 else {"type": "error"}}})
+        return {"errors": any(i["index"]["status"] >= 300 for i in items), "items": items}
+
+    def search_docs(self, alias="bdnews_articles"):
+        return self.docs[self.aliases[alias]]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "news.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL,
+            headline TEXT NOT NULL,
+            article TEXT NOT NULL,
+            category TEXT,
+            author TEXT,
+            publication_date TEXT,
+            source_language TEXT,
+            word_count INTEGER,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_articles(db_path, count):
+    conn = sqlite3.connect(db_path)
+    start = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    for i in range(start, start + count):
+        conn.execute(
+            "INSERT INTO articles (url, paper_name, headline, article, word_count, scraped_at)"
+            " VALUES (?, 'prothomalo', ?, ?, 3, '2024-12-25 10:00:00')",
+            (f"https://example.com/{i}", f"Headline {i}", f"Body of article {i}"),
+        )
+    conn.commit()
+    conn.close()
+
+
+def make_sync(es, db_path, **kwargs):
+    kwargs.setdefault("retry_backoff", 0)
+    return SearchSync(es, db_path, **kwargs)
+
+
+class TestSearchSync:
+    """Tests for SearchSync."""
+
+    def test_first_sync_builds_index_behind_alias(self, db_path):
+        add_articles(db_path, 5)
+        es = FakeElasticsearch()
+        sync = make_sync(es, db_path)
+
+        assert sync.sync() == 5
+        docs = es.search_docs()
+        assert len(docs) == 5
+        assert docs["1"]["article_body"] == "Body of article 0"
+        assert docs["1"]["scraped_at"] == "2024-12-25T10:00:00Z"
+        index = es.aliases["bdnews_articles"]
+        assert index.startswith("bdnews_articles_")
+        assert es.settings[index]["refresh_interval"] == "1s"
+        conn = sqlite3.connect(db_path)
+        assert sync.last_article_id(conn) == 5
+        conn.close()
+
+    def test_incremental_sync_sends_only_new_articles(self, db_path):
+        add_articles(db_path, 4)
+        es = FakeElasticsearch()
+        make_sync(es, db_path).sync()
+        es.bulk_calls.clear()
+
+        add_articles(db_path, 3)
+        assert make_sync(es, db_path).sync() == 3
+        assert [id for call in es.bulk_calls for id in call] == ["5", "6", "7"]
+        assert make_sync(es, db_path).sync() == 0
+        assert len(es.search_docs()) == 7
+
+    def test_chunks_are_capped_by_bytes(self, db_path):
+        add_articles(db_path, 10)
+        es = FakeElasticsearch()
+        sync = make_sync(es, db_path, chunk_bytes=600, streams=3)
+        sync.sync()
+
+        assert len(es.bulk_calls) > 3
+        assert sorted(int(id) for call in es.bulk_calls for id in call) == list(range(1, 11))
+        assert sync.stats["requests"] == len(es.bulk_calls)
+
+    def test_retries_only_failed_documents(self, db_path):
+        add_articles(db_path, 4)
+        es = FakeElasticsearch()
+        es.item_errors = {"2": [429, 503]}
+        sync = make_sync(es, db_path)
+
+        assert sync.sync() == 4
+        assert es.bulk_calls == [["1", "2", "3", "4"], ["2"], ["2"]]
+        assert sync.stats["retried"] == 2
+
+    def test_transport_error_retries_whole_chunk(self, db_path):
+        add_articles(db_path, 3)
+        es = FakeElasticsearch()
+        es.fail_requests = 1
+        assert make_sync(es, db_path).sync() == 3
+        assert es.bulk_calls == [["1", "2", "3"]]
+
+    def test_persistent_failures_are_retried_next_sync(self, db_path):
+        add_articles(db_path, 3)
+        es = FakeElasticsearch()
+        make_sync(es, db_path).sync()
+
+        add_articles(db_path, 2)
+        es.item_errors = {"4": [503] * 4}
+        sync = make_sync(es, db_path)
+        assert sync.sync() == 1
+        conn = sqlite3.connect(db_path)
+        assert sync.pending_failures(conn) == 1
+        assert sync.last_article_id(conn) == 5
+
+        es.bulk_calls.clear()
+        sync = make_sync(es, db_path)
+        assert sync.sync() == 1
+        assert es.bulk_calls == [["4"]]
+        assert sync.pending_failures(conn) == 0
+        conn.close()
+
+    def test_rejected_documents_stop_being_sent(self, db_path):
+        add_articles(db_path, 3)
+        es = FakeElasticsearch()
+        es.item_errors = {"2": [400] * 10, "3": [503] * 10}
+        sync = make_sync(es, db_path, max_retries=0, max_sync_attempts=3)
+        assert sync.sync() == 1
+        assert sync.stats["rejected"] == 1
+        assert es.bulk_calls == [["1", "2", "3"]]
+
+        # The 400 is never re-sent; the 503 is retried until it runs out of attempts
+        for _ in range(3):
+            make_sync(es, db_path, max_retries=0, max_sync_attempts=3).sync()
+        assert es.bulk_calls[1:] == [["3"], ["3"]]
+        conn = sqlite3.connect(db_path)
+        assert sync.pending_failures(conn) == 0 and sync.parked_failures(conn) == 2
+        conn.close()
+
+    def test_reindex_swaps_alias_and_drops_old_index(self, db_path):
+        add_articles(db_path, 3)
+        es = FakeElasticsearch()
+        make_sync(es, db_path).sync()
+        old = es.aliases["bdnews_articles"]
+
+        add_articles(db_path, 2)
+        assert make_sync(es, db_path).reindex() == 5
+        new = es.aliases["bdnews_articles"]
+        assert new != old
+        assert old not in es.docs
+        assert len(es.search_docs()) == 5
+        assert es.alias_updates[-1] == [
+            {"add": {"index": new, "alias": "bdnews_articles"}},
+            {"remove": {"index": old, "alias": "bdnews_articles"}},
+        ]
+
+    def test_failed_reindex_keeps_serving_old_index(self, db_path, monkeypatch):
+        add_articles(db_path, 3)
+        es = FakeElasticsearch()
+        make_sync(es, db_path).sync()
+        old = es.aliases["bdnews_articles"]
+
+        sync = make_sync(es, db_path)
+        monkeypatch.setattr(sync, "_swap_alias", lambda index: (_ for _ in ()).throw(RuntimeError("boom")))
+        with pytest.raises(RuntimeError):
+            sync.reindex()
+        assert es.aliases["bdnews_articles"] == old
+        assert set(es.docs) == {old}
+
+    def test_replaces_legacy_concrete_index(self, db_path):
+        add_articles(db_path, 2)
+        es = FakeElasticsearch()
+        es.docs["bdnews_articles"] = {"1": {}}
+
+        make_sync(es, db_path).sync()
+        assert "bdnews_articles" not in es.docs
+        assert es.alias_updates[-1][-1] == {"remove_index": {"index": "bdnews_articles"}}
+        assert len(es.search_docs()) == 2
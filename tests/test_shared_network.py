@@ -0,0 +1,150 @@
+"""
+Shared Network Tests
+====================
+Tests for the process-wide DNS cache and HTTP connection pool.
+"""
+
+import pytest
+from twisted.internet import defer
+from twisted.internet.error import DNSLookupError
+from twisted.internet.task import Clock
+
+from BDNewsPaper import shared_network
+from BDNewsPaper.shared_network import (
+    DNSCache, SharedConnectionPool, SharedDNSResolver, get_connection_pool, prefetch,
+)
+
+
+class ScriptedResolver(SharedDNSResolver):
+    """Lookups answered by the test instead of the system resolver."""
+
+    def __init__(self, clock, **cache_kwargs):
+        super().__init__(clock, DNSCache(**cache_kwargs), timeout=5.0)
+        self.pending = []
+
+    def _lookup(self, name):
+        d = defer.Deferred()
+        self.pending.append((name, d))
+        return d
+
+
+def results_of(d):
+    results = []
+    d.addBoth(results.append)
+    return results
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(shared_network, "_default_connection_pool", None)
+
+
+class TestSharedDNSResolver:
+    """Tests for SharedDNSResolver."""
+
+    def test_coalesces_and_expires_after_ttl(self):
+        clock = Clock()
+        resolver = ScriptedResolver(clock, ttl=300)
+        first, second = (results_of(resolver.getHostByName("www.example.com")) for _ in range(2))
+        assert len(resolver.pending) == 1  # one lookup for both requests
+
+        clock.advance(0.25)
+        resolver.pending.pop()[1].callback("93.184.216.34")
+        assert first == second == ["93.184.216.34"]
+        assert results_of(resolver.getHostByName("www.example.com")) == ["93.184.216.34"]
+        assert resolver.cache.hits == 1 and resolver.cache.saved_seconds == 0.25
+
+        clock.advance(300)
+        resolver.getHostByName("www.example.com")
+        assert [name for name, _ in resolver.pending] == ["www.example.com"]
+
+    def test_failures_cached_and_stale_address_kept(self):
+        clock = Clock()
+        resolver = ScriptedResolver(clock, ttl=10, negative_ttl=5)
+        missing = results_of(resolver.getHostByName("gone.example.com"))
+        resolver.pending.pop()[1].errback(DNSLookupError("gone.example.com"))
+        missing[0].trap(DNSLookupError)
+        results_of(resolver.getHostByName("gone.example.com"))[0].trap(DNSLookupError)
+        assert not resolver.pending and resolver.cache.negative_hits == 1
+
+        resolver.getHostByName("www.example.com")
+        resolver.pending.pop()[1].callback("10.0.0.1")
+        clock.advance(10)
+        refreshed = results_of(resolver.getHostByName("www.example.com"))
+        resolver.pending.pop()[1].errback(DNSLookupError("www.example.com"))
+        assert refreshed == ["10.0.0.1"] and resolver.cache.stale_served == 1
+
+    def test_prefetch(self):
+        resolver = ScriptedResolver(Clock())
+        resolved = results_of(prefetch(["a.example.com", "b.example.com", "a.example.com"], resolver))
+        assert sorted(name for name, _ in resolver.pending) == ["a.example.com", "b.example.com"]
+        resolver.pending[0][1].callback("10.0.0.1")
+        resolver.pending[1][1].errback(DNSLookupError("b.example.com"))
+        assert resolved == [1]
+        assert results_of(prefetch(["a.example.com"], resolver=object())) == [0]
+
+
+class FakeTransport:
+    def loseConnection(self):
+        pass
+
+
+class FakeProtocol:
+    state = "QUIESCENT"
+    transport = FakeTransport()
+
+    def abort(self):
+        return defer.succeed(None)
+
+
+class ShutdownClock(Clock):
+    def __init__(self):
+        super().__init__()
+        self.triggers = []
+
+    def addSystemEventTrigger(self, phase, event, f, *args):
+        self.triggers.append((phase, event, f))
+
+
+class SlowEndpoint:
+    """Connects after `delay` seconds of the test clock."""
+
+    def __init__(self, clock, delay):
+        self.clock, self.delay = clock, delay
+        self.protocol = FakeProtocol()
+
+    def connect(self, factory):
+        d = defer.Deferred()
+        self.clock.callLater(self.delay, d.callback, self.protocol)
+        return d
+
+
+class TestSharedConnectionPool:
+    """Tests for SharedConnectionPool."""
+
+    def test_counts_reuse_and_setup_time_saved(self):
+        clock = Clock()
+        pool = SharedConnectionPool(clock)
+        key = ("https", b"www.example.com", 443)
+        endpoint = SlowEndpoint(clock, 0.08)
+        for _ in range(3):
+            pool.getConnection(key, endpoint)
+            clock.advance(0.08)
+            pool._putConnection(key, endpoint.protocol)  # request done, back in the pool
+        summary = pool.summary()
+        assert summary["connections_opened"] == 1 and summary["connections_reused"] == 2
+        assert summary["connect_p50_ms"] == pytest.approx(80.0, rel=0.01)
+        assert summary["connect_saved_s"] == pytest.approx(0.16, rel=0.01)
+
+    def test_one_pool_per_process(self):
+        reactor = ShutdownClock()
+        pools = [get_connection_pool(reactor) for _ in range(3)]
+        assert pools[0] is pools[1] is pools[2]
+        assert len(reactor.triggers) == 1  # closed once, when the reactor stops
+
+        pool = pools[0]
+        for limit in (4, 16):
+            pool.attach(limit)
+        assert pool.maxPersistentPerHost == 20
+        pool.detach(4)
+        assert pool.maxPersistentPerHost == 16
@@ -12,6 +12,7 @@ from scrapy.exceptions import DropItem
 
 from BDNewsPaper.items import NewsArticleItem
 from BDNewsPaper.pipelines import SharedSQLitePipeline
+from BDNewsPaper.stats_rollup import StatsRollup
 
 
 class TestSharedSQLitePipeline:
@@ -96,6 +97,46 @@ class TestSharedSQLitePipeline:
         assert result is item
         assert count == 1
 
+    def test_process_item_updates_stats_rollup(self, tmp_path, mock_spider):
+        """Each insert is counted in the rollup within the same transaction."""
+        pipeline = self._make_pipeline(tmp_path)
+        pipeline.open_spider(mock_spider)
+
+        pipeline.process_item(self._make_item(url="https://example.com/a"), mock_spider)
+        pipeline.process_item(self._make_item(
+            url="https://example.com/b", category="Sports",
+            article_body="A different article body, long enough to pass validation. " * 10,
+        ), mock_spider)
+
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        rollup = StatsRollup(conn)
+        assert rollup.totals()["articles"] == 2
+        assert rollup.counts_by("category") == {"National": 1, "Sports": 1}
+        assert rollup.totals(hours=1)["articles"] == 2
+        # Nothing left for a reader to catch up on
+        assert rollup.catch_up() == 0
+        conn.close()
+
+    def test_partitioned_mode_routes_through_view(self, tmp_path, mock_spider):
+        """With partitions enabled, articles land in a month table behind the articles view."""
+        pipeline = SharedSQLitePipeline(db_path=str(tmp_path / "test.db"), partitioned=True)
+        pipeline.open_spider(mock_spider)
+
+        pipeline.process_item(self._make_item(url="https://example.com/a"), mock_spider)
+        with pytest.raises(DropItem):
+            pipeline.process_item(self._make_item(url="https://example.com/a"), mock_spider)
+
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        assert conn.execute("SELECT type FROM sqlite_master WHERE name = 'articles'").fetchone() == ("view",)
+        assert conn.execute("SELECT id, url FROM articles").fetchall() == [(1, "https://example.com/a")]
+        assert StatsRollup(conn).totals()["articles"] == 1
+        conn.close()
+
+        # Reopening without the setting keeps the partitioned layout
+        pipeline = self._make_pipeline(tmp_path)
+        pipeline.open_spider(mock_spider)
+        assert pipeline.partitioned
+
     # ------------------------------------------------------------------
     # All fields stored correctly
     # ------------------------------------------------------------------
@@ -265,6 +306,7 @@ class TestSharedSQLitePipeline:
             "idx_publication_date",
             "idx_category",
             "idx_content_hash",
+            "idx_scraped_at",
         }
         assert expected_indexes.issubset(index_names)
 
@@ -0,0 +1,162 @@
+"""
+Stats Rollup Tests
+==================
+Tests for the materialized article counters.
+"""
+
+import sqlite3
+
+import pytest
+
+from BDNewsPaper.stats_rollup import StatsRollup
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "rollup.db"))
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            paper_name TEXT NOT NULL,
+            article TEXT NOT NULL,
+            category TEXT,
+            source_language TEXT,
+            publication_date TEXT,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    yield conn
+    conn.close()
+
+
+def insert(conn, n, paper="prothomalo", category="National", language="Bengali",
+           published="2024-12-25", scraped_at=None, article="x" * 100):
+    for _ in range(n):
+        count = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        conn.execute(
+            "INSERT INTO articles (url, paper_name, article, category, source_language,"
+            " publication_date, scraped_at) VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))",
+            (f"https://example.com/{count}", paper, article, category, language, published, scraped_at),
+        )
+    conn.commit()
+
+
+def snapshot(conn):
+    return sorted(conn.execute("SELECT * FROM article_rollup").fetchall())
+
+
+class TestStatsRollup:
+    """Tests for StatsRollup."""
+
+    def test_ensure_backfills_existing_articles(self, conn):
+        insert(conn, 3)
+        insert(conn, 2, paper="dailysun", category=None, language="English")
+
+        rollup = StatsRollup(conn)
+        assert rollup.ensure()
+
+        totals = rollup.totals()
+        assert totals["articles"] == 5
+        assert totals["avg_length"] == 100
+        assert totals["papers"] == 2
+        assert totals["categories"] == 1
+        assert rollup.counts_by("paper_name") == {"prothomalo": 3, "dailysun": 2}
+        assert rollup.counts_by("category") == {"National": 3}
+        assert rollup.counts_by("language") == {"Bengali": 3, "English": 2}
+
+    def test_ensure_without_articles_table(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "empty.db"))
+        assert StatsRollup(conn).ensure() is False
+        conn.close()
+
+    def test_record_matches_rebuild(self, conn):
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+        for i in range(6):
+            insert(conn, 1, paper=f"paper{i % 2}", published=f"2024-12-{20 + i}")
+            rollup.record(conn.execute("SELECT MAX(id) FROM articles").fetchone()[0])
+            conn.commit()
+        incremental = snapshot(conn)
+
+        assert rollup.rebuild() == 6
+        assert snapshot(conn) == incremental
+
+    def test_record_is_idempotent(self, conn):
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+        insert(conn, 1)
+        rollup.record(1)
+        rollup.record(1)
+        conn.commit()
+        assert rollup.totals()["articles"] == 1
+
+    def test_catch_up_folds_outside_writes(self, conn):
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+        insert(conn, 4)
+
+        assert rollup.catch_up() == 4
+        assert rollup.catch_up() == 0
+        assert rollup.totals()["articles"] == 4
+
+    def test_windows(self, conn):
+        insert(conn, 2, scraped_at="2020-01-01 10:00:00")
+        insert(conn, 3)
+
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+
+        assert rollup.totals()["articles"] == 5
+        assert rollup.totals(hours=24)["articles"] == 3
+        assert rollup.totals(day="today")["articles"] == 3
+        assert rollup.totals(day="2020-01-01")["articles"] == 2
+        assert rollup.counts_by("paper_name", hours=1) == {"prothomalo": 3}
+
+    def test_papers_and_date_range(self, conn):
+        insert(conn, 1, published="2024-01-01", scraped_at="2024-01-02 08:00:00")
+        insert(conn, 1, published="2024-06-01", scraped_at="2024-06-02 08:00:00")
+        insert(conn, 1, published=None, category="Sports")
+
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+
+        totals = rollup.totals()
+        assert totals["earliest_published"] == "2024-01-01"
+        assert totals["latest_published"] == "2024-06-01"
+
+        (paper,) = rollup.papers()
+        assert paper["paper_name"] == "prothomalo"
+        assert paper["count"] == 3
+        assert paper["latest_article"] == "2024-06-01"
+        assert paper["last_scraped"] > "2024-06-02 08:00:00"
+
+    def test_counts_by_limit_and_unknown_dimension(self, conn):
+        for i, category in enumerate(["A", "B", "C"]):
+            insert(conn, i + 1, category=category)
+
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+
+        assert rollup.counts_by("category", limit=2) == {"C": 3, "B": 2}
+        with pytest.raises(ValueError):
+            rollup.counts_by("headline")
+
+    def test_hourly_buckets_expire_into_day_buckets(self, conn):
+        insert(conn, 2, scraped_at="2020-01-01 10:00:00")
+        insert(conn, 1)
+
+        rollup = StatsRollup(conn)
+        rollup.ensure()
+
+        hours = conn.execute(
+            "SELECT SUM(articles) FROM article_rollup WHERE grain = 'hour'"
+        ).fetchone()[0]
+        assert hours == 1
+        # Past the hourly retention the window falls back to day buckets
+        assert rollup.totals(hours=24 * 365 * 100)["articles"] == 3
+
+        conn.execute("UPDATE article_rollup SET bucket = '2020-01-01 10' WHERE grain = 'hour'")
+        conn.commit()
+        assert rollup.prune() == 1
+        assert rollup.totals(hours=24)["articles"] == 0
@@ -0,0 +1,138 @@
+"""
+Streaming Statistics Tests
+==========================
+Tests for the fixed-memory quantile sketch, ring buffer and per-domain stats.
+"""
+
+import random
+import time
+
+import pytest
+from scrapy import Spider
+from scrapy.http import Request, Response
+from scrapy.utils.test import get_crawler
+
+from BDNewsPaper.middlewares import AdaptiveThrottlingMiddleware, StatisticsMiddleware
+from BDNewsPaper.streaming_stats import (
+    QuantileSketch, RingBuffer, StreamingStats, all_streaming_stats, get_streaming_stats,
+)
+
+
+class StatsSpider(Spider):
+    name = "streaming_stats_test"
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(3)
+        values = [rng.lognormvariate(-1.0, 1.2) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.95, 0.99):
+            assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.02)
+        assert sketch.count == 20000 and sketch.max == max(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+        assert QuantileSketch().quantile(0.5) == 0.0
+
+    def test_memory_bounded_and_mergeable(self):
+        sketch = QuantileSketch(max_buckets=64)
+        for exponent in range(-6, 6):
+            for i in range(1, 100):
+                sketch.add(i * 10.0 ** exponent)
+        assert len(sketch.bins) == 64
+        # Folding only costs accuracy at the low end
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(
+            [i * 10.0 ** e for e in range(-6, 6) for i in range(1, 100)], 0.99), rel=0.02)
+
+        other = QuantileSketch()
+        other.add(0.0)
+        other.add(2.0)
+        merged = QuantileSketch()
+        merged.merge(other)
+        assert merged.count == 2 and merged.quantile(0.0) == 0.0
+        assert merged.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+
+class TestRingBuffer:
+    """Tests for RingBuffer."""
+
+    def test_keeps_last_values_and_mean(self):
+        ring = RingBuffer(3)
+        for value in (1.0, 2.0):
+            ring.append(value)
+        assert len(ring) == 2 and not ring.full and ring.mean == 1.5
+        for value in (3.0, 4.0, 5.0):
+            ring.append(value)
+        assert list(ring) == [3.0, 4.0, 5.0] and ring.full
+        assert ring.mean == 4.0
+
+
+class TestStreamingStats:
+    """Tests for StreamingStats and the middlewares that feed it."""
+
+    def test_summary_and_export(self):
+        now = [100.0]
+        streams = StreamingStats(clock=lambda: now[0])
+        for i in range(100):
+            streams.note_request("www.example.com")
+            streams.observe("www.example.com", 0.01 * (i + 1), 200 if i % 10 else 503, 1000)
+            now[0] += 0.1
+        summary = streams.summary("www.example.com")
+        assert summary["requests"] == summary["responses"] == 100
+        assert summary["latency_p50_s"] == pytest.approx(0.5, rel=0.03)
+        assert summary["latency_p99_s"] == pytest.approx(0.99, rel=0.03)
+        assert summary["bytes_per_s"] == pytest.approx(100000 / 9.9, rel=0.01)
+        assert summary["status_200"] == 90 and summary["status_503"] == 10
+
+        crawler = get_crawler(StatsSpider)
+        streams.export(crawler.stats)
+        assert crawler.stats.get_value("domain/www.example.com/status_503") == 10
+
+    def test_statistics_middleware(self):
+        crawler = get_crawler(StatsSpider)
+        middleware = StatisticsMiddleware.from_crawler(crawler)
+        spider = StatsSpider.from_crawler(crawler)
+        middleware.spider_opened(spider)
+        for i in range(50):
+            request = Request(f"https://www.example.com/news/{i}")
+            middleware.process_request(request, spider)
+            request.meta["download_latency"] = 0.2
+            middleware.process_response(request, Response(request.url, body=b"x" * 100, status=200), spider)
+
+        streams = get_streaming_stats(spider.name)
+        assert all_streaming_stats()[spider.name] is streams
+        assert len(streams.domains["www.example.com"].latency.bins) == 1
+        middleware.spider_closed(spider, "finished")
+        assert crawler.stats.get_value("domain/www.example.com/latency_p95_s") == pytest.approx(0.2, rel=0.01)
+        assert crawler.stats.get_value("domain/www.example.com/bytes") == 5000
+
+        # A new run of the spider starts from scratch
+        middleware.spider_opened(spider)
+        assert get_streaming_stats(spider.name).domains == {}
+
+    def test_adaptive_throttle_window(self, mock_spider):
+        middleware = AdaptiveThrottlingMiddleware(threshold_ms=500, window_size=3)
+        for seconds in (0.1, 0.1, 0.1, 1.0, 1.0, 1.0):
+            request = Request("https://www.example.com/a",
+                              meta={"_adaptive_throttle_start": time.time() - seconds})
+            middleware.process_response(request, Response(request.url), mock_spider)
+        window = middleware.domain_stats["www.example.com"]["response_times"]
+        assert len(window) == 3 and window.mean == pytest.approx(1000, rel=0.05)
+        assert middleware.stats["delay_increases"] >= 1
+
+    def test_prometheus_collector(self):
+        pytest.importorskip("prometheus_client")
+        from BDNewsPaper.prometheus_metrics import StreamingStatsCollector
+
+        get_streaming_stats("prometheus_test").observe("www.example.com", 0.3, 200, 512)
+        families = {family.name: family for family in StreamingStatsCollector().collect()}
+        samples = [s for s in families["scrapy_domain_latency_seconds"].samples
+                   if s.labels["spider"] == "prometheus_test"]
+        assert {s.labels["quantile"] for s in samples} == {"0.5", "0.95", "0.99"}
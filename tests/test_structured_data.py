@@ -0,0 +1,77 @@
+"""
+Structured Data Tests
+=====================
+Tests for the memoized per-response JSON-LD, meta tag and <time> view.
+"""
+
+import json
+
+from scrapy.http import HtmlResponse
+
+from BDNewsPaper.extractors import JSONLDExtractor
+from BDNewsPaper.spiders.base_spider import BaseNewsSpider
+from BDNewsPaper.structured_data import StructuredData, structured_data
+
+ARTICLE = {
+    "@type": "NewsArticle",
+    "headline": "Padma bridge traffic doubles in first month",
+    "articleBody": "Vehicle crossings on the Padma bridge doubled in its first month of operation. " * 3,
+    "author": [{"@type": "Person", "name": "Staff Correspondent"}],
+    "datePublished": "2024-07-01T10:00:00+06:00",
+    "image": {"url": "https://example.com/padma.jpg"},
+}
+
+PAGE = f"""<html><head>
+<meta property="og:image" content="https://example.com/og.jpg">
+<meta name="Author" content="Meta Author">
+<meta property="article:published_time" content="2024-07-01T09:00:00+06:00">
+<script type="application/ld+json">{json.dumps({"@context": "https://schema.org",
+    "@graph": [{"@type": "WebSite", "name": "Example"}, ARTICLE]})}</script>
+<script type="application/ld+json">{{ broken</script>
+</head><body><h1>Padma bridge traffic doubles</h1>
+<time datetime="2024-07-01T10:00:00+06:00">1 July 2024</time></body></html>"""
+
+
+class ArticleSpider(BaseNewsSpider):
+    name = "structured_test"
+    paper_name = "Structured Test"
+
+
+def make_response(body=PAGE):
+    return HtmlResponse("https://example.com/news/1", body=body.encode(), encoding="utf-8")
+
+
+class TestStructuredData:
+    """Tests for StructuredData and structured_data()."""
+
+    def test_parses_graph_meta_and_times(self):
+        data = structured_data(make_response())
+        assert [node["@type"] for node in data.jsonld] == ["WebSite", "NewsArticle"]
+        assert data.first_of_type("Article", "NewsArticle")["headline"] == ARTICLE["headline"]
+        assert data.of_type("BlogPosting") == []
+        assert data.meta["og:image"] == "https://example.com/og.jpg"
+        assert data.meta["author"] == "Meta Author"
+        assert data.times == [{"datetime": "2024-07-01T10:00:00+06:00", "text": "1 July 2024"}]
+
+    def test_memoized_per_response(self, monkeypatch):
+        response = make_response()
+        loads = []
+        monkeypatch.setattr("BDNewsPaper.structured_data.json.loads",
+                            lambda text, _loads=json.loads: loads.append(text) or _loads(text))
+
+        spider = ArticleSpider()
+        assert spider.extract_from_jsonld(response)["headline"] == ARTICLE["headline"]
+        assert spider.extract_author(response) == "Staff Correspondent"
+        assert spider.try_generic_selectors(response)["publication_date"] == "2024-07-01T10:00:00+06:00"
+        assert JSONLDExtractor().extract(response.text, data=structured_data(response)).headline
+        assert structured_data(response) is structured_data(response)
+        assert len(loads) == 2  # one per ld+json block, broken one included
+        assert structured_data(make_response()) is not structured_data(response)
+
+    def test_from_html_matches_response_view(self):
+        from_html = StructuredData.from_html(PAGE)
+        assert from_html.jsonld == structured_data(make_response()).jsonld
+        assert from_html.meta["article:published_time"] == "2024-07-01T09:00:00+06:00"
+        result = JSONLDExtractor().extract(PAGE)
+        assert result.author == "Staff Correspondent"
+        assert result.image_url == "https://example.com/padma.jpg"
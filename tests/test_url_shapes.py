@@ -0,0 +1,149 @@
+"""
+URL Shape Learning Tests
+========================
+Tests for per-domain URL shape yield learning and its spider middleware.
+"""
+
+import asyncio
+
+from scrapy import Spider
+from scrapy.exceptions import DropItem
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+
+from BDNewsPaper.pipelines import NeutralDropItem
+from BDNewsPaper.url_shapes import (
+    SHAPE_META_KEY, UrlShapeLearner, UrlShapeMiddleware, get_url_shape_learner, url_shape,
+)
+
+DOMAIN = "www.example.com"
+SPIDER = Spider("news")
+
+
+def tagged_response(url):
+    request = Request(url, meta={SHAPE_META_KEY: (DOMAIN, url_shape(url))})
+    return HtmlResponse(url=url, body=b"<html></html>", request=request)
+
+
+class TestUrlShape:
+    """Tests for url_shape()."""
+
+    def test_variable_parts_are_abstracted(self):
+        assert url_shape("https://x.com/politics/news/123456") == "/politics/news/{n}"
+        assert url_shape("https://x.com/2024/12/27/metro-rail-extends-hours") == "/{yyyy}/{n}/{n}/{slug}"
+        assert url_shape("https://x.com/details/article-title-98765.html?id=3&b=") == "/details/{slug}-{n}.html?b&id"
+        assert url_shape("https://x.com/news/2024-12-27/ab12cd34") == "/news/{date}/{id}"
+        assert url_shape("https://x.com/video/ঢাকায়-বৃষ্টি") == "/video/{slug}"
+        assert url_shape("https://x.com/") == "/"
+
+    def test_same_template_same_shape(self):
+        assert url_shape("https://x.com/sports/cricket-team-wins-series") == url_shape(
+            "https://x.com/sports/budget-passed-in-parliament-today")
+        assert url_shape("https://x.com/sports/news/1") != url_shape("https://x.com/video/news/1")
+
+
+class TestUrlShapeLearner:
+    """Tests for UrlShapeLearner."""
+
+    def test_low_yield_shapes_are_skipped_and_persisted(self, tmp_path):
+        db_path = str(tmp_path / "news.db")
+        learner = UrlShapeLearner(db_path, min_samples=5, min_yield=0.2, explore_every=1000)
+        for i in range(5):
+            learner.record(DOMAIN, "/video/{n}", stored=False)
+            learner.record(DOMAIN, "/news/{n}", stored=True)
+        learner.flush()
+
+        urls = ["https://x.com/video/1", "https://x.com/topic/dhaka", "https://x.com/news/2"]
+        ranked = UrlShapeLearner(db_path, min_samples=5, min_yield=0.2, explore_every=1000).rank(DOMAIN, urls)
+        assert [(url, priority) for url, _, priority in ranked] == [
+            ("https://x.com/news/2", 9), ("https://x.com/topic/dhaka", 5),
+        ]
+
+    def test_flush_adds_increments(self, tmp_path):
+        db_path = str(tmp_path / "news.db")
+        for _ in range(2):
+            learner = UrlShapeLearner(db_path)
+            learner.record(DOMAIN, "/news/{n}", stored=True)
+            learner.record(DOMAIN, "/news/{n}", stored=False)
+            learner.flush()
+            learner.flush()
+        assert UrlShapeLearner(db_path).shapes(DOMAIN)[0] == {
+            "shape": "/news/{n}", "fetched": 4, "stored": 2, "yield": 0.5,
+        }
+
+    def test_skipped_shapes_are_still_explored(self):
+        learner = UrlShapeLearner(min_samples=3, min_yield=0.5, explore_every=4)
+        for _ in range(3):
+            learner.record(DOMAIN, "/video/{n}", stored=False)
+        ranked = learner.rank(DOMAIN, [f"https://x.com/video/{i}" for i in range(8)])
+        assert len(ranked) == 2
+        assert learner.stats["requests_saved"] == 6
+        assert learner.stats["explored"] == 2
+        assert learner.stats["candidates"] == 8
+
+    def test_learner_per_database(self, tmp_path):
+        first = Settings({"DATABASE_PATH": str(tmp_path / "a.db")})
+        second = Settings({"DATABASE_PATH": str(tmp_path / "b.db")})
+        assert get_url_shape_learner(first) is get_url_shape_learner(Settings(dict(first)))
+        assert get_url_shape_learner(second).db_path == str(tmp_path / "b.db")
+        assert get_url_shape_learner(first) is not get_url_shape_learner(second)
+
+
+class TestUrlShapeMiddleware:
+    """Tests for outcome recording in UrlShapeMiddleware."""
+
+    def test_outcomes(self):
+        learner = UrlShapeLearner()
+        middleware = UrlShapeMiddleware(learner)
+        shape = (DOMAIN, "/news/{n}")
+
+        # Callback produced nothing: not an article
+        assert list(middleware.process_spider_output(tagged_response("https://x.com/news/1"), [], SPIDER)) == []
+        # Item stored
+        response = tagged_response("https://x.com/news/2")
+        output = list(middleware.process_spider_output(response, [{"headline": "h"}], SPIDER))
+        middleware.item_scraped(output[0], response, SPIDER)
+        # Dropped for content vs. a neutral duplicate drop
+        middleware.item_dropped({}, response, DropItem("Missing required field: article"), SPIDER)
+        middleware.item_dropped({}, response, NeutralDropItem("Duplicate URL: https://x.com/news/2"), SPIDER)
+        # Untagged responses are ignored
+        middleware.item_scraped({}, HtmlResponse(url="https://x.com/about", body=b""), SPIDER)
+
+        assert learner._counts[shape] == [3, 1]
+        assert learner.stats["stored"] == 1 and learner.stats["non_article"] == 2
+
+    def test_async_output(self):
+        learner = UrlShapeLearner()
+        middleware = UrlShapeMiddleware(learner)
+
+        async def output():
+            yield Request("https://x.com/news/3")
+
+        async def consume():
+            return [entry async for entry in middleware.process_spider_output_async(
+                tagged_response("https://x.com/news/2"), output(), SPIDER)]
+
+        assert len(asyncio.run(consume())) == 1
+        assert learner._counts[(DOMAIN, "/news/{n}")] == [1, 0]
+
+    def test_closed_spider_reports_its_own_counts(self):
+        class Stats:
+            def __init__(self):
+                self.values = {}
+
+            def set_value(self, key, value):
+                self.values[key] = value
+
+        learner = UrlShapeLearner()
+        learner.record(DOMAIN, "/news/{n}", stored=True, owner="earlier")
+        learner.rank(DOMAIN, ["https://x.com/news/1"], owner="earlier")
+        middleware = UrlShapeMiddleware(learner, Stats())
+        learner.rank(DOMAIN, ["https://x.com/news/2", "https://x.com/news/3"], owner=SPIDER.name)
+        middleware.item_scraped({}, tagged_response("https://x.com/news/2"), SPIDER)
+        middleware.spider_closed(SPIDER, "finished")
+
+        assert middleware.stats.values["url_shapes/candidates"] == 2
+        assert middleware.stats.values["url_shapes/stored"] == 1
+        assert learner.stats["candidates"] == 3 and learner.stats["stored"] == 2
+        # A later job of the same spider starts from zero
+        assert learner.pop_stats(SPIDER.name)["candidates"] == 0